@@ -4,5 +4,8 @@
 """
 
 from .technical_indicators import *
+from .streaming_indicators import *
+from .prompt_payload import *
+from .decision_cache import *
 from .ai_analysis import *
 from .models import *
@@ -7,7 +7,24 @@ from datetime import datetime
 from typing import Optional, Dict, Any, List
 from openai import OpenAI
 from .models import TradingDecision
-from config.settings import OPENAI_API_KEY
+from .decision_cache import get_cached_decision, store_decision, decision_cache
+from .prompt_payload import build_prompt_payload, print_payload_stats, count_tokens, dumps_compact
+from utils.json_serializer import JsonPayload, frame_to_records, dumps_str
+from config.settings import OPENAI_API_KEY, PROMPT_PAYLOAD_FORMAT, PROMPT_TOKEN_BUDGET, PROMPT_TOKEN_STATS
+
+# 전역 OpenAI 클라이언트 (HTTP 연결 재사용)
+_openai_client = None
+
+def get_openai_client() -> OpenAI:
+    """OpenAI 클라이언트 반환 (없으면 생성)"""
+    global _openai_client
+    if _openai_client is None:
+        _openai_client = OpenAI()
+    return _openai_client
+
+def image_mime_type(image_base64: str) -> str:
+    """Base64 이미지의 MIME 타입 (JPEG/PNG 시그니처로 판별)"""
+    return "image/jpeg" if image_base64.startswith("/9j/") else "image/png"
 
 def create_market_analysis_data(daily_df, minute_df, current_price, orderbook, fear_greed_data, analyzed_news):
     """AI 분석용 시장 데이터 생성"""
@@ -69,19 +86,51 @@ def create_market_analysis_data(daily_df, minute_df, current_price, orderbook, f
             'recent_news': analyzed_news[:5]  # 최근 5개 뉴스만
         }
     
-    analysis_data = {
+    # 캔들 레코드의 NaN/Infinity는 DataFrame 단계에서 정리하고, 직렬화 결과는 프롬프트와 DB 저장에 재사용
+    analysis_data = JsonPayload({
         "current_price": current_price,
-        "daily_data": daily_df.to_dict('records') if not daily_df.empty else [],
-        "minute_data": minute_df.tail(100).to_dict('records') if not minute_df.empty else [],
+        "daily_data": frame_to_records(daily_df),
+        "minute_data": frame_to_records(minute_df, tail=100),
         "technical_indicators": technical_summary,
         "fear_greed_index": fear_greed_data,
         "news_analysis": news_summary,
         "orderbook": orderbook if orderbook and isinstance(orderbook, dict) else None,
         "analysis_time": datetime.now().isoformat()
-    }
+    })
     
     return analysis_data
 
+def serialize_market_data(market_data: Dict[str, Any], payload_format: Optional[str] = None,
+                          token_budget: int = PROMPT_TOKEN_BUDGET) -> str:
+    """
+    프롬프트에 넣을 시장 데이터 직렬화
+
+    전체 JSON은 full 형식이거나 compact 생성에 실패했을 때만 만들고,
+    full 형식과의 토큰 비교는 PROMPT_TOKEN_STATS가 켜져 있을 때만 계산합니다.
+
+    Args:
+        market_data: create_market_analysis_data 결과
+        payload_format: "compact" 또는 "full" (기본값: PROMPT_PAYLOAD_FORMAT)
+        token_budget: compact 형식 토큰 예산
+
+    Returns:
+        JSON 문자열
+    """
+    payload_format = payload_format or PROMPT_PAYLOAD_FORMAT
+    if payload_format != "compact":
+        full_json = dumps_str(market_data)
+        if PROMPT_TOKEN_STATS:
+            print(f"🧮 프롬프트 토큰 (full): {count_tokens(full_json):,}")
+        return full_json
+
+    try:
+        payload, stats = build_prompt_payload(market_data, token_budget)
+        print_payload_stats(stats, count_tokens(dumps_str(market_data)) if PROMPT_TOKEN_STATS else None)
+        return dumps_compact(payload)
+    except Exception as e:
+        print(f"⚠️ compact 페이로드 생성 실패, 기존 형식을 사용합니다: {e}")
+        return dumps_str(market_data)
+
 def analyze_market_sentiment(market_data: Dict[str, Any]) -> Dict[str, Any]:
     """
     시장 심리 분석
@@ -93,7 +142,7 @@ def analyze_market_sentiment(market_data: Dict[str, Any]) -> Dict[str, Any]:
         분석 결과
     """
     try:
-        client = OpenAI()
+        client = get_openai_client()
         
         # 시장 데이터 요약
         current_price = market_data.get('current_price', 0)
@@ -246,11 +295,18 @@ def generate_improvement_suggestions(performance_analysis: Dict[str, Any]) -> Li
     
     return suggestions
 
-def ai_trading_decision_with_indicators(market_data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
-    """기술적 지표를 포함한 AI 매매 결정 함수"""
+def ai_trading_decision_with_indicators(market_data: Dict[str, Any], payload_format: Optional[str] = None,
+                                        use_cache: bool = True) -> Optional[Dict[str, Any]]:
+    """기술적 지표를 포함한 AI 매매 결정 함수 (payload_format: "compact" 또는 "full")"""
     print("=== AI 매매 결정 분석 중 (기술적 지표 포함) ===")
     
-    client = OpenAI()
+    fingerprint, cached_decision = get_cached_decision(market_data, "indicators") if use_cache else (None, None)
+    if cached_decision:
+        print(f"♻️ 시장 상태 변화 없음, 이전 AI 결정 재사용: {cached_decision['decision']}")
+        decision_cache.print_stats()
+        return cached_decision
+    
+    client = get_openai_client()
     
     # 기술적 지표, 공포탐욕지수, 뉴스를 포함한 개선된 시스템 메시지
     system_message = """
@@ -306,6 +362,7 @@ def ai_trading_decision_with_indicators(market_data: Dict[str, Any]) -> Optional
     """
     
     try:
+        market_data_json = serialize_market_data(market_data, payload_format)
         response = client.chat.completions.create(
             model="gpt-4o",
             messages=[
@@ -315,7 +372,7 @@ def ai_trading_decision_with_indicators(market_data: Dict[str, Any]) -> Optional
                 },
                 {
                     "role": "user",
-                    "content": f"Please analyze this Bitcoin market data with technical indicators and provide trading decision: {json.dumps(market_data, default=str)}"
+                    "content": f"Please analyze this Bitcoin market data with technical indicators and provide trading decision: {market_data_json}"
                 }
             ],
             response_format={"type": "json_object"},
@@ -351,7 +408,11 @@ def ai_trading_decision_with_indicators(market_data: Dict[str, Any]) -> Optional
             print(f"   - 뉴스 감정: {decision.key_indicators.news_sentiment}")
             print(f"📝 분석 이유: {decision.reason}")
             
-            return decision.model_dump()
+            result = decision.model_dump()
+            if use_cache:
+                store_decision(fingerprint, result)
+                decision_cache.print_stats()
+            return result
         else:
             print("❌ Structured output 파싱 실패")
             return None
@@ -360,11 +421,19 @@ def ai_trading_decision_with_indicators(market_data: Dict[str, Any]) -> Optional
         print(f"❌ AI 분석 중 오류 발생: {e}")
         return None
 
-def ai_trading_decision_with_vision(market_data: Dict[str, Any], chart_image_base64: Optional[str] = None) -> Optional[Dict[str, Any]]:
+def ai_trading_decision_with_vision(market_data: Dict[str, Any], chart_image_base64: Optional[str] = None,
+                                    payload_format: Optional[str] = None, use_cache: bool = True) -> Optional[Dict[str, Any]]:
     """Vision API를 사용한 AI 매매 결정 함수"""
     print("=== AI 매매 결정 분석 중 (Vision API 포함) ===")
     
-    client = OpenAI()
+    mode = "vision" if chart_image_base64 else "indicators"
+    fingerprint, cached_decision = get_cached_decision(market_data, mode) if use_cache else (None, None)
+    if cached_decision:
+        print(f"♻️ 시장 상태 변화 없음, 이전 AI 결정 재사용: {cached_decision['decision']}")
+        decision_cache.print_stats()
+        return cached_decision
+    
+    client = get_openai_client()
     
     # Vision API를 위한 시스템 메시지
     system_message = """
@@ -372,7 +441,7 @@ def ai_trading_decision_with_vision(market_data: Dict[str, Any], chart_image_bas
     
     You will analyze:
     1. Market data including technical indicators, Fear and Greed Index, and news sentiment
-    2. A chart screenshot showing the current Bitcoin price chart with technical indicators (1-hour timeframe with Bollinger Bands)
+    2. A chart image showing the current Bitcoin price with technical indicators: either an Upbit screenshot (1-hour timeframe with Bollinger Bands) or a rendered chart with daily and recent 1-minute candlesticks, Bollinger Bands, SMA 50, EMA 12 and volume
     
     When analyzing the chart image, focus on:
     - Price action patterns and trends
@@ -417,6 +486,8 @@ def ai_trading_decision_with_vision(market_data: Dict[str, Any], chart_image_bas
     """
     
     try:
+        market_data_json = serialize_market_data(market_data, payload_format)
+
         # 메시지 구성
         messages = [
             {
@@ -430,18 +501,18 @@ def ai_trading_decision_with_vision(market_data: Dict[str, Any], chart_image_bas
             user_content = [
                 {
                     "type": "text",
-                    "text": f"Please analyze this Bitcoin market data with technical indicators and the provided chart image to provide trading decision: {json.dumps(market_data, default=str)}"
+                    "text": f"Please analyze this Bitcoin market data with technical indicators and the provided chart image to provide trading decision: {market_data_json}"
                 },
                 {
                     "type": "image_url",
                     "image_url": {
-                        "url": f"data:image/png;base64,{chart_image_base64}"
+                        "url": f"data:{image_mime_type(chart_image_base64)};base64,{chart_image_base64}"
                     }
                 }
             ]
         else:
             # 이미지가 없는 경우 기존 방식 사용
-            user_content = f"Please analyze this Bitcoin market data with technical indicators and provide trading decision: {json.dumps(market_data, default=str)}"
+            user_content = f"Please analyze this Bitcoin market data with technical indicators and provide trading decision: {market_data_json}"
         
         messages.append({"role": "user", "content": user_content})
         
@@ -490,7 +561,11 @@ def ai_trading_decision_with_vision(market_data: Dict[str, Any], chart_image_bas
             
             print(f"📝 분석 이유: {decision.reason}")
             
-            return decision.model_dump()
+            result = decision.model_dump()
+            if use_cache:
+                store_decision(fingerprint, result)
+                decision_cache.print_stats()
+            return result
         else:
             print("❌ Structured output 파싱 실패")
             return None
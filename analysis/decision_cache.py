@@ -0,0 +1,168 @@
+"""
+AI 결정 캐시 모듈
+시장 상태를 양자화한 지문(fingerprint)이 같으면 이전 매매 결정을 재사용합니다.
+
+지문 구성:
+- 가격 구간 (DECISION_CACHE_PRICE_STEP 비율 단위 로그 구간)
+- 기술적 지표 신호 튜플 (RSI/스토캐스틱/윌리엄스 구간, MACD 방향, 볼린저 위치 등)
+- 공포탐욕지수 구간
+- 최근 뉴스 제목 해시
+"""
+
+import copy
+import math
+import time
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Optional, Dict, Any, Tuple
+from config.settings import (
+    DECISION_CACHE_ENABLED, DECISION_CACHE_TTL, DECISION_CACHE_MAX_SIZE,
+    DECISION_CACHE_PRICE_STEP, DECISION_CACHE_FEAR_GREED_STEP
+)
+
+def _zone(value: Optional[float], lower: float, upper: float) -> Optional[str]:
+    """값을 low/mid/high 구간으로 변환"""
+    if value is None or (isinstance(value, float) and math.isnan(value)):
+        return None
+    if value < lower:
+        return 'low'
+    if value > upper:
+        return 'high'
+    return 'mid'
+
+def _bucket(value: Optional[float], step: float) -> Optional[int]:
+    """값을 step 단위 구간 번호로 변환"""
+    if value is None or (isinstance(value, float) and math.isnan(value)):
+        return None
+    return int(math.floor(value / step))
+
+def price_bucket(price: Optional[float], step: float = DECISION_CACHE_PRICE_STEP) -> Optional[int]:
+    """가격을 step 비율 단위의 로그 구간 번호로 변환"""
+    if not price or price <= 0:
+        return None
+    return int(math.floor(math.log(price) / math.log1p(step)))
+
+def indicator_signals(indicators: Optional[Dict[str, Any]]) -> Tuple:
+    """지표 요약을 매매 신호 튜플로 변환"""
+    if not indicators:
+        return ()
+    macd = indicators.get('macd')
+    macd_signal = indicators.get('macd_signal')
+    return (
+        _zone(indicators.get('rsi'), 30, 70),
+        None if macd is None or macd_signal is None else macd > macd_signal,
+        _bucket(indicators.get('bb_position'), 0.25),
+        _zone(indicators.get('stoch_k'), 20, 80),
+        _zone(indicators.get('williams_r'), -80, -20),
+        _zone(indicators.get('cci'), -100, 100),
+        None if indicators.get('adx') is None else indicators['adx'] > 25
+    )
+
+def news_digest(news_analysis: Optional[Dict[str, Any]]) -> Optional[str]:
+    """최근 뉴스 제목 목록의 해시"""
+    if not news_analysis:
+        return None
+    titles = sorted(news.get('title', '') for news in news_analysis.get('recent_news') or [])
+    return hashlib.sha1('\n'.join(titles).encode('utf-8')).hexdigest()[:12]
+
+def market_fingerprint(market_data: Dict[str, Any], mode: str = "indicators") -> Tuple:
+    """
+    시장 데이터의 양자화된 지문 생성
+
+    Args:
+        market_data: create_market_analysis_data 결과
+        mode: 결정 함수 구분 ("indicators" 또는 "vision")
+
+    Returns:
+        해시 가능한 지문 튜플
+    """
+    technical = market_data.get('technical_indicators') or {}
+    fear_greed = market_data.get('fear_greed_index') or {}
+    return (
+        mode,
+        price_bucket(market_data.get('current_price')),
+        indicator_signals(technical.get('daily_indicators')),
+        indicator_signals(technical.get('minute_indicators')),
+        _bucket(fear_greed.get('current_value'), DECISION_CACHE_FEAR_GREED_STEP),
+        news_digest(market_data.get('news_analysis'))
+    )
+
+class DecisionCache:
+    """
+    TTL + LRU 매매 결정 캐시
+
+    같은 지문으로 TTL 안에 다시 요청하면 저장된 결정을 반환하고,
+    최대 크기를 넘으면 가장 오래 사용하지 않은 항목부터 제거합니다.
+    """
+
+    def __init__(self, ttl: float = DECISION_CACHE_TTL, max_size: int = DECISION_CACHE_MAX_SIZE):
+        self.ttl = ttl
+        self.max_size = max_size
+        self._entries: "OrderedDict[Tuple, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, fingerprint: Tuple) -> Optional[Dict[str, Any]]:
+        """지문에 해당하는 결정 반환 (없거나 만료되면 None)"""
+        with self._lock:
+            entry = self._entries.get(fingerprint)
+            if entry is not None and time.monotonic() - entry[0] > self.ttl:
+                del self._entries[fingerprint]
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(fingerprint)
+            self.hits += 1
+            return copy.deepcopy(entry[1])
+
+    def put(self, fingerprint: Tuple, decision: Dict[str, Any]):
+        """결정 저장"""
+        with self._lock:
+            self._entries[fingerprint] = (time.monotonic(), copy.deepcopy(decision))
+            self._entries.move_to_end(fingerprint)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        """캐시 비우기"""
+        with self._lock:
+            self._entries.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """캐시 통계 반환"""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                'size': len(self._entries),
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_ratio': self.hits / total if total > 0 else 0.0
+            }
+
+    def print_stats(self):
+        """캐시 통계 출력"""
+        stats = self.get_stats()
+        print(f"🗃️ 결정 캐시: 적중 {stats['hits']}회 / 미적중 {stats['misses']}회 "
+              f"(적중률 {stats['hit_ratio']:.1%}, {stats['size']}개 저장)")
+
+# 전역 결정 캐시 인스턴스
+decision_cache = DecisionCache()
+
+def get_cached_decision(market_data: Dict[str, Any], mode: str = "indicators") -> Tuple[Tuple, Optional[Dict[str, Any]]]:
+    """캐시된 결정 조회 (편의 함수). (지문, 결정 또는 None) 반환"""
+    fingerprint = market_fingerprint(market_data, mode)
+    if not DECISION_CACHE_ENABLED:
+        return fingerprint, None
+    return fingerprint, decision_cache.get(fingerprint)
+
+def store_decision(fingerprint: Tuple, decision: Optional[Dict[str, Any]]):
+    """결정 저장 (편의 함수)"""
+    if DECISION_CACHE_ENABLED and decision:
+        decision_cache.put(fingerprint, decision)
+
+def get_decision_cache_stats() -> Dict[str, Any]:
+    """캐시 통계 반환 (편의 함수)"""
+    return decision_cache.get_stats()
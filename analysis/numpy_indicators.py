@@ -0,0 +1,218 @@
+"""
+NumPy 기술적 지표 모듈
+calculate_technical_indicators와 같은 컬럼을 float64 배열 연산으로 한 번에 계산합니다.
+True Range, 이동 최대/최소, EMA 커널 등 공통 중간값은 한 번만 계산해 재사용합니다.
+"""
+
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+from typing import Dict
+
+def _linear_recurrence(x: np.ndarray, decay: float, gain: float, initial: float) -> np.ndarray:
+    """
+    y[i] = decay * y[i-1] + gain * x[i] (y[-1] = initial) 계산
+
+    블록 단위로 누적합을 이용해 벡터화합니다. 블록 길이는 decay^-k가
+    float64 범위를 넘지 않도록 decay에 따라 정합니다.
+    """
+    n = len(x)
+    out = np.empty(n)
+    if n == 0:
+        return out
+    if decay <= 0.0 or decay >= 1.0:
+        block = 1
+    else:
+        block = max(1, min(n, int(30 / -np.log(decay))))
+    powers = decay ** np.arange(block + 1)
+    inverse_powers = 1.0 / powers[:block]
+
+    previous = initial
+    for start in range(0, n, block):
+        chunk = x[start:start + block]
+        length = len(chunk)
+        scaled_sum = np.cumsum(chunk * inverse_powers[:length])
+        out[start:start + length] = powers[1:length + 1] * previous + gain * powers[:length] * scaled_sum
+        previous = out[start + length - 1]
+    return out
+
+def _ewm(x: np.ndarray, alpha: float, min_periods: int) -> np.ndarray:
+    """pandas ewm(alpha, adjust=False).mean()과 같은 EMA (선행 NaN은 건너뜀)"""
+    out = np.full(len(x), np.nan)
+    valid = np.flatnonzero(~np.isnan(x))
+    if len(valid) == 0:
+        return out
+    start = valid[0]
+    values = x[start:]
+    out[start:] = _linear_recurrence(values, 1.0 - alpha, alpha, values[0])
+    out[start:start + min_periods - 1] = np.nan
+    return out
+
+def _rolling(x: np.ndarray, window: int) -> np.ndarray:
+    """(n - window + 1, window) 모양의 이동 윈도우 뷰"""
+    return sliding_window_view(x, window)
+
+def _rolling_apply(x: np.ndarray, window: int, func) -> np.ndarray:
+    """이동 윈도우 집계 (윈도우가 차지 않은 구간은 NaN)"""
+    out = np.full(len(x), np.nan)
+    if len(x) >= window:
+        out[window - 1:] = func(_rolling(x, window), axis=1)
+    return out
+
+def _safe_divide(numerator: np.ndarray, denominator: np.ndarray, fill: float = np.nan) -> np.ndarray:
+    """0으로 나누는 위치는 fill로 채우는 나눗셈"""
+    with np.errstate(divide='ignore', invalid='ignore'):
+        result = numerator / denominator
+    return np.where(denominator != 0, result, fill)
+
+def compute_indicator_arrays(high: np.ndarray, low: np.ndarray, close: np.ndarray,
+                             volume: np.ndarray) -> Dict[str, np.ndarray]:
+    """
+    OHLCV 배열에서 모든 기술적 지표 배열 계산
+
+    ta 라이브러리와 같은 워밍업 규칙(NaN 또는 0)을 따릅니다.
+    """
+    n = len(close)
+    indicators = {}
+
+    previous_close = np.empty(n)
+    previous_close[0] = np.nan
+    previous_close[1:] = close[:-1]
+
+    # 공통 중간값: 종가 20봉 윈도우, 14봉 최고/최저가, True Range
+    mean_20 = _rolling_apply(close, 20, np.mean)
+    std_20 = _rolling_apply(close, 20, np.std)
+    highest_14 = _rolling_apply(high, 14, np.max)
+    lowest_14 = _rolling_apply(low, 14, np.min)
+    true_range = np.fmax(high - low, np.fmax(np.abs(high - previous_close), np.abs(low - previous_close)))
+
+    # 1. 이동평균선
+    ema_12 = _linear_recurrence(close, 1 - 2 / 13, 2 / 13, close[0])
+    ema_26 = _linear_recurrence(close, 1 - 2 / 27, 2 / 27, close[0])
+    indicators['SMA_20'] = mean_20
+    indicators['SMA_50'] = _rolling_apply(close, 50, np.mean)
+    indicators['EMA_12'] = np.where(np.arange(n) >= 11, ema_12, np.nan)
+    indicators['EMA_26'] = np.where(np.arange(n) >= 25, ema_26, np.nan)
+
+    # 2. MACD
+    macd = np.where(np.arange(n) >= 25, ema_12 - ema_26, np.nan)
+    macd_signal = _ewm(macd, 2 / 10, 9)
+    indicators['MACD'] = macd
+    indicators['MACD_Signal'] = macd_signal
+    indicators['MACD_Histogram'] = macd - macd_signal
+
+    # 3. RSI (Wilder)
+    diff = np.zeros(n)
+    diff[1:] = np.diff(close)
+    ema_up = _ewm(np.where(diff > 0, diff, 0.0), 1 / 14, 14)
+    ema_down = _ewm(np.where(diff < 0, -diff, 0.0), 1 / 14, 14)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        rsi = 100 - 100 / (1 + ema_up / ema_down)
+    indicators['RSI'] = np.where(ema_down == 0, 100.0, rsi)
+
+    # 4. 볼린저 밴드
+    upper = mean_20 + 2 * std_20
+    lower = mean_20 - 2 * std_20
+    indicators['BB_Upper'] = upper
+    indicators['BB_Middle'] = mean_20
+    indicators['BB_Lower'] = lower
+    indicators['BB_Width'] = (upper - lower) / mean_20 * 100
+    indicators['BB_Position'] = _safe_divide(close - lower, upper - lower)
+
+    # 5. 스토캐스틱 / 6. 윌리엄스 %R
+    price_range = highest_14 - lowest_14
+    stoch_k = _safe_divide(100 * (close - lowest_14), price_range)
+    indicators['Stoch_K'] = stoch_k
+    indicators['Stoch_D'] = _rolling_apply(stoch_k, 3, np.mean)
+    indicators['Williams_R'] = _safe_divide(-100 * (highest_14 - close), price_range)
+
+    # 7. ATR (첫 캔들 TR은 고가-저가, 워밍업 구간은 0)
+    window = 14
+    atr = np.zeros(n)
+    if n >= window:
+        atr[window - 1] = true_range[:window].mean()
+        atr[window:] = _linear_recurrence(true_range[window:], (window - 1) / window, 1 / window, atr[window - 1])
+    indicators['ATR'] = atr
+
+    # 8. ADX (두 번째 캔들부터 누적, 워밍업 구간은 0)
+    adx = np.zeros(n)
+    adx_pos = np.zeros(n)
+    adx_neg = np.zeros(n)
+    if n > window:
+        up_move = np.zeros(n)
+        down_move = np.zeros(n)
+        up_move[1:] = high[1:] - high[:-1]
+        down_move[1:] = low[:-1] - low[1:]
+        pos_dm = np.where((up_move > down_move) & (up_move > 0), up_move, 0.0)
+        neg_dm = np.where((down_move > up_move) & (down_move > 0), down_move, 0.0)
+
+        def wilder_sum(values):
+            smoothed = np.empty(n - window)
+            smoothed[0] = values[1:window + 1].sum()
+            smoothed[1:] = _linear_recurrence(values[window + 1:], 1 - 1 / window, 1.0, smoothed[0])
+            return smoothed
+
+        tr_sum = wilder_sum(true_range)
+        di_pos = _safe_divide(100 * wilder_sum(pos_dm), tr_sum, 0.0)
+        di_neg = _safe_divide(100 * wilder_sum(neg_dm), tr_sum, 0.0)
+        dx = _safe_divide(100 * np.abs(di_pos - di_neg), di_pos + di_neg, 0.0)
+
+        adx_pos[window + 1:] = di_pos[1:]
+        adx_neg[window + 1:] = di_neg[1:]
+        if n >= 2 * window:
+            adx[2 * window - 1] = dx[:window].mean()
+            adx[2 * window:] = _linear_recurrence(dx[window:], (window - 1) / window, 1 / window, adx[2 * window - 1])
+    indicators['ADX'] = adx
+    indicators['ADX_Pos'] = adx_pos
+    indicators['ADX_Neg'] = adx_neg
+
+    # 9. OBV (종가가 같으면 거래량을 더함)
+    indicators['OBV'] = np.cumsum(np.where(close < previous_close, -volume, volume))
+
+    # 10. ROC
+    roc = np.full(n, np.nan)
+    if n > 12:
+        roc[12:] = (close[12:] - close[:-12]) / close[:-12] * 100
+    indicators['ROC'] = roc
+
+    # 11. CCI
+    typical_price = (high + low + close) / 3.0
+    cci = np.full(n, np.nan)
+    if n >= 20:
+        tp_windows = _rolling(typical_price, 20)
+        tp_mean = tp_windows.mean(axis=1)
+        mean_deviation = np.abs(tp_windows - tp_mean[:, None]).mean(axis=1)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            cci[19:] = (typical_price[19:] - tp_mean) / (0.015 * mean_deviation)
+    indicators['CCI'] = cci
+
+    return indicators
+
+def calculate_technical_indicators_numpy(df: pd.DataFrame, column_mapping: Dict[str, str]) -> pd.DataFrame:
+    """
+    NumPy 백엔드로 기술적 지표 계산
+
+    Args:
+        df: OHLCV DataFrame
+        column_mapping: 'open', 'high', 'low', 'close', 'volume' -> 실제 컬럼명
+
+    Returns:
+        calculate_technical_indicators(ta 백엔드)와 같은 컬럼의 DataFrame
+    """
+    arrays = {
+        key: np.ascontiguousarray(df[column_mapping[key]].to_numpy(dtype=np.float64))
+        for key in ['high', 'low', 'close', 'volume']
+    }
+    indicators = compute_indicator_arrays(arrays['high'], arrays['low'], arrays['close'], arrays['volume'])
+
+    # 컬럼명 통일 후 지표 컬럼 추가 (DataFrame은 한 번만 생성)
+    renames = {
+        column_mapping['open']: 'Open',
+        column_mapping['high']: 'High',
+        column_mapping['low']: 'Low',
+        column_mapping['close']: 'Close',
+        column_mapping['volume']: 'Volume'
+    }
+    columns = {renames.get(col, col): df[col].to_numpy() for col in df.columns}
+    columns.update(indicators)
+    return pd.DataFrame(columns, index=df.index)
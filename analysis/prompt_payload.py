@@ -0,0 +1,183 @@
+"""
+프롬프트 페이로드 모듈
+AI 매매 결정 요청에 넣을 시장 데이터를 토큰 예산 안에서 간결하게 인코딩합니다.
+
+- OHLCV/지표 레코드는 컬럼별 배열로 변환 (키 이름 반복 제거)
+- 숫자는 유효숫자 기준으로 반올림
+- 모두 NaN인 컬럼과 워밍업 구간의 앞쪽 NaN은 제거
+- 섹션별 토큰 수를 측정하고 예산을 넘으면 오래된 캔들부터 줄임
+"""
+
+import json
+import math
+from typing import Optional, Dict, Any, List, Tuple
+from config.settings import PROMPT_TOKEN_BUDGET
+
+try:
+    import tiktoken
+    _encoding = tiktoken.encoding_for_model("gpt-4o")
+except Exception:
+    _encoding = None
+
+# 프롬프트에서 제외할 중복 컬럼 (value = 거래대금, close * volume과 중복)
+REDUNDANT_COLUMNS = {'value'}
+
+# 오더북 호가 단계 수
+ORDERBOOK_LEVELS = 5
+
+# 예산 초과 시 줄일 때 남길 최소 캔들 수
+MIN_SERIES_LENGTH = 10
+
+def count_tokens(text: str) -> int:
+    """토큰 수 계산 (tiktoken이 없으면 4글자당 1토큰으로 추정)"""
+    if _encoding is not None:
+        return len(_encoding.encode(text))
+    return math.ceil(len(text) / 4)
+
+def dumps_compact(data: Any) -> str:
+    """공백 없는 JSON 직렬화"""
+    return json.dumps(data, ensure_ascii=False, separators=(',', ':'), default=str)
+
+def compact_number(value: Any, significant: int = 6) -> Any:
+    """숫자를 유효숫자 기준으로 반올림 (NaN/Infinity는 None)"""
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        try:
+            value = float(value)
+        except (TypeError, ValueError):
+            return value
+    if math.isnan(value) or math.isinf(value):
+        return None
+    if abs(value) >= 10 ** significant:
+        return int(round(value))
+    rounded = float(f"{value:.{significant}g}")
+    return int(rounded) if rounded.is_integer() else rounded
+
+def encode_series(records: List[Dict[str, Any]], max_length: Optional[int] = None) -> Optional[Dict[str, Any]]:
+    """
+    레코드 리스트를 컬럼별 배열로 변환
+
+    모든 배열은 가장 최근 캔들에서 끝나도록 정렬되며,
+    앞쪽의 NaN(지표 워밍업 구간)은 잘라냅니다.
+    """
+    if not records:
+        return None
+    if max_length is not None:
+        records = records[-max_length:]
+
+    series = {}
+    for column in records[0].keys():
+        if column in REDUNDANT_COLUMNS:
+            continue
+        values = [compact_number(record.get(column)) for record in records]
+        first_valid = next((i for i, value in enumerate(values) if value is not None), None)
+        if first_valid is None:
+            continue
+        series[column] = values[first_valid:]
+
+    return {'length': len(records), 'series': series}
+
+def encode_orderbook(orderbook: Optional[Dict[str, Any]], levels: int = ORDERBOOK_LEVELS) -> Optional[Dict[str, Any]]:
+    """오더북 상위 호가를 컬럼별 배열로 변환"""
+    if not orderbook or not isinstance(orderbook, dict):
+        return None
+    units = orderbook.get('orderbook_units', [])[:levels]
+    return {
+        'total_ask_size': compact_number(orderbook.get('total_ask_size')),
+        'total_bid_size': compact_number(orderbook.get('total_bid_size')),
+        'ask_price': [compact_number(unit.get('ask_price')) for unit in units],
+        'ask_size': [compact_number(unit.get('ask_size')) for unit in units],
+        'bid_price': [compact_number(unit.get('bid_price')) for unit in units],
+        'bid_size': [compact_number(unit.get('bid_size')) for unit in units]
+    }
+
+def encode_news(news_analysis: Optional[Dict[str, Any]], max_items: int = 5) -> Optional[Dict[str, Any]]:
+    """뉴스 감정 요약에서 링크/스니펫 등 판단에 필요 없는 필드 제거"""
+    if not news_analysis:
+        return None
+    encoded = {key: compact_number(value) for key, value in news_analysis.items() if key != 'recent_news'}
+    encoded['recent_news'] = [
+        {
+            'title': news.get('title', ''),
+            'source': news.get('source', ''),
+            'date': news.get('date', ''),
+            'sentiment': news.get('sentiment', ''),
+            'score': compact_number(news.get('sentiment_score', 0))
+        }
+        for news in (news_analysis.get('recent_news') or [])[:max_items]
+    ]
+    return encoded
+
+def _compact_mapping(data: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    """딕셔너리(중첩 포함)의 숫자 값 반올림"""
+    if data is None:
+        return None
+    compacted = {}
+    for key, value in data.items():
+        if isinstance(value, dict):
+            compacted[key] = _compact_mapping(value)
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            compacted[key] = compact_number(value)
+        else:
+            compacted[key] = value
+    return compacted
+
+def build_prompt_payload(market_data: Dict[str, Any], token_budget: int = PROMPT_TOKEN_BUDGET) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """
+    create_market_analysis_data 결과를 토큰 예산 안의 간결한 페이로드로 변환
+
+    Args:
+        market_data: create_market_analysis_data 결과
+        token_budget: 페이로드 전체 토큰 예산
+
+    Returns:
+        (페이로드, 섹션별 토큰 통계)
+    """
+    daily_records = market_data.get('daily_data') or []
+    minute_records = market_data.get('minute_data') or []
+    lengths = {'daily_data': len(daily_records), 'minute_data': len(minute_records)}
+    news_items = 5
+
+    while True:
+        payload = {
+            'format': 'columnar; every series array ends at the latest candle; leading warm-up NaNs removed',
+            'current_price': compact_number(market_data.get('current_price')),
+            'analysis_time': market_data.get('analysis_time'),
+            'technical_indicators': _compact_mapping(market_data.get('technical_indicators')),
+            'fear_greed_index': _compact_mapping(market_data.get('fear_greed_index')),
+            'orderbook': encode_orderbook(market_data.get('orderbook')),
+            'news_analysis': encode_news(market_data.get('news_analysis'), news_items),
+            'daily_data': encode_series(daily_records, lengths['daily_data']),
+            'minute_data': encode_series(minute_records, lengths['minute_data'])
+        }
+        section_tokens = {key: count_tokens(dumps_compact(value)) for key, value in payload.items()}
+        total_tokens = count_tokens(dumps_compact(payload))
+        if total_tokens <= token_budget:
+            break
+
+        # 가장 큰 캔들 섹션부터 오래된 캔들을 절반씩 줄임
+        shrinkable = [key for key in ('minute_data', 'daily_data') if lengths[key] > MIN_SERIES_LENGTH]
+        if shrinkable:
+            largest = max(shrinkable, key=lambda key: section_tokens[key])
+            lengths[largest] = max(MIN_SERIES_LENGTH, lengths[largest] // 2)
+        elif news_items > 0:
+            news_items -= 1
+        else:
+            break
+
+    stats = {
+        'sections': section_tokens,
+        'total_tokens': total_tokens,
+        'token_budget': token_budget,
+        'within_budget': total_tokens <= token_budget,
+        'series_lengths': lengths
+    }
+    return payload, stats
+
+def print_payload_stats(stats: Dict[str, Any], full_tokens: Optional[int] = None):
+    """섹션별 토큰 수 출력"""
+    print(f"🧮 프롬프트 토큰: {stats['total_tokens']:,} / 예산 {stats['token_budget']:,}")
+    for section, tokens in stats['sections'].items():
+        print(f"   - {section}: {tokens:,}")
+    if full_tokens:
+        saved = (1 - stats['total_tokens'] / full_tokens) * 100
+        print(f"   📉 기존 형식 대비: {full_tokens:,} → {stats['total_tokens']:,} ({saved:.1f}% 절감)")
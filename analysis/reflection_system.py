@@ -9,7 +9,10 @@ from typing import Dict, Any, List, Optional, Tuple
 from dataclasses import dataclass
 from mysql.connector import Error
 import numpy as np
-from database.connection import get_db_connection
+from database.connection import db_cursor
+from database.rollups import get_period_metrics
+from database.streaming import iter_trades
+from database.snapshot_store import load_trade_market_data
 from analysis.ai_analysis import analyze_market_sentiment
 from utils.logger import get_logger
 
@@ -55,7 +58,6 @@ class TradingReflectionSystem:
     
     def __init__(self):
         self.logger = get_logger(__name__)
-        self.connection = get_db_connection()
     
     def create_immediate_reflection(self, trade_id: int, trade_data: Dict[str, Any], 
                                   market_data: Dict[str, Any]) -> bool:
@@ -104,24 +106,23 @@ class TradingReflectionSystem:
                                  period_start: datetime, period_end: datetime) -> bool:
         """주기적 회고 생성 (일/주/월)"""
         try:
-            # 해당 기간의 거래 데이터 조회
-            trades = self._get_trades_in_period(period_start, period_end)
+            # 성과 지표 계산 (거래 롤업 기준)
+            metrics = self._calculate_period_metrics(period_start, period_end, reflection_type)
+            if metrics is None:
+                return False
             
-            if not trades:
+            if metrics.total_trades == 0:
                 self.logger.info(f"{reflection_type} 회고: 해당 기간에 거래가 없습니다.")
                 return True
             
-            # 성과 지표 계산
-            metrics = self._calculate_period_metrics(trades, period_start, period_end)
-            
             # AI 기반 종합 분석
-            ai_analysis = self._perform_period_ai_analysis(trades, metrics)
-            improvement_suggestions = self._generate_period_improvements(trades, metrics)
-            lessons_learned = self._extract_period_lessons(trades, metrics)
-            next_actions = self._suggest_period_actions(trades, metrics)
+            ai_analysis = self._perform_period_ai_analysis(metrics)
+            improvement_suggestions = self._generate_period_improvements(metrics)
+            lessons_learned = self._extract_period_lessons(metrics)
+            next_actions = self._suggest_period_actions(metrics)
             
-            # 각 거래에 대한 반성 생성
-            for trade in trades:
+            # 각 거래에 대한 반성 생성 (거래 ID만 청크 단위로 스트리밍)
+            for trade in iter_trades(period_start, period_end, columns=('id',)):
                 reflection = TradeReflection(
                     trade_id=trade['id'],
                     reflection_type=reflection_type,
@@ -143,7 +144,7 @@ class TradingReflectionSystem:
             # 성과 지표 저장
             self._save_performance_metrics(metrics)
             
-            self.logger.info(f"{reflection_type} 회고 완료: {len(trades)}개 거래 분석")
+            self.logger.info(f"{reflection_type} 회고 완료: {metrics.total_trades}개 거래 분석")
             return True
             
         except Exception as e:
@@ -344,8 +345,6 @@ class TradingReflectionSystem:
     def _save_reflection(self, reflection: TradeReflection) -> bool:
         """반성 데이터 저장"""
         try:
-            cursor = self.connection.cursor()
-            
             insert_query = """
             INSERT INTO trading_reflections (
                 trade_id, reflection_type, performance_score, profit_loss, profit_loss_percentage,
@@ -354,17 +353,15 @@ class TradingReflectionSystem:
             ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
             """
             
-            cursor.execute(insert_query, (
-                reflection.trade_id, reflection.reflection_type, reflection.performance_score,
-                reflection.profit_loss, reflection.profit_loss_percentage,
-                json.dumps(reflection.market_conditions, ensure_ascii=False),
-                reflection.decision_quality_score, reflection.timing_score, reflection.risk_management_score,
-                reflection.ai_analysis, reflection.improvement_suggestions,
-                reflection.lessons_learned, reflection.next_actions
-            ))
-            
-            self.connection.commit()
-            cursor.close()
+            with db_cursor() as cursor:
+                cursor.execute(insert_query, (
+                    reflection.trade_id, reflection.reflection_type, reflection.performance_score,
+                    reflection.profit_loss, reflection.profit_loss_percentage,
+                    json.dumps(reflection.market_conditions, ensure_ascii=False),
+                    reflection.decision_quality_score, reflection.timing_score, reflection.risk_management_score,
+                    reflection.ai_analysis, reflection.improvement_suggestions,
+                    reflection.lessons_learned, reflection.next_actions
+                ))
             
             return True
             
@@ -372,47 +369,52 @@ class TradingReflectionSystem:
             self.logger.error(f"반성 데이터 저장 오류: {e}")
             return False
     
-    def _get_trades_in_period(self, start_date: datetime, end_date: datetime) -> List[Dict[str, Any]]:
-        """기간 내 거래 데이터 조회"""
+    def _get_trades_in_period(self, start_date: datetime, end_date: datetime,
+                              include_market_data: bool = False) -> List[Dict[str, Any]]:
+        """기간 내 거래 데이터 조회 (요약 컬럼만 청크 단위로 스트리밍, market_data는 요청 시에만)"""
         try:
-            cursor = self.connection.cursor(dictionary=True)
-            
-            select_query = """
-            SELECT * FROM trades 
-            WHERE timestamp BETWEEN %s AND %s
-            ORDER BY timestamp ASC
-            """
-            
-            cursor.execute(select_query, (start_date, end_date))
-            trades = cursor.fetchall()
-            
-            cursor.close()
+            trades = list(iter_trades(start_date, end_date, include_market_data=include_market_data))
+            if include_market_data:
+                # 스냅샷 저장소에 있는 시장 데이터는 이때 지연 로딩
+                for trade in trades:
+                    trade['market_data'] = load_trade_market_data(trade)
             return trades
             
         except Error as e:
             self.logger.error(f"거래 데이터 조회 오류: {e}")
             return []
     
-    def _calculate_period_metrics(self, trades: List[Dict[str, Any]], 
-                                period_start: datetime, period_end: datetime) -> PerformanceMetrics:
-        """기간별 성과 지표 계산"""
+    def _calculate_period_metrics(self, period_start: datetime, period_end: datetime,
+                                period_type: str = 'daily') -> PerformanceMetrics:
+        """기간별 성과 지표 계산 (거래 롤업 기준, 롤업이 없으면 거래를 스트리밍하며 계산)"""
         try:
-            total_trades = len(trades)
-            winning_trades = sum(1 for trade in trades if self._calculate_profit_loss(trade) > 0)
-            losing_trades = total_trades - winning_trades
-            win_rate = winning_trades / total_trades if total_trades > 0 else 0
-            
-            total_profit_loss = sum(self._calculate_profit_loss(trade) for trade in trades)
-            total_profit_loss_percentage = (total_profit_loss / 1000000) * 100  # 임시 계산
-            
-            # 최대 낙폭 계산 (간단한 버전)
-            max_drawdown = 0.1  # 임시값
+            rollup = get_period_metrics(period_start, period_end)
+            if rollup:
+                total_trades = rollup['total_trades']
+                winning_trades = rollup['winning_trades']
+                losing_trades = rollup['losing_trades']
+                win_rate = rollup['win_rate']
+                total_profit_loss = rollup['realized_pnl']
+                total_profit_loss_percentage = rollup['realized_pnl_percentage']
+                max_drawdown = rollup['max_drawdown']
+            else:
+                total_trades = winning_trades = 0
+                total_profit_loss = 0.0
+                for trade in iter_trades(period_start, period_end):
+                    profit_loss = self._calculate_profit_loss(trade)
+                    total_trades += 1
+                    winning_trades += profit_loss > 0
+                    total_profit_loss += profit_loss
+                losing_trades = total_trades - winning_trades
+                win_rate = winning_trades / total_trades if total_trades > 0 else 0
+                total_profit_loss_percentage = (total_profit_loss / 1000000) * 100  # 임시 계산
+                max_drawdown = 0.1  # 임시값
             
             # 샤프 비율 계산 (간단한 버전)
             sharpe_ratio = 0.5  # 임시값
             
             return PerformanceMetrics(
-                period_type='daily',
+                period_type=period_type,
                 period_start=period_start,
                 period_end=period_end,
                 total_trades=total_trades,
@@ -434,8 +436,7 @@ class TradingReflectionSystem:
             self.logger.error(f"성과 지표 계산 오류: {e}")
             return None
     
-    def _perform_period_ai_analysis(self, trades: List[Dict[str, Any]], 
-                                  metrics: PerformanceMetrics) -> str:
+    def _perform_period_ai_analysis(self, metrics: PerformanceMetrics) -> str:
         """기간별 AI 분석"""
         try:
             return f"기간 분석 결과: 총 {metrics.total_trades}건 거래, 승률 {metrics.win_rate:.2%}, 수익률 {metrics.total_profit_loss_percentage:.2f}%"
@@ -443,8 +444,7 @@ class TradingReflectionSystem:
             self.logger.error(f"기간별 AI 분석 오류: {e}")
             return "기간별 분석을 수행할 수 없습니다."
     
-    def _generate_period_improvements(self, trades: List[Dict[str, Any]], 
-                                    metrics: PerformanceMetrics) -> str:
+    def _generate_period_improvements(self, metrics: PerformanceMetrics) -> str:
         """기간별 개선 제안"""
         try:
             improvements = []
@@ -464,8 +464,7 @@ class TradingReflectionSystem:
             self.logger.error(f"기간별 개선 제안 오류: {e}")
             return "개선 제안을 생성할 수 없습니다."
     
-    def _extract_period_lessons(self, trades: List[Dict[str, Any]], 
-                               metrics: PerformanceMetrics) -> str:
+    def _extract_period_lessons(self, metrics: PerformanceMetrics) -> str:
         """기간별 교훈 추출"""
         try:
             return f"기간 교훈: {metrics.total_trades}건의 거래를 통해 시장 상황별 대응 전략의 중요성을 확인했습니다."
@@ -473,8 +472,7 @@ class TradingReflectionSystem:
             self.logger.error(f"기간별 교훈 추출 오류: {e}")
             return "교훈을 추출할 수 없습니다."
     
-    def _suggest_period_actions(self, trades: List[Dict[str, Any]], 
-                               metrics: PerformanceMetrics) -> str:
+    def _suggest_period_actions(self, metrics: PerformanceMetrics) -> str:
         """기간별 다음 행동 제안"""
         try:
             return "다음 기간을 위한 전략 조정 및 시장 모니터링 강화"
@@ -485,8 +483,6 @@ class TradingReflectionSystem:
     def _save_performance_metrics(self, metrics: PerformanceMetrics) -> bool:
         """성과 지표 저장"""
         try:
-            cursor = self.connection.cursor()
-            
             insert_query = """
             INSERT INTO performance_metrics (
                 period_type, period_start, period_end, total_trades, winning_trades, losing_trades,
@@ -496,18 +492,16 @@ class TradingReflectionSystem:
             ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
             """
             
-            cursor.execute(insert_query, (
-                metrics.period_type, metrics.period_start, metrics.period_end,
-                metrics.total_trades, metrics.winning_trades, metrics.losing_trades,
-                metrics.win_rate, metrics.total_profit_loss, metrics.total_profit_loss_percentage,
-                metrics.max_drawdown, metrics.sharpe_ratio, metrics.average_trade_duration,
-                metrics.best_trade_profit, metrics.worst_trade_loss,
-                json.dumps(metrics.market_condition_performance, ensure_ascii=False),
-                json.dumps(metrics.strategy_performance, ensure_ascii=False)
-            ))
-            
-            self.connection.commit()
-            cursor.close()
+            with db_cursor() as cursor:
+                cursor.execute(insert_query, (
+                    metrics.period_type, metrics.period_start, metrics.period_end,
+                    metrics.total_trades, metrics.winning_trades, metrics.losing_trades,
+                    metrics.win_rate, metrics.total_profit_loss, metrics.total_profit_loss_percentage,
+                    metrics.max_drawdown, metrics.sharpe_ratio, metrics.average_trade_duration,
+                    metrics.best_trade_profit, metrics.worst_trade_loss,
+                    json.dumps(metrics.market_condition_performance, ensure_ascii=False),
+                    json.dumps(metrics.strategy_performance, ensure_ascii=False)
+                ))
             
             return True
             
@@ -608,8 +602,6 @@ class TradingReflectionSystem:
     def _save_learning_insight(self, insight: Dict[str, Any]) -> bool:
         """학습 인사이트 저장"""
         try:
-            cursor = self.connection.cursor()
-            
             insert_query = """
             INSERT INTO learning_insights (
                 insight_type, insight_title, insight_description, confidence_level,
@@ -617,15 +609,13 @@ class TradingReflectionSystem:
             ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
             """
             
-            cursor.execute(insert_query, (
-                insight['insight_type'], insight['insight_title'], insight['insight_description'],
-                insight['confidence_level'], json.dumps(insight['supporting_data'], ensure_ascii=False),
-                json.dumps(insight['applicable_conditions'], ensure_ascii=False),
-                insight['action_items'], insight['priority_level']
-            ))
-            
-            self.connection.commit()
-            cursor.close()
+            with db_cursor() as cursor:
+                cursor.execute(insert_query, (
+                    insight['insight_type'], insight['insight_title'], insight['insight_description'],
+                    insight['confidence_level'], json.dumps(insight['supporting_data'], ensure_ascii=False),
+                    json.dumps(insight['applicable_conditions'], ensure_ascii=False),
+                    insight['action_items'], insight['priority_level']
+                ))
             
             return True
             
@@ -717,8 +707,6 @@ class TradingReflectionSystem:
     def _save_strategy_improvement(self, improvement: Dict[str, Any]) -> bool:
         """전략 개선 제안 저장"""
         try:
-            cursor = self.connection.cursor()
-            
             insert_query = """
             INSERT INTO strategy_improvements (
                 improvement_type, old_value, new_value, reason, expected_impact,
@@ -727,16 +715,14 @@ class TradingReflectionSystem:
             ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
             """
             
-            cursor.execute(insert_query, (
-                improvement['improvement_type'], improvement['old_value'], improvement['new_value'],
-                improvement['reason'], improvement['expected_impact'], improvement['implementation_date'],
-                improvement['validation_period_days'], json.dumps(improvement['performance_before'], ensure_ascii=False),
-                json.dumps(improvement['performance_after'], ensure_ascii=False),
-                improvement['success_metric'], improvement['status']
-            ))
-            
-            self.connection.commit()
-            cursor.close()
+            with db_cursor() as cursor:
+                cursor.execute(insert_query, (
+                    improvement['improvement_type'], improvement['old_value'], improvement['new_value'],
+                    improvement['reason'], improvement['expected_impact'], improvement['implementation_date'],
+                    improvement['validation_period_days'], json.dumps(improvement['performance_before'], ensure_ascii=False),
+                    json.dumps(improvement['performance_after'], ensure_ascii=False),
+                    improvement['success_metric'], improvement['status']
+                ))
             
             return True
             
@@ -0,0 +1,516 @@
+"""
+스트리밍 기술적 지표 모듈
+새 캔들이 들어올 때마다 지표 상태를 O(1)로 갱신합니다.
+calculate_technical_indicators (ta 라이브러리)와 같은 값을 계산합니다.
+
+ta는 매번 조회한 캔들 구간(예: 분봉 1440개)의 첫 캔들부터 다시 계산하지만, 엔진은 처음 반영한 캔들부터
+상태를 이어갑니다. 구간이 밀려도 같은 값이 되도록 지표별로 다음과 같이 처리합니다.
+
+- SMA/볼린저 밴드/스토캐스틱/윌리엄스 %R/ROC/CCI: 고정 길이 윈도우라 항상 ta와 같음
+- EMA/MACD/RSI/ATR/ADX: 지수 가중이라 시작 캔들의 영향이 (1 - α)^n으로 줄어듦.
+  분봉 1440개 구간에서는 부동소수점 정밀도 안에서 ta와 같지만, 일봉 30개처럼 짧은 구간에서는
+  더 긴 이력을 반영하므로 ta 값과 크게 다름 (구간 앞쪽의 워밍업 NaN도 없음).
+  그래서 일봉은 DAILY_INDICATOR_BACKEND(기본 numpy)로 매번 전체 재계산하고 이 엔진은 분봉에만 사용
+- OBV: 누적합이라 calculate_technical_indicators_streaming에서 조회 구간의 첫 캔들 기준으로 다시 맞춤
+"""
+
+import copy
+import math
+from collections import deque
+from typing import Optional, Dict
+import numpy as np
+import pandas as pd
+
+NAN = float('nan')
+
+class _Cloneable:
+    """미마감 캔들 교체용 상태 복사 (고정 길이 컨테이너만 얕게 복사, 깊은 복사 없음)"""
+
+    def clone(self):
+        other = copy.copy(self)
+        for name, value in vars(self).items():
+            if isinstance(value, deque):
+                setattr(other, name, deque(value, value.maxlen))
+            elif isinstance(value, list):
+                setattr(other, name, list(value))
+            elif isinstance(value, _Cloneable):
+                setattr(other, name, value.clone())
+        return other
+
+class _RollingWindow(_Cloneable):
+    """고정 길이 윈도우의 합/제곱합 (첫 값을 기준으로 빼서 정밀도 유지)"""
+
+    def __init__(self, window: int):
+        self.window = window
+        self.values = deque()
+        self.anchor = None
+        self.total = 0.0
+        self.total_sq = 0.0
+
+    def push(self, value: float):
+        if self.anchor is None:
+            self.anchor = value
+        delta = value - self.anchor
+        self.values.append(delta)
+        self.total += delta
+        self.total_sq += delta * delta
+        if len(self.values) > self.window:
+            old = self.values.popleft()
+            self.total -= old
+            self.total_sq -= old * old
+
+    @property
+    def full(self) -> bool:
+        return len(self.values) >= self.window
+
+    def mean(self) -> float:
+        return self.anchor + self.total / len(self.values)
+
+    def std(self) -> float:
+        """모표준편차 (ddof=0)"""
+        count = len(self.values)
+        variance = self.total_sq / count - (self.total / count) ** 2
+        return math.sqrt(max(variance, 0.0))
+
+class _RollingExtreme(_Cloneable):
+    """단조 덱을 이용한 이동 최대/최소값"""
+
+    def __init__(self, window: int, use_max: bool):
+        self.window = window
+        self.use_max = use_max
+        self.items = deque()
+        self.count = 0
+
+    def push(self, value: float):
+        index = self.count
+        self.count += 1
+        if self.use_max:
+            while self.items and self.items[-1][1] <= value:
+                self.items.pop()
+        else:
+            while self.items and self.items[-1][1] >= value:
+                self.items.pop()
+        self.items.append((index, value))
+        while self.items[0][0] <= index - self.window:
+            self.items.popleft()
+
+    @property
+    def full(self) -> bool:
+        return self.count >= self.window
+
+    @property
+    def value(self) -> float:
+        return self.items[0][1]
+
+class _EMA(_Cloneable):
+    """지수이동평균 (pandas ewm(adjust=False)와 동일)"""
+
+    def __init__(self, alpha: float, min_periods: int):
+        self.alpha = alpha
+        self.min_periods = min_periods
+        self.value = None
+        self.count = 0
+
+    def push(self, x: float):
+        if self.value is None:
+            self.value = x
+        else:
+            self.value = self.alpha * x + (1 - self.alpha) * self.value
+        self.count += 1
+
+    @property
+    def ready(self) -> bool:
+        return self.count >= self.min_periods
+
+    def get(self) -> float:
+        return self.value if self.ready else NAN
+
+class _IndicatorState(_Cloneable):
+    """지표별 누적 상태"""
+
+    def __init__(self):
+        self.bar_count = 0
+        self.prev_high = None
+        self.prev_low = None
+        self.prev_close = None
+
+        # 이동평균 / 볼린저 밴드 (SMA_20과 볼린저 중심선은 같은 윈도우 공유)
+        self.window_20 = _RollingWindow(20)
+        self.window_50 = _RollingWindow(50)
+        self.ema_12 = _EMA(2 / (12 + 1), 12)
+        self.ema_26 = _EMA(2 / (26 + 1), 26)
+        self.macd_signal = _EMA(2 / (9 + 1), 9)
+
+        # RSI (Wilder)
+        self.rsi_up = _EMA(1 / 14, 14)
+        self.rsi_down = _EMA(1 / 14, 14)
+
+        # 스토캐스틱 / 윌리엄스 %R (14봉 고가/저가 공유)
+        self.high_14 = _RollingExtreme(14, use_max=True)
+        self.low_14 = _RollingExtreme(14, use_max=False)
+        self.stoch_k_values = deque(maxlen=3)
+
+        # ATR
+        self.atr_tr_sum = 0.0
+        self.atr = 0.0
+
+        # ADX
+        self.adx_tr_sum = 0.0
+        self.adx_pos_sum = 0.0
+        self.adx_neg_sum = 0.0
+        self.dx_values = []
+        self.adx = 0.0
+
+        # OBV / ROC / CCI
+        self.obv = 0.0
+        self.roc_closes = deque(maxlen=13)
+        self.cci_window = _RollingWindow(20)
+        self.typical_prices = deque(maxlen=20)
+
+class StreamingIndicatorEngine:
+    """
+    스트리밍 기술적 지표 엔진
+
+    캔들을 하나씩 받아 SMA/EMA, MACD, RSI, 볼린저 밴드, 스토캐스틱, 윌리엄스 %R,
+    ATR, ADX, OBV, ROC, CCI를 갱신합니다. 각 갱신은 전체 이력 길이와 무관하게
+    지표 윈도우 크기만큼의 연산만 수행합니다.
+
+    아직 마감되지 않은 캔들은 update(..., closed=False)로 반영하면 반영 전 상태를 보관하고,
+    다음 update(..., replace_last=True)에서 그 상태로 되돌려 다시 계산합니다.
+    update_from_dataframe은 반영한 캔들의 지표 값을 시각별로 history에 보관합니다.
+    """
+
+    ATR_WINDOW = 14
+    ADX_WINDOW = 14
+    ROC_WINDOW = 12
+    CCI_CONSTANT = 0.015
+
+    def __init__(self):
+        self.history: deque = deque()
+        self.reset()
+
+    def reset(self):
+        """상태 초기화"""
+        self._state = _IndicatorState()
+        self._state_before_last: Optional[_IndicatorState] = None
+        self.last_timestamp = None
+        self._checkpoint = None  # 마지막으로 반영한 마감 캔들의 (시각, 종가), 이어지는 데이터인지 확인용
+        self.values: Dict[str, float] = {}
+        self.history.clear()
+
+    @property
+    def bar_count(self) -> int:
+        return self._state.bar_count
+
+    def update(self, open_price: float, high: float, low: float, close: float, volume: float,
+               replace_last: bool = False, closed: bool = True) -> Dict[str, float]:
+        """
+        캔들 하나로 지표 갱신
+
+        Args:
+            open_price, high, low, close, volume: 캔들 OHLCV
+            replace_last: True면 마지막 캔들(closed=False로 반영한 캔들)을 새 값으로 교체
+            closed: False면 아직 마감되지 않은 캔들 (다음 갱신에서 교체할 수 있도록 반영 전 상태 보관)
+
+        Returns:
+            최신 지표 값 딕셔너리
+        """
+        return self._push(high, low, close, volume, replace_last, keep_snapshot=not closed)
+
+    def _push(self, high: float, low: float, close: float, volume: float,
+              replace_last: bool, keep_snapshot: bool) -> Dict[str, float]:
+        """캔들 반영 (keep_snapshot이면 교체를 위해 반영 전 상태 보관)"""
+        if replace_last and self._state_before_last is not None:
+            self._state = self._state_before_last
+        self._state_before_last = self._state.clone() if keep_snapshot else None
+        self.values = self._apply(self._state, float(high), float(low), float(close), float(volume))
+        return self.values
+
+    def _apply(self, s: _IndicatorState, high: float, low: float, close: float, volume: float) -> Dict[str, float]:
+        """상태에 캔들 하나 반영 후 지표 값 반환"""
+        index = s.bar_count
+        prev_close = s.prev_close
+        values = {}
+
+        # 1. 이동평균선
+        s.window_20.push(close)
+        s.window_50.push(close)
+        s.ema_12.push(close)
+        s.ema_26.push(close)
+        values['SMA_20'] = s.window_20.mean() if s.window_20.full else NAN
+        values['SMA_50'] = s.window_50.mean() if s.window_50.full else NAN
+        values['EMA_12'] = s.ema_12.get()
+        values['EMA_26'] = s.ema_26.get()
+
+        # 2. MACD (시그널은 MACD가 유효해진 시점부터 계산)
+        if s.ema_12.ready and s.ema_26.ready:
+            macd = s.ema_12.value - s.ema_26.value
+            s.macd_signal.push(macd)
+            values['MACD'] = macd
+            values['MACD_Signal'] = s.macd_signal.get()
+            values['MACD_Histogram'] = macd - values['MACD_Signal']
+        else:
+            values['MACD'] = values['MACD_Signal'] = values['MACD_Histogram'] = NAN
+
+        # 3. RSI (첫 캔들의 변화량은 0으로 취급)
+        diff = 0.0 if prev_close is None else close - prev_close
+        s.rsi_up.push(diff if diff > 0 else 0.0)
+        s.rsi_down.push(-diff if diff < 0 else 0.0)
+        if not s.rsi_down.ready:
+            values['RSI'] = NAN
+        elif s.rsi_down.value == 0:
+            values['RSI'] = 100.0
+        else:
+            values['RSI'] = 100 - 100 / (1 + s.rsi_up.value / s.rsi_down.value)
+
+        # 4. 볼린저 밴드
+        if s.window_20.full:
+            middle = s.window_20.mean()
+            deviation = 2 * s.window_20.std()
+            upper, lower = middle + deviation, middle - deviation
+            values['BB_Upper'] = upper
+            values['BB_Middle'] = middle
+            values['BB_Lower'] = lower
+            values['BB_Width'] = (upper - lower) / middle * 100 if middle != 0 else NAN
+            values['BB_Position'] = (close - lower) / (upper - lower) if upper != lower else NAN
+        else:
+            values['BB_Upper'] = values['BB_Middle'] = values['BB_Lower'] = NAN
+            values['BB_Width'] = values['BB_Position'] = NAN
+
+        # 5. 스토캐스틱 / 6. 윌리엄스 %R
+        s.high_14.push(high)
+        s.low_14.push(low)
+        if s.high_14.full:
+            highest, lowest = s.high_14.value, s.low_14.value
+            price_range = highest - lowest
+            stoch_k = 100 * (close - lowest) / price_range if price_range != 0 else NAN
+            williams_r = -100 * (highest - close) / price_range if price_range != 0 else NAN
+        else:
+            stoch_k = williams_r = NAN
+        s.stoch_k_values.append(stoch_k)
+        values['Stoch_K'] = stoch_k
+        if len(s.stoch_k_values) == 3 and not any(math.isnan(k) for k in s.stoch_k_values):
+            values['Stoch_D'] = sum(s.stoch_k_values) / 3
+        else:
+            values['Stoch_D'] = NAN
+        values['Williams_R'] = williams_r
+
+        # 7. ATR (첫 캔들의 TR은 고가-저가, 워밍업 구간은 0)
+        if prev_close is None:
+            true_range = high - low
+        else:
+            true_range = max(high - low, abs(high - prev_close), abs(low - prev_close))
+        window = self.ATR_WINDOW
+        if index < window:
+            s.atr_tr_sum += true_range
+            if index == window - 1:
+                s.atr = s.atr_tr_sum / window
+        else:
+            s.atr = (s.atr * (window - 1) + true_range) / window
+        values['ATR'] = s.atr
+
+        # 8. ADX (두 번째 캔들부터 방향성 움직임 누적)
+        values['ADX'] = values['ADX_Pos'] = values['ADX_Neg'] = 0.0
+        window = self.ADX_WINDOW
+        if prev_close is not None:
+            up_move = high - s.prev_high
+            down_move = s.prev_low - low
+            pos_dm = up_move if (up_move > down_move and up_move > 0) else 0.0
+            neg_dm = down_move if (down_move > up_move and down_move > 0) else 0.0
+            if index <= window:
+                s.adx_tr_sum += true_range
+                s.adx_pos_sum += pos_dm
+                s.adx_neg_sum += neg_dm
+            else:
+                s.adx_tr_sum = s.adx_tr_sum - s.adx_tr_sum / window + true_range
+                s.adx_pos_sum = s.adx_pos_sum - s.adx_pos_sum / window + pos_dm
+                s.adx_neg_sum = s.adx_neg_sum - s.adx_neg_sum / window + neg_dm
+
+            if index >= window:
+                tr_sum = s.adx_tr_sum
+                di_pos = 100 * s.adx_pos_sum / tr_sum if tr_sum != 0 else 0.0
+                di_neg = 100 * s.adx_neg_sum / tr_sum if tr_sum != 0 else 0.0
+                di_sum = di_pos + di_neg
+                dx = 100 * abs((di_pos - di_neg) / di_sum) if di_sum != 0 else 0.0
+
+                if index < 2 * window:
+                    s.dx_values.append(dx)
+                    if index == 2 * window - 1:
+                        s.adx = sum(s.dx_values) / window
+                else:
+                    s.adx = (s.adx * (window - 1) + dx) / window
+
+                # ta와 동일하게 +DI/-DI는 윈도우 다음 캔들부터 출력
+                if index > window:
+                    values['ADX_Pos'] = di_pos
+                    values['ADX_Neg'] = di_neg
+                values['ADX'] = s.adx
+
+        # 9. OBV (종가가 같으면 거래량을 더함)
+        if prev_close is not None and close < prev_close:
+            s.obv -= volume
+        else:
+            s.obv += volume
+        values['OBV'] = s.obv
+
+        # 10. ROC
+        s.roc_closes.append(close)
+        if len(s.roc_closes) > self.ROC_WINDOW:
+            base = s.roc_closes[0]
+            values['ROC'] = (close - base) / base * 100 if base != 0 else NAN
+        else:
+            values['ROC'] = NAN
+
+        # 11. CCI (평균 절대 편차는 20봉 윈도우에서 계산)
+        typical_price = (high + low + close) / 3.0
+        s.cci_window.push(typical_price)
+        s.typical_prices.append(typical_price)
+        if s.cci_window.full:
+            mean_tp = s.cci_window.mean()
+            mean_deviation = sum(abs(tp - mean_tp) for tp in s.typical_prices) / len(s.typical_prices)
+            if mean_deviation != 0:
+                values['CCI'] = (typical_price - mean_tp) / (self.CCI_CONSTANT * mean_deviation)
+            else:
+                values['CCI'] = NAN
+        else:
+            values['CCI'] = NAN
+
+        s.prev_high, s.prev_low, s.prev_close = high, low, close
+        s.bar_count += 1
+        return values
+
+    def update_from_dataframe(self, df: pd.DataFrame) -> Dict[str, float]:
+        """
+        OHLCV DataFrame에서 아직 반영하지 않은 캔들만 반영
+
+        마지막으로 반영한 시각과 같은 캔들은 미마감 캔들로 보고 교체합니다.
+        이어지지 않거나 이미 반영한 마감 캔들의 종가가 다른 데이터가 들어오면 처음부터 다시 계산합니다.
+        """
+        if df is None or df.empty:
+            return self.values
+
+        columns = _find_ohlcv_columns(df)
+        if columns is None:
+            print("❌ 필수 OHLCV 컬럼을 찾을 수 없습니다.")
+            return self.values
+
+        if self.last_timestamp is not None:
+            if df.index[-1] < self.last_timestamp or df.index[0] > self.last_timestamp:
+                self.reset()
+            elif self._checkpoint is not None and self._checkpoint[0] in df.index:
+                if float(df.at[self._checkpoint[0], columns['close']]) != self._checkpoint[1]:
+                    self.reset()
+        if self.history.maxlen is None or self.history.maxlen < len(df):
+            self.history = deque(self.history, maxlen=len(df))
+
+        if self.last_timestamp is None:
+            pending = df
+        else:
+            pending = df[df.index >= self.last_timestamp]
+
+        # 반영 전 상태는 마지막 캔들에 대해서만 보관하면 됨
+        subset = pending[[columns['high'], columns['low'], columns['close'], columns['volume']]]
+        last_position = len(subset) - 1
+        for position, (timestamp, high, low, close, volume) in enumerate(subset.itertuples(name=None)):
+            replace_last = timestamp == self.last_timestamp
+            values = self._push(high, low, close, volume, replace_last=replace_last,
+                                keep_snapshot=(position == last_position))
+            if replace_last and self.history:
+                self.history.pop()
+            self.history.append((timestamp, values))
+            self.last_timestamp = timestamp
+        if len(subset) >= 2:
+            self._checkpoint = (subset.index[-2], float(subset.iloc[-2, 2]))
+
+        return self.values
+
+    def history_frame(self, index: pd.Index) -> pd.DataFrame:
+        """history에 보관한 지표 값을 주어진 시각 인덱스에 맞춘 DataFrame (없는 시각은 NaN)"""
+        if not self.history:
+            return pd.DataFrame(index=index)
+        timestamps = pd.Index([timestamp for timestamp, _ in self.history])
+        frame = pd.DataFrame(np.array([tuple(values.values()) for _, values in self.history]),
+                             index=timestamps, columns=list(self.history[-1][1].keys()))
+        if len(timestamps) >= len(index) and timestamps[len(timestamps) - len(index):].equals(index):
+            return frame.iloc[len(timestamps) - len(index):]
+        return frame.reindex(index)
+
+    def snapshot(self) -> Dict[str, float]:
+        """최신 캔들의 전체 지표 값 반환"""
+        return dict(self.values)
+
+    def get_latest_indicators(self) -> Optional[dict]:
+        """get_latest_indicators(df)와 같은 형식의 최신 지표 반환"""
+        if not self.values:
+            return None
+        keys = [
+            'SMA_20', 'SMA_50', 'EMA_12', 'EMA_26', 'RSI', 'MACD', 'MACD_Signal',
+            'BB_Upper', 'BB_Middle', 'BB_Lower', 'BB_Position',
+            'Stoch_K', 'Stoch_D', 'Williams_R', 'ATR', 'ADX', 'CCI', 'ROC'
+        ]
+        return {key: float(self.values[key]) for key in keys}
+
+def _find_ohlcv_columns(df: pd.DataFrame) -> Optional[Dict[str, str]]:
+    """DataFrame에서 OHLCV 컬럼 이름 찾기"""
+    column_mapping = {}
+    for req_col in ['open', 'high', 'low', 'close', 'volume']:
+        for df_col in df.columns:
+            if req_col in str(df_col).lower():
+                column_mapping[req_col] = df_col
+                break
+    return column_mapping if len(column_mapping) == 5 else None
+
+def calculate_technical_indicators_streaming(df: pd.DataFrame, column_mapping: Dict[str, str],
+                                             name: Optional[str] = None) -> pd.DataFrame:
+    """
+    스트리밍 백엔드로 기술적 지표 계산 (이전 호출 이후 새로 들어온 캔들만 계산)
+
+    Args:
+        df: OHLCV DataFrame (시각 인덱스)
+        column_mapping: 'open', 'high', 'low', 'close', 'volume' -> 실제 컬럼명
+        name: 엔진 이름 (없으면 캔들 간격으로 구분, 일봉과 분봉은 서로 다른 엔진 사용)
+
+    Returns:
+        calculate_technical_indicators(ta 백엔드)와 같은 컬럼의 DataFrame
+    """
+    engine = get_indicator_engine(name or _interval_name(df))
+    engine.update_from_dataframe(df)
+    indicators = engine.history_frame(df.index)
+
+    # OBV는 엔진 시작부터의 누적합이므로 ta처럼 조회 구간의 첫 캔들 거래량에서 시작하도록 맞춤
+    if 'OBV' in indicators and len(indicators) > 0:
+        obv = indicators['OBV']
+        indicators['OBV'] = obv - obv.iloc[0] + float(df[column_mapping['volume']].iloc[0])
+
+    renames = {
+        column_mapping['open']: 'Open',
+        column_mapping['high']: 'High',
+        column_mapping['low']: 'Low',
+        column_mapping['close']: 'Close',
+        column_mapping['volume']: 'Volume'
+    }
+    columns = {renames.get(col, col): df[col].to_numpy() for col in df.columns}
+    columns.update(zip(indicators.columns, indicators.to_numpy().T))
+    return pd.DataFrame(columns, index=df.index)
+
+def _interval_name(df: pd.DataFrame) -> str:
+    """캔들 간격으로 엔진 이름 결정 (예: 'interval_60s', 빠진 캔들이 있어도 최근 간격 중 최솟값 사용)"""
+    if len(df) < 2:
+        return "default"
+    interval = pd.Series(df.index[-10:]).diff().min()
+    return f"interval_{int(interval.total_seconds())}s"
+
+# 이름별 스트리밍 엔진 (예: 'minute', 'daily')
+_indicator_engines: Dict[str, StreamingIndicatorEngine] = {}
+
+def get_indicator_engine(name: str = "minute") -> StreamingIndicatorEngine:
+    """이름별 스트리밍 지표 엔진 반환 (없으면 생성)"""
+    if name not in _indicator_engines:
+        _indicator_engines[name] = StreamingIndicatorEngine()
+    return _indicator_engines[name]
+
+def update_streaming_indicators(df: pd.DataFrame, name: str = "minute") -> Optional[dict]:
+    """DataFrame의 새 캔들만 반영하고 get_latest_indicators 형식의 최신 지표 반환"""
+    engine = get_indicator_engine(name)
+    engine.update_from_dataframe(df)
+    return engine.get_latest_indicators()
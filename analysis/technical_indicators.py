@@ -11,12 +11,26 @@ from ta.momentum import StochasticOscillator, WilliamsRIndicator, RSIIndicator
 from ta.volatility import BollingerBands, AverageTrueRange
 from ta.volume import OnBalanceVolumeIndicator
 from typing import Optional
+from config.settings import INDICATOR_BACKEND
+from .numpy_indicators import calculate_technical_indicators_numpy
+from .streaming_indicators import calculate_technical_indicators_streaming
 
-def calculate_technical_indicators(df: pd.DataFrame) -> pd.DataFrame:
-    """기술적 지표 계산 함수"""
+def calculate_technical_indicators(df: pd.DataFrame, backend: Optional[str] = None,
+                                   stream_name: Optional[str] = None) -> pd.DataFrame:
+    """
+    기술적 지표 계산 함수
+    
+    Args:
+        df: OHLCV DataFrame
+        backend: 'ta' (ta 라이브러리), 'numpy' (NumPy 일괄 계산) 또는 'streaming' (새 캔들만 증분 계산),
+                 기본값은 INDICATOR_BACKEND
+        stream_name: streaming 백엔드의 엔진 이름 (예: 'daily', 'minute', 없으면 캔들 간격으로 구분)
+    """
     if df.empty:
         return df
     
+    backend = backend or INDICATOR_BACKEND
+    
     # 기본 OHLCV 컬럼명 확인 및 통일
     required_columns = ['open', 'high', 'low', 'close', 'volume']
     df_columns = [col.lower() for col in df.columns]
@@ -34,6 +48,24 @@ def calculate_technical_indicators(df: pd.DataFrame) -> pd.DataFrame:
         print("❌ 필수 OHLCV 컬럼을 찾을 수 없습니다.")
         return df
     
+    if backend == 'numpy':
+        try:
+            df_indicators = calculate_technical_indicators_numpy(df, column_mapping)
+            print(f"✅ 기술적 지표 계산 완료 (numpy): {len(df_indicators.columns)}개 컬럼")
+            return df_indicators
+        except Exception as e:
+            print(f"❌ 기술적 지표 계산 중 오류 발생: {e}")
+            return df
+
+    if backend == 'streaming':
+        try:
+            df_indicators = calculate_technical_indicators_streaming(df, column_mapping, stream_name)
+            print(f"✅ 기술적 지표 계산 완료 (streaming): {len(df_indicators.columns)}개 컬럼")
+            return df_indicators
+        except Exception as e:
+            print(f"❌ 기술적 지표 계산 중 오류 발생: {e}")
+            return df
+    
     # 컬럼명 통일
     df_renamed = df.rename(columns={
         column_mapping['open']: 'Open',
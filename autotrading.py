@@ -1149,13 +1149,22 @@ def _save_trade_and_create_reflection(decision, execution_result, investment_sta
             print("\n🤔 거래 반성 생성 중...")
             
             # 최근 거래 ID 조회 (실제 구현에서는 더 정확한 방법 필요)
-            from database.connection import get_db_connection
-            connection = get_db_connection()
-            if connection:
-                cursor = connection.cursor()
-                cursor.execute("SELECT MAX(id) as last_id FROM trades")
-                result = cursor.fetchone()
-                if result and result[0]:
+            from database.connection import db_cursor
+            from database.write_queue import flush_write_queue
+            # 쓰기 대기열에 남은 거래 기록이 저장된 뒤 조회 (커밋되지 않았으면 다른 거래를 가리키므로 건너뜀)
+            result = None
+            committed = flush_write_queue()
+            if not committed:
+                print("⚠️ 거래 기록이 아직 저장되지 않아 즉시 반성을 건너뜁니다.")
+            else:
+                try:
+                    with db_cursor() as cursor:
+                        cursor.execute("SELECT MAX(id) as last_id FROM trades")
+                        result = cursor.fetchone()
+                except Exception as e:
+                    print(f"❌ 데이터베이스 조회 실패: {e}")
+            if result is not None:
+                if result[0]:
                     trade_id = result[0]
                     
                     # 즉시 반성 생성
@@ -1166,8 +1175,7 @@ def _save_trade_and_create_reflection(decision, execution_result, investment_sta
                         print("❌ 즉시 반성 생성 실패")
                 else:
                     print("⚠️ 거래 ID를 찾을 수 없어 반성 생성을 건너뜁니다.")
-                cursor.close()
-            else:
+            elif committed:
                 print("❌ 데이터베이스 연결 실패로 반성 생성을 건너뜁니다.")
         
         print("=" * 50)
@@ -20,6 +20,32 @@ TRADING_SYMBOL = "KRW-BTC"
 MIN_TRADE_AMOUNT = 5000  # 최소 거래 금액 (원)
 TRADE_RATIO = 0.95  # 거래 시 사용할 비율 (95%)
 FEE_RATE = 0.0005  # 수수료율 (0.05%)
+ORDER_FILL_TIMEOUT = 10.0  # 주문 체결 확인 최대 대기 시간 (초), 넘으면 예상 값으로 기록
+ORDER_POLL_INITIAL_DELAY = 0.2  # 첫 주문 상태 조회까지 대기 시간 (초), 이후 두 배씩 증가
+ORDER_POLL_MAX_DELAY = 2.0  # 주문 상태 조회 최대 간격 (초)
+ACCOUNT_CACHE_TTL = 600  # 잔고 캐시 유효 시간 (초), 체결은 캐시에 직접 반영하고 이 주기마다 실제 잔고로 다시 맞춤
+EXECUTION_STRATEGY = "market"  # 큰 주문 실행 방식: "market" (한 번에 시장가, 기본값), "twap" (시간 분할), "iceberg" (호가 잔량 기준 분할)
+SLICED_EXECUTION_MIN_KRW = 1000000  # 주문 금액이 이 이상일 때만 분할 실행 (원)
+EXECUTION_WINDOW_SECONDS = 120  # 분할 주문 실행 구간 (초, ANALYSIS_INTERVAL보다 짧아야 함)
+EXECUTION_MAX_SLICES = 5  # 최대 조각 수 (각 조각은 MIN_TRADE_AMOUNT 이상)
+SLICE_ORDER_TYPE = "market"  # 조각 주문 방식: "market" (기본값) 또는 "limit" (최우선 호가 지정가, 미체결분은 취소 후 이월)
+SLICE_LIMIT_TIMEOUT = 5.0  # 지정가 조각 체결 대기 시간 (초)
+ICEBERG_DEPTH_RATIO = 0.2  # iceberg 조각 크기: 보이는 호가 잔량 대비 비율
+ICEBERG_DEPTH_LEVELS = 5  # iceberg 조각 크기 계산에 사용할 호가 단계 수
+MARKET_IMPACT_ENABLED = True  # 주문 전 오더북 호가 잔량으로 예상 체결가/슬리피지 추정 후 주문 크기 제한
+MAX_SLIPPAGE_BPS = 15  # 한 번에 내는 시장가 주문의 슬리피지 한도 (bp, 최우선 호가 대비)
+
+# 모의 거래 설정 (paper_trading.py)
+PAPER_INITIAL_KRW = 10000000  # 모의 계좌 시작 현금 (원)
+PAPER_FEE_RATE = FEE_RATE  # 모의 체결 수수료율
+PAPER_LATENCY = 0.05  # API 호출 1회당 지연 (시뮬레이션 초)
+PAPER_SPEED = 0  # 재생 배속 (지연/사이클 간격을 실제로 1/배속만큼 대기, 0이면 기다리지 않음)
+PAPER_FILL_DELAY = 0.0  # 주문 접수 후 체결 내역이 조회될 때까지 시간 (시뮬레이션 초)
+PAPER_FILL_RATIO = 1.0  # 시장가 주문 중 체결되는 비율 (1 미만이면 나머지는 취소, 부분 체결 재현)
+PAPER_BOOK_LEVELS = 15  # 기록된 오더북이 없을 때 만드는 합성 오더북 호가 단계 수
+PAPER_BOOK_SPREAD_BPS = 2.0  # 합성 오더북 스프레드 (bp)
+PAPER_BOOK_LEVEL_BPS = 1.0  # 합성 오더북 호가 단계 간격 (bp)
+PAPER_BOOK_LEVEL_SIZE = 0.3  # 합성 오더북 호가 단계별 잔량 (BTC)
 
 # 분석 설정
 DAILY_DATA_COUNT = 30  # 일봉 데이터 개수
@@ -31,6 +57,29 @@ TECHNICAL_INDICATORS = [
     'Stoch_K', 'Stoch_D', 'Williams_R', 'ATR',
     'ADX', 'OBV', 'ROC', 'CCI'
 ]
+INDICATOR_BACKEND = "streaming"  # 기술적 지표 계산 백엔드: "ta", "numpy" 또는 "streaming" (사이클마다 새 캔들만 계산)
+DAILY_INDICATOR_BACKEND = "numpy"  # 일봉 지표 백엔드 (30개 구간은 streaming이면 EMA/MACD/RSI/ADX가 ta와 달라지므로 전체 재계산)
+PROMPT_PAYLOAD_FORMAT = "compact"  # AI 프롬프트 시장 데이터 형식: "compact" 또는 "full"
+PROMPT_TOKEN_BUDGET = 6000  # compact 형식 시장 데이터 토큰 예산
+PROMPT_TOKEN_STATS = False  # 사이클마다 full 형식 대비 토큰 수 출력 (전체 직렬화/토큰화 비용 추가, 평소 비교는 payload_replay.py)
+DECISION_CACHE_ENABLED = True  # 시장 상태가 같으면 이전 AI 결정 재사용
+DECISION_CACHE_TTL = 900  # 결정 캐시 유효 시간 (초)
+DECISION_CACHE_MAX_SIZE = 128  # 결정 캐시 최대 항목 수
+DECISION_CACHE_PRICE_STEP = 0.003  # 가격 구간 크기 (0.3%)
+DECISION_CACHE_FEAR_GREED_STEP = 5  # 공포탐욕지수 구간 크기
+
+# 시장 데이터 수집 설정
+MARKET_DATA_CONCURRENT = True  # 시장 데이터 병렬 수집 여부
+MARKET_DATA_MAX_WORKERS = 5  # 병렬 수집 스레드 수
+MARKET_DATA_SOURCE_TIMEOUTS = {  # 소스별 타임아웃 (초)
+    'daily': 10,
+    'minute': 20,
+    'current_price': 5,
+    'orderbook': 5,
+    'fear_greed': 10
+}
+CANDLE_STORE_ENABLED = True  # 분봉 캔들 증분 조회 사용 여부
+CANDLE_STORE_DIR = "cache/candles"  # 캔들 저장소 디렉토리
 
 # 뉴스 분석 설정
 NEWS_COUNT = 20  # 수집할 뉴스 개수
@@ -41,17 +90,64 @@ NEWS_REGION = "kr"  # 뉴스 지역
 SCREENSHOT_WINDOW_SIZE = (1920, 1080)
 SCREENSHOT_MAX_SIZE_MB = 2.0
 SCREENSHOT_QUALITY = 85
+SCREENSHOT_PERSISTENT_BROWSER = True  # 브라우저 세션을 유지하며 재사용
+SCREENSHOT_MAX_CAPTURES_PER_SESSION = 50  # 이 횟수만큼 캡처하면 브라우저 재시작
+SCREENSHOT_MAX_MEMORY_GROWTH_MB = 300  # 시작 시점 대비 메모리 증가량이 넘으면 브라우저 재시작
+SCREENSHOT_PAGE_REFRESH_INTERVAL = 1800  # 차트 페이지 새로고침 간격 (초)
+SCREENSHOT_WAIT_TIMEOUT = 30  # DOM 조건 대기 시간 (초)
+SCREENSHOT_CROP_TO_CHART = True  # 스크린샷에서 차트 영역만 잘라서 사용
+SCREENSHOT_SAVE_TO_DISK = False  # 최적화된 스크린샷을 images/에 저장
+
+# 차트 이미지 설정
+CHART_SOURCE = "local"  # Vision API 차트 이미지: "local" (직접 렌더링) 또는 "screenshot" (업비트 캡처)
+CHART_RENDER_SIZE = (1024, 1024)  # 렌더링 이미지 크기 (일봉/분봉 패널을 위아래로 배치)
+CHART_RENDER_FORMAT = "PNG"  # 렌더링 이미지 형식: "PNG" 또는 "JPEG"
+CHART_RENDER_MINUTE_CANDLES = 120  # 렌더링할 최근 분봉 개수
 
 # 실행 설정
 ANALYSIS_INTERVAL = 300  # 분석 간격 (초)
 NEWS_ANALYSIS_INTERVAL = 1800  # 뉴스 분석 간격 (초)
 
 # 데이터베이스 설정
+DB_BACKEND = os.getenv("DB_BACKEND", "mysql")  # 저장소 백엔드: "mysql" 또는 "sqlite" (서버 없이 단일 파일)
+SQLITE_PATH = os.getenv("SQLITE_PATH", "db/trading.db")  # SQLite 데이터베이스 파일 경로
+SQLITE_BUSY_TIMEOUT = 5.0  # SQLite 쓰기 잠금 대기 시간 (초)
 DB_HOST = os.getenv("DB_HOST", "localhost")
 DB_PORT = int(os.getenv("DB_PORT", "3306"))
 DB_NAME = os.getenv("DB_NAME", "gptbitcoin")
 DB_USER = os.getenv("DB_USER", "root")
 DB_PASSWORD = os.getenv("DB_PASSWORD", "kimjink@@7")
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))  # 커넥션 풀 최대 연결 수
+DB_POOL_TIMEOUT = 10  # 모든 연결이 사용 중일 때 반납을 기다리는 시간 (초)
+DB_POOL_PING_INTERVAL = 60  # 이 시간 이상 쉰 연결은 빌려주기 전에 상태 확인 (초)
+WRITE_BEHIND_ENABLED = True  # 거래/시장 데이터/로그 INSERT를 백그라운드에서 배치 저장
+WRITE_QUEUE_MAX_SIZE = 1000  # 쓰기 대기열 최대 크기
+WRITE_QUEUE_BATCH_SIZE = 50  # 한 트랜잭션에 저장할 최대 요청 수
+WRITE_QUEUE_FLUSH_INTERVAL = 2.0  # 배치가 차지 않아도 저장하는 간격 (초)
+WRITE_QUEUE_PUT_TIMEOUT = 1.0  # 대기열이 가득 찼을 때 기다리는 시간 (초), 넘으면 스풀 파일에 기록
+WRITE_QUEUE_RETRY_INTERVAL = 30  # DB 저장 실패 후 재시도 간격 (초)
+WRITE_QUEUE_SPOOL_PATH = "cache/db_spool.jsonl"  # DB 장애 시 요청을 보관할 스풀 파일
+WRITE_QUEUE_QUARANTINE_PATH = "cache/db_quarantine.jsonl"  # 데이터 오류로 저장할 수 없는 요청을 옮겨 둘 격리 파일
+STATS_CACHE_TTL = 30  # 거래/반성 요약 통계 캐시 유효 시간 (초)
+STREAM_CHUNK_SIZE = 500  # 대량 조회 시 한 번에 읽을 행 수
+SNAPSHOT_STORE_ENABLED = True  # 거래의 시장 데이터를 압축 스냅샷 저장소에 해시 참조로 저장
+SNAPSHOT_CODEC = "zstd"  # 스냅샷 압축 방식 (zstandard 미설치 시 gzip)
+SNAPSHOT_COMPRESSION_LEVEL = 6  # 스냅샷 압축 레벨 (gzip은 최대 9)
+SNAPSHOT_CACHE_SIZE = 32  # 지연 로딩한 스냅샷을 메모리에 보관할 개수
+RETENTION_ENABLED = False  # 보존 정책 주기 적용 (월 파티션 변환은 `python -m database.retention partition`으로 별도 실행)
+RETENTION_MONTHS = {  # 테이블별 보존 기간 (개월, None이면 영구 보존)
+    'trades': None,
+    'market_data': 6,
+    'system_logs': 3
+}
+RETENTION_ARCHIVE = True  # 만료 파티션을 삭제 전에 압축 파일로 보관
+RETENTION_ARCHIVE_DIR = "archive"  # 보관 파일 디렉토리 ({테이블}/{테이블}_YYYYMM.jsonl.gz)
+RETENTION_FUTURE_MONTHS = 2  # 미리 만들어 둘 미래 월 파티션 수
+RETENTION_INTERVAL_HOURS = 24  # 보존 정책 적용 주기 (시간)
+PARQUET_ARCHIVE_ENABLED = True  # 캔들/지표/매매 결정/체결을 Parquet 분석 아카이브에 증분 저장 (pyarrow 필요)
+PARQUET_ARCHIVE_DIR = "archive/parquet"  # 아카이브 디렉토리 ({데이터셋}/symbol=.../date=YYYY-MM-DD/*.parquet)
+PARQUET_ARCHIVE_INTERVAL_MINUTES = 60  # 아카이브 저장 주기 (분, 분봉 캔들 저장소 크기보다 짧아야 함)
+PARQUET_COMPRESSION = "zstd"  # Parquet 압축 방식
 
 def validate_api_keys():
     """API 키 유효성 검사"""
@@ -7,7 +7,6 @@ import pandas as pd
 import plotly.graph_objects as go
 import plotly.express as px
 from plotly.subplots import make_subplots
-import mysql.connector
 from datetime import datetime, timedelta
 import numpy as np
 from typing import Dict, List, Optional
@@ -17,35 +16,14 @@ import os
 # 프로젝트 루트를 Python 경로에 추가
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
-from config.settings import DB_HOST, DB_PORT, DB_NAME, DB_USER, DB_PASSWORD
+from database.connection import pooled_connection
+from database.stats_service import get_trade_summary, get_reflection_summary
 
 class TradingDashboard:
     """거래 대시보드 클래스"""
     
-    def __init__(self):
-        self.db_config = {
-            'host': DB_HOST,
-            'port': DB_PORT,
-            'database': DB_NAME,
-            'user': DB_USER,
-            'password': DB_PASSWORD
-        }
-    
-    def get_connection(self):
-        """데이터베이스 연결"""
-        try:
-            connection = mysql.connector.connect(**self.db_config)
-            return connection
-        except Exception as e:
-            st.error(f"데이터베이스 연결 오류: {e}")
-            return None
-    
     def get_recent_trades(self, limit: int = 50) -> pd.DataFrame:
         """최근 거래 기록 조회"""
-        connection = self.get_connection()
-        if not connection:
-            return pd.DataFrame()
-        
         try:
             query = """
             SELECT 
@@ -57,8 +35,8 @@ class TradingDashboard:
             LIMIT %s
             """
             
-            df = pd.read_sql(query, connection, params=(limit,))
-            connection.close()
+            with pooled_connection() as connection:
+                df = pd.read_sql(query, connection, params=(limit,))
             return df
         except Exception as e:
             st.error(f"거래 데이터 조회 오류: {e}")
@@ -66,10 +44,6 @@ class TradingDashboard:
     
     def get_trading_reflections(self, limit: int = 20) -> pd.DataFrame:
         """거래 반성 데이터 조회"""
-        connection = self.get_connection()
-        if not connection:
-            return pd.DataFrame()
-        
         try:
             query = """
             SELECT 
@@ -84,8 +58,8 @@ class TradingDashboard:
             LIMIT %s
             """
             
-            df = pd.read_sql(query, connection, params=(limit,))
-            connection.close()
+            with pooled_connection() as connection:
+                df = pd.read_sql(query, connection, params=(limit,))
             return df
         except Exception as e:
             st.error(f"반성 데이터 조회 오류: {e}")
@@ -93,10 +67,6 @@ class TradingDashboard:
     
     def get_performance_metrics(self, days: int = 7) -> pd.DataFrame:
         """성과 지표 조회"""
-        connection = self.get_connection()
-        if not connection:
-            return pd.DataFrame()
-        
         try:
             query = """
             SELECT 
@@ -110,8 +80,8 @@ class TradingDashboard:
             ORDER BY period_start DESC
             """
             
-            df = pd.read_sql(query, connection, params=(days,))
-            connection.close()
+            with pooled_connection() as connection:
+                df = pd.read_sql(query, connection, params=(days,))
             return df
         except Exception as e:
             st.error(f"성과 지표 조회 오류: {e}")
@@ -119,10 +89,6 @@ class TradingDashboard:
     
     def get_learning_insights(self, limit: int = 10) -> pd.DataFrame:
         """학습 인사이트 조회"""
-        connection = self.get_connection()
-        if not connection:
-            return pd.DataFrame()
-        
         try:
             query = """
             SELECT 
@@ -133,8 +99,8 @@ class TradingDashboard:
             LIMIT %s
             """
             
-            df = pd.read_sql(query, connection, params=(limit,))
-            connection.close()
+            with pooled_connection() as connection:
+                df = pd.read_sql(query, connection, params=(limit,))
             return df
         except Exception as e:
             st.error(f"학습 인사이트 조회 오류: {e}")
@@ -142,10 +108,6 @@ class TradingDashboard:
     
     def get_strategy_improvements(self, limit: int = 10) -> pd.DataFrame:
         """전략 개선 제안 조회"""
-        connection = self.get_connection()
-        if not connection:
-            return pd.DataFrame()
-        
         try:
             query = """
             SELECT 
@@ -156,8 +118,8 @@ class TradingDashboard:
             LIMIT %s
             """
             
-            df = pd.read_sql(query, connection, params=(limit,))
-            connection.close()
+            with pooled_connection() as connection:
+                df = pd.read_sql(query, connection, params=(limit,))
             return df
         except Exception as e:
             st.error(f"전략 개선 제안 조회 오류: {e}")
@@ -165,10 +127,6 @@ class TradingDashboard:
     
     def get_market_data(self, limit: int = 100) -> pd.DataFrame:
         """시장 데이터 조회"""
-        connection = self.get_connection()
-        if not connection:
-            return pd.DataFrame()
-        
         try:
             query = """
             SELECT 
@@ -180,8 +138,8 @@ class TradingDashboard:
             LIMIT %s
             """
             
-            df = pd.read_sql(query, connection, params=(limit,))
-            connection.close()
+            with pooled_connection() as connection:
+                df = pd.read_sql(query, connection, params=(limit,))
             return df
         except Exception as e:
             st.error(f"시장 데이터 조회 오류: {e}")
@@ -337,12 +295,12 @@ def main():
     with col1:
         st.subheader("📊 실시간 통계")
         
-        # 최근 거래 데이터
-        recent_trades = dashboard.get_recent_trades(10)
-        if not recent_trades.empty:
-            total_trades = len(recent_trades)
-            buy_trades = len(recent_trades[recent_trades['action'] == 'buy'])
-            sell_trades = len(recent_trades[recent_trades['action'] == 'sell'])
+        # 최근 7일 거래 요약 (집계 쿼리 1회)
+        trade_summary = get_trade_summary(7)
+        if trade_summary:
+            total_trades = trade_summary['total_trades']
+            buy_trades = trade_summary['action_counts']['buy']
+            sell_trades = trade_summary['action_counts']['sell']
             
             st.metric("총 거래 수", total_trades)
             st.metric("매수 거래", buy_trades)
@@ -368,12 +326,12 @@ def main():
     with col3:
         st.subheader("🤔 반성 시스템")
         
-        reflections = dashboard.get_trading_reflections(5)
-        if not reflections.empty:
-            avg_score = reflections['performance_score'].mean()
-            st.metric("평균 성과 점수", f"{avg_score:.2f}")
+        # 최근 7일 반성 요약 (쿼리 1회)
+        reflection_summary = get_reflection_summary(7)
+        if reflection_summary:
+            st.metric("평균 성과 점수", f"{reflection_summary['avg_performance_score']:.2f}")
             
-            reflection_types = reflections['reflection_type'].value_counts()
+            reflection_types = reflection_summary['reflection_types']
             st.metric("즉시 반성", reflection_types.get('immediate', 0))
             st.metric("주기적 반성", reflection_types.get('daily', 0) + 
                      reflection_types.get('weekly', 0) + 
@@ -4,5 +4,7 @@
 """
 
 from .market_data import *
+from .candle_store import *
 from .news_data import *
 from .screenshot import *
+from .chart_renderer import *
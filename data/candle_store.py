@@ -0,0 +1,153 @@
+"""
+캔들 저장소 모듈
+OHLCV 캔들을 메모리(링 버퍼)와 디스크에 보관하고, 새로 생긴 캔들만 증분 조회합니다.
+"""
+
+import os
+import math
+import threading
+import pyupbit
+import pandas as pd
+from datetime import datetime, timedelta, timezone
+from typing import Optional, Dict, Any, Callable, Tuple
+from config.settings import TRADING_SYMBOL, CANDLE_STORE_DIR
+
+# 업비트 캔들 API 1회 최대 조회 개수
+MAX_CANDLES_PER_REQUEST = 200
+
+# 업비트 캔들 인덱스는 KST 기준
+KST = timezone(timedelta(hours=9))
+
+def interval_to_timedelta(interval: str) -> timedelta:
+    """pyupbit interval 문자열을 캔들 간격으로 변환"""
+    if interval.startswith("minute"):
+        return timedelta(minutes=int(interval[len("minute"):] or 1))
+    if interval in ("day", "days"):
+        return timedelta(days=1)
+    if interval in ("week", "weeks"):
+        return timedelta(weeks=1)
+    raise ValueError(f"지원하지 않는 interval입니다: {interval}")
+
+class CandleStore:
+    """
+    OHLCV 캔들 저장소
+
+    최근 capacity개의 캔들을 메모리에 유지하고 디스크 파일에 저장합니다.
+    콜드 스타트 이후에는 마지막 저장 시점 이후의 캔들만 조회해 병합하며,
+    아직 마감되지 않은 마지막 캔들은 새로 조회한 값으로 덮어씁니다.
+    """
+
+    def __init__(self, symbol: str = TRADING_SYMBOL, interval: str = "minute1", capacity: int = 1440,
+                 storage_dir: str = CANDLE_STORE_DIR, fetcher: Optional[Callable[..., Optional[pd.DataFrame]]] = None,
+                 clock: Optional[Callable[[], datetime]] = None):
+        self.symbol = symbol
+        self.interval = interval
+        self.capacity = capacity
+        self.bar_interval = interval_to_timedelta(interval)
+        self.storage_path = os.path.join(storage_dir, f"{symbol}_{interval}.pkl") if storage_dir else None
+        self.fetcher = fetcher or pyupbit.get_ohlcv
+        self.clock = clock  # 현재 시각 (KST, 모의 거래에서는 시뮬레이션 시각)
+        self.candles: Optional[pd.DataFrame] = None
+        self.request_count = 0
+        self._lock = threading.Lock()
+        self._load()
+
+    def _load(self):
+        """디스크에 저장된 캔들 로드"""
+        if not self.storage_path or not os.path.exists(self.storage_path):
+            return
+        try:
+            self.candles = pd.read_pickle(self.storage_path).tail(self.capacity)
+            print(f"📂 캔들 저장소 로드: {self.symbol} {self.interval} {len(self.candles)}개")
+        except Exception as e:
+            print(f"⚠️ 캔들 저장소 로드 실패, 전체 조회로 진행합니다: {e}")
+            self.candles = None
+
+    def _save(self):
+        """현재 캔들을 디스크에 저장"""
+        if not self.storage_path or self.candles is None:
+            return
+        try:
+            os.makedirs(os.path.dirname(self.storage_path), exist_ok=True)
+            temp_path = f"{self.storage_path}.tmp"
+            self.candles.to_pickle(temp_path)
+            os.replace(temp_path, self.storage_path)
+        except Exception as e:
+            print(f"⚠️ 캔들 저장소 저장 실패: {e}")
+
+    def _fetch(self, count: int) -> Optional[pd.DataFrame]:
+        """최근 count개 캔들 조회"""
+        self.request_count += math.ceil(count / MAX_CANDLES_PER_REQUEST)
+        return self.fetcher(self.symbol, interval=self.interval, count=count)
+
+    def _missing_bar_count(self, now: Optional[datetime] = None) -> int:
+        """마지막 저장 캔들 이후 새로 생긴 캔들 수 추정 (마지막 캔들 갱신분 포함)"""
+        now = now or (self.clock() if self.clock else datetime.now(KST).replace(tzinfo=None))
+        last_timestamp = self.candles.index[-1]
+        elapsed = now - last_timestamp.to_pydatetime()
+        return max(int(elapsed / self.bar_interval), 0) + 2
+
+    def _merge(self, new_candles: pd.DataFrame):
+        """새 캔들을 병합 (같은 시각의 캔들은 새 값으로 교체)"""
+        merged = pd.concat([self.candles, new_candles])
+        merged = merged[~merged.index.duplicated(keep='last')].sort_index()
+        self.candles = merged.tail(self.capacity)
+
+    def refresh(self, now: Optional[datetime] = None) -> Optional[pd.DataFrame]:
+        """캔들 저장소 갱신 후 최근 capacity개 캔들 반환"""
+        with self._lock:
+            if self.candles is None or self.candles.empty:
+                return self._full_reload()
+
+            count = self._missing_bar_count(now)
+            if count > self.capacity:
+                print("⚠️ 저장된 캔들이 너무 오래되었습니다. 전체 조회합니다.")
+                return self._full_reload()
+
+            new_candles = self._fetch(count)
+            if new_candles is None or new_candles.empty:
+                print(f"⚠️ {self.interval} 증분 조회 실패, 저장된 캔들을 사용합니다.")
+                return self.candles.copy()
+
+            # 조회 구간이 저장된 마지막 캔들과 이어지지 않으면 빈 구간이 생기므로 전체 조회
+            if new_candles.index[0] > self.candles.index[-1]:
+                print(f"⚠️ {self.interval} 캔들 구간이 끊어졌습니다. 전체 조회합니다.")
+                return self._full_reload()
+
+            self._merge(new_candles)
+            self._save()
+            print(f"✅ {self.interval} 캔들 증분 갱신: {len(new_candles)}개 조회, 총 {len(self.candles)}개")
+            return self.candles.copy()
+
+    def _full_reload(self) -> Optional[pd.DataFrame]:
+        """전체 캔들 조회 (콜드 스타트)"""
+        candles = self._fetch(self.capacity)
+        if candles is None or candles.empty:
+            print(f"❌ {self.interval} 캔들 전체 조회 실패")
+            return None
+        self.candles = candles.sort_index().tail(self.capacity)
+        self._save()
+        print(f"✅ {self.interval} 캔들 전체 조회 완료: {len(self.candles)}개")
+        return self.candles.copy()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """저장소 상태 반환"""
+        return {
+            'symbol': self.symbol,
+            'interval': self.interval,
+            'size': 0 if self.candles is None else len(self.candles),
+            'last_timestamp': None if self.candles is None or self.candles.empty else self.candles.index[-1],
+            'request_count': self.request_count
+        }
+
+# (심볼, interval, capacity)별 저장소
+_candle_stores: Dict[Tuple[str, str, int], CandleStore] = {}
+_candle_stores_lock = threading.Lock()
+
+def get_candle_store(symbol: str = TRADING_SYMBOL, interval: str = "minute1", capacity: int = 1440) -> CandleStore:
+    """캔들 저장소 반환 (없으면 생성)"""
+    key = (symbol, interval, capacity)
+    with _candle_stores_lock:
+        if key not in _candle_stores:
+            _candle_stores[key] = CandleStore(symbol, interval, capacity)
+        return _candle_stores[key]
@@ -0,0 +1,230 @@
+"""
+차트 렌더링 모듈
+이미 수집한 OHLCV/지표 DataFrame으로 캔들 차트 이미지를 직접 그립니다.
+브라우저와 네트워크 없이 Vision API용 이미지를 메모리에서 생성합니다.
+"""
+
+import io
+import time
+import base64
+import math
+import pandas as pd
+from PIL import Image, ImageDraw, ImageFont
+from typing import Optional, Tuple, Dict, Any, List
+from config.settings import (
+    TRADING_SYMBOL, CHART_SOURCE, CHART_RENDER_SIZE, CHART_RENDER_FORMAT, CHART_RENDER_MINUTE_CANDLES, SCREENSHOT_QUALITY
+)
+
+# 업비트 차트 색상
+BACKGROUND_COLOR = (255, 255, 255)
+GRID_COLOR = (235, 235, 235)
+TEXT_COLOR = (60, 60, 60)
+UP_COLOR = (200, 74, 49)
+DOWN_COLOR = (18, 97, 196)
+BB_BAND_COLOR = (147, 112, 219)
+BB_MIDDLE_COLOR = (255, 152, 0)
+SMA_50_COLOR = (0, 150, 136)
+EMA_12_COLOR = (233, 30, 99)
+
+# 가격 위에 그릴 지표 선 (컬럼명, 색상, 굵기)
+OVERLAY_LINES = [
+    ('BB_Upper', BB_BAND_COLOR, 1),
+    ('BB_Lower', BB_BAND_COLOR, 1),
+    ('BB_Middle', BB_MIDDLE_COLOR, 1),
+    ('SMA_50', SMA_50_COLOR, 1),
+    ('EMA_12', EMA_12_COLOR, 1)
+]
+
+# 여백 (왼쪽, 위, 오른쪽 가격축, 아래)
+MARGIN_LEFT = 10
+MARGIN_TOP = 24
+MARGIN_RIGHT = 90
+MARGIN_BOTTOM = 8
+
+def _ohlcv_columns(df: pd.DataFrame) -> Dict[str, str]:
+    """OHLCV 컬럼명 찾기 (대문자/소문자 모두 지원)"""
+    mapping = {}
+    for key in ['open', 'high', 'low', 'close', 'volume']:
+        for candidate in (key.capitalize(), key):
+            if candidate in df.columns:
+                mapping[key] = candidate
+                break
+        else:
+            raise ValueError(f"'{key}' 컬럼이 없습니다.")
+    return mapping
+
+def _format_price(value: float) -> str:
+    """가격축 라벨 형식"""
+    if abs(value) >= 1000:
+        return f"{value:,.0f}"
+    return f"{value:,.2f}"
+
+def _draw_line(draw: ImageDraw.ImageDraw, points: List[Optional[Tuple[float, float]]], color, width: int):
+    """NaN 구간은 끊어서 선 그리기"""
+    segment = []
+    for point in points + [None]:
+        if point is None:
+            if len(segment) > 1:
+                draw.line(segment, fill=color, width=width)
+            segment = []
+        else:
+            segment.append(point)
+
+def draw_candle_panel(image: Image.Image, df: pd.DataFrame, box: Tuple[int, int, int, int], title: str):
+    """
+    지정한 영역에 캔들 + 지표 선 + 거래량 패널 그리기
+
+    Args:
+        image: 그릴 이미지
+        df: OHLCV(+지표) DataFrame
+        box: (left, top, right, bottom) 영역
+        title: 패널 제목
+    """
+    draw = ImageDraw.Draw(image)
+    font = ImageFont.load_default()
+    columns = _ohlcv_columns(df)
+    left, top, right, bottom = box
+
+    plot_left = left + MARGIN_LEFT
+    plot_right = right - MARGIN_RIGHT
+    plot_top = top + MARGIN_TOP
+    plot_bottom = bottom - MARGIN_BOTTOM
+    volume_height = (plot_bottom - plot_top) // 5
+    price_bottom = plot_bottom - volume_height - 6
+
+    opens = df[columns['open']].to_numpy(float)
+    highs = df[columns['high']].to_numpy(float)
+    lows = df[columns['low']].to_numpy(float)
+    closes = df[columns['close']].to_numpy(float)
+    volumes = df[columns['volume']].to_numpy(float)
+    overlays = [(name, color, width) for name, color, width in OVERLAY_LINES if name in df.columns]
+
+    # 가격 범위 (지표 선 포함)
+    price_values = [highs.max(), lows.min()]
+    for name, _, _ in overlays:
+        values = df[name].to_numpy(float)
+        values = values[~pd.isna(values)]
+        if len(values) > 0:
+            price_values.extend([values.max(), values.min()])
+    price_max, price_min = max(price_values), min(price_values)
+    padding = (price_max - price_min) * 0.05 or price_max * 0.01 or 1.0
+    price_max += padding
+    price_min -= padding
+    volume_max = volumes.max() if volumes.max() > 0 else 1.0
+
+    count = len(df)
+    step = (plot_right - plot_left) / count
+    body_width = max(1.0, step * 0.7)
+
+    def x_at(i: int) -> float:
+        return plot_left + step * (i + 0.5)
+
+    def y_at(price: float) -> float:
+        return price_bottom - (price - price_min) / (price_max - price_min) * (price_bottom - plot_top)
+
+    # 격자와 가격축 라벨
+    for level in range(5):
+        price = price_min + (price_max - price_min) * level / 4
+        y = y_at(price)
+        draw.line([(plot_left, y), (plot_right, y)], fill=GRID_COLOR)
+        draw.text((plot_right + 6, y - 6), _format_price(price), fill=TEXT_COLOR, font=font)
+    draw.line([(plot_left, price_bottom + 3), (plot_right, price_bottom + 3)], fill=GRID_COLOR)
+
+    # 캔들과 거래량
+    for i in range(count):
+        color = UP_COLOR if closes[i] >= opens[i] else DOWN_COLOR
+        x = x_at(i)
+        draw.line([(x, y_at(highs[i])), (x, y_at(lows[i]))], fill=color)
+        body_top, body_bottom = sorted((y_at(opens[i]), y_at(closes[i])))
+        draw.rectangle([x - body_width / 2, body_top, x + body_width / 2, max(body_bottom, body_top + 1)], fill=color)
+        volume_top = plot_bottom - volumes[i] / volume_max * volume_height
+        draw.rectangle([x - body_width / 2, volume_top, x + body_width / 2, plot_bottom], fill=color)
+
+    # 지표 선
+    for name, color, width in overlays:
+        values = df[name].to_numpy(float)
+        points = [None if math.isnan(value) else (x_at(i), y_at(value)) for i, value in enumerate(values)]
+        _draw_line(draw, points, color, width)
+
+    # 제목, 기간, 범례
+    first, last = df.index[0], df.index[-1]
+    header = f"{title}  {first:%Y-%m-%d %H:%M} ~ {last:%Y-%m-%d %H:%M}  close {_format_price(closes[-1])}"
+    draw.text((plot_left, top + 6), header, fill=TEXT_COLOR, font=font)
+    legend_x = plot_right - 8
+    for name, color, _ in reversed(overlays):
+        legend_x -= draw.textlength(name, font=font) + 14
+        draw.text((legend_x, top + 6), name, fill=color, font=font)
+    draw.rectangle([left, top, right - 1, bottom - 1], outline=GRID_COLOR)
+
+def render_market_chart(daily_df: Optional[pd.DataFrame], minute_df: Optional[pd.DataFrame],
+                        size: Tuple[int, int] = CHART_RENDER_SIZE, image_format: str = CHART_RENDER_FORMAT,
+                        minute_candles: int = CHART_RENDER_MINUTE_CANDLES,
+                        symbol: str = TRADING_SYMBOL) -> Tuple[bytes, Dict[str, Any]]:
+    """
+    일봉/분봉 차트를 한 장의 이미지로 렌더링
+
+    Args:
+        daily_df: 기술적 지표가 계산된 일봉 DataFrame
+        minute_df: 기술적 지표가 계산된 분봉 DataFrame
+        size: 이미지 크기 (width, height)
+        image_format: "PNG" 또는 "JPEG"
+        minute_candles: 그릴 최근 분봉 개수
+        symbol: 패널 제목에 표시할 마켓 코드
+
+    Returns:
+        (이미지 바이트, 렌더링 정보)
+    """
+    start = time.perf_counter()
+    panels = []
+    if daily_df is not None and not daily_df.empty:
+        panels.append((daily_df, f"{symbol} 1D"))
+    if minute_df is not None and not minute_df.empty:
+        panels.append((minute_df.tail(minute_candles), f"{symbol} 1m"))
+    if not panels:
+        raise ValueError("차트를 그릴 데이터가 없습니다.")
+
+    width, height = size
+    image = Image.new("RGB", size, BACKGROUND_COLOR)
+    panel_height = height // len(panels)
+    for index, (df, title) in enumerate(panels):
+        draw_candle_panel(image, df, (0, index * panel_height, width, (index + 1) * panel_height), title)
+
+    buffer = io.BytesIO()
+    if image_format.upper() == "JPEG":
+        image.save(buffer, format="JPEG", quality=SCREENSHOT_QUALITY, optimize=True)
+    else:
+        image.save(buffer, format="PNG", compress_level=1)
+    image_bytes = buffer.getvalue()
+
+    info = {
+        'format': image_format.upper(),
+        'width': width,
+        'height': height,
+        'titles': [title for _, title in panels],
+        'size_kb': len(image_bytes) / 1024,
+        'render_ms': (time.perf_counter() - start) * 1000
+    }
+    return image_bytes, info
+
+def get_chart_image(daily_df: Optional[pd.DataFrame], minute_df: Optional[pd.DataFrame],
+                    source: str = CHART_SOURCE) -> Optional[Tuple[str, str]]:
+    """
+    Vision API용 차트 이미지 (편의 함수)
+
+    source가 "local"이면 DataFrame으로 직접 렌더링하고, 실패하거나 "screenshot"이면
+    업비트 차트 스크린샷을 캡처합니다.
+
+    Returns:
+        (이미지 출처, Base64 인코딩 이미지) 또는 None
+    """
+    if source == "local":
+        try:
+            image_bytes, info = render_market_chart(daily_df, minute_df)
+            print(f"🖼️ 차트 렌더링 완료: {info['width']}x{info['height']} {info['format']}, "
+                  f"{info['size_kb']:.1f} KB, {info['render_ms']:.0f}ms")
+            return "local_render", base64.b64encode(image_bytes).decode('utf-8')
+        except Exception as e:
+            print(f"⚠️ 차트 렌더링 실패, 스크린샷으로 대체합니다: {e}")
+
+    from .screenshot import capture_upbit_screenshot
+    return capture_upbit_screenshot()
@@ -3,11 +3,27 @@
 업비트 API를 통해 비트코인 시장 데이터를 수집합니다.
 """
 
+import time
 import pyupbit
 import pandas as pd
 import requests
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FuturesTimeoutError
 from typing import Optional, Dict, Any, Tuple
-from config.settings import TRADING_SYMBOL, DAILY_DATA_COUNT, MINUTE_DATA_COUNT
+from config.settings import (
+    TRADING_SYMBOL, DAILY_DATA_COUNT, MINUTE_DATA_COUNT,
+    MARKET_DATA_CONCURRENT, MARKET_DATA_MAX_WORKERS, MARKET_DATA_SOURCE_TIMEOUTS,
+    CANDLE_STORE_ENABLED
+)
+from .candle_store import get_candle_store
+
+# 병렬 수집용 스레드 풀 (사이클마다 새로 만들지 않도록 재사용)
+_market_data_executor: Optional[ThreadPoolExecutor] = None
+
+# 타임아웃 후에도 아직 실행 중인 소스 요청 (끝날 때까지 같은 소스를 다시 요청하지 않음)
+_stuck_requests: Dict[str, Future] = {}
+
+# 마지막 수집의 소스별 결과 (상태, 지연 시간)
+_last_collection_report: Dict[str, Dict[str, Any]] = {}
 
 def get_current_price(symbol: str = TRADING_SYMBOL) -> Optional[float]:
     """현재 가격 조회"""
@@ -34,6 +50,20 @@ def get_ohlcv_data(symbol: str = TRADING_SYMBOL, interval: str = "day", count: i
         print(f"❌ {interval} 데이터 조회 중 오류: {e}")
         return None
 
+def get_ohlcv_data_incremental(symbol: str = TRADING_SYMBOL, interval: str = "minute1", count: int = MINUTE_DATA_COUNT) -> Optional[pd.DataFrame]:
+    """캔들 저장소를 통한 OHLCV 데이터 조회 (마지막 저장 이후 캔들만 조회)"""
+    if not CANDLE_STORE_ENABLED:
+        return get_ohlcv_data(symbol, interval, count)
+    try:
+        df = get_candle_store(symbol, interval, count).refresh()
+        if df is not None and not df.empty:
+            return df
+        print(f"❌ {interval} 데이터 수집 실패")
+        return None
+    except Exception as e:
+        print(f"❌ {interval} 캔들 저장소 갱신 중 오류: {e}")
+        return get_ohlcv_data(symbol, interval, count)
+
 def get_orderbook(symbol: str = TRADING_SYMBOL) -> Optional[Dict[str, Any]]:
     """오더북 정보 조회"""
     try:
@@ -60,7 +90,7 @@ def get_fear_greed_index() -> Optional[Dict[str, Any]]:
     """공포탐욕지수 데이터 수집"""
     try:
         url = "https://api.alternative.me/fng/?limit=2"
-        response = requests.get(url, timeout=10)
+        response = requests.get(url, timeout=MARKET_DATA_SOURCE_TIMEOUTS.get('fear_greed', 10))
         response.raise_for_status()
         
         data = response.json()
@@ -93,15 +123,134 @@ def get_fear_greed_index() -> Optional[Dict[str, Any]]:
         print(f"❌ 공포탐욕지수 조회 중 오류: {e}")
         return None
 
-def get_market_data() -> Tuple[Optional[pd.DataFrame], Optional[pd.DataFrame], Optional[float], Optional[Dict], Optional[Dict]]:
+def _get_market_data_executor() -> ThreadPoolExecutor:
+    """시장 데이터 수집용 스레드 풀 반환"""
+    global _market_data_executor
+    if _market_data_executor is None:
+        _market_data_executor = ThreadPoolExecutor(
+            max_workers=MARKET_DATA_MAX_WORKERS,
+            thread_name_prefix="market-data"
+        )
+    return _market_data_executor
+
+def _retire_market_data_executor():
+    """
+    멈춘 요청이 있는 스레드 풀 교체
+
+    실행 중인 작업은 future.cancel()로 멈출 수 없으므로, 기존 풀은 남은 작업이 끝나면 정리되도록 두고
+    다음 수집부터 새 풀을 사용합니다.
+    """
+    global _market_data_executor
+    if _market_data_executor is not None:
+        _market_data_executor.shutdown(wait=False)
+        _market_data_executor = None
+
+def _timed_call(func, *args) -> Tuple[Any, float]:
+    """함수를 실행하고 (결과, 소요 시간) 반환"""
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+def get_last_market_data_report() -> Dict[str, Dict[str, Any]]:
+    """마지막 시장 데이터 수집의 소스별 상태 및 지연 시간 반환"""
+    return dict(_last_collection_report)
+
+def get_market_data_concurrent(timeouts: Optional[Dict[str, float]] = None) -> Tuple[Optional[pd.DataFrame], Optional[pd.DataFrame], Optional[float], Optional[Dict], Optional[Dict]]:
+    """
+    전체 시장 데이터 병렬 수집
+    
+    다섯 개 소스를 동시에 요청하고 소스별 타임아웃을 적용합니다.
+    타임아웃이 지난 소스는 None으로 채워 부분 결과를 반환합니다.
+    타임아웃된 요청이 스레드를 계속 점유하면 풀을 교체하고, 그 요청이 끝날 때까지 해당 소스는 'stuck'으로 건너뜁니다.
+    
+    Args:
+        timeouts: 소스별 타임아웃 (초), 지정하지 않은 소스는 설정값 사용
+        
+    Returns:
+        (일봉, 분봉, 현재가, 오더북, 공포탐욕지수) 튜플
+    """
+    global _last_collection_report
+    print("=== 시장 데이터 병렬 수집 중 ===")
+    
+    source_timeouts = dict(MARKET_DATA_SOURCE_TIMEOUTS)
+    if timeouts:
+        source_timeouts.update(timeouts)
+    
+    sources = {
+        'daily': (get_ohlcv_data, (TRADING_SYMBOL, "day", DAILY_DATA_COUNT)),
+        'minute': (get_ohlcv_data_incremental, (TRADING_SYMBOL, "minute1", MINUTE_DATA_COUNT)),
+        'current_price': (get_current_price, (TRADING_SYMBOL,)),
+        'orderbook': (get_orderbook, (TRADING_SYMBOL,)),
+        'fear_greed': (get_fear_greed_index, ())
+    }
+    
+    # 지난 수집에서 멈췄던 요청 중 끝난 것은 정리, 아직 실행 중이면 다시 요청하지 않음
+    for name, future in list(_stuck_requests.items()):
+        if future.done():
+            del _stuck_requests[name]
+    
+    executor = _get_market_data_executor()
+    started_at = time.perf_counter()
+    futures = {name: executor.submit(_timed_call, func, *args)
+               for name, (func, args) in sources.items() if name not in _stuck_requests}
+    
+    results = {}
+    report = {}
+    for name in _stuck_requests:
+        results[name] = None
+        report[name] = {'status': 'stuck', 'latency': 0.0}
+    
+    timed_out = False
+    for name, future in futures.items():
+        # 모든 소스가 동시에 시작했으므로 남은 시간만큼만 대기
+        remaining = source_timeouts.get(name, 10) - (time.perf_counter() - started_at)
+        try:
+            value, latency = future.result(timeout=max(remaining, 0))
+            results[name] = value
+            report[name] = {'status': 'ok' if value is not None else 'empty', 'latency': latency}
+        except FuturesTimeoutError:
+            if not future.cancel():  # 이미 실행 중이면 취소되지 않으므로 끝날 때까지 추적
+                _stuck_requests[name] = future
+                timed_out = True
+            results[name] = None
+            report[name] = {'status': 'timeout', 'latency': time.perf_counter() - started_at}
+        except Exception as e:
+            results[name] = None
+            report[name] = {'status': 'error', 'latency': time.perf_counter() - started_at, 'error': str(e)}
+    
+    if timed_out:
+        _retire_market_data_executor()
+    
+    total_latency = time.perf_counter() - started_at
+    _last_collection_report = {name: report[name] for name in sources}
+    
+    print(f"⏱️ 시장 데이터 수집 시간: {total_latency:.2f}초")
+    for name, info in _last_collection_report.items():
+        status_icon = "✅" if info['status'] == 'ok' else "⚠️"
+        print(f"   {status_icon} {name}: {info['status']} ({info['latency']:.2f}초)")
+    
+    return (
+        results['daily'],
+        results['minute'],
+        results['current_price'],
+        results['orderbook'],
+        results['fear_greed']
+    )
+
+def get_market_data(concurrent: Optional[bool] = None) -> Tuple[Optional[pd.DataFrame], Optional[pd.DataFrame], Optional[float], Optional[Dict], Optional[Dict]]:
     """전체 시장 데이터 수집"""
+    if concurrent is None:
+        concurrent = MARKET_DATA_CONCURRENT
+    if concurrent:
+        return get_market_data_concurrent()
+    
     print("=== 시장 데이터 수집 중 ===")
     
     # 일봉 데이터
     daily_df = get_ohlcv_data(TRADING_SYMBOL, "day", DAILY_DATA_COUNT)
     
-    # 분봉 데이터
-    minute_df = get_ohlcv_data(TRADING_SYMBOL, "minute1", MINUTE_DATA_COUNT)
+    # 분봉 데이터 (캔들 저장소에서 증분 조회)
+    minute_df = get_ohlcv_data_incremental(TRADING_SYMBOL, "minute1", MINUTE_DATA_COUNT)
     
     # 현재가
     current_price = get_current_price(TRADING_SYMBOL)
@@ -5,7 +5,9 @@
 
 import os
 import time
+import atexit
 import base64
+import threading
 from datetime import datetime
 from selenium import webdriver
 from selenium.webdriver.chrome.service import Service
@@ -13,86 +15,160 @@ from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
+from selenium.common.exceptions import WebDriverException
 from webdriver_manager.chrome import ChromeDriverManager
 from PIL import Image
 import io
-from typing import Optional, Tuple
-from config.settings import SCREENSHOT_WINDOW_SIZE, SCREENSHOT_MAX_SIZE_MB, SCREENSHOT_QUALITY
+from typing import Optional, Tuple, Union
+from config.settings import (
+    SCREENSHOT_WINDOW_SIZE, SCREENSHOT_MAX_SIZE_MB, SCREENSHOT_QUALITY,
+    SCREENSHOT_PERSISTENT_BROWSER, SCREENSHOT_MAX_CAPTURES_PER_SESSION, SCREENSHOT_MAX_MEMORY_GROWTH_MB,
+    SCREENSHOT_PAGE_REFRESH_INTERVAL, SCREENSHOT_WAIT_TIMEOUT, SCREENSHOT_CROP_TO_CHART, SCREENSHOT_SAVE_TO_DISK
+)
 
-def optimize_image(image_path: str, max_size_mb: float = SCREENSHOT_MAX_SIZE_MB, quality: int = SCREENSHOT_QUALITY) -> Tuple[bytes, dict]:
-    """이미지를 최적화하여 파일 크기를 줄이고 품질을 유지"""
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+UPBIT_CHART_URL = "https://upbit.com/exchange?code=CRIX.UPBIT.KRW-BTC"
+
+# 차트 메뉴 XPath
+CHART_MENU_XPATH = "/html/body/div[1]/div[2]/div[3]/div/section[1]/article[1]/div/span[2]/div/div/div[1]/div[1]/div"
+TIME_BUTTON_XPATH = f"{CHART_MENU_XPATH}/cq-menu[1]/span/cq-clickable"
+ONE_HOUR_XPATH = f"{CHART_MENU_XPATH}/cq-menu[1]/cq-menu-dropdown/cq-item[8]"
+INDICATOR_BUTTON_XPATH = f"{CHART_MENU_XPATH}/cq-menu[3]/span"
+BOLLINGER_XPATH = f"{CHART_MENU_XPATH}/cq-menu[3]/cq-menu-dropdown/cq-scroll/cq-studies/cq-studies-content/cq-item[2]"
+CHART_AREA_XPATH = "/html/body/div[1]/div[2]/div[3]/div/section[1]/article[1]"
+BOLLINGER_LEGEND_XPATH = "//cq-study-legend//*[contains(text(), 'Bollinger') or contains(text(), '볼린저')]"
+
+def encode_jpeg_to_target(img: Image.Image, max_bytes: int, max_quality: int = SCREENSHOT_QUALITY,
+                          min_quality: int = 10) -> Tuple[bytes, int, int]:
+    """
+    목표 크기 이하가 되는 가장 높은 JPEG 품질을 이진 탐색으로 찾아 인코딩
+
+    Returns:
+        (JPEG 바이트, 최종 품질, 인코딩 횟수)
+    """
+    encoded = {}
+
+    def encode(quality: int) -> bytes:
+        if quality not in encoded:
+            buffer = io.BytesIO()
+            img.save(buffer, format='JPEG', quality=quality, optimize=True)
+            encoded[quality] = buffer.getvalue()
+        return encoded[quality]
+
+    # 최고 품질로 한 번에 맞으면 바로 반환
+    if len(encode(max_quality)) <= max_bytes:
+        return encoded[max_quality], max_quality, len(encoded)
+
+    best_quality = None
+    low, high = min_quality, max_quality - 1
+    while low <= high:
+        middle = (low + high) // 2
+        if len(encode(middle)) <= max_bytes:
+            best_quality = middle
+            low = middle + 1
+        else:
+            high = middle - 1
+
+    # 최저 품질로도 맞지 않으면 최저 품질 결과 사용
+    if best_quality is None:
+        best_quality = min_quality
+    return encode(best_quality), best_quality, len(encoded)
+
+def optimize_image(image_source: Union[str, bytes], max_size_mb: float = SCREENSHOT_MAX_SIZE_MB, quality: int = SCREENSHOT_QUALITY,
+                   crop_box: Optional[Tuple[int, int, int, int]] = None) -> Tuple[bytes, dict]:
+    """
+    이미지를 최적화하여 파일 크기를 줄이고 품질을 유지
+
+    Args:
+        image_source: 이미지 파일 경로 또는 메모리의 이미지 바이트 (PNG 스크린샷 등)
+        max_size_mb: 최대 크기 (MB)
+        quality: 최대 JPEG 품질
+        crop_box: 잘라낼 영역 (left, top, right, bottom), None이면 전체
+    """
     try:
-        with Image.open(image_path) as img:
-            original_size = os.path.getsize(image_path) / (1024 * 1024)  # MB
+        if isinstance(image_source, (bytes, bytearray)):
+            original_size = len(image_source) / (1024 * 1024)  # MB
+            img = Image.open(io.BytesIO(image_source))
+        else:
+            original_size = os.path.getsize(image_source) / (1024 * 1024)  # MB
+            img = Image.open(image_source)
+
+        with img:
             original_width, original_height = img.size
-            
             print(f"📏 원본 이미지 크기: {original_size:.2f} MB ({original_width}x{original_height})")
-            
+
+            # 차트 영역만 잘라내기
+            if crop_box:
+                img = img.crop(crop_box)
+                print(f"✂️ 차트 영역 잘라내기: {img.size[0]}x{img.size[1]}")
+
             # RGB 모드로 변환 (JPEG 최적화를 위해)
             if img.mode != 'RGB':
                 img = img.convert('RGB')
-            
+
             # 이미지 크기 조정 (너무 큰 경우)
             max_dimension = 1920
-            if original_width > max_dimension or original_height > max_dimension:
-                ratio = min(max_dimension / original_width, max_dimension / original_height)
-                new_width = int(original_width * ratio)
-                new_height = int(original_height * ratio)
+            width, height = img.size
+            if width > max_dimension or height > max_dimension:
+                ratio = min(max_dimension / width, max_dimension / height)
+                new_width = int(width * ratio)
+                new_height = int(height * ratio)
                 img = img.resize((new_width, new_height), Image.Resampling.LANCZOS)
                 print(f"📐 이미지 크기 조정: {new_width}x{new_height}")
-            
-            # 최적화된 이미지를 메모리에 저장
-            output_buffer = io.BytesIO()
-            
-            # 파일 크기가 목표 크기보다 클 때까지 품질을 낮춤
-            current_quality = quality
-            while True:
-                output_buffer.seek(0)
-                output_buffer.truncate()
-                
-                img.save(output_buffer, format='JPEG', quality=current_quality, optimize=True)
-                
-                optimized_size = len(output_buffer.getvalue()) / (1024 * 1024)  # MB
-                
-                if optimized_size <= max_size_mb or current_quality <= 10:
-                    break
-                
-                current_quality -= 5
-            
-            optimized_bytes = output_buffer.getvalue()
+
+            # 목표 크기에 맞는 품질을 이진 탐색으로 찾아 인코딩
+            encode_start = time.perf_counter()
+            optimized_bytes, final_quality, encode_count = encode_jpeg_to_target(
+                img, int(max_size_mb * 1024 * 1024), quality
+            )
+            encode_ms = (time.perf_counter() - encode_start) * 1000
             optimized_size = len(optimized_bytes) / (1024 * 1024)  # MB
-            
+
             optimization_info = {
                 'original_size_mb': original_size,
                 'optimized_size_mb': optimized_size,
                 'compression_ratio': (1 - optimized_size / original_size) * 100,
-                'final_quality': current_quality,
+                'final_quality': final_quality,
+                'encode_count': encode_count,
+                'encode_ms': encode_ms,
                 'width': img.size[0],
                 'height': img.size[1]
             }
-            
+
             print(f"✅ 이미지 최적화 완료:")
             print(f"   📏 원본 크기: {original_size:.2f} MB")
             print(f"   📏 최적화 크기: {optimized_size:.2f} MB")
             print(f"   📊 압축률: {optimization_info['compression_ratio']:.1f}%")
-            print(f"   🎨 최종 품질: {current_quality}")
-            
+            print(f"   🎨 최종 품질: {final_quality}")
+            print(f"   ⏱️ 인코딩: {encode_count}회, {encode_ms:.0f}ms")
+
             return optimized_bytes, optimization_info
-            
+
     except Exception as e:
         print(f"⚠️ 이미지 최적화 중 오류: {e}")
-        # 오류 발생 시 원본 파일을 그대로 사용
-        with open(image_path, "rb") as f:
+        # 오류 발생 시 원본 이미지를 그대로 사용
+        if isinstance(image_source, (bytes, bytearray)):
+            return bytes(image_source), {'error': str(e)}
+        with open(image_source, "rb") as f:
             return f.read(), {'error': str(e)}
 
+# ChromeDriver 설치 경로 (한 번만 설치/확인)
+_chromedriver_path = None
+
 def setup_driver() -> webdriver.Chrome:
     """Chrome 드라이버 설정"""
+    global _chromedriver_path
     chrome_options = Options()
     
     # 창 크기 설정
     chrome_options.add_argument(f"--window-size={SCREENSHOT_WINDOW_SIZE[0]},{SCREENSHOT_WINDOW_SIZE[1]}")
     
     # 기타 옵션들
+    chrome_options.add_argument("--headless=new")
     chrome_options.add_argument("--no-sandbox")
     chrome_options.add_argument("--disable-dev-shm-usage")
     chrome_options.add_argument("--disable-gpu")
@@ -104,7 +180,9 @@ def setup_driver() -> webdriver.Chrome:
     chrome_options.add_argument("--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36")
     
     # ChromeDriver 자동 설치 및 설정
-    service = Service(ChromeDriverManager().install())
+    if _chromedriver_path is None:
+        _chromedriver_path = ChromeDriverManager().install()
+    service = Service(_chromedriver_path)
     driver = webdriver.Chrome(service=service, options=chrome_options)
     
     return driver
@@ -115,120 +193,252 @@ def create_images_directory():
         os.makedirs("images")
         print("📁 images 디렉토리를 생성했습니다.")
 
-def capture_upbit_screenshot() -> Optional[Tuple[str, str]]:
-    """업비트 페이지 스크린샷 캡쳐"""
-    url = "https://upbit.com/exchange?code=CRIX.UPBIT.KRW-BTC"
-    
-    print("🚀 업비트 페이지 스크린샷 캡쳐를 시작합니다...")
-    print(f"📄 대상 URL: {url}")
-    
-    driver = None
+def _process_tree_rss_mb(root_pid: int) -> Optional[float]:
+    """프로세스와 모든 자식 프로세스의 메모리(RSS) 합계 (MB)"""
     try:
-        # 드라이버 설정
-        driver = setup_driver()
-        
-        # 페이지 로드
-        print("⏳ 페이지를 로딩 중입니다...")
-        driver.get(url)
-        
-        # 페이지가 완전히 로드될 때까지 대기
-        wait = WebDriverWait(driver, 30)
-        
-        # 메인 콘텐츠가 로드될 때까지 대기
-        try:
-            wait.until(EC.presence_of_element_located((By.TAG_NAME, "body")))
-            print("✅ 페이지 로딩이 완료되었습니다.")
-        except Exception as e:
-            print(f"⚠️ 페이지 로딩 대기 중 오류: {e}")
-            print("계속 진행합니다...")
-        
-        # 추가 대기 시간 (동적 콘텐츠 로딩을 위해)
-        time.sleep(5)
-        
-        # 차트 시간 설정 변경
+        if psutil is not None:
+            root = psutil.Process(root_pid)
+            processes = [root] + root.children(recursive=True)
+            return sum(process.memory_info().rss for process in processes) / (1024 * 1024)
+
+        # psutil이 없으면 /proc에서 직접 계산 (Linux)
+        children = {}
+        for entry in os.listdir("/proc"):
+            if not entry.isdigit():
+                continue
+            try:
+                with open(f"/proc/{entry}/stat") as f:
+                    parent_pid = int(f.read().rsplit(")", 1)[1].split()[1])
+                children.setdefault(parent_pid, []).append(int(entry))
+            except (OSError, IndexError, ValueError):
+                continue
+
+        page_size = os.sysconf("SC_PAGE_SIZE")
+        total_pages = 0
+        pending = [root_pid]
+        while pending:
+            pid = pending.pop()
+            try:
+                with open(f"/proc/{pid}/statm") as f:
+                    total_pages += int(f.read().split()[1])
+            except (OSError, IndexError, ValueError):
+                pass
+            pending.extend(children.get(pid, []))
+        return total_pages * page_size / (1024 * 1024)
+    except Exception:
+        return None
+
+class ChartBrowserSession:
+    """
+    업비트 차트 브라우저 세션
+
+    헤드리스 Chrome을 계속 띄워 둔 채 1시간 봉 + 볼린저 밴드 차트 페이지를 유지하고,
+    요청이 있을 때마다 캡처합니다. 상태 점검에 실패하거나, 캡처 횟수/메모리 증가량이
+    한도를 넘으면 브라우저를 재시작합니다. 대기는 고정 sleep 대신 DOM 조건으로 합니다.
+    """
+
+    def __init__(self, url: str = UPBIT_CHART_URL, max_captures: int = SCREENSHOT_MAX_CAPTURES_PER_SESSION,
+                 max_memory_growth_mb: float = SCREENSHOT_MAX_MEMORY_GROWTH_MB,
+                 refresh_interval: float = SCREENSHOT_PAGE_REFRESH_INTERVAL, wait_timeout: float = SCREENSHOT_WAIT_TIMEOUT):
+        self.url = url
+        self.max_captures = max_captures
+        self.max_memory_growth_mb = max_memory_growth_mb
+        self.refresh_interval = refresh_interval
+        self.wait_timeout = wait_timeout
+        self.driver: Optional[webdriver.Chrome] = None
+        self.capture_count = 0
+        self.session_count = 0
+        self.baseline_memory_mb: Optional[float] = None
+        self.loaded_at = 0.0
+        self._lock = threading.Lock()
+
+    def start(self):
+        """브라우저 시작 및 차트 페이지 준비"""
+        print("🚀 차트 브라우저 세션을 시작합니다...")
+        self.driver = setup_driver()
+        self.capture_count = 0
+        self.session_count += 1
+        self.load_chart()
+        self.baseline_memory_mb = self.memory_mb()
+
+    def close(self):
+        """브라우저 종료"""
+        if self.driver:
+            try:
+                self.driver.quit()
+                print("🔒 브라우저를 종료했습니다.")
+            except Exception as e:
+                print(f"⚠️ 브라우저 종료 중 오류: {e}")
+        self.driver = None
+
+    def _wait(self) -> WebDriverWait:
+        return WebDriverWait(self.driver, self.wait_timeout)
+
+    def _wait_for_chart(self):
+        """문서 로딩 완료 후 차트 캔버스가 나타날 때까지 대기"""
+        wait = self._wait()
+        wait.until(lambda driver: driver.execute_script("return document.readyState") == "complete")
+        wait.until(EC.presence_of_element_located((By.TAG_NAME, "canvas")))
+
+    def _select_menu_item(self, button_xpath: str, item_xpath: str):
+        """차트 메뉴를 열고 항목 선택 (드롭다운이 닫힐 때까지 대기)"""
+        wait = self._wait()
+        wait.until(EC.element_to_be_clickable((By.XPATH, button_xpath))).click()
+        wait.until(EC.element_to_be_clickable((By.XPATH, item_xpath))).click()
+        wait.until(EC.invisibility_of_element_located((By.XPATH, item_xpath)))
+
+    def load_chart(self):
+        """차트 페이지 로드 후 1시간 봉과 볼린저 밴드 적용"""
+        print(f"⏳ 차트 페이지를 로딩 중입니다: {self.url}")
+        self.driver.get(self.url)
+        self._wait_for_chart()
+        print("✅ 페이지 로딩이 완료되었습니다.")
+
         print("⏰ 차트 시간 설정을 1시간으로 변경합니다...")
         try:
-            # 시간 설정 버튼 클릭
-            time_button_xpath = "/html/body/div[1]/div[2]/div[3]/div/section[1]/article[1]/div/span[2]/div/div/div[1]/div[1]/div/cq-menu[1]/span/cq-clickable"
-            time_button = wait.until(EC.element_to_be_clickable((By.XPATH, time_button_xpath)))
-            time_button.click()
-            print("✅ 시간 설정 버튼을 클릭했습니다.")
-            
-            # 메뉴가 나타날 때까지 대기
-            time.sleep(2)
-            
-            # 1시간 옵션 클릭
-            one_hour_xpath = "/html/body/div[1]/div[2]/div[3]/div/section[1]/article[1]/div/span[2]/div/div/div[1]/div[1]/div/cq-menu[1]/cq-menu-dropdown/cq-item[8]"
-            one_hour_option = wait.until(EC.element_to_be_clickable((By.XPATH, one_hour_xpath)))
-            one_hour_option.click()
+            self._select_menu_item(TIME_BUTTON_XPATH, ONE_HOUR_XPATH)
             print("✅ 1시간 옵션을 선택했습니다.")
-            
-            # 설정 변경 후 차트가 업데이트될 때까지 대기
-            time.sleep(3)
-            
         except Exception as e:
             print(f"⚠️ 차트 시간 설정 변경 중 오류: {e}")
             print("기본 설정으로 계속 진행합니다...")
-        
-        # 볼린저 밴드 추가
-        print("📊 볼린저 밴드를 추가합니다...")
+
+        # 저장된 차트 레이아웃에 이미 볼린저 밴드가 있으면 중복 추가하지 않음
+        if self.driver.find_elements(By.XPATH, BOLLINGER_LEGEND_XPATH):
+            print("✅ 볼린저 밴드가 이미 적용되어 있습니다.")
+        else:
+            print("📊 볼린저 밴드를 추가합니다...")
+            try:
+                self._select_menu_item(INDICATOR_BUTTON_XPATH, BOLLINGER_XPATH)
+                print("✅ 볼린저 밴드를 선택했습니다.")
+            except Exception as e:
+                print(f"⚠️ 볼린저 밴드 추가 중 오류: {e}")
+                print("기본 설정으로 계속 진행합니다...")
+
+        self._wait_for_chart()
+        self.loaded_at = time.monotonic()
+
+    def chart_crop_box(self) -> Optional[Tuple[int, int, int, int]]:
+        """스크린샷에서 차트 영역 좌표 (기기 픽셀 기준), 찾지 못하면 None"""
         try:
-            # 지표 설정 버튼 클릭
-            indicator_button_xpath = "/html/body/div[1]/div[2]/div[3]/div/section[1]/article[1]/div/span[2]/div/div/div[1]/div[1]/div/cq-menu[3]/span"
-            indicator_button = wait.until(EC.element_to_be_clickable((By.XPATH, indicator_button_xpath)))
-            indicator_button.click()
-            print("✅ 지표 설정 버튼을 클릭했습니다.")
-            
-            # 메뉴가 나타날 때까지 대기
-            time.sleep(2)
-            
-            # 볼린저 밴드 옵션 클릭
-            bollinger_xpath = "/html/body/div[1]/div[2]/div[3]/div/section[1]/article[1]/div/span[2]/div/div/div[1]/div[1]/div/cq-menu[3]/cq-menu-dropdown/cq-scroll/cq-studies/cq-studies-content/cq-item[2]"
-            bollinger_option = wait.until(EC.element_to_be_clickable((By.XPATH, bollinger_xpath)))
-            bollinger_option.click()
-            print("✅ 볼린저 밴드를 선택했습니다.")
-            
-            # 설정 변경 후 차트가 업데이트될 때까지 대기
-            time.sleep(3)
-            
+            rect = self.driver.find_element(By.XPATH, CHART_AREA_XPATH).rect
+            ratio = self.driver.execute_script("return window.devicePixelRatio") or 1
+            return (int(rect['x'] * ratio), int(rect['y'] * ratio),
+                    int((rect['x'] + rect['width']) * ratio), int((rect['y'] + rect['height']) * ratio))
         except Exception as e:
-            print(f"⚠️ 볼린저 밴드 추가 중 오류: {e}")
-            print("기본 설정으로 계속 진행합니다...")
-        
-        # 현재 시간으로 파일명 생성
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        filename = f"upbit_screenshot_{timestamp}.png"
-        filepath = os.path.join("images", filename)
-        
-        # 전체 페이지 스크린샷 캡쳐
-        print("📸 전체 페이지 스크린샷을 캡쳐 중입니다...")
-        
-        # 페이지 전체 높이 계산
-        total_height = driver.execute_script("return document.body.scrollHeight")
-        driver.set_window_size(1920, total_height)
-        
-        # 스크린샷 촬영
-        driver.save_screenshot(filepath)
-        
-        # 이미지 최적화
-        print("🔧 이미지를 최적화합니다...")
-        optimized_bytes, optimization_info = optimize_image(filepath, SCREENSHOT_MAX_SIZE_MB, SCREENSHOT_QUALITY)
-        
-        # 최적화된 이미지를 Base64 인코딩
-        image_base64 = base64.b64encode(optimized_bytes).decode('utf-8')
-        
-        print(f"✅ 스크린샷이 성공적으로 저장되었습니다!")
-        print(f"📁 저장 위치: {filepath}")
-        print(f"📏 원본 파일 크기: {os.path.getsize(filepath) / 1024:.1f} KB")
-        print(f"🔗 최적화된 Base64 인코딩 완료")
-        
-        return filepath, image_base64
-        
-    except Exception as e:
-        print(f"❌ 스크린샷 캡쳐 중 오류 발생: {e}")
+            print(f"⚠️ 차트 영역을 찾지 못해 전체 페이지를 사용합니다: {e}")
+            return None
+
+    def is_healthy(self) -> bool:
+        """브라우저가 응답하고 차트가 표시 중인지 확인"""
+        if self.driver is None:
+            return False
+        try:
+            ready = self.driver.execute_script("return document.readyState") == "complete"
+            return ready and len(self.driver.find_elements(By.TAG_NAME, "canvas")) > 0
+        except WebDriverException:
+            return False
+
+    def memory_mb(self) -> Optional[float]:
+        """브라우저 프로세스(드라이버 + Chrome) 메모리 사용량 (MB)"""
+        try:
+            return _process_tree_rss_mb(self.driver.service.process.pid)
+        except Exception:
+            return None
+
+    def _recycle_reason(self) -> Optional[str]:
+        """브라우저를 재시작해야 하는 이유 (없으면 None)"""
+        if self.capture_count >= self.max_captures:
+            return f"캡처 {self.capture_count}회 도달"
+        memory = self.memory_mb()
+        if memory is not None and self.baseline_memory_mb is not None:
+            growth = memory - self.baseline_memory_mb
+            if growth > self.max_memory_growth_mb:
+                return f"메모리 {growth:.0f}MB 증가"
+        if not self.is_healthy():
+            return "상태 점검 실패"
         return None
-        
+
+    def _ensure_ready(self):
+        """캡처 전 세션 준비 (시작, 재시작, 새로고침)"""
+        if self.driver is None:
+            self.start()
+            return
+        reason = self._recycle_reason()
+        if reason:
+            print(f"♻️ 브라우저를 재시작합니다: {reason}")
+            self.close()
+            self.start()
+        elif time.monotonic() - self.loaded_at > self.refresh_interval:
+            print("🔄 차트 페이지를 새로고침합니다...")
+            self.load_chart()
+
+    def capture(self) -> Optional[Tuple[str, str]]:
+        """차트 스크린샷 캡처 후 (파일 경로, 최적화된 Base64) 반환"""
+        with self._lock:
+            try:
+                self._ensure_ready()
+
+                # 전체 페이지 스크린샷을 메모리로 캡쳐
+                print("📸 전체 페이지 스크린샷을 캡쳐 중입니다...")
+                total_height = self.driver.execute_script("return document.body.scrollHeight")
+                self.driver.set_window_size(1920, total_height)
+                png_bytes = self.driver.get_screenshot_as_png()
+                self.capture_count += 1
+
+                # 이미지 최적화 (디스크를 거치지 않음)
+                print("🔧 이미지를 최적화합니다...")
+                crop_box = self.chart_crop_box() if SCREENSHOT_CROP_TO_CHART else None
+                optimized_bytes, optimization_info = optimize_image(png_bytes, SCREENSHOT_MAX_SIZE_MB, SCREENSHOT_QUALITY, crop_box)
+
+                # 최적화된 이미지를 Base64 인코딩
+                image_base64 = base64.b64encode(optimized_bytes).decode('utf-8')
+                print(f"🔗 최적화된 Base64 인코딩 완료")
+
+                filepath = "memory"
+                if SCREENSHOT_SAVE_TO_DISK:
+                    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+                    filepath = os.path.join("images", f"upbit_screenshot_{timestamp}.jpg")
+                    create_images_directory()
+                    with open(filepath, "wb") as f:
+                        f.write(optimized_bytes)
+                    print(f"📁 저장 위치: {filepath}")
+
+                return filepath, image_base64
+
+            except Exception as e:
+                print(f"❌ 스크린샷 캡쳐 중 오류 발생: {e}")
+                # 다음 캡처에서 새 브라우저로 시작
+                self.close()
+                return None
+
+    def get_stats(self) -> dict:
+        """세션 상태 반환"""
+        return {
+            'running': self.driver is not None,
+            'session_count': self.session_count,
+            'capture_count': self.capture_count,
+            'memory_mb': self.memory_mb() if self.driver else None,
+            'baseline_memory_mb': self.baseline_memory_mb
+        }
+
+# 전역 차트 브라우저 세션
+chart_browser = ChartBrowserSession()
+atexit.register(chart_browser.close)
+
+def capture_upbit_screenshot() -> Optional[Tuple[str, str]]:
+    """업비트 페이지 스크린샷 캡쳐"""
+    print("🚀 업비트 페이지 스크린샷 캡쳐를 시작합니다...")
+    
+    if SCREENSHOT_PERSISTENT_BROWSER:
+        return chart_browser.capture()
+    
+    # 세션을 유지하지 않는 경우 캡처마다 브라우저를 새로 띄움
+    session = ChartBrowserSession()
+    try:
+        return session.capture()
     finally:
-        if driver:
-            driver.quit()
-            print("🔒 브라우저를 종료했습니다.")
+        session.close()
+
+def close_chart_browser():
+    """차트 브라우저 세션 종료 (편의 함수)"""
+    chart_browser.close()
@@ -1,28 +1,190 @@
 """
 MySQL 데이터베이스 연결 모듈
+커넥션 풀에서 연결을 빌려 쓰고 돌려주는 방식으로 여러 모듈이 동시에 DB를 사용합니다.
 """
 
+import time
+import threading
 import mysql.connector
 from mysql.connector import Error
-from typing import Optional
+from mysql.connector.errors import PoolError
+from contextlib import contextmanager
+from collections import deque
+from typing import Optional, Dict, Any
 import logging
 
+class ConnectionPool:
+    """
+    MySQL 커넥션 풀
+
+    최대 size개의 연결을 필요할 때 생성해 재사용합니다. 일정 시간 이상 쉬었던 연결은
+    빌려주기 전에 ping으로 상태를 확인하고, 끊겼으면 재연결하거나 새 연결로 교체합니다.
+    모든 연결이 사용 중이면 timeout초 동안 반납을 기다린 뒤 PoolError를 발생시킵니다.
+    """
+
+    def __init__(self, size: int, timeout: float, ping_interval: float, **connect_kwargs):
+        self.size = size
+        self.timeout = timeout
+        self.ping_interval = ping_interval
+        self.connect_kwargs = connect_kwargs
+        self._idle = deque()  # (연결, 마지막 반납 시각)
+        self._in_use = 0
+        self._condition = threading.Condition()
+        self.created_count = 0
+        self.reconnect_count = 0
+        self.wait_count = 0
+        self.logger = logging.getLogger(__name__)
+
+    def _create(self):
+        """새 연결 생성"""
+        connection = mysql.connector.connect(charset='utf8mb4', autocommit=True, **self.connect_kwargs)
+        self.created_count += 1
+        return connection
+
+    def _ensure_alive(self, connection, idle_since: float):
+        """오래 쉰 연결은 ping으로 확인하고 끊겼으면 재연결 (실패 시 새 연결)"""
+        if time.monotonic() - idle_since < self.ping_interval:
+            return connection
+        try:
+            connection.ping(reconnect=True, attempts=2, delay=0.5)
+            return connection
+        except Error as e:
+            self.logger.warning(f"MySQL 연결 상태 확인 실패, 새 연결로 교체합니다: {e}")
+            self.reconnect_count += 1
+            self._discard(connection)
+            return self._create()
+
+    def _discard(self, connection):
+        """연결 닫기 (오류 무시)"""
+        try:
+            connection.close()
+        except Exception:
+            pass
+
+    def acquire(self, timeout: Optional[float] = None):
+        """연결 빌리기"""
+        timeout = self.timeout if timeout is None else timeout
+        deadline = time.monotonic() + timeout
+        with self._condition:
+            while not self._idle and self._in_use >= self.size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise PoolError(f"커넥션 풀의 모든 연결({self.size}개)이 사용 중입니다.")
+                self.wait_count += 1
+                self._condition.wait(remaining)
+            idle = self._idle.pop() if self._idle else None
+            self._in_use += 1
+
+        try:
+            if idle is None:
+                return self._create()
+            return self._ensure_alive(*idle)
+        except Exception:
+            with self._condition:
+                self._in_use -= 1
+                self._condition.notify()
+            raise
+
+    def release(self, connection, broken: bool = False):
+        """연결 반납 (broken이면 닫고 버림)"""
+        if not broken:
+            try:
+                if connection.in_transaction:
+                    connection.rollback()
+            except Error:
+                broken = True
+        if broken:
+            self._discard(connection)
+        with self._condition:
+            self._in_use -= 1
+            if not broken:
+                self._idle.append((connection, time.monotonic()))
+            self._condition.notify()
+
+    @contextmanager
+    def connection(self):
+        """연결을 빌렸다가 블록이 끝나면 반납하는 컨텍스트 매니저"""
+        connection = self.acquire()
+        broken = False
+        try:
+            yield connection
+        except (mysql.connector.errors.OperationalError, mysql.connector.errors.InterfaceError):
+            broken = True
+            raise
+        finally:
+            self.release(connection, broken)
+
+    @contextmanager
+    def cursor(self, dictionary: bool = False):
+        """커서를 열고 블록이 끝나면 커서를 닫고 연결을 반납하는 컨텍스트 매니저"""
+        with self.connection() as connection:
+            cursor = connection.cursor(dictionary=dictionary)
+            try:
+                yield cursor
+            finally:
+                cursor.close()
+
+    def close_all(self):
+        """쉬고 있는 연결 모두 닫기"""
+        with self._condition:
+            while self._idle:
+                self._discard(self._idle.pop()[0])
+
+    def get_stats(self) -> Dict[str, Any]:
+        """풀 상태 반환"""
+        with self._condition:
+            return {
+                'size': self.size,
+                'idle': len(self._idle),
+                'in_use': self._in_use,
+                'created': self.created_count,
+                'reconnects': self.reconnect_count,
+                'waits': self.wait_count
+            }
+
 class DatabaseConnection:
-    """MySQL 데이터베이스 연결 클래스"""
+    """
+    데이터베이스 연결 클래스
+
+    DB_BACKEND 설정에 따라 MySQL 커넥션 풀 또는 SQLite(WAL) 풀을 사용합니다.
+    두 풀은 같은 인터페이스를 제공하므로 db_cursor/pooled_connection을 쓰는 코드는 백엔드와 무관하게 동작합니다.
+    """
     
-    def __init__(self, host=None, port=None, database=None, user=None, password=None):
-        from config.settings import DB_HOST, DB_PORT, DB_NAME, DB_USER, DB_PASSWORD
+    def __init__(self, host=None, port=None, database=None, user=None, password=None, backend=None, sqlite_path=None):
+        from config.settings import (
+            DB_BACKEND, DB_HOST, DB_PORT, DB_NAME, DB_USER, DB_PASSWORD, DB_POOL_SIZE, DB_POOL_TIMEOUT,
+            DB_POOL_PING_INTERVAL, SQLITE_PATH, SQLITE_BUSY_TIMEOUT
+        )
         
+        self.backend = (backend or DB_BACKEND).lower()
         self.host = host or DB_HOST
         self.port = port or DB_PORT
         self.database = database or DB_NAME
         self.user = user or DB_USER
         self.password = password or DB_PASSWORD
+        self.sqlite_path = sqlite_path or SQLITE_PATH
         self.connection = None
+        if self.backend == 'sqlite':
+            from .sqlite_backend import SQLiteConnectionPool
+            self.pool = SQLiteConnectionPool(DB_POOL_SIZE, DB_POOL_TIMEOUT, self.sqlite_path, SQLITE_BUSY_TIMEOUT)
+        else:
+            self.pool = ConnectionPool(
+                DB_POOL_SIZE, DB_POOL_TIMEOUT, DB_POOL_PING_INTERVAL,
+                host=self.host, port=self.port, database=self.database, user=self.user, password=self.password
+            )
         self.logger = logging.getLogger(__name__)
     
     def connect(self) -> bool:
-        """데이터베이스 연결"""
+        """데이터베이스 연결 (기존 스크립트용 공유 연결)"""
+        if self.backend == 'sqlite':
+            try:
+                self.connection = self.pool._create()
+                self.logger.info(f"SQLite 데이터베이스 연결 성공: {self.sqlite_path}")
+                return True
+            except Error as e:
+                self.logger.error(f"SQLite 연결 오류: {e}")
+                return False
+        
         try:
             self.connection = mysql.connector.connect(
                 host=self.host,
@@ -49,16 +211,15 @@ class DatabaseConnection:
         """데이터베이스 연결 해제"""
         if self.connection and self.connection.is_connected():
             self.connection.close()
-            self.logger.info("MySQL 데이터베이스 연결 해제")
+            self.logger.info("데이터베이스 연결 해제")
+        self.pool.close_all()
     
     def create_tables(self):
         """거래 기록 테이블 생성"""
-        if not self.connection or not self.connection.is_connected():
-            if not self.connect():
-                return False
-        
+        connection = None
         try:
-            cursor = self.connection.cursor()
+            connection = self.pool.acquire()
+            cursor = connection.cursor()
             
             # 거래 기록 테이블
             create_trades_table = """
@@ -207,7 +368,7 @@ class DatabaseConnection:
             cursor.execute(create_learning_insights_table)
             cursor.execute(create_strategy_improvements_table)
             
-            self.connection.commit()
+            connection.commit()
             cursor.close()
             
             self.logger.info("데이터베이스 테이블 생성 완료")
@@ -216,9 +377,12 @@ class DatabaseConnection:
         except Error as e:
             self.logger.error(f"테이블 생성 오류: {e}")
             return False
+        finally:
+            if connection:
+                self.pool.release(connection)
     
     def get_connection(self):
-        """데이터베이스 연결 객체 반환"""
+        """데이터베이스 연결 객체 반환 (기존 스크립트용 단일 공유 연결, 새 코드는 db_cursor 사용)"""
         if not self.connection or not self.connection.is_connected():
             self.connect()
         return self.connection
@@ -227,9 +391,34 @@ class DatabaseConnection:
 db_connection = DatabaseConnection()
 
 def get_db_connection():
-    """데이터베이스 연결 객체 반환"""
+    """데이터베이스 연결 객체 반환 (기존 스크립트용 단일 공유 연결)"""
     return db_connection.get_connection()
 
+def pooled_connection():
+    """커넥션 풀에서 연결 빌리기 (with 문으로 사용, 블록이 끝나면 반납)"""
+    return db_connection.pool.connection()
+
+def db_cursor(dictionary: bool = False):
+    """커넥션 풀 연결의 커서 (with 문으로 사용, 블록이 끝나면 커서 닫고 연결 반납)"""
+    return db_connection.pool.cursor(dictionary=dictionary)
+
+def get_backend() -> str:
+    """사용 중인 저장소 백엔드 이름 ('mysql' 또는 'sqlite')"""
+    return db_connection.backend
+
+def get_pool_stats() -> Dict[str, Any]:
+    """커넥션 풀 상태 반환"""
+    return db_connection.pool.get_stats()
+
 def init_database():
-    """데이터베이스 초기화"""
-    return db_connection.create_tables()
+    """
+    데이터베이스 초기화 (테이블 생성, 스키마 마이그레이션, 스냅샷 저장소/거래 롤업 준비)
+
+    월 파티션 변환은 테이블을 다시 쓰므로 여기서 하지 않습니다 (`python -m database.retention partition`).
+    """
+    if not db_connection.create_tables():
+        return False
+    from .migrations import apply_migrations
+    from .rollups import trade_rollups
+    from .snapshot_store import snapshot_store
+    return apply_migrations() and snapshot_store.ensure_table() and trade_rollups.ensure_backfilled()
@@ -0,0 +1,154 @@
+"""
+스키마 마이그레이션 모듈
+버전별 인덱스/컬럼 추가 작업을 순서대로 적용하고 적용된 스키마 버전을 schema_migrations 테이블에 기록합니다.
+"""
+
+import logging
+from typing import List, Tuple, Dict, Any, Union
+from mysql.connector import Error
+from .connection import db_cursor, get_backend
+
+logger = logging.getLogger(__name__)
+
+# (버전, 설명, [작업])
+# 작업은 (테이블, 인덱스명, 컬럼 목록 튜플) 또는 (테이블, 컬럼명, 컬럼 정의 문자열)
+# 인덱스는 조회 경로의 WHERE/ORDER BY/GROUP BY 컬럼 기준, 동등 조건 컬럼을 앞에 두는 복합 인덱스
+MIGRATIONS: List[Tuple[int, str, List[Tuple[str, str, Union[Tuple[str, ...], str]]]]] = [
+    (1, "거래/시장 데이터/로그 조회용 인덱스", [
+        ('trades', 'idx_trades_timestamp', ('timestamp',)),
+        ('trades', 'idx_trades_created_at', ('created_at',)),
+        ('trades', 'idx_trades_action_timestamp', ('action', 'timestamp')),
+        ('trades', 'idx_trades_timestamp_decision', ('timestamp', 'decision')),
+        ('market_data', 'idx_market_data_timestamp', ('timestamp',)),
+        ('market_data', 'idx_market_data_created_at', ('created_at',)),
+        ('system_logs', 'idx_system_logs_timestamp', ('timestamp',)),
+        ('system_logs', 'idx_system_logs_level_timestamp', ('level', 'timestamp')),
+    ]),
+    (2, "반성/성과 지표 조회용 인덱스", [
+        ('trading_reflections', 'idx_reflections_created_at', ('created_at',)),
+        ('trading_reflections', 'idx_reflections_type_created_at', ('reflection_type', 'created_at')),
+        ('performance_metrics', 'idx_metrics_period_start', ('period_start',)),
+        ('performance_metrics', 'idx_metrics_type_period_start', ('period_type', 'period_start')),
+    ]),
+    (3, "학습 인사이트/전략 개선 조회용 인덱스", [
+        ('learning_insights', 'idx_insights_created_at', ('created_at',)),
+        ('learning_insights', 'idx_insights_type_created_at', ('insight_type', 'created_at')),
+        ('strategy_improvements', 'idx_improvements_created_at', ('created_at',)),
+        ('strategy_improvements', 'idx_improvements_status_created_at', ('status', 'created_at')),
+    ]),
+    (4, "거래 시장 데이터 스냅샷 참조 컬럼", [
+        ('trades', 'market_snapshot_hash', "CHAR(64) NULL AFTER market_data"),
+    ]),
+]
+
+LATEST_SCHEMA_VERSION = MIGRATIONS[-1][0]
+
+def index_exists(cursor, table: str, index_name: str) -> bool:
+    """인덱스 존재 여부 확인 (MySQL은 CREATE INDEX IF NOT EXISTS를 지원하지 않음)"""
+    if get_backend() == 'sqlite':
+        cursor.execute("SELECT COUNT(*) FROM sqlite_master WHERE type = 'index' AND tbl_name = %s AND name = %s",
+                       (table, index_name))
+        return cursor.fetchone()[0] > 0
+    cursor.execute("""
+        SELECT COUNT(*) FROM information_schema.statistics
+        WHERE table_schema = DATABASE() AND table_name = %s AND index_name = %s
+    """, (table, index_name))
+    return cursor.fetchone()[0] > 0
+
+def add_index(cursor, table: str, index_name: str, columns: Tuple[str, ...]) -> bool:
+    """인덱스가 없으면 추가 (추가했으면 True)"""
+    if index_exists(cursor, table, index_name):
+        return False
+    column_list = ", ".join(f"`{column}`" for column in columns)
+    if get_backend() == 'sqlite':
+        cursor.execute(f"CREATE INDEX `{index_name}` ON `{table}` ({column_list})")
+    else:
+        cursor.execute(f"ALTER TABLE `{table}` ADD INDEX `{index_name}` ({column_list})")
+    return True
+
+def column_exists(cursor, table: str, column: str) -> bool:
+    """컬럼 존재 여부 확인"""
+    if get_backend() == 'sqlite':
+        cursor.execute("SELECT COUNT(*) FROM pragma_table_info(%s) WHERE name = %s", (table, column))
+        return cursor.fetchone()[0] > 0
+    cursor.execute("""
+        SELECT COUNT(*) FROM information_schema.columns
+        WHERE table_schema = DATABASE() AND table_name = %s AND column_name = %s
+    """, (table, column))
+    return cursor.fetchone()[0] > 0
+
+def add_column(cursor, table: str, column: str, definition: str) -> bool:
+    """컬럼이 없으면 추가 (추가했으면 True)"""
+    if column_exists(cursor, table, column):
+        return False
+    cursor.execute(f"ALTER TABLE `{table}` ADD COLUMN `{column}` {definition}")
+    return True
+
+def apply_step(cursor, table: str, name: str, spec: Union[Tuple[str, ...], str]) -> bool:
+    """마이그레이션 작업 1개 적용 (컬럼 정의 문자열이면 컬럼, 튜플이면 인덱스 추가)"""
+    if isinstance(spec, str):
+        return add_column(cursor, table, name, spec)
+    return add_index(cursor, table, name, spec)
+
+def ensure_migrations_table(cursor):
+    """스키마 버전 기록 테이블 생성"""
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS schema_migrations (
+            version INT PRIMARY KEY,
+            description VARCHAR(200) NOT NULL,
+            applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
+    """)
+
+def get_schema_version() -> int:
+    """적용된 최신 스키마 버전 조회 (없으면 0)"""
+    try:
+        with db_cursor() as cursor:
+            ensure_migrations_table(cursor)
+            cursor.execute("SELECT MAX(version) FROM schema_migrations")
+            return cursor.fetchone()[0] or 0
+    except Error as e:
+        logger.error(f"스키마 버전 조회 오류: {e}")
+        return 0
+
+def apply_migrations(target_version: int = LATEST_SCHEMA_VERSION) -> bool:
+    """
+    아직 적용되지 않은 마이그레이션을 버전 순서대로 적용
+
+    인덱스/컬럼 추가는 존재 여부를 먼저 확인하므로, 중간에 실패한 버전을 다시 실행해도 안전합니다.
+
+    Args:
+        target_version: 이 버전까지 적용
+
+    Returns:
+        성공 여부
+    """
+    try:
+        with db_cursor() as cursor:
+            ensure_migrations_table(cursor)
+            cursor.execute("SELECT version FROM schema_migrations")
+            applied = {row[0] for row in cursor.fetchall()}
+
+            for version, description, steps in MIGRATIONS:
+                if version in applied or version > target_version:
+                    continue
+                added = [name for table, name, spec in steps if apply_step(cursor, table, name, spec)]
+                cursor.execute(
+                    "INSERT INTO schema_migrations (version, description) VALUES (%s, %s)",
+                    (version, description)
+                )
+                logger.info(f"스키마 마이그레이션 v{version} 적용 완료: {description} (변경 {len(added)}개)")
+        return True
+
+    except Error as e:
+        logger.error(f"스키마 마이그레이션 오류: {e}")
+        return False
+
+def get_migration_status() -> Dict[str, Any]:
+    """마이그레이션 적용 상태 반환"""
+    current = get_schema_version()
+    return {
+        'current_version': current,
+        'latest_version': LATEST_SCHEMA_VERSION,
+        'pending': [version for version, _, _ in MIGRATIONS if version > current]
+    }
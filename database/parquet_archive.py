@@ -0,0 +1,363 @@
+"""
+Parquet 분석 아카이브 모듈
+OHLCV 캔들(기술적 지표 포함)과 AI 매매 결정/체결 기록을 컬럼 형식(Parquet) 파일로 증분 저장합니다.
+
+파일 구조: {base_dir}/{dataset}/symbol={심볼}/date={YYYY-MM-DD}/part-*.parquet (Hive 파티션)
+- candles_{interval}: 마감된 캔들과 지표 (timestamp 기준 증분)
+- trades: 매매 결정(decision/confidence/reasoning)과 체결 결과 (id 기준 증분)
+
+조회 시 심볼/날짜 파티션과 timestamp 조건을 pyarrow에 넘겨 필요한 파일과 행 그룹만 읽고(predicate pushdown),
+요청한 컬럼만 읽습니다. 라이브 DB에 부하를 주지 않고 몇 달치 기록을 백테스트/회고에 사용할 수 있습니다.
+"""
+
+import os
+import json
+import glob
+import logging
+import pandas as pd
+from decimal import Decimal
+from datetime import datetime, date
+from typing import Dict, Any, Optional, Sequence
+from mysql.connector import Error
+from .streaming import stream_query
+from config.settings import (
+    TRADING_SYMBOL, MINUTE_DATA_COUNT, CANDLE_STORE_ENABLED, STREAM_CHUNK_SIZE,
+    PARQUET_ARCHIVE_ENABLED, PARQUET_ARCHIVE_DIR, PARQUET_ARCHIVE_INTERVAL_MINUTES, PARQUET_COMPRESSION
+)
+
+try:
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+    import pyarrow.parquet as pq
+except ImportError:  # pyarrow는 선택 의존성 (없으면 아카이브 비활성화)
+    pa = ds = pq = None
+
+logger = logging.getLogger(__name__)
+
+# 아카이브에 저장할 trades 컬럼 (market_data 본문은 스냅샷 저장소에 있으므로 해시만 저장)
+TRADE_ARCHIVE_COLUMNS = (
+    'id', 'timestamp', 'decision', 'confidence', 'reasoning', 'action', 'price', 'amount', 'total_value',
+    'fee', 'balance_krw', 'balance_btc', 'order_id', 'status', 'market_snapshot_hash'
+)
+
+# 증분 저장 위치(워터마크) 파일
+STATE_FILE = "_state.json"
+
+# 하루치 파일을 하나로 합칠 때 쓰는 임시 파일 (.writing: 작성 중, .merged: 작성 완료)
+WRITING_SUFFIX = ".writing"
+MERGED_SUFFIX = ".merged"
+COMPACTED_NAME = "part-day.parquet"
+
+def _require_pyarrow():
+    if pa is None:
+        raise RuntimeError("Parquet 아카이브를 사용하려면 pyarrow를 설치해주세요 (pip install pyarrow)")
+
+def _partitioning():
+    """symbol/date Hive 파티션 (날짜는 문자열로 비교)"""
+    return ds.partitioning(pa.schema([('symbol', pa.string()), ('date', pa.string())]), flavor='hive')
+
+def to_arrow_table(frame: pd.DataFrame) -> 'pa.Table':
+    """
+    DataFrame을 파일마다 같은 타입이 되도록 변환
+
+    MySQL DECIMAL은 float64, 시각은 timestamp[us]로 통일해 파일 간 스키마가 달라지지 않게 합니다.
+    """
+    frame = frame.copy()
+    for column in frame.columns:
+        series = frame[column]
+        if pd.api.types.is_datetime64_any_dtype(series):
+            frame[column] = series.astype('datetime64[us]')
+        elif series.dtype == object:
+            sample = series.dropna()
+            if not sample.empty and isinstance(sample.iloc[0], Decimal):
+                frame[column] = series.astype(float)
+            elif not sample.empty and isinstance(sample.iloc[0], datetime):
+                frame[column] = pd.to_datetime(series).astype('datetime64[us]')
+    return pa.Table.from_pandas(frame, preserve_index=False)
+
+def _part_name(first_value: Any) -> str:
+    """
+    첫 행의 키로 파일 이름 생성
+
+    같은 워터마크 이후를 다시 저장하면 같은 이름이 되어 덮어쓰므로,
+    파일 저장 후 워터마크 기록 전에 중단되어도 중복 행이 생기지 않습니다.
+    """
+    if isinstance(first_value, (datetime, pd.Timestamp)):
+        return f"part-{first_value:%H%M%S%f}.parquet"
+    return f"part-{int(first_value):012d}.parquet"
+
+class ParquetArchive:
+    """Parquet 분석 아카이브 (증분 저장, 일 단위 파일 병합, 파티션/컬럼 선택 조회)"""
+
+    def __init__(self, base_dir: str = PARQUET_ARCHIVE_DIR, compression: str = PARQUET_COMPRESSION):
+        self.base_dir = base_dir
+        self.compression = compression
+        self.last_archived: Optional[datetime] = None
+        self.logger = logging.getLogger(__name__)
+
+    def _state_path(self) -> str:
+        return os.path.join(self.base_dir, STATE_FILE)
+
+    def _load_state(self) -> Dict[str, Dict[str, Any]]:
+        try:
+            with open(self._state_path(), "r", encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+
+    def _save_state(self, state: Dict[str, Dict[str, Any]]):
+        os.makedirs(self.base_dir, exist_ok=True)
+        temp_path = self._state_path() + ".tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump(state, f, ensure_ascii=False, indent=2, sort_keys=True)
+        os.replace(temp_path, self._state_path())
+
+    def get_watermark(self, dataset: str, symbol: str) -> Any:
+        """마지막으로 저장한 키 값 (timestamp는 pd.Timestamp, id는 int, 없으면 None)"""
+        value = self._load_state().get(dataset, {}).get(symbol)
+        if isinstance(value, str):
+            return pd.Timestamp(value)
+        return value
+
+    def _set_watermark(self, dataset: str, symbol: str, value: Any):
+        state = self._load_state()
+        if isinstance(value, (datetime, pd.Timestamp)):
+            value = pd.Timestamp(value).isoformat()
+        else:
+            value = int(value)
+        state.setdefault(dataset, {})[symbol] = value
+        self._save_state(state)
+
+    def _partition_dir(self, dataset: str, symbol: str, day: str) -> str:
+        return os.path.join(self.base_dir, dataset, f"symbol={symbol}", f"date={day}")
+
+    def append(self, dataset: str, symbol: str, frame: pd.DataFrame, key: str = 'timestamp') -> int:
+        """
+        워터마크 이후의 행만 날짜별 파일로 추가 저장
+
+        Args:
+            dataset: 데이터셋 이름 (디렉토리)
+            symbol: 심볼 (파티션)
+            frame: 'timestamp' 컬럼이 있는 DataFrame
+            key: 증분 기준 컬럼 (단조 증가해야 함)
+
+        Returns:
+            저장한 행 수
+        """
+        _require_pyarrow()
+        if frame is None or frame.empty:
+            return 0
+        watermark = self.get_watermark(dataset, symbol)
+        frame = frame.sort_values(key)
+        if watermark is not None:
+            frame = frame[frame[key] > watermark]
+        if frame.empty:
+            return 0
+
+        days = pd.to_datetime(frame['timestamp']).dt.strftime('%Y-%m-%d')
+        for day, rows in frame.groupby(days, sort=True):
+            directory = self._partition_dir(dataset, symbol, day)
+            os.makedirs(directory, exist_ok=True)
+            path = os.path.join(directory, _part_name(rows[key].iloc[0]))
+            temp_path = path + WRITING_SUFFIX
+            pq.write_table(to_arrow_table(rows), temp_path, compression=self.compression)
+            os.replace(temp_path, path)
+
+        self._set_watermark(dataset, symbol, frame[key].iloc[-1])
+        return len(frame)
+
+    def archive_candles(self, candles: pd.DataFrame, symbol: str = TRADING_SYMBOL,
+                        interval: str = "minute1") -> int:
+        """
+        기술적 지표가 계산된 캔들 저장 (DatetimeIndex 기준)
+
+        마지막 캔들은 아직 마감되지 않았을 수 있으므로 저장하지 않고 다음 실행에서 저장합니다.
+        """
+        if candles is None or len(candles) < 2:
+            return 0
+        frame = candles.iloc[:-1].rename_axis('timestamp').reset_index()
+        return self.append(f"candles_{interval}", symbol, frame)
+
+    def archive_trades(self, symbol: str = TRADING_SYMBOL, chunk_size: int = STREAM_CHUNK_SIZE) -> int:
+        """마지막 저장 이후의 거래(매매 결정 + 체결 결과)를 id 순서대로 스트리밍해 저장"""
+        _require_pyarrow()
+        watermark = self.get_watermark('trades', symbol) or 0
+        query = f"SELECT {', '.join(TRADE_ARCHIVE_COLUMNS)} FROM trades WHERE id > %s ORDER BY id ASC"
+        total = 0
+        for rows in stream_query(query, (watermark,), chunk_size):
+            total += self.append('trades', symbol, pd.DataFrame(rows, columns=TRADE_ARCHIVE_COLUMNS), key='id')
+        return total
+
+    def _compact_partition(self, directory: str) -> bool:
+        """날짜 파티션의 파일들을 하나로 병합 (중단되면 다음 실행에서 이어서 처리)"""
+        target = os.path.join(directory, COMPACTED_NAME)
+        merged_path = target + MERGED_SUFFIX
+        parts = sorted(glob.glob(os.path.join(directory, "*.parquet")))
+
+        if not os.path.exists(merged_path):
+            if len(parts) < 2:
+                return False
+            table = pa.concat_tables([pq.read_table(part) for part in parts], promote_options='permissive')
+            table = table.sort_by('timestamp')
+            pq.write_table(table, target + WRITING_SUFFIX, compression=self.compression)
+            os.replace(target + WRITING_SUFFIX, merged_path)
+
+        # 병합 파일이 완성된 뒤에만 원본을 지우므로 중간에 중단되어도 행이 사라지지 않음
+        for part in parts:
+            os.remove(part)
+        os.replace(merged_path, target)
+        return True
+
+    def compact(self, today: Optional[date] = None) -> int:
+        """오늘 이전 날짜 파티션의 파일을 하루 한 개로 병합 (병합한 파티션 수 반환)"""
+        _require_pyarrow()
+        today = (today or datetime.now().date()).isoformat()
+        compacted = 0
+        for directory in sorted(glob.glob(os.path.join(self.base_dir, "*", "symbol=*", "date=*"))):
+            day = os.path.basename(directory)[len("date="):]
+            if day >= today:
+                continue
+            for leftover in glob.glob(os.path.join(directory, "*" + WRITING_SUFFIX)):
+                os.remove(leftover)
+            try:
+                if self._compact_partition(directory):
+                    compacted += 1
+            except (OSError, pa.ArrowException) as e:
+                self.logger.error(f"Parquet 파티션 병합 오류 ({directory}): {e}")
+        return compacted
+
+    def load(self, dataset: str, symbol: Optional[str] = TRADING_SYMBOL, start: Optional[datetime] = None,
+             end: Optional[datetime] = None, columns: Optional[Sequence[str]] = None) -> pd.DataFrame:
+        """
+        아카이브 조회
+
+        Args:
+            dataset: 데이터셋 이름 (예: 'candles_minute1', 'trades')
+            symbol: 심볼 (None이면 전체)
+            start: 시작 시각 (포함)
+            end: 종료 시각 (포함)
+            columns: 읽을 컬럼 (None이면 전체, 'symbol'/'date' 파티션 컬럼도 지정 가능)
+
+        Returns:
+            timestamp 순으로 정렬된 DataFrame (데이터가 없으면 빈 DataFrame)
+        """
+        _require_pyarrow()
+        path = os.path.join(self.base_dir, dataset)
+
+        # 파티션 조건으로 읽을 파일을 먼저 고르고, timestamp 조건은 행 그룹 통계로 건너뜀
+        partition_filter = None
+        row_filter = None
+        conditions = []
+        if symbol is not None:
+            conditions.append(ds.field('symbol') == symbol)
+        if start is not None:
+            conditions.append(ds.field('date') >= start.strftime('%Y-%m-%d'))
+            row_filter = ds.field('timestamp') >= pa.scalar(start, pa.timestamp('us'))
+        if end is not None:
+            conditions.append(ds.field('date') <= end.strftime('%Y-%m-%d'))
+            upper = ds.field('timestamp') <= pa.scalar(end, pa.timestamp('us'))
+            row_filter = upper if row_filter is None else row_filter & upper
+        for condition in conditions:
+            partition_filter = condition if partition_filter is None else partition_filter & condition
+
+        # 작성 중인 임시 파일(.writing/.merged)은 제외
+        files = sorted(glob.glob(os.path.join(path, "symbol=*", "date=*", "*.parquet")))
+        if not files:
+            return pd.DataFrame(columns=list(columns or []))
+        dataset_files = ds.dataset(files, format='parquet', partitioning=_partitioning(), partition_base_dir=path)
+        fragments = list(dataset_files.get_fragments(filter=partition_filter))
+        if not fragments:
+            return pd.DataFrame(columns=list(columns or []))
+
+        # 지표 컬럼이 추가된 경우 등 파일마다 다른 스키마를 합침 (없는 컬럼은 null)
+        schema = pa.unify_schemas([fragment.physical_schema for fragment in fragments] +
+                                  [_partitioning().schema], promote_options='permissive')
+        dataset_files = ds.dataset([fragment.path for fragment in fragments], schema=schema, format='parquet',
+                                   partitioning=_partitioning(), partition_base_dir=path)
+        if columns is not None and 'timestamp' not in columns:
+            read_columns = list(columns) + ['timestamp']
+        else:
+            read_columns = list(columns) if columns is not None else None
+        table = dataset_files.to_table(columns=read_columns, filter=row_filter).sort_by('timestamp')
+
+        frame = table.to_pandas()
+        if columns is not None:
+            frame = frame[list(columns)]
+        return frame.reset_index(drop=True)
+
+    def archive(self, candles: Optional[pd.DataFrame] = None, symbol: str = TRADING_SYMBOL,
+                interval: str = "minute1", now: Optional[datetime] = None) -> Dict[str, int]:
+        """
+        캔들/거래 증분 저장 후 지난 날짜 파티션 병합
+
+        Args:
+            candles: 저장할 캔들 (None이면 캔들 저장소의 분봉으로 지표를 계산해 저장)
+
+        Returns:
+            데이터셋별 저장한 행 수와 병합한 파티션 수
+        """
+        _require_pyarrow()
+        now = now or datetime.now()
+        result = {}
+        if candles is None and CANDLE_STORE_ENABLED:
+            candles = self._stored_candles(symbol, interval)
+        try:
+            result[f"candles_{interval}"] = self.archive_candles(candles, symbol, interval)
+        except (OSError, pa.ArrowException, ValueError) as e:
+            self.logger.error(f"캔들 아카이브 오류: {e}")
+        try:
+            result['trades'] = self.archive_trades(symbol)
+        except (Error, OSError, pa.ArrowException) as e:
+            self.logger.error(f"거래 아카이브 오류: {e}")
+        result['compacted'] = self.compact(now.date())
+        self.last_archived = now
+        return result
+
+    def _stored_candles(self, symbol: str, interval: str) -> Optional[pd.DataFrame]:
+        """캔들 저장소에 있는 캔들에 기술적 지표를 계산해 반환 (API 호출 없음)"""
+        from data.candle_store import get_candle_store
+        from analysis.technical_indicators import calculate_technical_indicators
+
+        candles = get_candle_store(symbol, interval, MINUTE_DATA_COUNT).candles
+        if candles is None or candles.empty:
+            return None
+        return calculate_technical_indicators(candles.copy(), stream_name=f"archive_{symbol}_{interval}")
+
+    def archive_if_due(self, now: Optional[datetime] = None) -> Optional[Dict[str, int]]:
+        """마지막 저장 후 PARQUET_ARCHIVE_INTERVAL_MINUTES가 지났으면 아카이브 실행 (실행하지 않으면 None)"""
+        now = now or datetime.now()
+        if not PARQUET_ARCHIVE_ENABLED or pa is None:
+            return None
+        if self.last_archived and (now - self.last_archived).total_seconds() < PARQUET_ARCHIVE_INTERVAL_MINUTES * 60:
+            return None
+        return self.archive(now=now)
+
+    def get_status(self) -> Dict[str, Any]:
+        """데이터셋별 파일 수, 크기, 워터마크"""
+        status = {}
+        state = self._load_state()
+        for path in sorted(glob.glob(os.path.join(self.base_dir, "*", ""))):
+            dataset = os.path.basename(os.path.dirname(path))
+            files = glob.glob(os.path.join(path, "symbol=*", "date=*", "*.parquet"))
+            status[dataset] = {
+                'files': len(files),
+                'size_bytes': sum(os.path.getsize(file) for file in files),
+                'watermarks': state.get(dataset, {})
+            }
+        return status
+
+# 전역 Parquet 아카이브 인스턴스
+parquet_archive = ParquetArchive()
+
+def archive_to_parquet_if_due() -> Optional[Dict[str, int]]:
+    """주기가 되었으면 캔들/거래를 Parquet 아카이브에 저장 (편의 함수)"""
+    return parquet_archive.archive_if_due()
+
+def load_archive(dataset: str, symbol: Optional[str] = TRADING_SYMBOL, start: Optional[datetime] = None,
+                 end: Optional[datetime] = None, columns: Optional[Sequence[str]] = None) -> pd.DataFrame:
+    """Parquet 아카이브 조회 (편의 함수)"""
+    return parquet_archive.load(dataset, symbol, start, end, columns)
+
+def get_archive_status() -> Dict[str, Any]:
+    """Parquet 아카이브 상태 조회 (편의 함수)"""
+    return parquet_archive.get_status()
@@ -0,0 +1,362 @@
+"""
+데이터 보존 정책 모듈
+trades/market_data/system_logs 테이블을 timestamp 기준 월 단위 RANGE 파티션으로 나누고,
+보존 기간이 지난 파티션은 압축 파일(JSONL.gz)로 보관한 뒤 삭제합니다.
+
+timestamp 범위 조건이 있는 조회는 MySQL이 해당 월 파티션만 읽습니다 (파티션 프루닝).
+SQLite 백엔드나 파티션으로 변환하지 않은 테이블은 같은 월 단위로 보관한 뒤 DELETE로 삭제합니다.
+
+파티션 변환은 테이블 전체를 다시 쓰고 기본 키를 (id, timestamp)로 바꾸므로 자동으로 실행하지 않습니다.
+보존 기간이 설정된 테이블만 명시적으로 변환합니다:
+
+    python -m database.retention partition
+
+파티션 테이블은 외래 키를 가질 수 없으므로 trades를 변환하면 trading_reflections → trades 외래 키가
+제거되고, trades 파티션을 삭제할 때 해당 거래의 반성 기록을 먼저 지웁니다 (ON DELETE CASCADE 대체).
+trades는 기본적으로 영구 보존(RETENTION_MONTHS['trades'] = None)이므로 변환하지 않습니다.
+"""
+
+import os
+import gzip
+import logging
+from datetime import datetime
+from typing import Dict, Any, List, Optional, Tuple
+from mysql.connector import Error
+from .connection import db_cursor, get_backend
+from .streaming import stream_query
+from utils.json_serializer import dumps_bytes
+from config.settings import (
+    RETENTION_ENABLED, RETENTION_MONTHS, RETENTION_ARCHIVE, RETENTION_ARCHIVE_DIR, RETENTION_FUTURE_MONTHS,
+    RETENTION_INTERVAL_HOURS
+)
+
+logger = logging.getLogger(__name__)
+
+# 파티션 대상 테이블
+PARTITIONED_TABLES = ('trades', 'market_data', 'system_logs')
+
+# 미리 만든 월 파티션 이후의 행을 받는 파티션
+FUTURE_PARTITION = 'p_future'
+
+def month_start(timestamp: datetime) -> datetime:
+    """해당 월의 시작 시각"""
+    return timestamp.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+
+def add_months(month: datetime, months: int) -> datetime:
+    """월 시작 시각에 개월 수 더하기"""
+    years, month_index = divmod(month.month - 1 + months, 12)
+    return month.replace(year=month.year + years, month=month_index + 1)
+
+def partition_name(month: datetime) -> str:
+    """월 파티션 이름 (예: p202405)"""
+    return f"p{month:%Y%m}"
+
+def partition_month(name: str) -> Optional[datetime]:
+    """월 파티션 이름에서 월 시작 시각 (p_future 등은 None)"""
+    try:
+        return datetime.strptime(name, "p%Y%m")
+    except ValueError:
+        return None
+
+def partition_definitions(months: List[datetime]) -> str:
+    """월 파티션 정의 목록 (마지막에 MAXVALUE 파티션 포함)"""
+    definitions = [f"PARTITION {partition_name(month)} VALUES LESS THAN ('{add_months(month, 1):%Y-%m-%d}')"
+                   for month in months]
+    definitions.append(f"PARTITION {FUTURE_PARTITION} VALUES LESS THAN (MAXVALUE)")
+    return ", ".join(definitions)
+
+def month_range(first: datetime, last: datetime) -> List[datetime]:
+    """first부터 last까지 월 시작 시각 목록"""
+    months, month = [], month_start(first)
+    while month <= last:
+        months.append(month)
+        month = add_months(month, 1)
+    return months
+
+def expired_partitions(names: List[str], now: datetime, retention_months: int) -> List[str]:
+    """보존 기간이 지난 월 파티션 (파티션의 마지막 날이 기준 월 이전이면 만료)"""
+    cutoff = add_months(month_start(now), -retention_months)
+    expired = []
+    for name in names:
+        month = partition_month(name)
+        if month is not None and add_months(month, 1) <= cutoff:
+            expired.append(name)
+    return expired
+
+class RetentionManager:
+    """파티션 관리/보존 정책 적용 클래스"""
+
+    def __init__(self, retention_months: Optional[Dict[str, Optional[int]]] = None,
+                 archive: bool = RETENTION_ARCHIVE, archive_dir: str = RETENTION_ARCHIVE_DIR,
+                 future_months: int = RETENTION_FUTURE_MONTHS):
+        self.logger = logging.getLogger(__name__)
+        self.retention_months = RETENTION_MONTHS if retention_months is None else retention_months
+        self.archive = archive
+        self.archive_dir = archive_dir
+        self.future_months = future_months
+        self.last_applied: Optional[datetime] = None
+
+    def get_partitions(self, cursor, table: str) -> List[str]:
+        """테이블 파티션 이름 목록 (파티션되지 않은 테이블은 빈 리스트)"""
+        cursor.execute("""
+            SELECT partition_name FROM information_schema.partitions
+            WHERE table_schema = DATABASE() AND table_name = %s AND partition_name IS NOT NULL
+            ORDER BY partition_ordinal_position
+        """, (table,))
+        return [row[0] for row in cursor.fetchall()]
+
+    def _drop_foreign_keys(self, cursor, table: str):
+        """테이블을 참조하는 외래 키 제거 (파티션 테이블은 외래 키를 지원하지 않음)"""
+        cursor.execute("""
+            SELECT table_name, constraint_name FROM information_schema.referential_constraints
+            WHERE constraint_schema = DATABASE() AND (referenced_table_name = %s OR table_name = %s)
+        """, (table, table))
+        for child_table, constraint in cursor.fetchall():
+            cursor.execute(f"ALTER TABLE `{child_table}` DROP FOREIGN KEY `{constraint}`")
+            self.logger.info(f"외래 키 제거: {child_table}.{constraint}")
+
+    def ensure_partitioned(self, table: str, now: Optional[datetime] = None) -> bool:
+        """
+        테이블을 월 단위 파티션으로 변환 (이미 파티션되어 있으면 그대로)
+
+        기존 행이 있는 가장 오래된 월부터 현재 + future_months개월까지 파티션을 만듭니다.
+        첫 파티션에는 그 이전 시각의 행도 들어갑니다. 큰 테이블은 변환 시 테이블 전체를 다시 씁니다.
+        """
+        now = now or datetime.now()
+        try:
+            with db_cursor() as cursor:
+                if self.get_partitions(cursor, table):
+                    return True
+                cursor.execute(f"SELECT MIN(timestamp) FROM `{table}`")
+                oldest = cursor.fetchone()[0] or now
+                months = month_range(oldest, add_months(month_start(now), self.future_months))
+
+                self._drop_foreign_keys(cursor, table)
+                # 파티션 키는 모든 고유 키에 포함되어야 함
+                cursor.execute(f"ALTER TABLE `{table}` DROP PRIMARY KEY, ADD PRIMARY KEY (id, timestamp)")
+                cursor.execute(f"ALTER TABLE `{table}` PARTITION BY RANGE COLUMNS(timestamp) "
+                               f"({partition_definitions(months)})")
+            self.logger.info(f"{table} 월 단위 파티션 변환 완료: {len(months)}개")
+            return True
+        except Error as e:
+            self.logger.error(f"{table} 파티션 변환 오류: {e}")
+            return False
+
+    def add_future_partitions(self, table: str, now: Optional[datetime] = None) -> int:
+        """현재 + future_months개월까지 월 파티션을 미리 추가 (추가한 개수 반환)"""
+        now = now or datetime.now()
+        try:
+            with db_cursor() as cursor:
+                months = [partition_month(name) for name in self.get_partitions(cursor, table)]
+                months = [month for month in months if month is not None]
+                if not months:
+                    return 0
+                new_months = month_range(add_months(max(months), 1),
+                                         add_months(month_start(now), self.future_months))
+                if not new_months:
+                    return 0
+                cursor.execute(f"ALTER TABLE `{table}` REORGANIZE PARTITION {FUTURE_PARTITION} "
+                               f"INTO ({partition_definitions(new_months)})")
+            self.logger.info(f"{table} 파티션 {len(new_months)}개 추가")
+            return len(new_months)
+        except Error as e:
+            self.logger.error(f"{table} 파티션 추가 오류: {e}")
+            return 0
+
+    def _partitioned(self, table: str) -> bool:
+        """테이블이 월 파티션으로 나뉘어 있는지 (SQLite나 변환하지 않은 테이블은 월 범위 DELETE로 대체)"""
+        if get_backend() == 'sqlite':
+            return False
+        with db_cursor() as cursor:
+            return bool(self.get_partitions(cursor, table))
+
+    def partition_targets(self) -> List[str]:
+        """파티션으로 변환할 테이블 (보존 기간이 설정된 테이블만, None이면 영구 보존이므로 제외)"""
+        return [table for table in PARTITIONED_TABLES if self.retention_months.get(table)]
+
+    def _partition_filter(self, table: str, name: str, partitioned: bool) -> Tuple[str, tuple]:
+        """파티션 행을 고르는 FROM 뒤 구문과 파라미터"""
+        if partitioned:
+            return f"PARTITION (`{name}`)", ()
+        # 오래된 월부터 차례로 삭제하므로 월 상한 이전의 행이 곧 해당 월의 행
+        return "WHERE timestamp < %s", (add_months(partition_month(name), 1),)
+
+    def _expired(self, table: str, now: datetime, months: int) -> List[str]:
+        """보존 기간이 지난 월 (파티션 이름 형식)"""
+        with db_cursor() as cursor:
+            if get_backend() != 'sqlite':
+                partitions = self.get_partitions(cursor, table)
+                if partitions:
+                    return expired_partitions(partitions, now, months)
+            cursor.execute(f"SELECT MIN(timestamp) FROM `{table}`")
+            oldest = cursor.fetchone()[0]
+        if oldest is None:
+            return []
+        if isinstance(oldest, str):
+            oldest = datetime.fromisoformat(oldest)
+        names = [partition_name(month) for month in month_range(oldest, month_start(now))]
+        return expired_partitions(names, now, months)
+
+    def archive_partition(self, table: str, name: str, partitioned: Optional[bool] = None) -> Optional[str]:
+        """
+        파티션의 행을 gzip 압축 JSONL 파일로 보관
+
+        Returns:
+            보관 파일 경로 (빈 파티션이면 None). 쓰기 실패 시 예외가 발생하며 임시 파일은 남기지 않습니다.
+        """
+        path = os.path.join(self.archive_dir, table, f"{table}_{name[1:]}.jsonl.gz")
+        temp_path = path + ".tmp"
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        rows = 0
+        if partitioned is None:
+            partitioned = self._partitioned(table)
+        source, params = self._partition_filter(table, name, partitioned)
+        try:
+            with gzip.open(temp_path, "wb") as f:
+                for chunk in stream_query(f"SELECT * FROM `{table}` {source} ORDER BY timestamp ASC", params):
+                    for row in chunk:
+                        f.write(dumps_bytes(row) + b"\n")
+                    rows += len(chunk)
+            if rows == 0:
+                os.remove(temp_path)
+                return None
+            # 같은 파티션을 다시 보관하면 덮어씀 (이전 실행이 삭제 전에 중단된 경우)
+            os.replace(temp_path, path)
+            self.logger.info(f"{table}.{name} 보관 완료: {rows}행 → {path}")
+            return path
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+
+    def drop_partition(self, table: str, name: str, partitioned: Optional[bool] = None):
+        """파티션 삭제 (trades는 해당 거래의 반성 기록을 먼저 삭제)"""
+        if partitioned is None:
+            partitioned = self._partitioned(table)
+        source, params = self._partition_filter(table, name, partitioned)
+        with db_cursor() as cursor:
+            if table == 'trades':
+                cursor.execute(f"""
+                    DELETE FROM trading_reflections
+                    WHERE trade_id IN (SELECT id FROM trades {source})
+                """, params)
+            if partitioned:
+                cursor.execute(f"ALTER TABLE `{table}` DROP PARTITION `{name}`")
+            else:
+                cursor.execute(f"DELETE FROM `{table}` {source}", params)
+        self.logger.info(f"{table}.{name} 파티션 삭제")
+
+    def prepare(self, now: Optional[datetime] = None) -> bool:
+        """
+        보존 기간이 설정된 테이블의 파티션 변환 및 미래 파티션 추가 (SQLite는 할 일 없음)
+
+        테이블을 다시 쓰는 마이그레이션이므로 `python -m database.retention partition`으로만 실행합니다.
+        """
+        if get_backend() == 'sqlite':
+            return True
+        ready = True
+        for table in self.partition_targets():
+            if self.ensure_partitioned(table, now):
+                self.add_future_partitions(table, now)
+            else:
+                ready = False
+        return ready
+
+    def apply(self, now: Optional[datetime] = None) -> Dict[str, List[str]]:
+        """
+        보존 정책 적용: 이미 변환된 테이블의 미래 파티션 추가 후 만료된 월 보관 및 삭제
+
+        파티션으로 변환하지 않은 테이블은 변환하지 않고 월 범위 DELETE로 삭제합니다.
+
+        Returns:
+            테이블별 삭제한 월 (파티션 이름 형식)
+        """
+        now = now or datetime.now()
+        if get_backend() != 'sqlite':
+            for table in PARTITIONED_TABLES:
+                self.add_future_partitions(table, now)
+        dropped: Dict[str, List[str]] = {}
+        for table in PARTITIONED_TABLES:
+            months = self.retention_months.get(table)
+            if not months:  # None이면 영구 보존
+                continue
+            try:
+                expired = self._expired(table, now, months)
+                partitioned = self._partitioned(table)
+            except Error as e:
+                self.logger.error(f"{table} 파티션 조회 오류: {e}")
+                continue
+
+            for name in expired:
+                try:
+                    if self.archive:
+                        self.archive_partition(table, name, partitioned)
+                    self.drop_partition(table, name, partitioned)
+                    dropped.setdefault(table, []).append(name)
+                except (Error, OSError) as e:
+                    # 보관에 실패한 파티션은 삭제하지 않고 다음 실행에서 다시 시도
+                    self.logger.error(f"{table}.{name} 보존 정책 적용 오류: {e}")
+        self.last_applied = now
+        return dropped
+
+    def apply_if_due(self, now: Optional[datetime] = None) -> Optional[Dict[str, List[str]]]:
+        """마지막 적용 후 RETENTION_INTERVAL_HOURS가 지났으면 보존 정책 적용 (적용하지 않으면 None)"""
+        now = now or datetime.now()
+        if not RETENTION_ENABLED:
+            return None
+        if self.last_applied and (now - self.last_applied).total_seconds() < RETENTION_INTERVAL_HOURS * 3600:
+            return None
+        return self.apply(now)
+
+    def get_status(self) -> Dict[str, List[Dict[str, Any]]]:
+        """테이블별 파티션 이름과 예상 행 수 (SQLite는 빈 딕셔너리)"""
+        status = {}
+        if get_backend() == 'sqlite':
+            return status
+        try:
+            with db_cursor(dictionary=True) as cursor:
+                for table in PARTITIONED_TABLES:
+                    cursor.execute("""
+                        SELECT partition_name AS name, table_rows AS rows_estimate
+                        FROM information_schema.partitions
+                        WHERE table_schema = DATABASE() AND table_name = %s AND partition_name IS NOT NULL
+                        ORDER BY partition_ordinal_position
+                    """, (table,))
+                    status[table] = cursor.fetchall()
+        except Error as e:
+            self.logger.error(f"파티션 상태 조회 오류: {e}")
+        return status
+
+# 전역 보존 정책 관리 인스턴스
+retention_manager = RetentionManager()
+
+def apply_retention(now: Optional[datetime] = None) -> Dict[str, List[str]]:
+    """보존 정책 적용 (편의 함수)"""
+    return retention_manager.apply(now)
+
+def apply_retention_if_due() -> Optional[Dict[str, List[str]]]:
+    """주기가 되었으면 보존 정책 적용 (편의 함수)"""
+    return retention_manager.apply_if_due()
+
+def get_retention_status() -> Dict[str, List[Dict[str, Any]]]:
+    """파티션 상태 조회 (편의 함수)"""
+    return retention_manager.get_status()
+
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description="월 파티션 변환 및 보존 정책 관리")
+    parser.add_argument("command", choices=['partition', 'apply', 'status'],
+                        help="partition: 보존 기간이 설정된 테이블을 월 파티션으로 변환, "
+                             "apply: 보존 정책 적용, status: 파티션 상태 조회")
+    args = parser.parse_args()
+    if args.command == 'partition':
+        print(f"🗂️ 파티션 변환 대상: {retention_manager.partition_targets()}")
+        if retention_manager.prepare():
+            print("✅ 파티션 변환 완료")
+        else:
+            print("❌ 파티션 변환 실패 (로그를 확인하세요)")
+    elif args.command == 'apply':
+        print(f"🗑️ 삭제한 월: {apply_retention()}")
+    else:
+        for table, partitions in get_retention_status().items():
+            print(f"📊 {table}: {partitions}")
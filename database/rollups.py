@@ -0,0 +1,289 @@
+"""
+거래 롤업 모듈
+거래가 저장될 때마다 시간/일/주/월 단위 집계 행(trade_rollups)을 증분 갱신합니다.
+통계와 주기적 회고는 원본 거래 대신 이 집계 행을 읽어 기간 수에 비례하는 비용으로 계산합니다.
+"""
+
+import logging
+from datetime import datetime, timedelta
+from typing import Dict, Any, List, Optional, Tuple
+from mysql.connector import Error
+from .connection import db_cursor
+from .streaming import iter_trade_chunks
+
+logger = logging.getLogger(__name__)
+
+PERIOD_TYPES = ('hourly', 'daily', 'weekly', 'monthly')
+
+CREATE_ROLLUPS_TABLE = """
+CREATE TABLE IF NOT EXISTS trade_rollups (
+    period_type ENUM('hourly', 'daily', 'weekly', 'monthly') NOT NULL,
+    period_start DATETIME NOT NULL,
+    trade_count INT NOT NULL DEFAULT 0,
+    buy_decisions INT NOT NULL DEFAULT 0,
+    sell_decisions INT NOT NULL DEFAULT 0,
+    hold_decisions INT NOT NULL DEFAULT 0,
+    executed_buys INT NOT NULL DEFAULT 0,
+    executed_sells INT NOT NULL DEFAULT 0,
+    buy_notional DECIMAL(20, 2) NOT NULL DEFAULT 0,
+    sell_notional DECIMAL(20, 2) NOT NULL DEFAULT 0,
+    fees DECIMAL(20, 2) NOT NULL DEFAULT 0,
+    realized_pnl DECIMAL(20, 2) NOT NULL DEFAULT 0,
+    winning_trades INT NOT NULL DEFAULT 0,
+    losing_trades INT NOT NULL DEFAULT 0,
+    equity_open DECIMAL(20, 2),
+    equity_close DECIMAL(20, 2),
+    equity_high DECIMAL(20, 2),
+    equity_low DECIMAL(20, 2),
+    first_trade_at DATETIME NOT NULL,
+    last_trade_at DATETIME NOT NULL,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+    PRIMARY KEY (period_type, period_start)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
+"""
+
+ROLLUP_COLUMNS = (
+    'period_type', 'period_start', 'trade_count', 'buy_decisions', 'sell_decisions', 'hold_decisions',
+    'executed_buys', 'executed_sells', 'buy_notional', 'sell_notional', 'fees', 'realized_pnl',
+    'winning_trades', 'losing_trades', 'equity_open', 'equity_close', 'equity_high', 'equity_low',
+    'first_trade_at', 'last_trade_at'
+)
+
+# MySQL은 ON DUPLICATE KEY UPDATE의 대입을 왼쪽부터 적용하므로
+# 시작/종료 자산은 first_trade_at/last_trade_at보다 먼저 갱신해야 합니다.
+UPSERT_ROLLUP_QUERY = f"""
+INSERT INTO trade_rollups ({", ".join(ROLLUP_COLUMNS)})
+VALUES ({", ".join(["%s"] * len(ROLLUP_COLUMNS))})
+ON DUPLICATE KEY UPDATE
+    trade_count = trade_count + VALUES(trade_count),
+    buy_decisions = buy_decisions + VALUES(buy_decisions),
+    sell_decisions = sell_decisions + VALUES(sell_decisions),
+    hold_decisions = hold_decisions + VALUES(hold_decisions),
+    executed_buys = executed_buys + VALUES(executed_buys),
+    executed_sells = executed_sells + VALUES(executed_sells),
+    buy_notional = buy_notional + VALUES(buy_notional),
+    sell_notional = sell_notional + VALUES(sell_notional),
+    fees = fees + VALUES(fees),
+    realized_pnl = realized_pnl + VALUES(realized_pnl),
+    winning_trades = winning_trades + VALUES(winning_trades),
+    losing_trades = losing_trades + VALUES(losing_trades),
+    equity_open = IF(VALUES(first_trade_at) < first_trade_at AND VALUES(equity_open) IS NOT NULL,
+                     VALUES(equity_open), COALESCE(equity_open, VALUES(equity_open))),
+    equity_close = IF(VALUES(last_trade_at) >= last_trade_at AND VALUES(equity_close) IS NOT NULL,
+                      VALUES(equity_close), COALESCE(equity_close, VALUES(equity_close))),
+    equity_high = GREATEST(COALESCE(equity_high, VALUES(equity_high)), COALESCE(VALUES(equity_high), equity_high)),
+    equity_low = LEAST(COALESCE(equity_low, VALUES(equity_low)), COALESCE(VALUES(equity_low), equity_low)),
+    first_trade_at = LEAST(first_trade_at, VALUES(first_trade_at)),
+    last_trade_at = GREATEST(last_trade_at, VALUES(last_trade_at))
+"""
+
+# 재구성에 필요한 거래 컬럼
+REBUILD_COLUMNS = ('id', 'timestamp', 'decision', 'action', 'price', 'amount', 'total_value', 'fee',
+                   'balance_krw', 'balance_btc', 'status')
+
+# 체결이 확인되지 않은 거래 상태 (주문 전 추정값으로 기록되므로 체결 건수/금액/수수료/손익에서 제외)
+UNCONFIRMED_STATUSES = ('pending',)
+
+def period_start(timestamp: datetime, period_type: str) -> datetime:
+    """거래 시각이 속한 집계 기간의 시작 시각 (주 단위는 월요일 시작)"""
+    if period_type == 'hourly':
+        return timestamp.replace(minute=0, second=0, microsecond=0)
+    day = timestamp.replace(hour=0, minute=0, second=0, microsecond=0)
+    if period_type == 'daily':
+        return day
+    if period_type == 'weekly':
+        return day - timedelta(days=day.weekday())
+    if period_type == 'monthly':
+        return day.replace(day=1)
+    raise ValueError(f"지원하지 않는 집계 기간입니다: {period_type}")
+
+def realized_pnl(action: str, price: float, amount: float, fee: float, avg_buy_price: float) -> Optional[float]:
+    """매도 거래의 실현 손익 (평균 매수가 기준, 매도가 아니거나 평균 매수가를 모르면 None)"""
+    if action != 'sell' or not avg_buy_price or not amount:
+        return None
+    return (float(price) - float(avg_buy_price)) * float(amount) - float(fee or 0)
+
+def build_rollup_rows(timestamp: datetime, decision: str, action: str, total_value: float, fee: float,
+                      pnl: Optional[float], equity: Optional[float], executed: bool = True) -> List[Tuple]:
+    """
+    거래 1건을 기간별 집계 행(UPSERT 파라미터)으로 변환
+
+    executed가 False면 (체결 미확인 또는 체결 없이 종료) 결정 건수와 자산만 반영하고 체결 건수/금액/수수료/손익은 0으로 둡니다.
+    """
+    total_value = float(total_value or 0)
+    executed_buy = executed and action == 'buy'
+    executed_sell = executed and action == 'sell'
+    if not executed:
+        fee, pnl = 0.0, None
+    values = (
+        1,
+        int(decision == 'buy'), int(decision == 'sell'), int(decision == 'hold'),
+        int(executed_buy), int(executed_sell),
+        total_value if executed_buy else 0.0, total_value if executed_sell else 0.0,
+        float(fee or 0), pnl or 0.0,
+        int(pnl is not None and pnl > 0), int(pnl is not None and pnl < 0),
+        equity, equity, equity, equity,
+        timestamp, timestamp
+    )
+    return [(period_type, period_start(timestamp, period_type)) + values for period_type in PERIOD_TYPES]
+
+def trade_equity(balance_krw: float, balance_btc: float, price: float) -> Optional[float]:
+    """거래 시점 총 자산 (가격을 모르면 None)"""
+    if not price:
+        return None
+    return float(balance_krw or 0) + float(balance_btc or 0) * float(price)
+
+def _decimal_total(rows: List[Dict[str, Any]], column: str) -> float:
+    return sum(float(row[column] or 0) for row in rows)
+
+class TradeRollups:
+    """거래 롤업 조회/재구성 클래스"""
+
+    def __init__(self):
+        self.logger = logging.getLogger(__name__)
+
+    def create_table(self, cursor):
+        """롤업 테이블 생성"""
+        cursor.execute(CREATE_ROLLUPS_TABLE)
+
+    def get_rollups(self, period_type: str, start: Optional[datetime] = None,
+                    end: Optional[datetime] = None) -> List[Dict[str, Any]]:
+        """기간 유형별 집계 행 조회 (period_start 오름차순)"""
+        conditions, params = ["period_type = %s"], [period_type]
+        if start is not None:
+            conditions.append("period_start >= %s")
+            params.append(period_start(start, period_type))
+        if end is not None:
+            conditions.append("period_start <= %s")
+            params.append(end)
+        try:
+            with db_cursor(dictionary=True) as cursor:
+                cursor.execute(f"""
+                    SELECT * FROM trade_rollups
+                    WHERE {" AND ".join(conditions)}
+                    ORDER BY period_start ASC
+                """, tuple(params))
+                return cursor.fetchall()
+        except Error as e:
+            self.logger.error(f"롤업 조회 오류: {e}")
+            return []
+
+    def get_period_metrics(self, start: datetime, end: datetime) -> Optional[Dict[str, Any]]:
+        """
+        기간 성과 지표 (시간 단위 집계 행 기준)
+
+        Returns:
+            거래 수, 승/패, 실현 손익, 수익률, 최대 낙폭 등 (집계 행이 없으면 None)
+        """
+        rows = self.get_rollups('hourly', start, end)
+        if not rows:
+            return None
+
+        winning = int(_decimal_total(rows, 'winning_trades'))
+        losing = int(_decimal_total(rows, 'losing_trades'))
+        pnl = _decimal_total(rows, 'realized_pnl')
+
+        # 시간별 최고/최저 자산으로 최대 낙폭 계산 (누적 최고점 대비)
+        peak, max_drawdown = None, 0.0
+        for row in rows:
+            if row['equity_high'] is not None:
+                peak = max(peak or 0.0, float(row['equity_high']))
+            if peak and row['equity_low'] is not None:
+                max_drawdown = max(max_drawdown, (peak - float(row['equity_low'])) / peak)
+
+        equity_open = next((float(row['equity_open']) for row in rows if row['equity_open'] is not None), None)
+        return {
+            'total_trades': int(_decimal_total(rows, 'trade_count')),
+            'decision_counts': {
+                'buy': int(_decimal_total(rows, 'buy_decisions')),
+                'sell': int(_decimal_total(rows, 'sell_decisions')),
+                'hold': int(_decimal_total(rows, 'hold_decisions'))
+            },
+            'winning_trades': winning,
+            'losing_trades': losing,
+            'win_rate': winning / (winning + losing) if winning + losing > 0 else 0.0,
+            'realized_pnl': pnl,
+            'realized_pnl_percentage': (pnl / equity_open * 100) if equity_open else 0.0,
+            'notional': _decimal_total(rows, 'buy_notional') + _decimal_total(rows, 'sell_notional'),
+            'fees': _decimal_total(rows, 'fees'),
+            'equity_high': peak,
+            'max_drawdown': max_drawdown,
+            'periods': len(rows)
+        }
+
+    def rebuild(self) -> int:
+        """
+        원본 거래 기록으로 롤업 테이블 재구성 (기존 기록 이관용)
+
+        trades 테이블에는 평균 매수가가 없으므로 거래 순서대로 보유 수량/매수 원가를 재생해
+        매도 시점의 평균 매수가를 계산합니다.
+
+        Returns:
+            반영한 거래 수
+        """
+        try:
+            position, cost, trade_count = 0.0, 0.0, 0
+            with db_cursor() as cursor:
+                self.create_table(cursor)
+                cursor.execute("DELETE FROM trade_rollups")
+
+                # 거래를 청크 단위로 스트리밍하며 청크마다 롤업 반영
+                for trades in iter_trade_chunks(columns=REBUILD_COLUMNS):
+                    rows = []
+                    for trade in trades:
+                        action = trade['action']
+                        amount = float(trade['amount'] or 0)
+                        # 체결 미확인 추정값과 체결 없이 끝난 주문(취소/실패)은 결정 건수만 반영
+                        executed = trade.get('status') not in UNCONFIRMED_STATUSES and amount > 0
+                        avg_buy_price = cost / position if position > 0 else 0.0
+                        pnl = None
+                        if executed:
+                            pnl = realized_pnl(action, trade['price'], amount, trade['fee'], avg_buy_price)
+                            if action == 'buy':
+                                position += amount
+                                cost += float(trade['total_value'] or 0)
+                            elif action == 'sell' and position > 0:
+                                sold = min(amount, position)
+                                cost -= avg_buy_price * sold
+                                position -= sold
+                        equity = trade_equity(trade['balance_krw'], trade['balance_btc'], trade['price'])
+                        rows.extend(build_rollup_rows(trade['timestamp'], trade['decision'], action,
+                                                      trade['total_value'], trade['fee'], pnl, equity, executed))
+                    cursor.executemany(UPSERT_ROLLUP_QUERY, rows)
+                    trade_count += len(trades)
+
+            self.logger.info(f"거래 롤업 재구성 완료: 거래 {trade_count}건")
+            return trade_count
+
+        except Error as e:
+            self.logger.error(f"거래 롤업 재구성 오류: {e}")
+            return 0
+
+    def ensure_backfilled(self) -> bool:
+        """롤업 테이블이 비어 있고 거래 기록이 있으면 재구성"""
+        try:
+            with db_cursor() as cursor:
+                self.create_table(cursor)
+                cursor.execute("SELECT EXISTS(SELECT 1 FROM trade_rollups), EXISTS(SELECT 1 FROM trades)")
+                has_rollups, has_trades = cursor.fetchone()
+            if has_trades and not has_rollups:
+                self.rebuild()
+            return True
+        except Error as e:
+            self.logger.error(f"거래 롤업 확인 오류: {e}")
+            return False
+
+# 전역 거래 롤업 객체
+trade_rollups = TradeRollups()
+
+def get_rollups(period_type: str, start: Optional[datetime] = None, end: Optional[datetime] = None) -> List[Dict[str, Any]]:
+    """기간 유형별 집계 행 조회 (편의 함수)"""
+    return trade_rollups.get_rollups(period_type, start, end)
+
+def get_period_metrics(start: datetime, end: datetime) -> Optional[Dict[str, Any]]:
+    """기간 성과 지표 조회 (편의 함수)"""
+    return trade_rollups.get_period_metrics(start, end)
+
+def rebuild_rollups() -> int:
+    """원본 거래 기록으로 롤업 재구성 (편의 함수)"""
+    return trade_rollups.rebuild()
@@ -0,0 +1,205 @@
+"""
+시장 데이터 스냅샷 저장소 모듈
+거래마다 저장하던 큰 market_data JSON을 압축해 내용 해시(SHA-256)로 한 번만 저장하고,
+trades 행에는 해시 참조(market_snapshot_hash)만 남깁니다.
+스냅샷 본문은 회고나 리플레이처럼 실제로 필요할 때만 지연 로딩합니다.
+"""
+
+import gzip
+import json
+import copy
+import hashlib
+import logging
+from collections import OrderedDict
+from typing import Dict, Any, Optional, Tuple
+from mysql.connector import Error
+from .connection import db_cursor
+from .streaming import stream_query
+from utils.json_serializer import dumps_canonical
+from config.settings import SNAPSHOT_CODEC, SNAPSHOT_COMPRESSION_LEVEL, SNAPSHOT_CACHE_SIZE
+
+try:
+    import zstandard
+except ImportError:  # zstandard는 선택 의존성 (없으면 gzip 사용)
+    zstandard = None
+
+logger = logging.getLogger(__name__)
+
+CREATE_SNAPSHOTS_TABLE = """
+CREATE TABLE IF NOT EXISTS market_snapshots (
+    hash CHAR(64) PRIMARY KEY,
+    codec VARCHAR(10) NOT NULL,
+    raw_size INT NOT NULL,
+    compressed_size INT NOT NULL,
+    data LONGBLOB NOT NULL,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
+"""
+
+# 같은 해시가 이미 있으면 무시 (내용이 같으면 본문도 같으므로 중복 저장하지 않음)
+INSERT_SNAPSHOT_QUERY = """
+INSERT IGNORE INTO market_snapshots (hash, codec, raw_size, compressed_size, data)
+VALUES (%s, %s, %s, %s, %s)
+"""
+
+def _codec() -> str:
+    """사용할 압축 방식 (zstd 요청 시 zstandard가 없으면 gzip)"""
+    if SNAPSHOT_CODEC == 'zstd' and zstandard is not None:
+        return 'zstd'
+    return 'gzip'
+
+def compress(raw: bytes, codec: str) -> bytes:
+    """바이트 압축"""
+    if codec == 'zstd':
+        return zstandard.ZstdCompressor(level=SNAPSHOT_COMPRESSION_LEVEL).compress(raw)
+    return gzip.compress(raw, compresslevel=min(SNAPSHOT_COMPRESSION_LEVEL, 9), mtime=0)
+
+def decompress(data: bytes, codec: str) -> bytes:
+    """바이트 압축 해제"""
+    if codec == 'zstd':
+        if zstandard is None:
+            raise RuntimeError("zstd로 압축된 스냅샷을 읽으려면 zstandard 패키지가 필요합니다.")
+        return zstandard.ZstdDecompressor().decompress(data)
+    return gzip.decompress(data)
+
+def canonical_json(data: Dict[str, Any]) -> bytes:
+    """키 정렬/공백 제거한 JSON (orjson 설치 여부와 관계없이 같은 내용이면 같은 바이트 → 같은 해시)"""
+    return dumps_canonical(data)
+
+def encode_snapshot(data: Dict[str, Any]) -> Tuple[str, tuple]:
+    """
+    스냅샷을 저장용 행으로 변환
+
+    Returns:
+        (해시, INSERT_SNAPSHOT_QUERY 파라미터)
+    """
+    raw = canonical_json(data)
+    snapshot_hash = hashlib.sha256(raw).hexdigest()
+    codec = _codec()
+    compressed = compress(raw, codec)
+    return snapshot_hash, (snapshot_hash, codec, len(raw), len(compressed), compressed)
+
+def decode_snapshot(codec: str, data: bytes) -> Dict[str, Any]:
+    """저장된 행 본문을 딕셔너리로 복원"""
+    return json.loads(decompress(bytes(data), codec).decode('utf-8'))
+
+class SnapshotStore:
+    """시장 데이터 스냅샷 저장/지연 로딩 클래스"""
+
+    def __init__(self, cache_size: int = SNAPSHOT_CACHE_SIZE):
+        self.logger = logging.getLogger(__name__)
+        self.cache_size = cache_size
+        self._cache: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+
+    def ensure_table(self) -> bool:
+        """스냅샷 테이블 생성"""
+        try:
+            with db_cursor() as cursor:
+                cursor.execute(CREATE_SNAPSHOTS_TABLE)
+            return True
+        except Error as e:
+            self.logger.error(f"스냅샷 테이블 생성 오류: {e}")
+            return False
+
+    def put(self, data: Dict[str, Any]) -> Optional[str]:
+        """스냅샷을 바로 저장하고 해시 반환 (이미 있으면 저장 생략)"""
+        try:
+            snapshot_hash, row = encode_snapshot(data)
+            with db_cursor() as cursor:
+                cursor.execute(INSERT_SNAPSHOT_QUERY, row)
+            return snapshot_hash
+        except Error as e:
+            self.logger.error(f"스냅샷 저장 오류: {e}")
+            return None
+
+    def load(self, snapshot_hash: str) -> Optional[Dict[str, Any]]:
+        """해시로 스냅샷 조회 (최근 조회분은 메모리 캐시, 호출자에게는 복사본 반환)"""
+        if not snapshot_hash:
+            return None
+        if snapshot_hash in self._cache:
+            self._cache.move_to_end(snapshot_hash)
+            return copy.deepcopy(self._cache[snapshot_hash])
+        try:
+            with db_cursor(dictionary=True) as cursor:
+                cursor.execute("SELECT codec, data FROM market_snapshots WHERE hash = %s", (snapshot_hash,))
+                row = cursor.fetchone()
+        except Error as e:
+            self.logger.error(f"스냅샷 조회 오류: {e}")
+            return None
+        if not row:
+            self.logger.warning(f"스냅샷을 찾을 수 없습니다: {snapshot_hash[:12]}")
+            return None
+
+        snapshot = decode_snapshot(row['codec'], row['data'])
+        self._cache[snapshot_hash] = snapshot
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+        return copy.deepcopy(snapshot)
+
+    def load_trade_market_data(self, trade: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        거래 행의 시장 데이터 조회
+
+        스냅샷 해시가 있으면 저장소에서 읽고, 이전 방식으로 trades.market_data에
+        JSON이 그대로 남아 있는 행은 그 값을 사용합니다.
+        """
+        if trade.get('market_snapshot_hash'):
+            return self.load(trade['market_snapshot_hash'])
+        inline = trade.get('market_data')
+        if isinstance(inline, (str, bytes, bytearray)):
+            try:
+                return json.loads(inline)
+            except json.JSONDecodeError:
+                return None
+        return inline
+
+    def migrate_inline_snapshots(self, chunk_size: int = 200) -> int:
+        """
+        trades.market_data에 남아 있는 JSON을 스냅샷 저장소로 옮기고 참조로 교체
+
+        Returns:
+            옮긴 거래 수
+        """
+        if not self.ensure_table():
+            return 0
+        migrated = 0
+        try:
+            # 읽기는 스트리밍 연결 하나를 점유하므로 갱신은 청크마다 다른 풀 연결로 실행
+            for chunk in stream_query("""
+                SELECT id, market_data FROM trades
+                WHERE market_data IS NOT NULL AND market_snapshot_hash IS NULL
+                ORDER BY id ASC
+            """, chunk_size=chunk_size):
+                encoded = []
+                for trade in chunk:
+                    market_data = self.load_trade_market_data(trade)
+                    if market_data is not None:
+                        encoded.append((trade['id'],) + encode_snapshot(market_data))
+                if not encoded:
+                    continue
+                with db_cursor() as cursor:
+                    cursor.executemany(INSERT_SNAPSHOT_QUERY, [row for _, _, row in encoded])
+                    cursor.executemany(
+                        "UPDATE trades SET market_snapshot_hash = %s, market_data = NULL WHERE id = %s",
+                        [(snapshot_hash, trade_id) for trade_id, snapshot_hash, _ in encoded]
+                    )
+                migrated += len(encoded)
+            self.logger.info(f"시장 데이터 스냅샷 이전 완료: {migrated}건")
+        except Error as e:
+            self.logger.error(f"시장 데이터 스냅샷 이전 오류: {e}")
+        return migrated
+
+# 전역 스냅샷 저장소 인스턴스
+snapshot_store = SnapshotStore()
+
+def load_snapshot(snapshot_hash: str) -> Optional[Dict[str, Any]]:
+    """해시로 스냅샷 조회 (편의 함수)"""
+    return snapshot_store.load(snapshot_hash)
+
+def load_trade_market_data(trade: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """거래 행의 시장 데이터 조회 (편의 함수)"""
+    return snapshot_store.load_trade_market_data(trade)
+
+def migrate_inline_snapshots() -> int:
+    """기존 거래의 시장 데이터를 스냅샷 저장소로 이전 (편의 함수)"""
+    return snapshot_store.migrate_inline_snapshots()
@@ -0,0 +1,209 @@
+"""
+SQLite 저장소 백엔드 모듈
+MySQL 서버 없이 단일 파일 DB(WAL 모드)로 같은 스키마와 쿼리를 사용합니다.
+
+연결 객체는 mysql.connector 연결과 같은 메서드(cursor(dictionary=...), start_transaction,
+commit, rollback, ping, consume_results 등)를 제공하고, 이 저장소에서 쓰는 MySQL 문법을
+SQLite 문법으로 바꿔 실행합니다. SQLite 오류는 mysql.connector 오류로 바꿔 발생시키므로
+기존 `except Error` 처리를 그대로 사용할 수 있습니다.
+"""
+
+import os
+import re
+import sqlite3
+from decimal import Decimal
+from datetime import datetime
+from functools import lru_cache
+from contextlib import contextmanager
+from typing import Any, Dict, List, Optional, Sequence
+from mysql.connector import errors
+from .connection import ConnectionPool
+
+# datetime은 'YYYY-MM-DD HH:MM:SS[.ffffff]' 문자열로 저장 (문자열 비교 = 시간 비교)
+sqlite3.register_adapter(datetime, lambda value: value.isoformat(" "))
+sqlite3.register_adapter(Decimal, float)
+
+def _convert_datetime(value: bytes) -> datetime:
+    return datetime.fromisoformat(value.decode())
+
+sqlite3.register_converter("DATETIME", _convert_datetime)
+sqlite3.register_converter("TIMESTAMP", _convert_datetime)
+
+_LOCAL_NOW = "datetime('now', 'localtime')"
+
+# (패턴, 치환) - 순서대로 적용
+_QUERY_REWRITES = [
+    (re.compile(r"DATE_SUB\(\s*NOW\(\)\s*,\s*INTERVAL\s+(%s|\d+)\s+(DAY|HOUR|MINUTE|SECOND)\s*\)", re.I),
+     lambda m: f"datetime('now', 'localtime', '-' || {m.group(1)} || ' {m.group(2).lower()}s')"),
+    (re.compile(r"\bNOW\(\)", re.I), lambda m: _LOCAL_NOW),
+    (re.compile(r"\bINSERT\s+IGNORE\s+INTO\b", re.I), lambda m: "INSERT OR IGNORE INTO"),
+    (re.compile(r"\bON\s+DUPLICATE\s+KEY\s+UPDATE\b", re.I), lambda m: "ON CONFLICT DO UPDATE SET"),
+    (re.compile(r"\bVALUES\((\w+)\)", re.I), lambda m: f"excluded.{m.group(1)}"),
+    (re.compile(r"\bIF\(", re.I), lambda m: "IIF("),
+    (re.compile(r"\bGREATEST\(", re.I), lambda m: "MAX("),
+    (re.compile(r"\bLEAST\(", re.I), lambda m: "MIN("),
+    (re.compile(r"%s"), lambda m: "?"),
+    (re.compile(r"%%"), lambda m: "%"),
+]
+
+# CREATE TABLE / ALTER TABLE 전용 치환
+_DDL_REWRITES = [
+    (re.compile(r"\bINT\s+AUTO_INCREMENT\s+PRIMARY\s+KEY\b", re.I), lambda m: "INTEGER PRIMARY KEY AUTOINCREMENT"),
+    (re.compile(r"\bENUM\s*\([^)]*\)", re.I), lambda m: "TEXT"),
+    (re.compile(r"\bJSON\b", re.I), lambda m: "TEXT"),
+    (re.compile(r"\s+ON\s+UPDATE\s+CURRENT_TIMESTAMP\b", re.I), lambda m: ""),
+    (re.compile(r"\bDEFAULT\s+CURRENT_TIMESTAMP\b", re.I), lambda m: f"DEFAULT ({_LOCAL_NOW})"),
+    (re.compile(r"\)\s*ENGINE\s*=.*$", re.I | re.S), lambda m: ")"),
+    (re.compile(r"\s+AFTER\s+`?\w+`?\s*$", re.I), lambda m: ""),
+]
+
+@lru_cache(maxsize=256)
+def translate_query(query: str) -> str:
+    """이 저장소에서 사용하는 MySQL 문법을 SQLite 문법으로 변환"""
+    translated = query.strip()
+    if re.match(r"(CREATE|ALTER)\s+TABLE\b", translated, re.I):
+        for pattern, replacement in _DDL_REWRITES:
+            translated = pattern.sub(replacement, translated)
+    for pattern, replacement in _QUERY_REWRITES:
+        translated = pattern.sub(replacement, translated)
+    return translated
+
+@contextmanager
+def _mysql_errors():
+    """SQLite 오류를 같은 의미의 mysql.connector 오류로 변환"""
+    try:
+        yield
+    except sqlite3.IntegrityError as e:
+        raise errors.IntegrityError(msg=str(e)) from e
+    except sqlite3.ProgrammingError as e:
+        raise errors.ProgrammingError(msg=str(e)) from e
+    except sqlite3.OperationalError as e:
+        raise errors.OperationalError(msg=str(e)) from e
+    except sqlite3.Error as e:
+        raise errors.DatabaseError(msg=str(e)) from e
+
+class SQLiteCursor:
+    """mysql.connector 커서처럼 동작하는 SQLite 커서 (dictionary=True면 행을 dict로 반환)"""
+
+    def __init__(self, cursor: sqlite3.Cursor, dictionary: bool = False):
+        self._cursor = cursor
+        self.dictionary = dictionary
+
+    def execute(self, query: str, params: Optional[Sequence] = None):
+        with _mysql_errors():
+            self._cursor.execute(translate_query(query), tuple(params or ()))
+
+    def executemany(self, query: str, rows: Sequence[Sequence]):
+        with _mysql_errors():
+            self._cursor.executemany(translate_query(query), [tuple(row) for row in rows])
+
+    def _row(self, row):
+        if row is None or not self.dictionary:
+            return row
+        return dict(zip((column[0] for column in self._cursor.description), row))
+
+    def fetchone(self):
+        with _mysql_errors():
+            return self._row(self._cursor.fetchone())
+
+    def fetchmany(self, size: int = 1) -> List[Any]:
+        with _mysql_errors():
+            return [self._row(row) for row in self._cursor.fetchmany(size)]
+
+    def fetchall(self) -> List[Any]:
+        with _mysql_errors():
+            return [self._row(row) for row in self._cursor.fetchall()]
+
+    def __iter__(self):
+        return iter(self.fetchall())
+
+    @property
+    def description(self):
+        return self._cursor.description
+
+    @property
+    def rowcount(self) -> int:
+        return self._cursor.rowcount
+
+    @property
+    def lastrowid(self) -> Optional[int]:
+        return self._cursor.lastrowid
+
+    def close(self):
+        self._cursor.close()
+
+class SQLiteConnection:
+    """mysql.connector 연결처럼 동작하는 SQLite 연결 (기본 autocommit, WAL 모드)"""
+
+    def __init__(self, path: str, busy_timeout: float = 5.0):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with _mysql_errors():
+            # isolation_level=None: MySQL 풀 연결(autocommit=True)과 같이 문장마다 커밋
+            self._connection = sqlite3.connect(path, timeout=busy_timeout, isolation_level=None,
+                                               detect_types=sqlite3.PARSE_DECLTYPES, check_same_thread=False)
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute("PRAGMA synchronous=NORMAL")
+            self._connection.execute("PRAGMA foreign_keys=ON")
+        self._closed = False
+
+    def cursor(self, dictionary: bool = False, buffered: bool = True) -> SQLiteCursor:
+        """커서 생성 (SQLite 커서는 항상 필요한 만큼만 읽으므로 buffered는 무시)"""
+        return SQLiteCursor(self._connection.cursor(), dictionary)
+
+    def start_transaction(self):
+        """쓰기 트랜잭션 시작 (쓰기 잠금을 먼저 잡아 다른 연결과의 잠금 승격 충돌 방지)"""
+        with _mysql_errors():
+            self._connection.execute("BEGIN IMMEDIATE")
+
+    def commit(self):
+        with _mysql_errors():
+            if self._connection.in_transaction:
+                self._connection.commit()
+
+    def rollback(self):
+        with _mysql_errors():
+            if self._connection.in_transaction:
+                self._connection.rollback()
+
+    @property
+    def in_transaction(self) -> bool:
+        return self._connection.in_transaction
+
+    def ping(self, reconnect: bool = False, attempts: int = 1, delay: float = 0):
+        with _mysql_errors():
+            self._connection.execute("SELECT 1")
+
+    def is_connected(self) -> bool:
+        return not self._closed
+
+    def consume_results(self):
+        """읽지 않은 결과 정리 (SQLite는 커서를 닫으면 되므로 할 일 없음)"""
+
+    def close(self):
+        self._closed = True
+        self._connection.close()
+
+class SQLiteConnectionPool(ConnectionPool):
+    """
+    SQLite 연결 풀
+
+    WAL 모드에서는 읽기 연결 여러 개와 쓰기 연결 하나가 동시에 동작하므로 MySQL 풀과 같은
+    방식으로 연결을 재사용합니다. 로컬 파일이라 연결 상태 확인(ping)은 하지 않습니다.
+    """
+
+    def __init__(self, size: int, timeout: float, path: str, busy_timeout: float = 5.0):
+        super().__init__(size, timeout, ping_interval=float('inf'))
+        self.path = path
+        self.busy_timeout = busy_timeout
+
+    def _create(self) -> SQLiteConnection:
+        connection = SQLiteConnection(self.path, self.busy_timeout)
+        self.created_count += 1
+        return connection
+
+    def get_stats(self) -> Dict[str, Any]:
+        stats = super().get_stats()
+        stats['path'] = self.path
+        return stats
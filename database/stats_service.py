@@ -0,0 +1,177 @@
+"""
+통계 조회 서비스 모듈
+거래 요약은 거래 롤업(trade_rollups) 합산 쿼리 한 번, 반성 요약은 조건부 집계 쿼리 한 번으로 계산하고
+짧은 TTL 캐시로 재사용합니다.
+"""
+
+import time
+import threading
+import logging
+from datetime import datetime, timedelta
+from typing import Dict, Any, Optional, Tuple
+from mysql.connector import Error
+from .connection import db_cursor
+from .rollups import period_start
+from config.settings import STATS_CACHE_TTL
+
+class StatisticsService:
+    """거래/반성 통계 서비스 클래스"""
+
+    def __init__(self, ttl: float = STATS_CACHE_TTL):
+        self.ttl = ttl
+        self._cache: Dict[Tuple, Tuple[float, Dict[str, Any]]] = {}
+        self._lock = threading.Lock()
+        self.logger = logging.getLogger(__name__)
+        self.stats = {'hits': 0, 'misses': 0}
+
+    def _cached(self, key: Tuple, compute) -> Dict[str, Any]:
+        """TTL 캐시 조회, 없으면 계산 후 저장 (실패한 빈 결과는 저장하지 않음)"""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._cache.get(key)
+            if entry and entry[0] > now:
+                self.stats['hits'] += 1
+                return dict(entry[1])
+            self.stats['misses'] += 1
+
+        result = compute()
+        if result and self.ttl > 0:
+            with self._lock:
+                self._cache[key] = (now + self.ttl, result)
+        return dict(result)
+
+    def invalidate(self):
+        """캐시 비우기 (새 거래 저장 직후 최신 통계가 필요할 때)"""
+        with self._lock:
+            self._cache.clear()
+
+    def get_trade_summary(self, days: Optional[int] = 30) -> Dict[str, Any]:
+        """
+        거래 요약 통계 (롤업 합산 쿼리 1회, 기간 수에 비례하는 비용)
+
+        Args:
+            days: 조회 기간 (일), None이면 전체 기간
+
+        Returns:
+            기간, 거래 수, 결정별/행동별 거래 수, 거래 금액, 수수료, 매수/매도 총액, 수익
+        """
+        return self._cached(('trades', days), lambda: self._query_trade_summary(days))
+
+    def _query_trade_summary(self, days: Optional[int]) -> Dict[str, Any]:
+        # 기간이 있으면 시간 단위, 전체 기간이면 월 단위 롤업 행만 합산
+        if days is not None:
+            where = "WHERE period_type = 'hourly' AND period_start >= %s"
+            params = (period_start(datetime.now() - timedelta(days=days), 'hourly'),)
+        else:
+            where, params = "WHERE period_type = 'monthly'", ()
+
+        try:
+            with db_cursor(dictionary=True) as cursor:
+                cursor.execute(f"""
+                    SELECT
+                        SUM(trade_count) as total_trades,
+                        SUM(buy_decisions) as buy_decisions,
+                        SUM(sell_decisions) as sell_decisions,
+                        SUM(hold_decisions) as hold_decisions,
+                        SUM(executed_buys) as executed_buys,
+                        SUM(executed_sells) as executed_sells,
+                        SUM(buy_notional) as buy_total,
+                        SUM(sell_notional) as sell_total,
+                        SUM(fees) as total_fee,
+                        SUM(realized_pnl) as realized_pnl
+                    FROM trade_rollups
+                    {where}
+                """, params)
+                row = cursor.fetchone()
+        except Error as e:
+            self.logger.error(f"거래 통계 조회 오류: {e}")
+            return {}
+
+        row = {key: (value or 0) for key, value in row.items()}
+        buy_total = row['buy_total']
+        sell_total = row['sell_total']
+        total_fee = row['total_fee']
+        profit = sell_total - buy_total - total_fee
+        decision_counts = {decision: int(row[f'{decision}_decisions']) for decision in ('buy', 'sell', 'hold')}
+        return {
+            'period_days': days,
+            'total_trades': int(row['total_trades']),
+            'decision_counts': {decision: count for decision, count in decision_counts.items() if count},
+            'action_counts': {'buy': int(row['executed_buys']), 'sell': int(row['executed_sells'])},
+            'total_value': buy_total + sell_total,
+            'total_fee': total_fee,
+            'buy_total': buy_total,
+            'sell_total': sell_total,
+            'profit': profit,
+            'profit_rate': (profit / buy_total * 100) if buy_total > 0 else 0,
+            'realized_pnl': row['realized_pnl']
+        }
+
+    def get_reflection_summary(self, days: int = 30) -> Dict[str, Any]:
+        """
+        반성 요약 통계 (반성/인사이트/전략 개선 집계를 UNION ALL로 묶어 쿼리 1회)
+
+        Returns:
+            반성 수, 유형별 반성 수, 평균 성과 점수, 최근 인사이트/전략 개선 수
+        """
+        return self._cached(('reflections', days), lambda: self._query_reflection_summary(days))
+
+    def _query_reflection_summary(self, days: int) -> Dict[str, Any]:
+        try:
+            with db_cursor(dictionary=True) as cursor:
+                cursor.execute("""
+                    SELECT 'reflection' as source, reflection_type as category, COUNT(*) as count,
+                           SUM(performance_score) as score_sum, COUNT(performance_score) as score_count
+                    FROM trading_reflections
+                    WHERE created_at >= DATE_SUB(NOW(), INTERVAL %s DAY)
+                    GROUP BY reflection_type
+                    UNION ALL
+                    SELECT 'insight', NULL, COUNT(*), NULL, NULL
+                    FROM learning_insights
+                    WHERE created_at >= DATE_SUB(NOW(), INTERVAL %s DAY)
+                    UNION ALL
+                    SELECT 'improvement', NULL, COUNT(*), NULL, NULL
+                    FROM strategy_improvements
+                    WHERE created_at >= DATE_SUB(NOW(), INTERVAL %s DAY)
+                """, (days, days, days))
+                rows = cursor.fetchall()
+        except Error as e:
+            self.logger.error(f"반성 요약 정보 조회 오류: {e}")
+            return {}
+
+        reflections = [row for row in rows if row['source'] == 'reflection']
+        score_count = sum(row['score_count'] or 0 for row in reflections)
+        score_sum = sum(row['score_sum'] or 0 for row in reflections)
+        counts = {row['source']: row['count'] for row in rows if row['source'] != 'reflection'}
+        return {
+            'total_reflections': sum(row['count'] for row in reflections),
+            'reflection_types': {row['category']: row['count'] for row in reflections},
+            'avg_performance_score': (score_sum / score_count) if score_count else 0,
+            'recent_insights': counts.get('insight', 0),
+            'recent_improvements': counts.get('improvement', 0),
+            'period_days': days
+        }
+
+    def get_stats(self) -> Dict[str, Any]:
+        """캐시 통계 반환"""
+        requests = self.stats['hits'] + self.stats['misses']
+        return {
+            **self.stats,
+            'entries': len(self._cache),
+            'hit_ratio': self.stats['hits'] / requests if requests else 0.0
+        }
+
+# 전역 통계 서비스 객체
+statistics_service = StatisticsService()
+
+def get_trade_summary(days: Optional[int] = 30) -> Dict[str, Any]:
+    """거래 요약 통계 조회 (편의 함수)"""
+    return statistics_service.get_trade_summary(days)
+
+def get_reflection_summary(days: int = 30) -> Dict[str, Any]:
+    """반성 요약 통계 조회 (편의 함수)"""
+    return statistics_service.get_reflection_summary(days)
+
+def invalidate_statistics():
+    """통계 캐시 비우기 (편의 함수)"""
+    statistics_service.invalidate()
@@ -0,0 +1,92 @@
+"""
+스트리밍 조회 모듈
+대량의 거래 기록을 unbuffered(서버 스트리밍) 커서로 일정 크기씩 읽어 메모리 사용량을 제한합니다.
+기본적으로 필요한 컬럼만 조회하고, 큰 JSON(market_data)은 명시적으로 요청할 때만 읽습니다.
+"""
+
+from datetime import datetime
+from typing import Dict, Any, List, Optional, Iterator, Sequence
+from .connection import pooled_connection
+from config.settings import STREAM_CHUNK_SIZE
+
+# trades 테이블 컬럼
+TRADE_COLUMNS = (
+    'id', 'timestamp', 'decision', 'action', 'price', 'amount', 'total_value', 'fee',
+    'balance_krw', 'balance_btc', 'order_id', 'status', 'confidence', 'reasoning', 'market_data',
+    'market_snapshot_hash', 'created_at', 'updated_at'
+)
+
+# 기본 조회 컬럼 (reasoning/market_data 같은 큰 텍스트 제외)
+TRADE_SUMMARY_COLUMNS = (
+    'id', 'timestamp', 'decision', 'action', 'price', 'amount', 'total_value', 'fee',
+    'balance_krw', 'balance_btc', 'status', 'confidence'
+)
+
+def stream_query(query: str, params: Sequence = (), chunk_size: int = STREAM_CHUNK_SIZE,
+                 dictionary: bool = True) -> Iterator[List[Any]]:
+    """
+    쿼리 결과를 chunk_size 행씩 나눠서 반환하는 제너레이터
+
+    unbuffered 커서는 fetchmany를 호출할 때마다 서버에서 다음 행을 받아오므로
+    전체 결과를 한 번에 메모리에 올리지 않습니다. 스트리밍 중에는 연결 하나를 점유합니다.
+    """
+    with pooled_connection() as connection:
+        cursor = connection.cursor(dictionary=dictionary, buffered=False)
+        exhausted = False
+        try:
+            cursor.execute(query, tuple(params))
+            while True:
+                rows = cursor.fetchmany(chunk_size)
+                if not rows:
+                    exhausted = True
+                    break
+                yield rows
+        finally:
+            # 중간에 멈추면 남은 결과를 버려야 연결을 풀에 반납해 재사용할 수 있음
+            if not exhausted:
+                connection.consume_results()
+            cursor.close()
+
+def _trade_columns(columns: Optional[Sequence[str]], include_market_data: bool) -> List[str]:
+    """조회할 컬럼 목록 (알 수 없는 컬럼명은 거부)"""
+    selected = list(columns or TRADE_SUMMARY_COLUMNS)
+    if include_market_data:
+        selected += [column for column in ('reasoning', 'market_data', 'market_snapshot_hash')
+                     if column not in selected]
+    unknown = [column for column in selected if column not in TRADE_COLUMNS]
+    if unknown:
+        raise ValueError(f"trades 테이블에 없는 컬럼입니다: {unknown}")
+    return selected
+
+def iter_trade_chunks(start: Optional[datetime] = None, end: Optional[datetime] = None,
+                      columns: Optional[Sequence[str]] = None, include_market_data: bool = False,
+                      chunk_size: int = STREAM_CHUNK_SIZE) -> Iterator[List[Dict[str, Any]]]:
+    """
+    기간 내 거래를 시간 순서대로 chunk_size건씩 반환
+
+    Args:
+        start: 시작 시각 (포함, None이면 처음부터)
+        end: 종료 시각 (포함, None이면 끝까지)
+        columns: 조회할 컬럼 (기본: TRADE_SUMMARY_COLUMNS)
+        include_market_data: reasoning/market_data/market_snapshot_hash 컬럼 포함 여부
+        chunk_size: 한 번에 읽을 행 수
+    """
+    conditions, params = [], []
+    if start is not None:
+        conditions.append("timestamp >= %s")
+        params.append(start)
+    if end is not None:
+        conditions.append("timestamp <= %s")
+        params.append(end)
+    where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+    column_list = ", ".join(f"`{column}`" for column in _trade_columns(columns, include_market_data))
+
+    query = f"SELECT {column_list} FROM trades {where} ORDER BY timestamp ASC, id ASC"
+    yield from stream_query(query, params, chunk_size)
+
+def iter_trades(start: Optional[datetime] = None, end: Optional[datetime] = None,
+                columns: Optional[Sequence[str]] = None, include_market_data: bool = False,
+                chunk_size: int = STREAM_CHUNK_SIZE) -> Iterator[Dict[str, Any]]:
+    """기간 내 거래를 한 건씩 반환 (내부적으로 chunk_size건씩 스트리밍)"""
+    for chunk in iter_trade_chunks(start, end, columns, include_market_data, chunk_size):
+        yield from chunk
@@ -2,13 +2,17 @@
 거래 기록 저장 모듈
 """
 
-import json
 from datetime import datetime
 from typing import Dict, Any, Optional
 from mysql.connector import Error
 import logging
-from .connection import get_db_connection
-from utils.json_cleaner import clean_json_data
+from .connection import db_cursor
+from .write_queue import enqueue_insert
+from .stats_service import get_trade_summary
+from .snapshot_store import INSERT_SNAPSHOT_QUERY, encode_snapshot
+from .rollups import UNCONFIRMED_STATUSES, UPSERT_ROLLUP_QUERY, build_rollup_rows, realized_pnl, trade_equity
+from utils.json_serializer import dumps_str
+from config.settings import WRITE_BEHIND_ENABLED, SNAPSHOT_STORE_ENABLED
 
 class TradeRecorder:
     """거래 기록 저장 클래스"""
@@ -16,17 +20,19 @@ class TradeRecorder:
     def __init__(self):
         self.logger = logging.getLogger(__name__)
     
+    def _insert(self, insert_query: str, params: tuple):
+        """INSERT 실행 (쓰기 대기열 사용 시 백그라운드에서 배치 저장)"""
+        if WRITE_BEHIND_ENABLED:
+            if not enqueue_insert(insert_query, params):
+                raise Error("쓰기 대기열과 스풀 파일 모두 기록에 실패했습니다.")
+            return
+        with db_cursor() as cursor:
+            cursor.execute(insert_query, params)
+    
     def save_trade(self, decision: Dict[str, Any], execution_result: Dict[str, Any], 
                    investment_status: Dict[str, Any], market_data: Dict[str, Any] = None) -> bool:
         """거래 기록을 데이터베이스에 저장"""
         try:
-            connection = get_db_connection()
-            if not connection:
-                self.logger.error("데이터베이스 연결 실패")
-                return False
-            
-            cursor = connection.cursor()
-            
             # 거래 정보 추출
             timestamp = datetime.now()
             decision_type = decision.get('decision', 'unknown')
@@ -42,32 +48,44 @@ class TradeRecorder:
             confidence = decision.get('confidence', 0)
             reasoning = decision.get('reasoning', '')
             
-            # 시장 데이터를 JSON으로 변환
+            # 시장 데이터를 JSON으로 변환 (스냅샷 저장소 사용 시 압축 저장 후 해시만 기록)
+            # 프롬프트 생성 때 직렬화한 바이트가 있으면 그대로 재사용 (NaN/Infinity는 null)
             market_data_json = None
+            snapshot_hash = None
             if market_data:
                 try:
-                    # NaN, Infinity 값 정리 후 JSON 변환
-                    cleaned_market_data = clean_json_data(market_data)
-                    market_data_json = json.dumps(cleaned_market_data, ensure_ascii=False)
-                except Exception as e:
+                    if SNAPSHOT_STORE_ENABLED:
+                        snapshot_hash, snapshot_row = encode_snapshot(market_data)
+                        self._insert(INSERT_SNAPSHOT_QUERY, snapshot_row)
+                    else:
+                        market_data_json = dumps_str(market_data)
+                except (TypeError, ValueError) as e:
                     self.logger.error(f"시장 데이터 JSON 변환 오류: {e}")
                     market_data_json = None
+                    snapshot_hash = None
             
             # 거래 기록 저장
             insert_query = """
             INSERT INTO trades (
                 timestamp, decision, action, price, amount, total_value, fee,
-                balance_krw, balance_btc, order_id, status, confidence, reasoning, market_data
-            ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+                balance_krw, balance_btc, order_id, status, confidence, reasoning, market_data,
+                market_snapshot_hash
+            ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
             """
             
-            cursor.execute(insert_query, (
+            self._insert(insert_query, (
                 timestamp, decision_type, action, price, amount, total_value, fee,
-                balance_krw, balance_btc, order_id, status, confidence, reasoning, market_data_json
+                balance_krw, balance_btc, order_id, status, confidence, reasoning, market_data_json,
+                snapshot_hash
             ))
             
-            connection.commit()
-            cursor.close()
+            # 시간/일/주/월 롤업 증분 갱신 (체결이 확인되지 않은 추정값은 체결 집계에서 제외)
+            executed = execution_result.get('success', True) and status not in UNCONFIRMED_STATUSES
+            equity_price = price or investment_status.get('current_price') or (market_data or {}).get('current_price')
+            pnl = realized_pnl(action, price, amount, fee, investment_status.get('btc_avg_price', 0)) if executed else None
+            for rollup_row in build_rollup_rows(timestamp, decision_type, action, total_value, fee, pnl,
+                                                trade_equity(balance_krw, balance_btc, equity_price), executed):
+                self._insert(UPSERT_ROLLUP_QUERY, rollup_row)
             
             self.logger.info(f"거래 기록 저장 완료: {decision_type} - {action}")
             return True
@@ -79,13 +97,6 @@ class TradeRecorder:
     def save_market_data(self, market_data: Dict[str, Any]) -> bool:
         """시장 데이터를 데이터베이스에 저장"""
         try:
-            connection = get_db_connection()
-            if not connection:
-                self.logger.error("데이터베이스 연결 실패")
-                return False
-            
-            cursor = connection.cursor()
-            
             timestamp = datetime.now()
             current_price = market_data.get('current_price', 0)
             volume_24h = market_data.get('volume_24h', 0)
@@ -106,14 +117,11 @@ class TradeRecorder:
             ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
             """
             
-            cursor.execute(insert_query, (
+            self._insert(insert_query, (
                 timestamp, current_price, volume_24h, change_24h, rsi, macd, macd_signal,
                 bollinger_upper, bollinger_lower, fear_greed_index, fear_greed_value, news_sentiment
             ))
             
-            connection.commit()
-            cursor.close()
-            
             self.logger.info("시장 데이터 저장 완료")
             return True
             
@@ -124,13 +132,6 @@ class TradeRecorder:
     def save_system_log(self, level: str, message: str, module: str = None) -> bool:
         """시스템 로그를 데이터베이스에 저장"""
         try:
-            connection = get_db_connection()
-            if not connection:
-                self.logger.error("데이터베이스 연결 실패")
-                return False
-            
-            cursor = connection.cursor()
-            
             timestamp = datetime.now()
             
             insert_query = """
@@ -138,10 +139,7 @@ class TradeRecorder:
             VALUES (%s, %s, %s, %s)
             """
             
-            cursor.execute(insert_query, (timestamp, level, message, module))
-            
-            connection.commit()
-            cursor.close()
+            self._insert(insert_query, (timestamp, level, message, module))
             
             return True
             
@@ -152,22 +150,15 @@ class TradeRecorder:
     def get_recent_trades(self, limit: int = 10) -> list:
         """최근 거래 기록 조회"""
         try:
-            connection = get_db_connection()
-            if not connection:
-                return []
-            
-            cursor = connection.cursor(dictionary=True)
-            
             select_query = """
             SELECT * FROM trades 
             ORDER BY timestamp DESC 
             LIMIT %s
             """
             
-            cursor.execute(select_query, (limit,))
-            trades = cursor.fetchall()
-            
-            cursor.close()
+            with db_cursor(dictionary=True) as cursor:
+                cursor.execute(select_query, (limit,))
+                trades = cursor.fetchall()
             return trades
             
         except Error as e:
@@ -175,46 +166,11 @@ class TradeRecorder:
             return []
     
     def get_trade_statistics(self) -> Dict[str, Any]:
-        """거래 통계 조회"""
-        try:
-            connection = get_db_connection()
-            if not connection:
-                return {}
-            
-            cursor = connection.cursor(dictionary=True)
-            
-            # 전체 거래 수
-            cursor.execute("SELECT COUNT(*) as total_trades FROM trades")
-            total_trades = cursor.fetchone()['total_trades']
-            
-            # 매수/매도/보유 거래 수
-            cursor.execute("""
-                SELECT decision, COUNT(*) as count 
-                FROM trades 
-                GROUP BY decision
-            """)
-            decision_counts = {row['decision']: row['count'] for row in cursor.fetchall()}
-            
-            # 총 거래 금액
-            cursor.execute("SELECT SUM(total_value) as total_value FROM trades")
-            total_value = cursor.fetchone()['total_value'] or 0
-            
-            # 총 수수료
-            cursor.execute("SELECT SUM(fee) as total_fee FROM trades")
-            total_fee = cursor.fetchone()['total_fee'] or 0
-            
-            cursor.close()
-            
-            return {
-                'total_trades': total_trades,
-                'decision_counts': decision_counts,
-                'total_value': total_value,
-                'total_fee': total_fee
-            }
-            
-        except Error as e:
-            self.logger.error(f"거래 통계 조회 오류: {e}")
+        """전체 기간 거래 통계 조회 (통계 서비스의 단일 집계 쿼리 + TTL 캐시)"""
+        summary = get_trade_summary(days=None)
+        if not summary:
             return {}
+        return {key: summary[key] for key in ('total_trades', 'decision_counts', 'total_value', 'total_fee')}
 
 # 전역 거래 기록기 객체
 trade_recorder = TradeRecorder()
@@ -0,0 +1,385 @@
+"""
+DB 쓰기 대기열 모듈
+INSERT 요청을 대기열에 넣고 백그라운드 스레드에서 묶어서(executemany) 저장합니다.
+MySQL에 연결할 수 없는 동안에는 로컬 스풀 파일에 보관했다가 복구되면 다시 저장합니다.
+데이터 오류로 저장할 수 없는 요청은 격리 파일로 옮겨 나머지 요청의 저장을 막지 않습니다.
+"""
+
+import os
+import json
+import base64
+import time
+import queue
+import atexit
+import logging
+import threading
+from typing import Optional, Dict, Any, List, Tuple
+from mysql.connector import errors
+from .connection import pooled_connection
+from config.settings import (
+    WRITE_QUEUE_MAX_SIZE, WRITE_QUEUE_BATCH_SIZE, WRITE_QUEUE_FLUSH_INTERVAL,
+    WRITE_QUEUE_PUT_TIMEOUT, WRITE_QUEUE_RETRY_INTERVAL, WRITE_QUEUE_SPOOL_PATH,
+    WRITE_QUEUE_QUARANTINE_PATH
+)
+
+# 대기열 종료 신호
+_STOP = object()
+
+# 다시 시도하면 저장될 수 있는 연결 오류 (그 밖의 오류는 요청 자체의 문제로 보고 격리)
+_CONNECTIVITY_ERRORS = (errors.OperationalError, errors.InterfaceError, errors.PoolError)
+
+class _FlushRequest:
+    """flush() 대기 표시 (앞선 요청이 모두 커밋됐는지 함께 전달)"""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.committed = False
+
+def _encode_param(value):
+    """스풀 파일용 파라미터 변환 (바이너리는 Base64로 보관)"""
+    if isinstance(value, (bytes, bytearray)):
+        return {'__bytes__': base64.b64encode(value).decode('ascii')}
+    return value
+
+def _decode_param(value):
+    """스풀 파일 파라미터 복원"""
+    if isinstance(value, dict) and '__bytes__' in value:
+        return base64.b64decode(value['__bytes__'])
+    return value
+
+def _append_records(path: str, batch: List[Tuple[str, Tuple]]):
+    """요청을 JSON Lines 파일에 추가"""
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "a", encoding="utf-8") as f:
+        for query, params in batch:
+            record = {'query': query, 'params': [_encode_param(param) for param in params]}
+            f.write(json.dumps(record, ensure_ascii=False, default=str) + "\n")
+
+class WriteBehindQueue:
+    """
+    배치 쓰기 대기열
+
+    - 배치 크기(batch_size)가 차거나 flush_interval초가 지나면 한 트랜잭션으로 저장
+    - 대기열이 가득 차면 put_timeout초 동안 기다리고(backpressure), 그래도 가득 차면 스풀 파일에 기록
+    - 연결 오류로 저장에 실패하면 배치를 스풀 파일에 기록하고 retry_interval초 후 다시 시도
+    - 데이터 오류로 배치 저장에 실패하면 한 건씩 다시 저장하고, 실패한 요청은 격리 파일로 옮김
+    - 스풀 파일은 대기열이 한가할 때만 다시 저장 (실시간 배치 앞에서 재생하지 않음)
+    - 종료 시 남은 요청을 모두 저장 (실패하면 스풀 파일에 보관)
+    """
+
+    def __init__(self, max_size: int = WRITE_QUEUE_MAX_SIZE, batch_size: int = WRITE_QUEUE_BATCH_SIZE,
+                 flush_interval: float = WRITE_QUEUE_FLUSH_INTERVAL, put_timeout: float = WRITE_QUEUE_PUT_TIMEOUT,
+                 retry_interval: float = WRITE_QUEUE_RETRY_INTERVAL, spool_path: Optional[str] = WRITE_QUEUE_SPOOL_PATH,
+                 quarantine_path: Optional[str] = WRITE_QUEUE_QUARANTINE_PATH, connection_factory=pooled_connection):
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.put_timeout = put_timeout
+        self.retry_interval = retry_interval
+        self.spool_path = spool_path
+        self.quarantine_path = quarantine_path
+        self.connection_factory = connection_factory
+        self._queue = queue.Queue(maxsize=max_size)
+        self._thread: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+        self._spool_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self._retry_at = 0.0
+        self._uncommitted = False  # 마지막 flush 이후 커밋되지 못한 요청이 있었는지
+        self.logger = logging.getLogger(__name__)
+        self.stats = {'enqueued': 0, 'written': 0, 'batches': 0, 'spooled': 0, 'replayed': 0, 'failures': 0,
+                      'quarantined': 0}
+
+    def start(self):
+        """백그라운드 쓰기 스레드 시작"""
+        with self._start_lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="db-write-behind", daemon=True)
+                self._thread.start()
+
+    def enqueue(self, query: str, params: Tuple) -> bool:
+        """INSERT 요청을 대기열에 추가 (가득 차면 잠시 기다린 뒤 스풀 파일에 기록)"""
+        self.start()
+        try:
+            self._queue.put((query, tuple(params)), timeout=self.put_timeout)
+            self._count('enqueued')
+            return True
+        except queue.Full:
+            self.logger.warning("DB 쓰기 대기열이 가득 차서 스풀 파일에 기록합니다.")
+            self._mark_uncommitted()
+            return self._spool([(query, tuple(params))])
+
+    def flush(self, timeout: float = 10.0) -> bool:
+        """
+        지금까지 넣은 요청이 처리될 때까지 대기
+
+        Returns:
+            bool: 앞선 요청이 모두 DB에 커밋됐으면 True
+                  (시간 초과, 스풀 파일 보관, 격리된 요청이 있으면 False)
+        """
+        if self._thread is None or not self._thread.is_alive():
+            return True
+        request = _FlushRequest()
+        try:
+            self._queue.put(request, timeout=timeout)
+        except queue.Full:
+            return False
+        return request.done.wait(timeout) and request.committed
+
+    def stop(self, timeout: float = 10.0):
+        """남은 요청을 저장하고 쓰기 스레드 종료"""
+        if self._thread is None or not self._thread.is_alive():
+            return
+        try:
+            self._queue.put(_STOP, timeout=timeout)
+        except queue.Full:
+            self.logger.error("DB 쓰기 대기열 종료 신호를 보내지 못했습니다.")
+            return
+        self._thread.join(timeout)
+
+    def _run(self):
+        """쓰기 스레드: 배치를 모아 저장"""
+        while True:
+            batch: List[Tuple[str, Tuple]] = []
+            waiters: List[_FlushRequest] = []
+            stop = False
+            deadline = time.monotonic() + self.flush_interval
+
+            while len(batch) < self.batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if item is _STOP:
+                    stop = True
+                    break
+                if isinstance(item, _FlushRequest):
+                    waiters.append(item)
+                    break
+                batch.append(item)
+
+            # 종료 시에는 대기열에 남은 요청까지 모두 처리
+            if stop:
+                while True:
+                    try:
+                        item = self._queue.get_nowait()
+                    except queue.Empty:
+                        break
+                    if isinstance(item, _FlushRequest):
+                        waiters.append(item)
+                    elif item is not _STOP:
+                        batch.append(item)
+
+            if batch:
+                if not self._write_or_spool(batch):
+                    self._mark_uncommitted()
+            elif time.monotonic() >= self._retry_at:
+                self._try_replay_spool()
+
+            if waiters:
+                with self._stats_lock:
+                    committed, self._uncommitted = not self._uncommitted, False
+                for waiter in waiters:
+                    waiter.committed = committed
+                    waiter.done.set()
+            if stop:
+                return
+
+    def _count(self, key: str, amount: int = 1):
+        """통계 증가 (요청 스레드와 쓰기 스레드가 함께 갱신)"""
+        with self._stats_lock:
+            self.stats[key] += amount
+
+    def _mark_uncommitted(self):
+        with self._stats_lock:
+            self._uncommitted = True
+
+    def _write(self, batch: List[Tuple[str, Tuple]]):
+        """배치를 쿼리별 executemany로 한 트랜잭션에 저장"""
+        grouped: Dict[str, List[Tuple]] = {}
+        for query, params in batch:
+            grouped.setdefault(query, []).append(params)
+
+        with self.connection_factory() as connection:
+            connection.start_transaction()
+            try:
+                cursor = connection.cursor()
+                try:
+                    for query, rows in grouped.items():
+                        cursor.executemany(query, rows)
+                finally:
+                    cursor.close()
+                connection.commit()
+            except Exception:
+                connection.rollback()
+                raise
+
+    def _write_or_spool(self, batch: List[Tuple[str, Tuple]]) -> bool:
+        """
+        배치 저장, 연결 오류가 나거나 재시도 대기 중이면 스풀 파일에 기록
+
+        스풀 파일이 남아 있으면 먼저 재저장해 저장 순서(거래 id)가 요청 순서와 같도록 하고,
+        재저장하지 못하면 이번 배치도 스풀 파일 뒤에 이어서 기록합니다.
+
+        Returns:
+            bool: 배치 전체가 커밋됐으면 True
+        """
+        if time.monotonic() < self._retry_at or (self._spool_exists() and not self._try_replay_spool()):
+            self._spool(batch)
+            return False
+        try:
+            self._write(batch)
+        except _CONNECTIVITY_ERRORS as e:
+            self._defer(batch, e)
+            return False
+        except Exception as e:
+            self.logger.warning(f"DB 배치 저장 실패, 한 건씩 다시 저장합니다: {e}")
+            written, remaining = self._write_rows(batch)
+            if remaining:
+                self._defer(remaining, "연결 오류")
+            return written == len(batch)
+        self._count('written', len(batch))
+        self._count('batches')
+        return True
+
+    def _write_rows(self, batch: List[Tuple[str, Tuple]]) -> Tuple[int, List[Tuple[str, Tuple]]]:
+        """
+        요청을 한 건씩 저장하고 데이터 오류가 난 요청은 격리 파일로 옮김
+
+        Returns:
+            tuple: (저장한 요청 수, 연결 오류로 저장하지 못한 나머지 요청)
+        """
+        written = 0
+        for index, item in enumerate(batch):
+            try:
+                self._write([item])
+            except _CONNECTIVITY_ERRORS:
+                return written, batch[index:]
+            except Exception as e:
+                self.logger.error(f"저장할 수 없는 요청을 격리 파일로 옮깁니다: {e}")
+                self._quarantine(item, e)
+            else:
+                written += 1
+                self._count('written')
+        return written, []
+
+    def _defer(self, batch: List[Tuple[str, Tuple]], error):
+        """연결 오류: 스풀 파일에 기록하고 retry_interval초 동안 저장 시도 중단"""
+        self.logger.error(f"DB 배치 저장 실패, 스풀 파일에 기록합니다: {error}")
+        self._count('failures')
+        self._retry_at = time.monotonic() + self.retry_interval
+        self._spool(batch)
+
+    def _spool_exists(self) -> bool:
+        return bool(self.spool_path and os.path.exists(self.spool_path))
+
+    def _try_replay_spool(self) -> bool:
+        """스풀 파일 재저장 시도 (실패하면 retry_interval초 뒤에 다시 시도), 모두 비웠으면 True"""
+        try:
+            replayed = self._replay_spool()
+        except Exception as e:
+            self.logger.warning(f"스풀 파일 읽기 실패: {e}")
+            replayed = False
+        if not replayed:
+            self.logger.warning(f"스풀 파일 재저장 실패, {self.retry_interval}초 후 다시 시도합니다.")
+            self._retry_at = time.monotonic() + self.retry_interval
+        return replayed
+
+    def _spool(self, batch: List[Tuple[str, Tuple]]) -> bool:
+        """요청을 스풀 파일(JSON Lines)에 추가"""
+        if not self.spool_path:
+            return False
+        try:
+            with self._spool_lock:
+                _append_records(self.spool_path, batch)
+            self._count('spooled', len(batch))
+            return True
+        except OSError as e:
+            self.logger.error(f"스풀 파일 기록 실패: {e}")
+            return False
+
+    def _quarantine(self, item, error):
+        """저장할 수 없는 요청(또는 읽을 수 없는 스풀 줄)을 오류 내용과 함께 격리 파일에 기록"""
+        self._count('quarantined')
+        if not self.quarantine_path:
+            return
+        try:
+            os.makedirs(os.path.dirname(self.quarantine_path) or ".", exist_ok=True)
+            with open(self.quarantine_path, "a", encoding="utf-8") as f:
+                if isinstance(item, str):
+                    record = {'line': item}
+                else:
+                    record = {'query': item[0], 'params': [_encode_param(param) for param in item[1]]}
+                record['error'] = str(error)
+                f.write(json.dumps(record, ensure_ascii=False, default=str) + "\n")
+        except OSError as e:
+            self.logger.error(f"격리 파일 기록 실패: {e}")
+
+    def _replay_spool(self) -> bool:
+        """
+        스풀 파일에 보관된 요청을 DB에 저장
+
+        데이터 오류가 난 요청은 격리 파일로 옮기고, 연결 오류로 저장하지 못한 요청만 스풀 파일에 남깁니다.
+
+        Returns:
+            bool: 스풀 파일을 모두 비웠으면 True
+        """
+        if not self.spool_path or not os.path.exists(self.spool_path):
+            return True
+        with self._spool_lock:
+            batch = []
+            with open(self.spool_path, encoding="utf-8") as f:
+                for line in f:
+                    if not line.strip():
+                        continue
+                    try:
+                        record = json.loads(line)
+                        batch.append((record['query'], tuple(_decode_param(param) for param in record['params'])))
+                    except (ValueError, KeyError, TypeError) as e:
+                        self._quarantine(line.rstrip("\n"), e)
+
+            remaining = []
+            if batch:
+                try:
+                    self._write(batch)
+                    written = len(batch)
+                    self._count('written', written)
+                except _CONNECTIVITY_ERRORS:
+                    return False
+                except Exception as e:
+                    self.logger.warning(f"스풀 파일 일괄 저장 실패, 한 건씩 다시 저장합니다: {e}")
+                    written, remaining = self._write_rows(batch)
+                self._count('replayed', written)
+                self.logger.info(f"스풀 파일의 요청 {written}개를 저장했습니다.")
+
+            if remaining:
+                temp_path = self.spool_path + ".tmp"
+                if os.path.exists(temp_path):
+                    os.remove(temp_path)
+                _append_records(temp_path, remaining)
+                os.replace(temp_path, self.spool_path)
+                return False
+            os.remove(self.spool_path)
+            return True
+
+    def get_stats(self) -> Dict[str, Any]:
+        """대기열 통계 반환"""
+        with self._stats_lock:
+            stats = dict(self.stats)
+        stats['pending'] = self._queue.qsize()
+        stats['spool_exists'] = self._spool_exists()
+        return stats
+
+# 전역 쓰기 대기열 인스턴스
+write_queue = WriteBehindQueue()
+atexit.register(write_queue.stop)
+
+def enqueue_insert(query: str, params: Tuple) -> bool:
+    """INSERT 요청을 쓰기 대기열에 추가 (편의 함수)"""
+    return write_queue.enqueue(query, params)
+
+def flush_write_queue(timeout: float = 10.0) -> bool:
+    """쓰기 대기열이 비워질 때까지 대기 (편의 함수)"""
+    return write_queue.flush(timeout)
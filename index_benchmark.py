@@ -0,0 +1,180 @@
+"""
+인덱스 벤치마크 스크립트
+실제 테이블 구조를 복사한 벤치마크 테이블에 대량의 합성 데이터를 넣고
+조회 경로의 쿼리 지연 시간을 마이그레이션 인덱스 적용 전/후로 비교합니다.
+
+사용법: python index_benchmark.py [--rows 1000000] [--repeat 5] [--keep]
+"""
+
+import sys
+import os
+import time
+import random
+import argparse
+import statistics
+from datetime import datetime, timedelta
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from database.connection import init_database, db_cursor
+from database.migrations import MIGRATIONS, add_index
+
+BENCH_PREFIX = "bench_"
+INSERT_CHUNK_SIZE = 5000
+
+def _random_timestamp(now: datetime, days: int = 365) -> datetime:
+    return now - timedelta(seconds=random.randint(0, days * 86400))
+
+def _trade_row(now):
+    action = random.choice(['buy', 'sell', 'hold', 'hold'])
+    return (_random_timestamp(now), action, action,
+            random.uniform(3e7, 1e8), random.uniform(0, 0.1), random.uniform(0, 1e6), random.uniform(0, 500),
+            random.uniform(0, 1e7), random.uniform(0, 1), random.choice(['executed', 'failed']),
+            random.random(), "benchmark")
+
+def _market_data_row(now):
+    return (_random_timestamp(now), random.uniform(3e7, 1e8), random.uniform(0, 1e12), random.uniform(-10, 10),
+            random.uniform(0, 100), random.uniform(-1000, 1000), random.uniform(-1000, 1000), random.randint(0, 100))
+
+def _system_log_row(now):
+    return (_random_timestamp(now), random.choice(['INFO'] * 8 + ['WARNING', 'ERROR']), "benchmark message", "bench")
+
+def _reflection_row(now):
+    return (random.randint(1, 1000000), random.choice(['immediate'] * 7 + ['daily', 'weekly', 'monthly']),
+            random.random(), random.uniform(-1e5, 1e5), _random_timestamp(now))
+
+def _metric_row(now):
+    start = _random_timestamp(now)
+    return (random.choice(['daily', 'weekly', 'monthly']), start, start + timedelta(days=1),
+            random.randint(0, 50), random.randint(0, 25), random.randint(0, 25))
+
+# 테이블별 (INSERT 컬럼, 행 생성 함수)
+BENCH_TABLES = {
+    'trades': ("timestamp, decision, action, price, amount, total_value, fee, balance_krw, balance_btc, "
+               "status, confidence, reasoning", _trade_row),
+    'market_data': ("timestamp, current_price, volume_24h, change_24h, rsi, macd, macd_signal, fear_greed_index",
+                    _market_data_row),
+    'system_logs': ("timestamp, level, message, module", _system_log_row),
+    'trading_reflections': ("trade_id, reflection_type, performance_score, profit_loss, created_at", _reflection_row),
+    'performance_metrics': ("period_type, period_start, period_end, total_trades, winning_trades, losing_trades",
+                            _metric_row),
+}
+
+def bench_queries(now: datetime):
+    """조회 경로별 벤치마크 쿼리 (이름, 테이블, SQL, 파라미터)"""
+    week_ago = now - timedelta(days=7)
+    return [
+        ("최근 거래 (get_recent_trades)", 'trades',
+         "SELECT * FROM {table} ORDER BY timestamp DESC LIMIT 10", ()),
+        ("기간 거래 (get_trades_by_date_range)", 'trades',
+         "SELECT * FROM {table} WHERE timestamp BETWEEN %s AND %s ORDER BY timestamp DESC", (week_ago, now)),
+        ("결정별 통계 (get_trade_statistics)", 'trades',
+         "SELECT decision, COUNT(*) FROM {table} WHERE timestamp >= %s GROUP BY decision", (week_ago,)),
+        ("매매 금액 (get_trade_statistics)", 'trades',
+         "SELECT SUM(total_value) FROM {table} WHERE timestamp >= %s AND action IN ('buy', 'sell')", (week_ago,)),
+        ("대시보드 거래 (dashboard.get_recent_trades)", 'trades',
+         "SELECT id, timestamp, decision, action, price FROM {table} ORDER BY created_at DESC LIMIT 50", ()),
+        ("대시보드 시장 데이터 (dashboard.get_market_data)", 'market_data',
+         "SELECT * FROM {table} ORDER BY created_at DESC LIMIT 100", ()),
+        ("로그 레벨 조회 (get_system_logs)", 'system_logs',
+         "SELECT * FROM {table} WHERE level = %s ORDER BY timestamp DESC LIMIT 100", ('ERROR',)),
+        ("반성 유형 통계 (get_reflection_summary)", 'trading_reflections',
+         "SELECT reflection_type, COUNT(*) FROM {table} WHERE created_at >= DATE_SUB(NOW(), INTERVAL %s DAY) "
+         "GROUP BY reflection_type", (7,)),
+        ("최근 반성 (get_recent_reflections)", 'trading_reflections',
+         "SELECT * FROM {table} ORDER BY created_at DESC LIMIT 10", ()),
+        ("성과 지표 (get_performance_metrics)", 'performance_metrics',
+         "SELECT * FROM {table} WHERE period_type = %s AND period_start >= DATE_SUB(NOW(), INTERVAL %s DAY) "
+         "ORDER BY period_start DESC", ('daily', 30)),
+    ]
+
+def prepare_table(cursor, table: str, rows: int, now: datetime):
+    """원본 구조를 복사한 벤치마크 테이블을 만들고 보조 인덱스 제거 후 데이터 채우기"""
+    bench_table = BENCH_PREFIX + table
+    cursor.execute(f"DROP TABLE IF EXISTS `{bench_table}`")
+    cursor.execute(f"CREATE TABLE `{bench_table}` LIKE `{table}`")
+    cursor.execute("""
+        SELECT DISTINCT index_name FROM information_schema.statistics
+        WHERE table_schema = DATABASE() AND table_name = %s AND index_name <> 'PRIMARY'
+    """, (bench_table,))
+    for (index_name,) in cursor.fetchall():
+        cursor.execute(f"ALTER TABLE `{bench_table}` DROP INDEX `{index_name}`")
+
+    columns, make_row = BENCH_TABLES[table]
+    placeholders = ", ".join(["%s"] * len(columns.split(",")))
+    insert_query = f"INSERT INTO `{bench_table}` ({columns}) VALUES ({placeholders})"
+    start = time.perf_counter()
+    for offset in range(0, rows, INSERT_CHUNK_SIZE):
+        chunk = [make_row(now) for _ in range(min(INSERT_CHUNK_SIZE, rows - offset))]
+        cursor.executemany(insert_query, chunk)
+    cursor.execute(f"ANALYZE TABLE `{bench_table}`")
+    cursor.fetchall()
+    print(f"📦 {bench_table}: {rows:,}행 생성 ({time.perf_counter() - start:.1f}초)")
+
+def apply_bench_indexes(cursor, table: str) -> int:
+    """마이그레이션에 정의된 인덱스를 벤치마크 테이블에 추가"""
+    bench_table = BENCH_PREFIX + table
+    added = 0
+    for _, _, indexes in MIGRATIONS:
+        for index_table, index_name, columns in indexes:
+            if index_table == table and isinstance(columns, tuple) and add_index(cursor, bench_table, index_name, columns):
+                added += 1
+    cursor.execute(f"ANALYZE TABLE `{bench_table}`")
+    cursor.fetchall()
+    return added
+
+def measure(cursor, queries, repeat: int):
+    """쿼리별 지연 시간 중앙값(ms)"""
+    results = {}
+    for name, table, sql, params in queries:
+        query = sql.format(table=BENCH_PREFIX + table)
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            cursor.execute(query, params)
+            cursor.fetchall()
+            timings.append((time.perf_counter() - start) * 1000)
+        results[name] = statistics.median(timings)
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description="마이그레이션 인덱스 적용 전/후 쿼리 지연 시간 비교")
+    parser.add_argument("--rows", type=int, default=1000000, help="테이블별 생성할 행 수")
+    parser.add_argument("--repeat", type=int, default=5, help="쿼리별 반복 횟수")
+    parser.add_argument("--keep", action="store_true", help="벤치마크 테이블을 삭제하지 않음")
+    args = parser.parse_args()
+
+    if not init_database():
+        print("❌ 데이터베이스 초기화 실패")
+        return
+
+    random.seed(42)
+    now = datetime.now()
+    queries = bench_queries(now)
+
+    with db_cursor() as cursor:
+        for table in BENCH_TABLES:
+            prepare_table(cursor, table, args.rows, now)
+
+        print("\n⏱️ 인덱스 적용 전 측정 중...")
+        before = measure(cursor, queries, args.repeat)
+
+        added = sum(apply_bench_indexes(cursor, table) for table in BENCH_TABLES)
+        print(f"🔧 인덱스 {added}개 추가")
+
+        print("⏱️ 인덱스 적용 후 측정 중...")
+        after = measure(cursor, queries, args.repeat)
+
+        if not args.keep:
+            for table in BENCH_TABLES:
+                cursor.execute(f"DROP TABLE IF EXISTS `{BENCH_PREFIX + table}`")
+
+    print("\n" + "=" * 80)
+    print(f"📊 쿼리 지연 시간 (테이블별 {args.rows:,}행, {args.repeat}회 중앙값)")
+    print("=" * 80)
+    print(f"{'쿼리':<48} {'적용 전':>10} {'적용 후':>10} {'개선':>8}")
+    for name, _, _, _ in queries:
+        speedup = before[name] / after[name] if after[name] > 0 else float('inf')
+        print(f"{name:<48} {before[name]:>8.1f}ms {after[name]:>8.1f}ms {speedup:>7.1f}x")
+
+if __name__ == "__main__":
+    main()
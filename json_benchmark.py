@@ -0,0 +1,95 @@
+"""
+JSON 직렬화 벤치마크 스크립트
+실제 수집 형태(일봉 30개, 분봉 1440개 + 기술적 지표, 오더북, 뉴스)의 시장 데이터로
+기존 경로와 새 직렬화 경로의 시간과 크기를 비교합니다.
+
+- 기존: to_dict('records') → 프롬프트용 json.dumps → DB용 clean_json_data + json.dumps
+- 새 방식: DataFrame 단계에서 NaN/Infinity 정리 → 프롬프트용 한 번 직렬화 (프롬프트/DB에 재사용)
+  + 스냅샷 해시용 정규화 직렬화 (실행 환경과 관계없이 같은 해시가 나오도록 항상 표준 json)
+
+사용법: python json_benchmark.py [--repeat 200]
+"""
+
+import sys
+import os
+import json
+import time
+import argparse
+import statistics
+import pandas as pd
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from analysis.technical_indicators import calculate_technical_indicators
+from analysis.ai_analysis import create_market_analysis_data
+from database.snapshot_store import encode_snapshot
+from utils.json_cleaner import clean_json_data
+from utils import json_serializer
+from test_utils import make_candles
+
+def make_inputs():
+    """create_market_analysis_data 입력값"""
+    daily_df = calculate_technical_indicators(make_candles(30, seed=1, freq="D"))
+    minute_df = calculate_technical_indicators(make_candles(1440, seed=2))
+    orderbook = {
+        'total_ask_size': 12.345678, 'total_bid_size': 9.87654321,
+        'orderbook_units': [{'ask_price': 100010000 + i * 1000, 'bid_price': 100000000 - i * 1000,
+                             'ask_size': 0.123456789, 'bid_size': 0.987654321} for i in range(15)]
+    }
+    news = [{'title': f'Bitcoin news {i}', 'link': f'https://example.com/{i}', 'snippet': '비트코인 ' * 40,
+             'source': 'Example', 'date': '1 hour ago', 'position': i, 'sentiment_score': 0.25,
+             'sentiment': '긍정', 'positive_keywords': 2, 'negative_keywords': 0} for i in range(10)]
+    return daily_df, minute_df, float(minute_df['Close'].iloc[-1]), orderbook, {'current_value': 55}, news
+
+def legacy_path(daily_df, minute_df, current_price, orderbook, fear_greed, news):
+    """기존 경로: 레코드 변환 후 프롬프트와 DB 저장에서 각각 직렬화"""
+    market_data = dict(create_market_analysis_data(pd.DataFrame(), pd.DataFrame(), current_price,
+                                                   orderbook, fear_greed, news))
+    market_data['daily_data'] = daily_df.to_dict('records')
+    market_data['minute_data'] = minute_df.tail(100).to_dict('records')
+    prompt = json.dumps(market_data, default=str)
+    stored = json.dumps(clean_json_data(market_data), ensure_ascii=False)
+    return prompt, stored
+
+def new_path(*inputs):
+    """새 경로: 프롬프트용 직렬화 + 스냅샷 저장 (해시용 정규화 바이트)"""
+    market_data = create_market_analysis_data(*inputs)
+    prompt = json_serializer.dumps_str(market_data)
+    snapshot_hash, _ = encode_snapshot(market_data)
+    return prompt, snapshot_hash
+
+def measure(function, inputs, repeat: int) -> float:
+    """반복 실행 중앙값 (ms)"""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function(*inputs)
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+def main():
+    parser = argparse.ArgumentParser(description="시장 데이터 JSON 직렬화 경로 비교")
+    parser.add_argument("--repeat", type=int, default=200, help="경로별 반복 횟수")
+    args = parser.parse_args()
+
+    inputs = make_inputs()
+    legacy_prompt, legacy_stored = legacy_path(*inputs)
+    new_prompt, _ = new_path(*inputs)
+
+    # 새 경로는 압축/해시까지 포함하므로 직렬화만 따로 측정
+    serialize_only = lambda *values: json_serializer.dumps_bytes(create_market_analysis_data(*values))
+    legacy_ms = measure(legacy_path, inputs, args.repeat)
+    serialize_ms = measure(serialize_only, inputs, args.repeat)
+    new_ms = measure(new_path, inputs, args.repeat)
+
+    print("=" * 70)
+    print(f"📊 시장 데이터 직렬화 ({args.repeat}회 중앙값, 인코더: {'orjson' if json_serializer.orjson else 'json'})")
+    print("=" * 70)
+    print(f"{'경로':<40} {'시간':>10} {'크기':>14}")
+    print(f"{'기존 (프롬프트 + DB 각각 직렬화)':<40} {legacy_ms:>8.2f}ms "
+          f"{len(legacy_prompt.encode()) + len(legacy_stored.encode()):>12,}B")
+    print(f"{'새 방식 (1회 직렬화)':<40} {serialize_ms:>8.2f}ms {len(new_prompt.encode()):>12,}B")
+    print(f"{'새 방식 (1회 직렬화 + 스냅샷 압축/해시)':<40} {new_ms:>8.2f}ms")
+    print(f"⚡ 직렬화 개선: {legacy_ms / serialize_ms:.1f}x")
+
+if __name__ == "__main__":
+    main()
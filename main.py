@@ -4,16 +4,21 @@
 
 import time
 import pyupbit
-from config.settings import validate_api_keys, UPBIT_ACCESS_KEY, UPBIT_SECRET_KEY, ANALYSIS_INTERVAL
+from config.settings import (
+    validate_api_keys, UPBIT_ACCESS_KEY, UPBIT_SECRET_KEY, ANALYSIS_INTERVAL, DAILY_INDICATOR_BACKEND
+)
 from data.market_data import get_market_data
 from data.news_data import get_bitcoin_news, analyze_news_sentiment, get_news_summary
-from data.screenshot import capture_upbit_screenshot, create_images_directory
+from data.screenshot import create_images_directory
+from data.chart_renderer import get_chart_image
 from analysis.technical_indicators import calculate_technical_indicators
 from analysis.ai_analysis import create_market_analysis_data, ai_trading_decision_with_indicators, ai_trading_decision_with_vision
 from trading.account import get_investment_status, get_pending_orders, get_recent_orders
-from trading.execution import execute_trading_decision
+from trading.execution import execute_trading_decision, attach_market_impact
 from utils.logger import setup_logger, log_trading_decision, log_execution_result
 from database.connection import init_database
+from database.retention import apply_retention_if_due
+from database.parquet_archive import archive_to_parquet_if_due
 from database.trade_recorder import save_market_data_record, save_system_log_record
 
 def main_trading_cycle_with_vision(upbit, logger):
@@ -28,9 +33,9 @@ def main_trading_cycle_with_vision(upbit, logger):
         
         # 기술적 지표 계산
         if daily_df is not None:
-            daily_df = calculate_technical_indicators(daily_df)
+            daily_df = calculate_technical_indicators(daily_df, backend=DAILY_INDICATOR_BACKEND)
         if minute_df is not None:
-            minute_df = calculate_technical_indicators(minute_df)
+            minute_df = calculate_technical_indicators(minute_df, stream_name='minute')
         
         # 뉴스 데이터 수집 및 분석
         analyzed_news = None
@@ -40,28 +45,31 @@ def main_trading_cycle_with_vision(upbit, logger):
             if analyzed_news:
                 news_summary = get_news_summary(analyzed_news)
         
-        # 투자 상태 조회
-        investment_status = get_investment_status(upbit)
+        # 투자 상태 조회 (시장 데이터 수집 때 조회한 현재가 사용, 잔고는 캐시)
+        investment_status = get_investment_status(upbit, current_price)
         
         # AI 분석용 데이터 생성 (기술적 지표, 공포탐욕지수, 뉴스 포함)
         market_data = create_market_analysis_data(daily_df, minute_df, current_price, orderbook, fear_greed_data, analyzed_news)
         
-        # 차트 스크린샷 캡처 및 base64 인코딩
-        print("📸 차트 스크린샷을 캡처합니다...")
+        # 예상 주문의 슬리피지 추정 (프롬프트 직렬화 전에 기록해야 직렬화 결과를 거래 기록에 재사용)
+        attach_market_impact(market_data, investment_status)
+        
+        # 차트 이미지 생성 (직접 렌더링, 실패 시 스크린샷) 및 base64 인코딩
+        print("📸 차트 이미지를 준비합니다...")
         try:
             create_images_directory()
-            screenshot_result = capture_upbit_screenshot()
-            if screenshot_result:
-                filepath, chart_image_base64 = screenshot_result
-                print(f"✅ 차트 스크린샷 캡처 완료: {filepath}")
+            chart_result = get_chart_image(daily_df, minute_df)
+            if chart_result:
+                chart_source, chart_image_base64 = chart_result
+                print(f"✅ 차트 이미지 준비 완료: {chart_source}")
                 
                 # AI 매매 결정 (Vision API 포함)
                 decision = ai_trading_decision_with_vision(market_data, chart_image_base64)
             else:
-                print("⚠️ 차트 스크린샷 캡처 실패, 기존 방식으로 진행합니다.")
+                print("⚠️ 차트 이미지 준비 실패, 기존 방식으로 진행합니다.")
                 decision = ai_trading_decision_with_indicators(market_data)
         except Exception as e:
-            print(f"⚠️ 차트 스크린샷 캡처 중 오류: {e}")
+            print(f"⚠️ 차트 이미지 준비 중 오류: {e}")
             print("기존 방식으로 진행합니다.")
             decision = ai_trading_decision_with_indicators(market_data)
         
@@ -97,9 +105,9 @@ def main_trading_cycle_with_indicators(upbit, logger):
         
         # 기술적 지표 계산
         if daily_df is not None:
-            daily_df = calculate_technical_indicators(daily_df)
+            daily_df = calculate_technical_indicators(daily_df, backend=DAILY_INDICATOR_BACKEND)
         if minute_df is not None:
-            minute_df = calculate_technical_indicators(minute_df)
+            minute_df = calculate_technical_indicators(minute_df, stream_name='minute')
         
         # 뉴스 데이터 수집 및 분석
         analyzed_news = None
@@ -109,12 +117,15 @@ def main_trading_cycle_with_indicators(upbit, logger):
             if analyzed_news:
                 news_summary = get_news_summary(analyzed_news)
         
-        # 투자 상태 조회
-        investment_status = get_investment_status(upbit)
+        # 투자 상태 조회 (시장 데이터 수집 때 조회한 현재가 사용, 잔고는 캐시)
+        investment_status = get_investment_status(upbit, current_price)
         
         # AI 분석용 데이터 생성 (기술적 지표, 공포탐욕지수, 뉴스 포함)
         market_data = create_market_analysis_data(daily_df, minute_df, current_price, orderbook, fear_greed_data, analyzed_news)
         
+        # 예상 주문의 슬리피지 추정 (프롬프트 직렬화 전에 기록해야 직렬화 결과를 거래 기록에 재사용)
+        attach_market_impact(market_data, investment_status)
+        
         # AI 매매 결정 (기술적 지표, 공포탐욕지수, 뉴스 포함)
         decision = ai_trading_decision_with_indicators(market_data)
         
@@ -160,7 +171,7 @@ def main():
         print("✅ 데이터베이스 초기화 완료")
     else:
         print("❌ 데이터베이스 초기화 실패")
-        print("💡 MySQL 서버가 실행 중인지 확인해주세요.")
+        print("💡 MySQL 서버가 실행 중인지 확인하거나, 서버 없이 실행하려면 DB_BACKEND=sqlite로 설정해주세요.")
         return
     
     # 업비트 연결
@@ -176,6 +187,16 @@ def main():
             # 메인 트레이딩 사이클 실행 (Vision API 포함)
             main_trading_cycle_with_vision(upbit, logger)
             
+            # 보존 기간이 지난 시장 데이터/로그 파티션 보관 및 삭제 (RETENTION_INTERVAL_HOURS마다)
+            dropped = apply_retention_if_due()
+            if dropped:
+                print(f"🗄️ 만료 파티션 정리: {dropped}")
+            
+            # 마감된 캔들/지표와 새 거래를 Parquet 분석 아카이브에 추가 (PARQUET_ARCHIVE_INTERVAL_MINUTES마다)
+            archived = archive_to_parquet_if_due()
+            if archived:
+                print(f"📦 Parquet 아카이브 저장: {archived}")
+            
             print("\n" + "=" * 60)
             print(f"⏰ {ANALYSIS_INTERVAL/60:.1f}분 후 다음 분석을 시작합니다...")
             print("=" * 60 + "\n")
@@ -0,0 +1,132 @@
+"""
+모의 거래(페이퍼 트레이딩) 실행 스크립트
+기록된 분봉(Parquet 분석 아카이브 또는 CSV)을 모의 거래소로 재생하며 main.py의 트레이딩 사이클을
+실제 거래소 없이 반복 실행하고, 사이클 소요 시간/API 호출 수/수익률을 보고합니다.
+
+거래 기록은 기본적으로 별도 SQLite 파일(db/paper_trading.db)에 저장합니다.
+
+사용 예:
+    python paper_trading.py --cycles 100 --decision random --offline
+    python paper_trading.py --csv candles.csv --speed 60 --profile
+"""
+
+import os
+import sys
+import time
+import random
+import argparse
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+# 실제 거래 기록과 섞이지 않도록 설정 모듈을 불러오기 전에 모의 거래용 저장소 지정
+os.environ.setdefault("DB_BACKEND", "sqlite")
+os.environ.setdefault("SQLITE_PATH", "db/paper_trading.db")
+
+import pandas as pd
+from datetime import timedelta
+import main
+import data.market_data as market_data
+from config.settings import ANALYSIS_INTERVAL, MINUTE_DATA_COUNT, PAPER_SPEED
+from database.connection import init_database
+from trading.paper_exchange import MarketReplay, PaperExchange
+from trading.sliced_execution import sliced_execution_engine
+from utils.logger import setup_logger
+
+def random_decision(rng: random.Random):
+    """AI 없이 부하 테스트용 무작위 매매 결정"""
+    def decide(market_data, *args, **kwargs):
+        decision = rng.choice(['buy', 'sell', 'hold'])
+        return {'decision': decision, 'confidence': round(rng.random(), 2), 'reasoning': '모의 거래 무작위 결정'}
+    return decide
+
+def load_replay(args) -> MarketReplay:
+    """재생할 분봉 로드 (CSV 인덱스는 KST 캔들 시작 시각)"""
+    if args.csv:
+        candles = pd.read_csv(args.csv, index_col=0, parse_dates=True)
+        return MarketReplay(candles)
+    start = pd.Timestamp(args.start).to_pydatetime() if args.start else None
+    end = pd.Timestamp(args.end).to_pydatetime() if args.end else None
+    return MarketReplay.from_archive(start=start, end=end)
+
+def percentile(values, ratio: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(int(len(ordered) * ratio), len(ordered) - 1)]
+
+def run(exchange: PaperExchange, cycles: int, interval: float, logger):
+    """트레이딩 사이클 반복 (사이클마다 시뮬레이션 시각을 interval만큼 진행)"""
+    durations = []
+    for cycle in range(cycles):
+        if exchange.finished:
+            print("📼 기록된 캔들을 모두 재생했습니다.")
+            break
+        print(f"\n🧪 모의 거래 사이클 {cycle + 1}/{cycles} ({exchange.now:%Y-%m-%d %H:%M})")
+        started = time.perf_counter()
+        main.main_trading_cycle_with_indicators(exchange, logger)
+        sliced_execution_engine.wait()  # 분할 주문은 다음 사이클 전에 마무리
+        durations.append(time.perf_counter() - started)
+        exchange.advance(interval)
+        if exchange.speed:
+            time.sleep(interval / exchange.speed)
+    return durations
+
+def print_report(exchange: PaperExchange, durations):
+    summary = exchange.get_summary()
+    print("\n" + "=" * 60)
+    print("📊 모의 거래 결과")
+    print("=" * 60)
+    if durations:
+        print(f"⏱️ 사이클 {len(durations)}회: 평균 {sum(durations) / len(durations):.3f}초, "
+              f"p95 {percentile(durations, 0.95):.3f}초, 최대 {max(durations):.3f}초")
+    print(f"🏦 평가 자산: {summary['equity']:,.0f}원 ({summary['return_pct']:+.2f}%)")
+    print(f"💰 현금: {summary['krw_balance']:,.0f}원, ₿ {summary['btc_balance']:.8f} BTC")
+    print(f"📋 주문 {summary['orders']}건 (체결 {summary['filled_orders']}건), 수수료 {summary['fees_paid']:,.0f}원")
+    print(f"🔌 API 호출: {summary['api_calls']}")
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="기록된 시세로 트레이딩 사이클을 모의 실행합니다.")
+    parser.add_argument("--csv", help="분봉 CSV 경로 (없으면 Parquet 분석 아카이브 사용)")
+    parser.add_argument("--start", help="아카이브 조회 시작 시각 (KST)")
+    parser.add_argument("--end", help="아카이브 조회 종료 시각 (KST)")
+    parser.add_argument("--cycles", type=int, default=100, help="실행할 사이클 수")
+    parser.add_argument("--interval", type=float, default=ANALYSIS_INTERVAL, help="사이클 간격 (시뮬레이션 초)")
+    parser.add_argument("--warmup-minutes", type=int, default=MINUTE_DATA_COUNT, help="지표 계산용으로 먼저 흘려보낼 분봉 수")
+    parser.add_argument("--speed", type=float, default=PAPER_SPEED, help="재생 배속 (0이면 기다리지 않음)")
+    parser.add_argument("--decision", choices=['ai', 'random'], default='ai', help="매매 결정 방식")
+    parser.add_argument("--seed", type=int, default=0, help="무작위 결정 시드")
+    parser.add_argument("--offline", action="store_true", help="뉴스/공포탐욕지수 수집 생략")
+    parser.add_argument("--profile", action="store_true", help="cProfile로 누적 시간 상위 함수 출력")
+    return parser.parse_args()
+
+def main_paper_trading():
+    args = parse_args()
+    replay = load_replay(args)
+    if replay.candles.empty:
+        print("❌ 재생할 분봉이 없습니다. Parquet 아카이브를 만들거나 --csv를 지정해주세요.")
+        return
+    exchange = PaperExchange(replay, speed=args.speed,
+                             start=replay.start + timedelta(minutes=args.warmup_minutes))
+    print(f"📼 분봉 {len(replay.candles):,}개 재생: {exchange.now} ~ {replay.end}")
+
+    if args.decision == 'random':
+        main.ai_trading_decision_with_indicators = random_decision(random.Random(args.seed))
+    if args.offline:
+        main.get_bitcoin_news = lambda: None
+        market_data.get_fear_greed_index = lambda: None
+
+    logger = setup_logger()
+    if not init_database():
+        print("❌ 데이터베이스 초기화 실패")
+        return
+
+    with exchange.install():
+        if args.profile:
+            import cProfile
+            import pstats
+            profiler = cProfile.Profile()
+            durations = profiler.runcall(run, exchange, args.cycles, args.interval, logger)
+            pstats.Stats(profiler).sort_stats('cumulative').print_stats(25)
+        else:
+            durations = run(exchange, args.cycles, args.interval, logger)
+    print_report(exchange, durations)
+
+if __name__ == "__main__":
+    main_paper_trading()
@@ -0,0 +1,102 @@
+"""
+프롬프트 페이로드 리플레이 스크립트
+저장된 거래의 시장 데이터로 full/compact 형식의 AI 결정을 다시 실행해
+토큰 수와 결정 일치율을 비교합니다.
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from database.connection import init_database, db_cursor
+from database.snapshot_store import load_trade_market_data
+from utils.json_serializer import dumps_str
+from analysis.ai_analysis import ai_trading_decision_with_indicators
+from analysis.prompt_payload import build_prompt_payload, count_tokens
+
+def load_replay_samples(limit: int = 20):
+    """시장 데이터가 저장된 최근 거래 조회 (스냅샷 저장소 참조 포함)"""
+    with db_cursor(dictionary=True) as cursor:
+        cursor.execute("""
+            SELECT id, timestamp, decision, market_data, market_snapshot_hash
+            FROM trades
+            WHERE market_data IS NOT NULL OR market_snapshot_hash IS NOT NULL
+            ORDER BY timestamp DESC
+            LIMIT %s
+        """, (limit,))
+        rows = cursor.fetchall()
+
+    samples = []
+    for row in rows:
+        market_data = load_trade_market_data(row)
+        if market_data and market_data.get('daily_data'):
+            samples.append({'id': row['id'], 'timestamp': row['timestamp'], 'decision': row['decision'],
+                            'market_data': market_data})
+    return samples
+
+def replay(samples):
+    """샘플마다 두 형식으로 결정을 실행하고 비교"""
+    results = []
+    for sample in samples:
+        market_data = sample['market_data']
+        print(f"\n📅 거래 #{sample['id']} ({sample['timestamp']}) 원래 결정: {sample['decision']}")
+
+        full_tokens = count_tokens(dumps_str(market_data))
+        _, stats = build_prompt_payload(market_data)
+
+        full_decision = ai_trading_decision_with_indicators(market_data, payload_format="full", use_cache=False)
+        compact_decision = ai_trading_decision_with_indicators(market_data, payload_format="compact", use_cache=False)
+        if not full_decision or not compact_decision:
+            print("⚠️ AI 결정 실패, 건너뜁니다.")
+            continue
+
+        results.append({
+            'id': sample['id'],
+            'full_tokens': full_tokens,
+            'compact_tokens': stats['total_tokens'],
+            'full_decision': full_decision['decision'],
+            'compact_decision': compact_decision['decision'],
+            'confidence_diff': abs(full_decision['confidence'] - compact_decision['confidence'])
+        })
+    return results
+
+def print_report(results):
+    """리플레이 결과 요약 출력"""
+    if not results:
+        print("❌ 비교할 결과가 없습니다.")
+        return
+
+    count = len(results)
+    agreement = sum(1 for r in results if r['full_decision'] == r['compact_decision']) / count
+    avg_full = sum(r['full_tokens'] for r in results) / count
+    avg_compact = sum(r['compact_tokens'] for r in results) / count
+    avg_confidence_diff = sum(r['confidence_diff'] for r in results) / count
+
+    print("\n" + "=" * 60)
+    print("📊 프롬프트 페이로드 리플레이 결과")
+    print(f"   샘플 수: {count}")
+    print(f"   결정 일치율: {agreement:.1%}")
+    print(f"   평균 신뢰도 차이: {avg_confidence_diff:.3f}")
+    print(f"   평균 토큰: full {avg_full:,.0f} → compact {avg_compact:,.0f} ({(1 - avg_compact / avg_full) * 100:.1f}% 절감)")
+    for r in results:
+        mark = "✅" if r['full_decision'] == r['compact_decision'] else "❌"
+        print(f"   {mark} #{r['id']}: {r['full_decision']} / {r['compact_decision']} "
+              f"({r['full_tokens']:,} → {r['compact_tokens']:,} 토큰)")
+
+def main():
+    """메인 함수"""
+    limit = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+
+    print("🔁 프롬프트 페이로드 리플레이")
+    print("=" * 60)
+
+    if not init_database():
+        print("❌ 데이터베이스 연결 실패")
+        return
+
+    samples = load_replay_samples(limit)
+    print(f"📂 리플레이 샘플: {len(samples)}개")
+    print_report(replay(samples))
+
+if __name__ == "__main__":
+    main()
@@ -11,84 +11,22 @@ from selenium.webdriver.support import expected_conditions as EC
 from webdriver_manager.chrome import ChromeDriverManager
 from PIL import Image
 import io
+from data.screenshot import optimize_image as _optimize_image
 
-def optimize_image(image_path, max_size_mb=2.0, quality=85):
+def optimize_image(image_source, max_size_mb=2.0, quality=85):
     """
     이미지를 최적화하여 파일 크기를 줄이고 품질을 유지
+    (data.screenshot.optimize_image와 같은 이진 탐색 인코더 사용)
     
     Args:
-        image_path (str): 원본 이미지 경로
+        image_source (str | bytes): 원본 이미지 경로 또는 이미지 bytes
         max_size_mb (float): 최대 파일 크기 (MB)
-        quality (int): JPEG 품질 (1-100)
+        quality (int): 최대 JPEG 품질 (1-100)
     
     Returns:
         tuple: (최적화된 이미지 bytes, 최적화 정보 dict)
     """
-    try:
-        # 원본 이미지 로드
-        with Image.open(image_path) as img:
-            original_size = os.path.getsize(image_path) / (1024 * 1024)  # MB
-            original_width, original_height = img.size
-            
-            print(f"📏 원본 이미지 크기: {original_size:.2f} MB ({original_width}x{original_height})")
-            
-            # RGB 모드로 변환 (JPEG 최적화를 위해)
-            if img.mode != 'RGB':
-                img = img.convert('RGB')
-            
-            # 이미지 크기 조정 (너무 큰 경우)
-            max_dimension = 1920
-            if original_width > max_dimension or original_height > max_dimension:
-                # 비율 유지하면서 크기 조정
-                ratio = min(max_dimension / original_width, max_dimension / original_height)
-                new_width = int(original_width * ratio)
-                new_height = int(original_height * ratio)
-                img = img.resize((new_width, new_height), Image.Resampling.LANCZOS)
-                print(f"📐 이미지 크기 조정: {new_width}x{new_height}")
-            
-            # 최적화된 이미지를 메모리에 저장
-            output_buffer = io.BytesIO()
-            
-            # 파일 크기가 목표 크기보다 클 때까지 품질을 낮춤
-            current_quality = quality
-            while True:
-                output_buffer.seek(0)
-                output_buffer.truncate()
-                
-                img.save(output_buffer, format='JPEG', quality=current_quality, optimize=True)
-                
-                optimized_size = len(output_buffer.getvalue()) / (1024 * 1024)  # MB
-                
-                if optimized_size <= max_size_mb or current_quality <= 10:
-                    break
-                
-                current_quality -= 5
-            
-            optimized_bytes = output_buffer.getvalue()
-            optimized_size = len(optimized_bytes) / (1024 * 1024)  # MB
-            
-            optimization_info = {
-                'original_size_mb': original_size,
-                'optimized_size_mb': optimized_size,
-                'compression_ratio': (1 - optimized_size / original_size) * 100,
-                'final_quality': current_quality,
-                'width': img.size[0],
-                'height': img.size[1]
-            }
-            
-            print(f"✅ 이미지 최적화 완료:")
-            print(f"   📏 원본 크기: {original_size:.2f} MB")
-            print(f"   📏 최적화 크기: {optimized_size:.2f} MB")
-            print(f"   📊 압축률: {optimization_info['compression_ratio']:.1f}%")
-            print(f"   🎨 최종 품질: {current_quality}")
-            
-            return optimized_bytes, optimization_info
-            
-    except Exception as e:
-        print(f"⚠️ 이미지 최적화 중 오류: {e}")
-        # 오류 발생 시 원본 파일을 그대로 사용
-        with open(image_path, "rb") as f:
-            return f.read(), {'error': str(e)}
+    return _optimize_image(image_source, max_size_mb, quality)
 
 def setup_driver():
     """Chrome 드라이버 설정"""
@@ -215,19 +153,24 @@ def capture_upbit_screenshot():
         total_height = driver.execute_script("return document.body.scrollHeight")
         driver.set_window_size(1920, total_height)
         
-        # 스크린샷 촬영
-        driver.save_screenshot(filepath)
+        # 스크린샷 촬영 (메모리)
+        png_bytes = driver.get_screenshot_as_png()
         
         # 이미지 최적화
         print("🔧 이미지를 최적화합니다...")
-        optimized_bytes, optimization_info = optimize_image(filepath, max_size_mb=2.0, quality=85)
+        optimized_bytes, optimization_info = optimize_image(png_bytes, max_size_mb=2.0, quality=85)
+        
+        # 최적화된 이미지만 저장
+        filepath = os.path.splitext(filepath)[0] + ".jpg"
+        with open(filepath, "wb") as f:
+            f.write(optimized_bytes)
         
         # 최적화된 이미지를 Base64 인코딩
         image_base64 = base64.b64encode(optimized_bytes).decode('utf-8')
         
         print(f"✅ 스크린샷이 성공적으로 저장되었습니다!")
         print(f"📁 저장 위치: {filepath}")
-        print(f"📏 원본 파일 크기: {os.path.getsize(filepath) / 1024:.1f} KB")
+        print(f"📏 최적화 파일 크기: {len(optimized_bytes) / 1024:.1f} KB")
         print(f"🔗 최적화된 Base64 인코딩 완료")
         
         return filepath, image_base64
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+계좌 상태 서비스 테스트
+가짜 업비트 객체로 잔고 캐시 적중/만료, 전달받은 현재가 사용, 체결 delta 갱신,
+주문 이벤트에 따른 무효화와 한 사이클의 API 호출 수를 확인합니다.
+"""
+
+import trading.execution as execution
+import trading.account_state as account_state_module
+from trading.account import get_investment_status
+from trading.account_state import AccountStateService, parse_balances, update_account_after_fill
+from trading.order_tracker import OrderTracker, parse_order_fill
+from test_order_tracker import FakeUpbit, FILLED, market_buy_order
+
+BALANCES = [
+    {'currency': 'KRW', 'balance': '1000000.0', 'locked': '0', 'avg_buy_price': '0'},
+    {'currency': 'BTC', 'balance': '0.01', 'locked': '0', 'avg_buy_price': '40000000'},
+]
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+class BalanceUpbit(FakeUpbit):
+    """잔고 조회 횟수를 세는 가짜 업비트"""
+
+    def __init__(self, states=()):
+        super().__init__(states or [FILLED])
+        self.balance_calls = 0
+
+    def get_balances(self):
+        self.balance_calls += 1
+        return [dict(balance) for balance in BALANCES]
+
+def make_service(clock=None):
+    prices = []
+    service = AccountStateService(ttl=60, price_fetcher=lambda symbol: prices.append(symbol) or 50000000,
+                                  clock=clock or FakeClock())
+    return service, prices
+
+def test_cache_and_injected_price():
+    """잔고는 TTL 동안 캐시되고, 현재가를 넘기면 다시 조회하지 않는지 테스트"""
+    print("🧪 잔고 캐시 테스트")
+    assert parse_balances({'KRW': {'balance': '5'}, 'BTC': {'balance': '0.1', 'avg_buy_price': '3'}}) == {
+        'krw_balance': 5.0, 'btc_balance': 0.1, 'btc_avg_price': 3.0}
+
+    clock = FakeClock()
+    service, prices = make_service(clock)
+    upbit = BalanceUpbit()
+    first = service.get_snapshot(upbit, current_price=51000000)
+    assert not first.cached and first.current_price == 51000000 and prices == []
+    assert first.to_dict() == {'krw_balance': 1000000.0, 'btc_balance': 0.01, 'btc_avg_price': 40000000.0,
+                               'current_price': 51000000}
+
+    clock.now = 30
+    second = service.get_snapshot(upbit)
+    assert second.cached and second.balance_age == 30 and second.current_price == 50000000 and len(prices) == 1
+    clock.now = 61
+    assert not service.get_snapshot(upbit, 1).cached  # TTL 만료 후 다시 조회
+    assert service.get_snapshot(upbit, 1, force_refresh=True).balance_age == 0
+    assert upbit.balance_calls == 3
+    stats = service.get_stats()
+    assert stats['hits'] == 1 and stats['misses'] == 3 and stats['balance_calls'] == 3 and stats['price_calls'] == 1
+    print(f"✅ 잔고 캐시 테스트 통과 ({stats})")
+
+def test_fill_delta_and_invalidation():
+    """체결은 캐시 잔고에 직접 반영하고, 확인하지 못한 주문은 캐시를 무효화하는지 테스트"""
+    print("🧪 체결 반영 테스트")
+    service, _ = make_service()
+    upbit = BalanceUpbit()
+    service.get_snapshot(upbit, 50000000)
+    service.apply_fill('buy', volume=0.01, funds=500000, fee=250)
+    snapshot = service.get_snapshot(upbit, 50000000)
+    assert snapshot.cached and upbit.balance_calls == 1
+    assert snapshot.krw_balance == 1000000 - 500250 and abs(snapshot.btc_balance - 0.02) < 1e-12
+    assert abs(snapshot.btc_avg_price - 45000000) < 1e-6
+
+    service.apply_fill('sell', volume=0.02, funds=1000000, fee=500)
+    snapshot = service.get_snapshot(upbit, 50000000)
+    assert snapshot.btc_balance == 0 and snapshot.btc_avg_price == 0 and snapshot.krw_balance == 499750 + 999500
+
+    original = account_state_module.account_state
+    account_state_module.account_state = service
+    try:
+        # 체결을 확인하지 못한 주문 → 다음 조회에서 잔고를 다시 확인
+        update_account_after_fill('buy', parse_order_fill(market_buy_order('wait')))
+    finally:
+        account_state_module.account_state = original
+    assert not service.get_snapshot(upbit, 50000000).cached and upbit.balance_calls == 2
+    print("✅ 체결 반영 테스트 통과")
+
+def test_cycle_uses_one_balance_call():
+    """매수 사이클 전체(상태 조회 → 주문 → 체결 → 다음 상태 조회)에서 잔고 조회가 한 번인지 테스트"""
+    print("🧪 사이클 API 호출 테스트")
+    service, prices = make_service()
+    upbit = BalanceUpbit([market_buy_order('wait'), FILLED])
+    originals = account_state_module.account_state, execution.save_trade_record, execution.wait_for_order_fill
+    account_state_module.account_state = service
+    execution.save_trade_record = lambda *args: True
+    execution.wait_for_order_fill = OrderTracker(timeout=1, initial_delay=0.001, max_delay=0.001).wait_for_fill
+    try:
+        status = get_investment_status(upbit, current_price=50000000)
+        result = execution.execute_trading_decision(upbit, {'decision': 'buy'}, status)
+        after = get_investment_status(upbit, current_price=50000000)
+    finally:
+        account_state_module.account_state, execution.save_trade_record, execution.wait_for_order_fill = originals
+
+    assert result['status'] == 'executed'
+    assert upbit.balance_calls == 1 and prices == []
+    assert abs(after['krw_balance'] - (status['krw_balance'] - result['total_value'] - result['fee'])) < 1e-6
+    assert abs(after['btc_balance'] - (status['btc_balance'] + result['amount'])) < 1e-12
+    print(f"✅ 사이클 API 호출 테스트 통과 (잔고 조회 {upbit.balance_calls}회, {service.get_stats()})")
+
+if __name__ == "__main__":
+    test_cache_and_injected_price()
+    test_fill_delta_and_invalidation()
+    test_cycle_uses_one_balance_call()
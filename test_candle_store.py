@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+캔들 저장소 증분 조회 테스트
+업비트 대신 합성 분봉 데이터를 반환하는 가짜 조회 함수를 사용합니다.
+"""
+
+import tempfile
+import numpy as np
+import pandas as pd
+from datetime import datetime, timedelta
+from data.candle_store import CandleStore
+
+def _make_fake_exchange(start: datetime, total_bars: int):
+    """합성 분봉을 제공하는 가짜 거래소 (현재 시각은 state['now']로 조정)"""
+    index = pd.date_range(start, periods=total_bars, freq="min")
+    close = 100000000 + np.cumsum(np.random.default_rng(0).normal(0, 10000, total_bars))
+    candles = pd.DataFrame({
+        'open': close, 'high': close + 5000, 'low': close - 5000,
+        'close': close, 'volume': 1.0, 'value': close
+    }, index=index)
+    state = {'now': start, 'calls': []}
+
+    def fetcher(symbol, interval="minute1", count=200):
+        state['calls'].append(count)
+        visible = candles[candles.index <= state['now']].copy()
+        # 마지막 캔들은 아직 마감되지 않아 종가가 달라질 수 있음
+        visible.iloc[-1, visible.columns.get_loc('close')] += len(state['calls'])
+        return visible.tail(count)
+
+    return candles, state, fetcher
+
+def test_incremental_refresh():
+    """콜드 스타트 이후 새 캔들만 조회하는지 테스트"""
+    print("🧪 캔들 저장소 증분 조회 테스트")
+    start = datetime(2025, 8, 1, 0, 0)
+    candles, state, fetcher = _make_fake_exchange(start, 3000)
+
+    with tempfile.TemporaryDirectory() as storage_dir:
+        state['now'] = start + timedelta(minutes=1999)
+        store = CandleStore("KRW-BTC", "minute1", 1440, storage_dir=storage_dir, fetcher=fetcher)
+        df = store.refresh(now=state['now'])
+        assert len(df) == 1440
+        assert state['calls'][-1] == 1440
+
+        # 5분 경과 후 갱신
+        state['now'] += timedelta(minutes=5)
+        df = store.refresh(now=state['now'])
+        print(f"📊 증분 조회 개수: {state['calls'][-1]}개")
+        assert state['calls'][-1] <= 10
+        assert len(df) == 1440
+        assert df.index[-1] == state['now']
+        assert not df.index.duplicated().any()
+        # 마감된 캔들은 원본과 동일, 마지막 캔들은 최신 값으로 교체
+        assert df['close'].iloc[-2] == candles.loc[df.index[-2], 'close']
+        assert df['close'].iloc[-1] == candles.loc[df.index[-1], 'close'] + len(state['calls'])
+
+        # 디스크에서 다시 로드한 저장소도 증분 조회만 수행
+        state['now'] += timedelta(minutes=3)
+        reloaded = CandleStore("KRW-BTC", "minute1", 1440, storage_dir=storage_dir, fetcher=fetcher)
+        df = reloaded.refresh(now=state['now'])
+        assert state['calls'][-1] <= 10
+        assert df.index[-1] == state['now']
+    print("✅ 캔들 저장소 테스트 통과")
+
+def test_stale_store_reloads():
+    """저장된 캔들이 너무 오래되면 전체 조회하는지 테스트"""
+    start = datetime(2025, 8, 1, 0, 0)
+    candles, state, fetcher = _make_fake_exchange(start, 5000)
+
+    with tempfile.TemporaryDirectory() as storage_dir:
+        state['now'] = start + timedelta(minutes=1500)
+        store = CandleStore("KRW-BTC", "minute1", 1440, storage_dir=storage_dir, fetcher=fetcher)
+        store.refresh(now=state['now'])
+
+        state['now'] += timedelta(minutes=2000)
+        df = store.refresh(now=state['now'])
+        assert state['calls'][-1] == 1440
+        assert df.index[-1] == state['now']
+    print("✅ 전체 재조회 테스트 통과")
+
+if __name__ == "__main__":
+    test_incremental_refresh()
+    test_stale_store_reloads()
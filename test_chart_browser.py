@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+차트 브라우저 세션 테스트
+실제 Chrome 대신 가짜 드라이버로 세션 재사용/재시작 규칙을 확인합니다.
+"""
+
+import data.screenshot as screenshot
+
+class FakeDriver:
+    """캡처에 필요한 최소한의 WebDriver 흉내"""
+
+    def __init__(self):
+        self.healthy = True
+        self.quit_called = False
+        self.loads = 0
+
+    def get(self, url):
+        self.loads += 1
+
+    def execute_script(self, script):
+        if not self.healthy:
+            raise screenshot.WebDriverException("tab crashed")
+        return "complete" if "readyState" in script else 1080
+
+    def find_elements(self, by, value):
+        return [object()] if value == "canvas" else []
+
+    def set_window_size(self, width, height):
+        pass
+
+    def get_screenshot_as_png(self):
+        return b"png"
+
+    def quit(self):
+        self.quit_called = True
+
+def make_session(drivers, max_captures=3):
+    """가짜 드라이버를 쓰는 세션 생성"""
+    session = screenshot.ChartBrowserSession(max_captures=max_captures)
+    session.load_chart = lambda: setattr(session, 'loaded_at', screenshot.time.monotonic())
+    session.memory_mb = lambda: None
+
+    original_setup = screenshot.setup_driver
+    original_optimize = screenshot.optimize_image
+
+    def fake_setup():
+        driver = FakeDriver()
+        drivers.append(driver)
+        return driver
+
+    screenshot.setup_driver = fake_setup
+    screenshot.optimize_image = lambda image, max_size, quality, crop_box=None: (b"jpeg", {})
+    return session, (original_setup, original_optimize)
+
+def restore(originals):
+    screenshot.setup_driver, screenshot.optimize_image = originals
+
+def test_session_reuse_and_recycle():
+    """캡처 횟수 한도까지 재사용하고 이후 재시작하는지 테스트"""
+    print("🧪 브라우저 세션 재사용 테스트")
+    drivers = []
+    session, originals = make_session(drivers, max_captures=3)
+    try:
+        for _ in range(3):
+            assert session.capture() is not None
+        assert len(drivers) == 1
+
+        assert session.capture() is not None
+        assert len(drivers) == 2
+        assert drivers[0].quit_called
+        assert session.session_count == 2
+    finally:
+        session.close()
+        restore(originals)
+    print("✅ 세션 재사용 테스트 통과")
+
+def test_unhealthy_session_restarts():
+    """상태 점검에 실패하면 새 브라우저로 캡처하는지 테스트"""
+    print("🧪 브라우저 상태 점검 테스트")
+    drivers = []
+    session, originals = make_session(drivers)
+    try:
+        assert session.capture() is not None
+        drivers[0].healthy = False
+        assert session.capture() is not None
+        assert len(drivers) == 2
+    finally:
+        session.close()
+        restore(originals)
+    print("✅ 상태 점검 테스트 통과")
+
+if __name__ == "__main__":
+    test_session_reuse_and_recycle()
+    test_unhealthy_session_restarts()
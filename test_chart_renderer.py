@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+차트 렌더러 테스트
+합성 캔들로 차트 이미지를 그리고, 렌더링 실패 시 스크린샷으로 대체되는지 확인합니다.
+"""
+
+import io
+import base64
+import pandas as pd
+from PIL import Image
+import data.screenshot as screenshot
+from config.settings import TRADING_SYMBOL
+from data.chart_renderer import render_market_chart, get_chart_image
+from analysis.technical_indicators import calculate_technical_indicators
+from test_utils import make_candles
+
+def test_render_market_chart():
+    """PNG/JPEG 렌더링 결과가 올바른 이미지인지 테스트"""
+    print("🧪 차트 렌더링 테스트")
+    daily_df = calculate_technical_indicators(make_candles(30, seed=3))
+    minute_df = calculate_technical_indicators(make_candles(1440, seed=4))
+
+    for image_format in ("PNG", "JPEG"):
+        image_bytes, info = render_market_chart(daily_df, minute_df, size=(1024, 1024), image_format=image_format)
+        with Image.open(io.BytesIO(image_bytes)) as image:
+            assert image.format == image_format
+            assert image.size == (1024, 1024)
+        print(f"✅ {image_format}: {info['size_kb']:.1f} KB, {info['render_ms']:.0f}ms")
+
+    # 분봉만 있어도 렌더링 가능
+    image_bytes, info = render_market_chart(None, minute_df)
+    assert info['width'] == 1024 and info['titles'] == [f"{TRADING_SYMBOL} 1m"]
+
+    # 패널 제목은 마켓 코드로 생성
+    image_bytes, info = render_market_chart(daily_df, minute_df, symbol="KRW-ETH")
+    assert info['titles'] == ["KRW-ETH 1D", "KRW-ETH 1m"]
+
+def test_fallback_to_screenshot():
+    """렌더링할 데이터가 없으면 스크린샷으로 대체되는지 테스트"""
+    print("🧪 스크린샷 대체 테스트")
+    original = screenshot.capture_upbit_screenshot
+    screenshot.capture_upbit_screenshot = lambda: ("images/fake.png", "iVBORfake")
+    try:
+        result = get_chart_image(pd.DataFrame(), None, source="local")
+    finally:
+        screenshot.capture_upbit_screenshot = original
+    assert result == ("images/fake.png", "iVBORfake")
+
+    daily_df = calculate_technical_indicators(make_candles(30, seed=3))
+    chart_source, image_base64 = get_chart_image(daily_df, None, source="local")
+    assert chart_source == "local_render"
+    assert base64.b64decode(image_base64)[:4] == b"\x89PNG"
+    print("✅ 스크린샷 대체 테스트 통과")
+
+if __name__ == "__main__":
+    test_render_market_chart()
+    test_fallback_to_screenshot()
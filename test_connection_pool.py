@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+MySQL 커넥션 풀 테스트
+실제 DB 대신 가짜 연결로 재사용, 대기, 상태 확인, 재연결 동작을 확인합니다.
+"""
+
+import time
+import threading
+from mysql.connector import errors
+from database.connection import ConnectionPool
+
+class FakeConnection:
+    """ping/cursor/rollback만 흉내내는 가짜 연결"""
+
+    def __init__(self, number):
+        self.number = number
+        self.alive = True
+        self.closed = False
+        self.in_transaction = False
+
+    def ping(self, reconnect=False, attempts=1, delay=0):
+        if not self.alive:
+            raise errors.InterfaceError("MySQL server has gone away")
+
+    def cursor(self, dictionary=False):
+        connection = self
+
+        class FakeCursor:
+            def execute(self, query, params=None):
+                if not connection.alive:
+                    raise errors.OperationalError("Lost connection")
+
+            def close(self):
+                pass
+
+        return FakeCursor()
+
+    def rollback(self):
+        self.in_transaction = False
+
+    def close(self):
+        self.closed = True
+
+class FakePool(ConnectionPool):
+    """실제 MySQL 대신 가짜 연결을 만드는 풀"""
+
+    def _create(self):
+        self.created_count += 1
+        return FakeConnection(self.created_count)
+
+def test_reuse_and_limit():
+    """연결 재사용과 최대 개수 제한 테스트"""
+    print("🧪 커넥션 풀 재사용/제한 테스트")
+    pool = FakePool(size=2, timeout=0.2, ping_interval=60)
+
+    with pool.connection() as first:
+        pass
+    with pool.connection() as second:
+        assert second is first
+
+    a = pool.acquire()
+    b = pool.acquire()
+    start = time.monotonic()
+    try:
+        pool.acquire()
+        assert False, "풀이 가득 차면 PoolError가 발생해야 합니다"
+    except errors.PoolError:
+        assert time.monotonic() - start >= 0.2
+    pool.release(a)
+    pool.release(b)
+    assert pool.get_stats()['created'] == 2
+    print("✅ 재사용/제한 테스트 통과")
+
+def test_waiting_borrower_gets_released_connection():
+    """대기 중인 스레드가 반납된 연결을 받는지 테스트"""
+    print("🧪 커넥션 대기 테스트")
+    pool = FakePool(size=1, timeout=2, ping_interval=60)
+    held = pool.acquire()
+    borrowed = []
+
+    worker = threading.Thread(target=lambda: borrowed.append(pool.acquire()))
+    worker.start()
+    time.sleep(0.1)
+    pool.release(held)
+    worker.join(timeout=2)
+
+    assert borrowed == [held]
+    assert pool.get_stats()['waits'] >= 1
+    print("✅ 대기 테스트 통과")
+
+def test_dead_connection_replaced():
+    """끊긴 연결은 상태 확인 후 교체되고, 오류가 난 연결은 버려지는지 테스트"""
+    print("🧪 커넥션 상태 확인/재연결 테스트")
+    pool = FakePool(size=2, timeout=1, ping_interval=0)
+
+    with pool.connection() as connection:
+        pass
+    connection.alive = False
+
+    with pool.connection() as replacement:
+        assert replacement is not connection
+    assert connection.closed
+    assert pool.get_stats()['reconnects'] == 1
+
+    try:
+        with pool.cursor() as cursor:
+            replacement.alive = False
+            cursor.execute("SELECT 1")
+    except errors.OperationalError:
+        pass
+    stats = pool.get_stats()
+    assert stats['idle'] == 0 and stats['in_use'] == 0
+    assert replacement.closed
+    print("✅ 상태 확인/재연결 테스트 통과")
+
+if __name__ == "__main__":
+    test_reuse_and_limit()
+    test_waiting_borrower_gets_released_connection()
+    test_dead_connection_replaced()
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+AI 결정 캐시 테스트
+시장 지문 양자화, TTL/LRU 동작, 캐시 적중 시 API 호출 생략을 확인합니다.
+"""
+
+import copy
+import time
+import analysis.ai_analysis as ai_analysis
+from analysis.decision_cache import DecisionCache, market_fingerprint, decision_cache
+
+def make_market_data(price=100000000.0, rsi=55.0, fear_greed=50):
+    indicators = {'rsi': rsi, 'macd': 10.0, 'macd_signal': 5.0, 'bb_position': 0.6,
+                  'stoch_k': 60.0, 'williams_r': -40.0, 'cci': 20.0, 'adx': 30.0}
+    return {
+        'current_price': price,
+        'technical_indicators': {'daily_indicators': indicators, 'minute_indicators': dict(indicators)},
+        'fear_greed_index': {'current_value': fear_greed},
+        'news_analysis': {'recent_news': [{'title': 'Bitcoin steady'}]}
+    }
+
+SAMPLE_DECISION = {'decision': 'hold', 'confidence': 0.6, 'reason': 'test'}
+
+def test_fingerprint_quantization():
+    """작은 변화는 같은 지문, 신호 변화는 다른 지문인지 테스트"""
+    print("🧪 시장 지문 양자화 테스트")
+    base = market_fingerprint(make_market_data())
+    assert market_fingerprint(make_market_data(price=100010000.0, rsi=57.0, fear_greed=51)) == base
+    assert market_fingerprint(make_market_data(price=102000000.0)) != base
+    assert market_fingerprint(make_market_data(rsi=75.0)) != base
+    assert market_fingerprint(make_market_data(fear_greed=70)) != base
+    assert market_fingerprint(make_market_data(), mode="vision") != base
+    print("✅ 지문 양자화 테스트 통과")
+
+def test_ttl_and_lru():
+    """TTL 만료와 LRU 제거 테스트"""
+    print("🧪 TTL/LRU 테스트")
+    cache = DecisionCache(ttl=0.2, max_size=2)
+    cache.put(('a',), SAMPLE_DECISION)
+    cache.put(('b',), SAMPLE_DECISION)
+    assert cache.get(('a',)) == SAMPLE_DECISION
+    cache.put(('c',), SAMPLE_DECISION)
+    assert cache.get(('b',)) is None
+    assert cache.get(('a',)) is not None
+
+    time.sleep(0.25)
+    assert cache.get(('a',)) is None
+
+    stats = cache.get_stats()
+    assert stats['hits'] == 2 and stats['misses'] == 2
+    assert stats['hit_ratio'] == 0.5
+    print(f"✅ TTL/LRU 테스트 통과 (적중률 {stats['hit_ratio']:.0%})")
+
+def test_cached_decision_skips_api():
+    """캐시 적중 시 OpenAI 호출 없이 결정을 반환하는지 테스트"""
+    print("🧪 캐시 적중 시 API 호출 생략 테스트")
+    market_data = make_market_data()
+    decision_cache.clear()
+    decision_cache.put(market_fingerprint(market_data), SAMPLE_DECISION)
+
+    def fail_client():
+        raise AssertionError("캐시 적중 시 OpenAI 클라이언트를 만들면 안 됩니다")
+
+    original = ai_analysis.get_openai_client
+    ai_analysis.get_openai_client = fail_client
+    try:
+        decision = ai_analysis.ai_trading_decision_with_indicators(copy.deepcopy(market_data))
+    finally:
+        ai_analysis.get_openai_client = original
+        decision_cache.clear()
+
+    assert decision == SAMPLE_DECISION
+    print("✅ API 호출 생략 테스트 통과")
+
+if __name__ == "__main__":
+    test_fingerprint_quantization()
+    test_ttl_and_lru()
+    test_cached_decision_skips_api()
@@ -4,7 +4,11 @@
 이미지 최적화 기능 테스트
 """
 
+import io
+import numpy as np
+from PIL import Image
 from screenshot_capture import capture_upbit_screenshot
+from data.screenshot import optimize_image, encode_jpeg_to_target
 
 def test_image_optimization():
     """
@@ -50,5 +54,36 @@ def test_image_optimization():
         import traceback
         traceback.print_exc()
 
+def test_target_size_encoder():
+    """
+    목표 크기 인코더 테스트 (네트워크 없이 합성 이미지 사용)
+    """
+    print("🧪 목표 크기 JPEG 인코더 테스트")
+    rng = np.random.default_rng(0)
+    pixels = rng.integers(0, 256, (1600, 1920, 3), dtype=np.uint8)
+    buffer = io.BytesIO()
+    Image.fromarray(pixels).save(buffer, format='PNG')
+    png_bytes = buffer.getvalue()
+
+    max_size_mb = 1.0
+    optimized_bytes, info = optimize_image(png_bytes, max_size_mb=max_size_mb, quality=85)
+    assert len(optimized_bytes) <= max_size_mb * 1024 * 1024
+    assert info['encode_count'] <= 8
+    print(f"✅ 품질 {info['final_quality']}, 인코딩 {info['encode_count']}회, {info['encode_ms']:.0f}ms")
+
+    # 찾은 품질보다 한 단계 높으면 목표 크기를 넘어야 함 (가장 높은 품질 선택)
+    with Image.open(io.BytesIO(png_bytes)) as img:
+        img = img.convert('RGB')
+        _, quality, _ = encode_jpeg_to_target(img, int(max_size_mb * 1024 * 1024), 85)
+        higher = io.BytesIO()
+        img.save(higher, format='JPEG', quality=quality + 1, optimize=True)
+        assert len(higher.getvalue()) > max_size_mb * 1024 * 1024
+
+    # 차트 영역 잘라내기
+    _, info = optimize_image(png_bytes, max_size_mb=2.0, quality=85, crop_box=(0, 100, 1200, 900))
+    assert (info['width'], info['height']) == (1200, 800)
+    print("✅ 목표 크기 인코더 테스트 통과")
+
 if __name__ == "__main__":
+    test_target_size_encoder()
     test_image_optimization()
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+JSON 직렬화 유틸리티 테스트
+DataFrame 단계의 NaN/Infinity 정리, orjson/표준 json 결과 일치, 해시용 정규화 바이트, 직렬화 결과 재사용을 확인합니다.
+"""
+
+import json
+import numpy as np
+import pandas as pd
+from utils import json_serializer
+from utils.json_serializer import JsonPayload, frame_to_records, dumps_bytes, dumps_canonical
+
+def test_frame_to_records():
+    """NaN/Infinity가 None으로 바뀌고 tail이 적용되는지 테스트"""
+    print("🧪 DataFrame 레코드 변환 테스트")
+    df = pd.DataFrame({'close': [1.0, 2.0, 3.0], 'rsi': [np.nan, np.inf, 55.5], 'count': [1, 2, 3]})
+    assert frame_to_records(df) == [
+        {'close': 1.0, 'rsi': None, 'count': 1},
+        {'close': 2.0, 'rsi': None, 'count': 2},
+        {'close': 3.0, 'rsi': 55.5, 'count': 3},
+    ]
+    assert frame_to_records(df, tail=1) == [{'close': 3.0, 'rsi': 55.5, 'count': 3}]
+    assert frame_to_records(pd.DataFrame()) == [] and frame_to_records(None) == []
+    print("✅ DataFrame 레코드 변환 테스트 통과")
+
+def test_encoders_agree():
+    """orjson과 표준 json 대체 경로가 같은 JSON을 만드는지 테스트"""
+    print("🧪 인코더 일치 테스트")
+    data = {'b': np.float64(1.5), 'a': [np.nan, float('inf'), np.int64(3)], 'text': '비트코인',
+            'time': pd.Timestamp('2025-08-01'), 'nested': {'z': None, 'y': -np.inf}}
+    fast = dumps_bytes(data)
+    original = json_serializer.orjson
+    json_serializer.orjson = None
+    try:
+        fallback = dumps_bytes(data)
+    finally:
+        json_serializer.orjson = original
+    assert json.loads(fast) == json.loads(fallback)
+    assert json.loads(fallback) == {'a': [None, None, 3], 'b': 1.5, 'nested': {'y': None, 'z': None},
+                                    'text': '비트코인', 'time': '2025-08-01 00:00:00'}
+    assert fallback.startswith(b'{"a":')
+    print(f"✅ 인코더 일치 테스트 통과 ({'orjson' if original else 'json'})")
+
+def test_canonical_bytes_independent_of_orjson():
+    """해시용 정규화 바이트는 orjson 설치 여부와 관계없이 바이트 단위로 같은지 테스트"""
+    print("🧪 정규화 바이트 테스트")
+    data = {'price': 1e16, 'ratio': np.float64(0.1), 'flag': np.bool_(True), 'levels': (1, 2),
+            'time': pd.Timestamp('2025-08-01 09:00'), 'missing': np.nan, 'text': '비트코인'}
+    canonical = dumps_canonical(data)
+    original = json_serializer.orjson
+    json_serializer.orjson = None
+    try:
+        assert dumps_canonical(data) == canonical
+    finally:
+        json_serializer.orjson = original
+    assert json.loads(canonical) == {'flag': True, 'levels': [1, 2], 'missing': None, 'price': 1e16,
+                                     'ratio': 0.1, 'text': '비트코인', 'time': '2025-08-01 09:00:00'}
+
+    # JsonPayload는 정규화 바이트도 한 번만 만들고, 값을 바꾸면 다시 만듦
+    payload = JsonPayload(data)
+    assert payload.canonical_bytes() == canonical and dumps_canonical(payload) is payload.canonical_bytes()
+    payload['price'] = 2
+    assert json.loads(dumps_canonical(payload))['price'] == 2
+    print("✅ 정규화 바이트 테스트 통과")
+
+def test_payload_reuses_encoding():
+    """한 번 직렬화한 바이트를 재사용하고 값을 바꾸면 다시 직렬화하는지 테스트"""
+    print("🧪 직렬화 결과 재사용 테스트")
+    payload = JsonPayload({'current_price': 100, 'daily_data': [{'close': 1.0}]})
+    encoded = dumps_bytes(payload)
+    assert payload.json_bytes() is encoded
+    assert json.loads(payload.json_str()) == {'current_price': 100, 'daily_data': [{'close': 1.0}]}
+
+    payload['current_price'] = 200
+    assert payload.json_bytes() is not encoded
+    assert json.loads(payload.json_bytes())['current_price'] == 200
+    print("✅ 직렬화 결과 재사용 테스트 통과")
+
+if __name__ == "__main__":
+    test_frame_to_records()
+    test_encoders_agree()
+    test_canonical_bytes_independent_of_orjson()
+    test_payload_reuses_encoding()
@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+시장 데이터 병렬 수집 테스트
+네트워크 대신 지연이 있는 가짜 소스를 사용합니다.
+"""
+
+import time
+import threading
+import data.market_data as market_data
+
+def _patch_sources(delays):
+    """소스 함수를 지연이 있는 가짜 함수로 교체"""
+    originals = {
+        'get_ohlcv_data': market_data.get_ohlcv_data,
+        'get_ohlcv_data_incremental': market_data.get_ohlcv_data_incremental,
+        'get_current_price': market_data.get_current_price,
+        'get_orderbook': market_data.get_orderbook,
+        'get_fear_greed_index': market_data.get_fear_greed_index
+    }
+
+    def fake_ohlcv(symbol, interval, count):
+        time.sleep(delays['daily'] if interval == 'day' else delays['minute'])
+        return f"{interval}-{count}"
+
+    def fake_price(symbol):
+        time.sleep(delays['current_price'])
+        return 100000000.0
+
+    def fake_orderbook(symbol):
+        time.sleep(delays['orderbook'])
+        return {'orderbook_units': []}
+
+    def fake_fear_greed():
+        time.sleep(delays['fear_greed'])
+        return {'current_value': 50}
+
+    market_data.get_ohlcv_data = fake_ohlcv
+    market_data.get_ohlcv_data_incremental = fake_ohlcv
+    market_data.get_current_price = fake_price
+    market_data.get_orderbook = fake_orderbook
+    market_data.get_fear_greed_index = fake_fear_greed
+    return originals
+
+def _restore_sources(originals):
+    for name, func in originals.items():
+        setattr(market_data, name, func)
+
+def test_concurrent_collection():
+    """다섯 개 소스가 병렬로 수집되는지 테스트"""
+    print("🧪 시장 데이터 병렬 수집 테스트")
+    delays = {'daily': 0.3, 'minute': 0.3, 'current_price': 0.3, 'orderbook': 0.3, 'fear_greed': 0.3}
+    originals = _patch_sources(delays)
+    try:
+        start = time.perf_counter()
+        daily_df, minute_df, current_price, orderbook, fear_greed = market_data.get_market_data(concurrent=True)
+        elapsed = time.perf_counter() - start
+    finally:
+        _restore_sources(originals)
+
+    print(f"⏱️ 소요 시간: {elapsed:.2f}초 (순차 수집 시 약 {sum(delays.values()):.1f}초)")
+    assert elapsed < sum(delays.values())
+    assert daily_df == "day-30"
+    assert current_price == 100000000.0
+    assert fear_greed == {'current_value': 50}
+
+    report = market_data.get_last_market_data_report()
+    assert all(info['status'] == 'ok' for info in report.values())
+    print("✅ 병렬 수집 테스트 통과")
+
+def test_partial_result_on_timeout():
+    """느린 소스가 있어도 부분 결과를 반환하는지 테스트"""
+    print("🧪 소스별 타임아웃 테스트")
+    delays = {'daily': 0.0, 'minute': 0.0, 'current_price': 0.0, 'orderbook': 0.0, 'fear_greed': 1.0}
+    originals = _patch_sources(delays)
+    try:
+        start = time.perf_counter()
+        result = market_data.get_market_data_concurrent(timeouts={'fear_greed': 0.2})
+        elapsed = time.perf_counter() - start
+    finally:
+        _restore_sources(originals)
+
+    daily_df, minute_df, current_price, orderbook, fear_greed = result
+    print(f"⏱️ 소요 시간: {elapsed:.2f}초")
+    assert elapsed < 1.0
+    assert fear_greed is None
+    assert minute_df == "minute1-1440"
+
+    report = market_data.get_last_market_data_report()
+    assert report['fear_greed']['status'] == 'timeout'
+    assert report['orderbook']['status'] == 'ok'
+    print("✅ 타임아웃 테스트 통과")
+
+def test_stuck_source_replaces_workers():
+    """타임아웃 후에도 멈춰 있는 소스는 풀을 교체하고, 끝날 때까지 다시 요청하지 않는지 테스트"""
+    print("🧪 멈춘 소스 테스트")
+    release = threading.Event()
+    calls = []
+    delays = {'daily': 0.0, 'minute': 0.0, 'current_price': 0.0, 'orderbook': 0.0, 'fear_greed': 0.0}
+    originals = _patch_sources(delays)
+
+    def hung_fear_greed():
+        calls.append(time.perf_counter())
+        release.wait(5)
+        return {'current_value': 50}
+
+    market_data.get_fear_greed_index = hung_fear_greed
+    for future in list(market_data._stuck_requests.values()):  # 앞선 테스트의 느린 요청이 끝날 때까지 대기
+        future.result(timeout=5)
+    try:
+        market_data.get_market_data_concurrent(timeouts={'fear_greed': 0.1})
+        assert market_data.get_last_market_data_report()['fear_greed']['status'] == 'timeout'
+        assert market_data._market_data_executor is None  # 멈춘 스레드가 있는 풀은 교체
+
+        # 멈춘 요청이 끝나기 전에는 다시 요청하지 않고 나머지 소스만 새 풀에서 수집
+        result = market_data.get_market_data_concurrent(timeouts={'fear_greed': 0.1})
+        report = market_data.get_last_market_data_report()
+        assert len(calls) == 1 and result[4] is None
+        assert report['fear_greed']['status'] == 'stuck' and report['daily']['status'] == 'ok'
+        assert list(report) == ['daily', 'minute', 'current_price', 'orderbook', 'fear_greed']
+
+        # 멈춘 요청이 끝나면 다시 요청
+        release.set()
+        market_data._stuck_requests['fear_greed'].result(timeout=5)
+        result = market_data.get_market_data_concurrent(timeouts={'fear_greed': 1.0})
+        assert len(calls) == 2 and result[4] == {'current_value': 50}
+        assert 'fear_greed' not in market_data._stuck_requests
+    finally:
+        release.set()
+        _restore_sources(originals)
+    print("✅ 멈춘 소스 테스트 통과")
+
+if __name__ == "__main__":
+    test_concurrent_collection()
+    test_partial_result_on_timeout()
+    test_stuck_source_replaces_workers()
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+시장 충격(슬리피지) 추정 테스트
+호가 단계를 따라 계산한 예상 체결가/슬리피지, 슬리피지 한도 안의 최대 주문 크기,
+execute_trading_decision의 주문 크기 제한과 market_data 기록(프롬프트 직렬화 전 미리 기록)을 확인합니다.
+"""
+
+import trading.execution as execution
+from utils.json_serializer import JsonPayload
+from trading.market_impact import estimate_market_impact, orderbook_ladder
+from trading.order_tracker import OrderTracker
+from test_order_tracker import FakeUpbit, FILLED, market_buy_order
+
+# 매도호가 50,000,000원부터 100,000원(20bp) 간격, 단계마다 0.005 BTC (매수호가는 49,900,000원부터 아래로)
+ORDERBOOK = {'orderbook_units': [
+    {'ask_price': 50000000 + 100000 * level, 'bid_price': 49900000 - 100000 * level, 'ask_size': 0.005, 'bid_size': 0.005}
+    for level in range(5)
+]}
+
+class OrderSizeUpbit(FakeUpbit):
+    """주문 금액을 기록하는 가짜 업비트"""
+
+    def __init__(self, states):
+        super().__init__(states)
+        self.orders = []
+
+    def buy_market_order(self, symbol, amount):
+        self.orders.append(amount)
+        return super().buy_market_order(symbol, amount)
+
+def test_walk_ladder():
+    """원화/BTC 주문 크기로 호가를 따라 예상 체결가와 슬리피지를 계산하는지 테스트"""
+    print("🧪 호가 소진 계산 테스트")
+    prices, sizes = orderbook_ladder(ORDERBOOK, 'sell')
+    assert prices[0] == 49900000 and len(sizes) == 5
+
+    # 0.0075 BTC 매수: 0.005 @ 50,000,000 + 0.0025 @ 50,100,000
+    estimate = estimate_market_impact(ORDERBOOK, 'buy', 0.0075, unit='btc')
+    assert abs(estimate.funds - (250000 + 125250)) < 1e-6 and estimate.levels_used == 2
+    assert abs(estimate.vwap - 375250 / 0.0075) < 1e-6
+    assert abs(estimate.slippage_bps - (estimate.vwap / 50000000 - 1) * 10000) < 1e-9
+    assert abs(estimate.spread_bps - 100000 / 49950000 * 10000) < 1e-9
+
+    # 같은 주문을 원화 금액으로
+    by_krw = estimate_market_impact(ORDERBOOK, 'buy', 375250)
+    assert by_krw.unit == 'krw' and abs(by_krw.volume - 0.0075) < 1e-12
+
+    # 매도는 낮게 체결될수록 양수, 보이는 잔량을 넘으면 depth_exhausted
+    sell = estimate_market_impact(ORDERBOOK, 'sell', 0.1)
+    assert sell.depth_exhausted and abs(sell.volume - 0.025) < 1e-12 and sell.slippage_bps > 0
+    assert not sell.within_budget
+    assert estimate_market_impact({'orderbook_units': []}, 'buy', 100000) is None
+    print(f"✅ 예상 체결가 {estimate.vwap:,.0f}원, 슬리피지 {estimate.slippage_bps:.2f}bp")
+
+def test_max_size_within_budget():
+    """슬리피지 한도 안의 최대 주문 크기로 다시 추정하면 슬리피지가 정확히 한도인지 테스트"""
+    print("🧪 슬리피지 한도 테스트")
+    for action in ('buy', 'sell'):
+        estimate = estimate_market_impact(ORDERBOOK, action, 0.02, unit='btc', budget_bps=3)
+        assert not estimate.within_budget and 0.005 < estimate.max_volume < 0.02
+        at_max = estimate_market_impact(ORDERBOOK, action, estimate.max_volume, unit='btc', budget_bps=3)
+        assert abs(at_max.slippage_bps - 3) < 1e-9 and abs(at_max.funds - estimate.max_funds) < 1e-6
+
+    # 한도가 넉넉하면 보이는 잔량 전체
+    estimate = estimate_market_impact(ORDERBOOK, 'buy', 100000, budget_bps=1000)
+    assert estimate.within_budget and abs(estimate.max_volume - 0.025) < 1e-12
+    print("✅ 슬리피지 한도 테스트 통과")
+
+def test_execution_caps_order():
+    """한 번에 내는 시장가 매수를 한도 안으로 줄이고, 추정 결과를 market_data에 남기는지 테스트"""
+    print("🧪 주문 크기 제한 테스트")
+    saved = []
+    originals = execution.save_trade_record, execution.wait_for_order_fill
+    execution.save_trade_record = lambda decision, result, status, market_data: saved.append(dict(market_data))
+    execution.wait_for_order_fill = OrderTracker(timeout=1, initial_delay=0.001, max_delay=0.001).wait_for_fill
+    try:
+        upbit = OrderSizeUpbit([market_buy_order('wait'), FILLED])
+        market_data = {'current_price': 50000000, 'orderbook': ORDERBOOK}
+        status = {'krw_balance': 900000, 'btc_balance': 0, 'current_price': 50000000}
+        execution.execute_trading_decision(upbit, {'decision': 'buy'}, status, market_data)
+    finally:
+        execution.save_trade_record, execution.wait_for_order_fill = originals
+
+    impact = market_data['market_impact']['buy']
+    expected = estimate_market_impact(ORDERBOOK, 'buy', 900000 * 0.95)
+    assert impact['requested'] == 900000 * 0.95 and impact['slippage_bps'] > impact['budget_bps']
+    assert upbit.orders == [expected.max_funds] == [impact['order_size']]
+    assert saved[0]['market_impact'] == {'buy': impact}
+    print(f"✅ 주문 금액 {impact['requested']:,.0f}원 → {impact['order_size']:,.0f}원")
+
+def test_impact_attached_before_serialization():
+    """프롬프트 직렬화 전에 매수/매도 추정을 기록하면 매매 실행이 직렬화 결과를 무효화하지 않는지 테스트"""
+    print("🧪 직렬화 전 추정 기록 테스트")
+    saved = []
+    originals = execution.save_trade_record, execution.wait_for_order_fill
+    execution.save_trade_record = lambda decision, result, status, market_data: saved.append(market_data)
+    execution.wait_for_order_fill = OrderTracker(timeout=1, initial_delay=0.001, max_delay=0.001).wait_for_fill
+    try:
+        market_data = JsonPayload({'current_price': 50000000, 'orderbook': ORDERBOOK})
+        status = {'krw_balance': 900000, 'btc_balance': 0.02, 'current_price': 50000000}
+        execution.attach_market_impact(market_data, status)
+        assert set(market_data['market_impact']) == {'buy', 'sell'}
+        encoded = market_data.json_bytes()  # 프롬프트 생성 시 직렬화
+        upbit = OrderSizeUpbit([market_buy_order('wait'), FILLED])
+        execution.execute_trading_decision(upbit, {'decision': 'buy'}, status, market_data)
+    finally:
+        execution.save_trade_record, execution.wait_for_order_fill = originals
+
+    assert upbit.orders == [market_data['market_impact']['buy']['order_size']]
+    assert saved == [market_data] and market_data.json_bytes() is encoded
+    print("✅ 직렬화 전 추정 기록 테스트 통과")
+
+if __name__ == "__main__":
+    test_walk_ladder()
+    test_max_size_within_budget()
+    test_execution_caps_order()
+    test_impact_attached_before_serialization()
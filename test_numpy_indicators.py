@@ -0,0 +1,40 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+NumPy 기술적 지표 백엔드 테스트
+ta 백엔드와 컬럼 및 값이 같은지 확인하고 계산 시간을 비교합니다.
+"""
+
+import time
+import numpy as np
+from analysis.technical_indicators import calculate_technical_indicators
+from test_utils import make_candles
+
+def test_numpy_backend_matches_ta():
+    """NumPy 백엔드가 ta 백엔드와 같은 결과를 내는지 테스트"""
+    print("🧪 NumPy 지표 백엔드 정확도 테스트")
+    for count in (30, 1440, 5000):
+        df = make_candles(count, seed=count)
+        expected = calculate_technical_indicators(df, backend='ta')
+        actual = calculate_technical_indicators(df, backend='numpy')
+
+        assert list(actual.columns) == list(expected.columns)
+        assert actual.index.equals(expected.index)
+        for column in expected.columns:
+            assert np.allclose(expected[column].to_numpy(float), actual[column].to_numpy(float),
+                               rtol=1e-6, atol=1e-6, equal_nan=True), f"{count}개 캔들 {column} 불일치"
+        print(f"✅ {count}개 캔들: {len(expected.columns)}개 컬럼 일치")
+
+def benchmark_backends(count: int = 4 * 1440, repeat: int = 5):
+    """여러 날의 분봉 데이터로 두 백엔드 계산 시간 비교"""
+    df = make_candles(count)
+    for backend in ('ta', 'numpy'):
+        start = time.perf_counter()
+        for _ in range(repeat):
+            calculate_technical_indicators(df, backend=backend)
+        elapsed = (time.perf_counter() - start) / repeat
+        print(f"⏱️ {backend}: {elapsed * 1000:.1f}ms ({count}개 캔들)")
+
+if __name__ == "__main__":
+    test_numpy_backend_matches_ta()
+    benchmark_backends()
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+주문 체결 추적 테스트
+가짜 업비트 객체로 주문 상태 조회(백오프), 체결 피드 즉시 알림, 시간 초과,
+execute_trading_decision의 실제 체결값 기록을 확인합니다.
+"""
+
+import time
+import threading
+import trading.execution as execution
+from trading.order_tracker import OrderTracker, OrderFillFeed, parse_order_fill
+
+def market_buy_order(state, trades=()):
+    """업비트 시장가 매수 주문 조회 응답 형식"""
+    return {
+        'uuid': 'order-1', 'side': 'bid', 'ord_type': 'price', 'state': state, 'price': '100000',
+        'executed_volume': str(sum(float(volume) for _, volume in trades)),
+        'paid_fee': str(sum(float(price) * float(volume) for price, volume in trades) * 0.0005),
+        'trades_count': len(trades),
+        'trades': [{'price': price, 'volume': volume, 'funds': str(float(price) * float(volume))}
+                   for price, volume in trades]
+    }
+
+class FakeUpbit:
+    """get_order를 호출할 때마다 준비된 주문 상태를 차례로 반환"""
+
+    def __init__(self, states):
+        self.states = list(states)
+        self.calls = 0
+
+    def get_order(self, uuid):
+        self.calls += 1
+        return self.states[min(self.calls, len(self.states)) - 1]
+
+    def buy_market_order(self, symbol, amount):
+        return {'uuid': 'order-1', 'side': 'bid', 'state': 'wait'}
+
+FILLED = market_buy_order('cancel', [('50000000', '0.001'), ('50100000', '0.000995')])
+
+def test_parse_order_fill():
+    """체결 목록에서 평균 체결가, 체결 금액, 수수료를 계산하는지 테스트"""
+    print("🧪 체결 결과 변환 테스트")
+    fill = parse_order_fill(FILLED)
+    assert fill.is_final and fill.is_filled and fill.trades_count == 2
+    assert abs(fill.executed_volume - 0.001995) < 1e-12
+    assert abs(fill.funds - (50000 + 50100000 * 0.000995)) < 1e-6
+    assert abs(fill.avg_price - fill.funds / fill.executed_volume) < 1e-6
+    assert abs(fill.paid_fee - fill.funds * 0.0005) < 1e-6
+    assert not parse_order_fill(market_buy_order('wait')).is_filled
+    print(f"✅ 평균 체결가: {fill.avg_price:,.0f}원")
+
+def test_polling_with_backoff():
+    """종료 상태가 될 때까지 백오프 간격으로 조회하고 바로 반환하는지 테스트"""
+    print("🧪 주문 상태 조회 테스트")
+    upbit = FakeUpbit([market_buy_order('wait'), market_buy_order('wait'), FILLED])
+    delays = []
+    tracker = OrderTracker(timeout=10, initial_delay=0.01, max_delay=0.03)
+    tracker._pause = lambda order_id, delay: delays.append(delay)
+    fill = tracker.wait_for_fill(upbit, 'order-1')
+    assert fill.state == 'cancel' and fill.is_filled and fill.polls == 3
+    assert delays == [0.01, 0.02, 0.03]
+
+    # 시간 안에 종료되지 않으면 마지막 상태 반환
+    upbit = FakeUpbit([market_buy_order('wait', [('50000000', '0.001')])])
+    tracker = OrderTracker(timeout=0.05, initial_delay=0.01, max_delay=0.01)
+    fill = tracker.wait_for_fill(upbit, 'order-1')
+    assert fill.state == 'wait' and not fill.is_final and fill.executed_volume == 0.001
+    print("✅ 주문 상태 조회 테스트 통과")
+
+def test_feed_wakes_immediately():
+    """체결 피드에 상태가 게시되면 조회 간격을 기다리지 않고 반환하는지 테스트"""
+    print("🧪 체결 피드 테스트")
+    feed = OrderFillFeed()
+    upbit = FakeUpbit([market_buy_order('wait')])
+    tracker = OrderTracker(timeout=10, initial_delay=5, max_delay=5, feed=feed)
+    threading.Timer(0.05, feed.publish, args=(FILLED,)).start()
+    started = time.monotonic()
+    fill = tracker.wait_for_fill(upbit, 'order-1')
+    assert time.monotonic() - started < 1 and fill.is_final and fill.polls == 0 and upbit.calls == 0
+    print(f"✅ 체결 피드 테스트 통과 ({fill.elapsed:.2f}초)")
+
+def test_execution_records_actual_fill():
+    """매수 결과에 추정값 대신 실제 체결가/수량/수수료를 기록하는지 테스트"""
+    print("🧪 매매 실행 체결 기록 테스트")
+    saved = []
+    originals = execution.save_trade_record, execution.wait_for_order_fill
+    tracker = OrderTracker(timeout=1, initial_delay=0.001, max_delay=0.001)
+    execution.save_trade_record = lambda decision, result, status, market_data: saved.append(dict(result))
+    execution.wait_for_order_fill = tracker.wait_for_fill
+    try:
+        status = {'krw_balance': 105000, 'btc_balance': 0, 'current_price': 49000000}
+        result = execution.execute_trading_decision(FakeUpbit([market_buy_order('wait'), FILLED]),
+                                                    {'decision': 'buy'}, status)
+        fill = parse_order_fill(FILLED)
+        assert result['status'] == 'executed' and result['order_id'] == 'order-1'
+        assert result['price'] == fill.avg_price and result['amount'] == fill.executed_volume
+        assert result['fee'] == fill.paid_fee and result['total_value'] == fill.funds
+        assert saved == [result]
+
+        # 체결 없이 취소돼도 결정은 success=False로 기록
+        result = execution.execute_trading_decision(FakeUpbit([market_buy_order('cancel')]), {'decision': 'buy'}, status)
+        assert result['status'] == 'cancelled' and not result['success']
+        assert len(saved) == 2 and saved[-1] == result and result['total_value'] == 0
+
+        # 시간 안에 체결을 확인하지 못하면 추정값을 success=False로 기록 (롤업 체결 집계에서 제외)
+        execution.wait_for_order_fill = OrderTracker(timeout=0.01, initial_delay=0.005, max_delay=0.005).wait_for_fill
+        result = execution.execute_trading_decision(FakeUpbit([market_buy_order('wait')]),
+                                                    {'decision': 'buy'}, status)
+        assert result['status'] == 'pending' and not result['success'] and saved[-1] == result
+    finally:
+        execution.save_trade_record, execution.wait_for_order_fill = originals
+    print("✅ 매매 실행 체결 기록 테스트 통과")
+
+if __name__ == "__main__":
+    test_parse_order_fill()
+    test_polling_with_backoff()
+    test_feed_wakes_immediately()
+    test_execution_records_actual_fill()
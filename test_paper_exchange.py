@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+모의 거래소 테스트
+합성 분봉을 재생해 시세 조회(마감된 분봉 기준, 일봉 묶기), 주문 체결과 잔고/수수료 반영,
+체결 지연/부분 체결/지정가 대기, install()로 기존 매매 경로를 실제 거래소 없이 실행하는지 확인합니다.
+"""
+
+import pyupbit
+import numpy as np
+import pandas as pd
+import trading.execution as execution
+import data.market_data as market_data
+from datetime import timedelta
+from trading.account import get_investment_status
+from trading.paper_exchange import MarketReplay, PaperExchange
+
+def make_candles(days=2, start='2025-01-01 09:00', price=100000000):
+    """1분마다 1만원씩 오르는 분봉 (고가/저가는 종가 ±5만원)"""
+    index = pd.date_range(start, periods=days * 1440, freq='1min')
+    close = price + 10000.0 * np.arange(len(index))
+    return pd.DataFrame({'open': close - 10000, 'high': close + 50000, 'low': close - 50000, 'close': close,
+                         'volume': 1.0, 'value': close}, index=index)
+
+def make_exchange(**kwargs):
+    replay = MarketReplay(make_candles(), kwargs.pop('orderbooks', None))
+    kwargs.setdefault('latency', 0)
+    return PaperExchange(replay, start=replay.start + timedelta(hours=24), **kwargs)
+
+def test_replay_market_data():
+    """현재가는 마감된 분봉 종가, 일봉은 09:00 기준으로 묶고, 기록된 오더북을 우선 사용하는지 테스트"""
+    print("🧪 시세 재생 테스트")
+    exchange = make_exchange()
+    assert exchange.now == pd.Timestamp('2025-01-02 09:01').to_pydatetime()
+    assert exchange.get_current_price() == 100000000 + 10000 * 1440  # 09:00 분봉 종가
+
+    daily = exchange.get_ohlcv(interval='day', count=30)
+    assert list(daily.index) == [pd.Timestamp('2025-01-01 09:00'), pd.Timestamp('2025-01-02 09:00')]
+    assert daily['volume'].tolist() == [1440, 1] and daily['close'].iloc[-1] == exchange.get_current_price()
+    assert len(exchange.get_ohlcv(interval='minute1', count=200)) == 200
+
+    # 기록된 오더북이 없으면 현재가 주변 합성 오더북
+    units = exchange.get_orderbook()['orderbook_units']
+    assert units[0]['bid_price'] < exchange.get_current_price() < units[0]['ask_price']
+    recorded = {'orderbook_units': [{'ask_price': 1, 'bid_price': 1, 'ask_size': 1, 'bid_size': 1}]}
+    exchange = make_exchange(orderbooks=[(pd.Timestamp('2025-01-02 09:00:30'), recorded)])
+    assert exchange.get_orderbook() is recorded
+    exchange.advance(120)
+    assert exchange.get_orderbook() is not recorded  # 1분보다 오래된 기록은 사용하지 않음
+    print("✅ 시세 재생 테스트 통과")
+
+def test_orders_and_balances():
+    """시장가 체결의 잔고/수수료 반영, 잔고 부족 오류, 체결 지연, 부분 체결, 지정가 대기 체결 테스트"""
+    print("🧪 주문 체결 테스트")
+    exchange = make_exchange(initial_krw=1000000, fee_rate=0.001)
+    order = exchange.buy_market_order('KRW-BTC', 500000)
+    fill = exchange.get_order(order['uuid'])
+    assert fill['state'] == 'cancel' and fill['trades_count'] == 1  # 업비트 시장가 매수는 'cancel'로 종료
+    balances = {balance['currency']: balance for balance in exchange.get_balances()}
+    assert float(balances['KRW']['balance']) == 1000000 - 500000 - 500 and float(balances['KRW']['locked']) == 0
+    volume = float(fill['executed_volume'])
+    assert float(balances['BTC']['balance']) == volume
+    assert abs(float(balances['BTC']['avg_buy_price']) - 500000 / volume) < 1e-6
+
+    assert exchange.buy_market_order('KRW-BTC', 600000)['error']['name'] == 'insufficient_funds_bid'
+    assert exchange.buy_market_order('KRW-BTC', 1000)['error']['name'] == 'under_min_total_bid'
+
+    # 체결 지연 동안은 체결 내역 없이 'wait'
+    delayed = make_exchange(fill_delay=1.0, initial_btc=0.01)
+    order = delayed.sell_market_order('KRW-BTC', 0.01)
+    assert delayed.get_order(order['uuid'])['state'] == 'wait' and delayed.get_order('KRW-BTC')[0]['uuid'] == order['uuid']
+    delayed.advance(1.0)
+    assert delayed.get_order(order['uuid'])['state'] == 'done'
+    assert delayed.get_summary()['btc_balance'] == 0
+
+    # 시장가 부분 체결은 나머지를 취소하고 잠금 해제
+    partial = make_exchange(fill_ratio=0.5, initial_btc=0.01)
+    fill = partial.get_order(partial.sell_market_order('KRW-BTC', 0.01)['uuid'])
+    assert fill['state'] == 'cancel' and abs(float(fill['executed_volume']) - 0.005) < 1e-12
+    assert abs(partial.balances['BTC']['balance'] - 0.005) < 1e-12 and partial.balances['BTC']['locked'] == 0
+
+    # 현재가보다 높은 지정가 매도는 대기하다가 이후 분봉 고가가 닿으면 체결
+    limit = make_exchange(initial_btc=0.01)
+    price = limit.get_current_price() + 100000
+    order = limit.sell_limit_order('KRW-BTC', price, 0.01)
+    assert limit.get_order(order['uuid'])['state'] == 'wait' and limit.balances['BTC']['locked'] == 0.01
+    limit.advance(60)
+    assert limit.get_order(order['uuid'])['state'] == 'wait'
+    limit.advance(5 * 60)
+    fill = limit.get_order(order['uuid'])
+    assert fill['state'] == 'done' and float(fill['trades'][0]['price']) == price
+    assert limit.cancel_order(order['uuid'])['error']['name'] == 'done_order'
+    print(f"✅ 주문 체결 테스트 통과 ({exchange.get_summary()['api_calls']})")
+
+def test_install_runs_trading_path():
+    """install() 안에서 기존 시세/계좌/매매 경로가 모의 거래소로 실행되고, 끝나면 되돌려지는지 테스트"""
+    print("🧪 모의 거래 경로 테스트")
+    exchange = make_exchange(latency=0.05)
+    original = pyupbit.get_ohlcv
+    saved = []
+    save_trade_record = execution.save_trade_record
+    execution.save_trade_record = lambda decision, result, status, market: saved.append(result)
+    try:
+        with exchange.install():
+            minute_df = market_data.get_ohlcv_data_incremental(count=1440)
+            price = market_data.get_current_price()
+            status = get_investment_status(exchange, price)
+            result = execution.execute_trading_decision(exchange, {'decision': 'buy'}, dict(status, krw_balance=500000))
+            after = get_investment_status(exchange, price)
+    finally:
+        execution.save_trade_record = save_trade_record
+
+    assert pyupbit.get_ohlcv is original and exchange.feed is None
+    assert len(minute_df) == 1440 and minute_df['close'].iloc[-1] == price
+    assert status['krw_balance'] == 10000000 and result['status'] == 'executed' and saved == [result]
+    assert abs(after['krw_balance'] - (10000000 - result['total_value'] - result['fee'])) < 1e-6
+    assert after['btc_balance'] == exchange.get_summary()['btc_balance'] == result['amount']
+    assert exchange.call_counts['get_balances'] == 1  # 체결은 계좌 캐시에 직접 반영
+    print(f"✅ 모의 거래 경로 테스트 통과 ({exchange.get_summary()})")
+
+if __name__ == "__main__":
+    test_replay_market_data()
+    test_orders_and_balances()
+    test_install_runs_trading_path()
@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Parquet 분석 아카이브 테스트
+임시 디렉토리에 캔들/거래를 증분 저장하고, 날짜/컬럼 선택 조회, 지난 날짜 파일 병합,
+병합 중단 후 복구를 확인합니다. 거래는 실제 DB 대신 가짜 stream_query로 공급합니다.
+"""
+
+import os
+import glob
+import tempfile
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+from decimal import Decimal
+from datetime import datetime
+import database.parquet_archive as parquet_archive
+from database.parquet_archive import ParquetArchive, TRADE_ARCHIVE_COLUMNS
+
+def make_candles(start: str, periods: int) -> pd.DataFrame:
+    """지표 컬럼이 포함된 분봉 캔들"""
+    index = pd.date_range(start, periods=periods, freq="min")
+    close = 50000000 + np.arange(periods) * 1000.0
+    return pd.DataFrame({'Open': close - 500, 'High': close + 800, 'Low': close - 900, 'Close': close,
+                         'Volume': np.full(periods, 0.5), 'RSI': np.linspace(30, 70, periods)}, index=index)
+
+def with_archive(test):
+    def wrapper():
+        with tempfile.TemporaryDirectory() as directory:
+            test(ParquetArchive(base_dir=directory), directory)
+    wrapper.__name__ = test.__name__
+    wrapper.__doc__ = test.__doc__
+    return wrapper
+
+@with_archive
+def test_incremental_candles(archive, directory):
+    """마감된 캔들만 한 번씩 저장되고 날짜/컬럼 조건으로 조회되는지 테스트"""
+    print("🧪 캔들 증분 저장 테스트")
+    candles = make_candles("2024-03-01 23:50", 20)  # 3/1 23:50 ~ 3/2 00:09
+    assert archive.archive_candles(candles) == 19  # 마지막(진행 중) 캔들 제외
+
+    # 다음 실행: 겹치는 구간 + 새 캔들 → 새로 마감된 캔들만 저장
+    assert archive.archive_candles(make_candles("2024-03-02 00:00", 15)) == 5
+    assert archive.archive_candles(make_candles("2024-03-02 00:00", 15)) == 0
+    assert archive.get_watermark('candles_minute1', 'KRW-BTC') == pd.Timestamp("2024-03-02 00:13")
+
+    full = archive.load('candles_minute1')
+    assert len(full) == 24 and full['timestamp'].is_monotonic_increasing and not full['timestamp'].duplicated().any()
+
+    window = archive.load('candles_minute1', start=datetime(2024, 3, 2, 0, 5), end=datetime(2024, 3, 2, 0, 10),
+                          columns=['timestamp', 'Close', 'RSI'])
+    assert list(window.columns) == ['timestamp', 'Close', 'RSI']
+    assert len(window) == 6 and window['Close'].iloc[0] == 50000000 + 15 * 1000.0  # 첫 실행에서 저장된 값
+
+    # 파티션 컬럼도 조회 가능, 다른 심볼은 비어 있음
+    assert set(archive.load('candles_minute1', columns=['date'])['date']) == {'2024-03-01', '2024-03-02'}
+    assert archive.load('candles_minute1', symbol='KRW-ETH').empty
+    print("✅ 캔들 증분 저장 테스트 통과")
+
+def fake_trades(rows):
+    def stream_query(query, params=(), chunk_size=500, dictionary=True):
+        assert "WHERE id > %s" in query
+        matching = [row for row in rows if row['id'] > params[0]]
+        for start in range(0, len(matching), chunk_size):
+            yield matching[start:start + chunk_size]
+    return stream_query
+
+def trade_row(trade_id, timestamp, action):
+    row = {column: None for column in TRADE_ARCHIVE_COLUMNS}
+    row.update({'id': trade_id, 'timestamp': timestamp, 'decision': action, 'action': action,
+                'confidence': Decimal('0.8000'), 'reasoning': f"거래 {trade_id}", 'price': Decimal('50000000.00000000'),
+                'amount': Decimal('0.01000000'), 'total_value': Decimal('500000.00'), 'fee': Decimal('250.00'),
+                'balance_krw': Decimal('1000000.00'), 'balance_btc': Decimal('0.01000000'), 'status': 'executed'})
+    return row
+
+@with_archive
+def test_incremental_trades(archive, directory):
+    """거래를 id 기준으로 스트리밍해 증분 저장하고 DECIMAL은 float으로 저장하는지 테스트"""
+    print("🧪 거래 증분 저장 테스트")
+    rows = [trade_row(i, datetime(2024, 3, 1 + i // 3, 9, i), 'buy' if i % 2 else 'sell') for i in range(1, 6)]
+    original = parquet_archive.stream_query
+    parquet_archive.stream_query = fake_trades(rows)
+    try:
+        assert archive.archive_trades(chunk_size=2) == 5
+        rows.append(trade_row(6, datetime(2024, 3, 3, 10, 0), 'buy'))
+        assert archive.archive_trades(chunk_size=2) == 1
+        assert archive.archive_trades() == 0
+    finally:
+        parquet_archive.stream_query = original
+
+    trades = archive.load('trades', columns=['id', 'timestamp', 'decision', 'price', 'confidence'])
+    assert list(trades['id']) == [1, 2, 3, 4, 5, 6]
+    assert trades['price'].dtype == np.float64 and trades['confidence'].iloc[0] == 0.8
+    assert list(archive.load('trades', start=datetime(2024, 3, 2), end=datetime(2024, 3, 2, 23, 59))['id']) == [3, 4, 5]
+    print("✅ 거래 증분 저장 테스트 통과")
+
+@with_archive
+def test_compaction(archive, directory):
+    """지난 날짜 파일은 하나로 병합되고, 병합 중단 후에도 행이 유지되는지 테스트"""
+    print("🧪 일 단위 병합 테스트")
+    archive.archive_candles(make_candles("2024-03-01 10:00", 4))
+    candles = make_candles("2024-03-01 10:00", 8)
+    candles['ATR'] = 1000.0  # 나중에 추가된 지표 컬럼
+    archive.archive_candles(candles)
+    archive.archive_candles(make_candles("2024-03-02 10:00", 3))
+
+    day_dir = os.path.join(directory, 'candles_minute1', 'symbol=KRW-BTC', 'date=2024-03-01')
+    assert len(glob.glob(os.path.join(day_dir, "*.parquet"))) == 2
+    before = archive.load('candles_minute1')
+
+    assert archive.compact(today=datetime(2024, 3, 2).date()) == 1  # 오늘(3/2) 파티션은 병합하지 않음
+    assert os.listdir(day_dir) == ['part-day.parquet']
+    after = archive.load('candles_minute1')
+    pd.testing.assert_frame_equal(before, after)
+    assert after['ATR'].isna().sum() == 5 and after['ATR'].notna().sum() == 4
+
+    # 병합 파일 작성 후 원본 삭제 전에 중단된 경우: 다음 실행에서 원본만 정리하고 병합 파일 사용
+    archive.archive_candles(make_candles("2024-03-02 10:00", 6))
+    next_dir = os.path.join(directory, 'candles_minute1', 'symbol=KRW-BTC', 'date=2024-03-02')
+    parts = sorted(glob.glob(os.path.join(next_dir, "*.parquet")))
+    assert len(parts) == 2
+    merged = pa.concat_tables([pq.read_table(part) for part in parts])
+    pq.write_table(merged, os.path.join(next_dir, 'part-day.parquet.merged'))
+    assert len(archive.load('candles_minute1')) == 12  # 작성 중인 병합 파일은 조회에서 제외
+    assert archive.compact(today=datetime(2024, 3, 3).date()) == 1
+    assert os.listdir(next_dir) == ['part-day.parquet'] and len(archive.load('candles_minute1')) == 12
+    print(f"✅ 일 단위 병합 테스트 통과 ({archive.get_status()['candles_minute1']['files']}개 파일)")
+
+if __name__ == "__main__":
+    test_incremental_candles()
+    test_incremental_trades()
+    test_compaction()
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+프롬프트 페이로드 인코더 테스트
+합성 캔들로 만든 시장 데이터로 compact 형식의 정확성과 토큰 예산을 확인합니다.
+"""
+
+import json
+import math
+import analysis.ai_analysis as ai_analysis
+from analysis.technical_indicators import calculate_technical_indicators
+from analysis.ai_analysis import create_market_analysis_data
+from analysis.prompt_payload import build_prompt_payload, count_tokens, dumps_compact, compact_number
+from test_utils import make_candles
+
+def make_market_data():
+    """합성 시장 데이터 생성"""
+    daily_df = calculate_technical_indicators(make_candles(30, seed=3))
+    minute_df = calculate_technical_indicators(make_candles(1440, seed=4))
+    orderbook = {
+        'total_ask_size': 12.345678,
+        'total_bid_size': 9.87654321,
+        'orderbook_units': [
+            {'ask_price': 100010000 + i * 1000, 'bid_price': 100000000 - i * 1000,
+             'ask_size': 0.123456789, 'bid_size': 0.987654321}
+            for i in range(15)
+        ]
+    }
+    news = [
+        {'title': f'Bitcoin news {i}', 'link': f'https://example.com/{i}', 'snippet': 'x' * 200,
+         'source': 'Example', 'date': '1 hour ago', 'position': i, 'sentiment_score': 0.25,
+         'sentiment': '긍정', 'positive_keywords': 2, 'negative_keywords': 0}
+        for i in range(10)
+    ]
+    return create_market_analysis_data(daily_df, minute_df, float(minute_df['Close'].iloc[-1]),
+                                       orderbook, {'current_value': 55}, news)
+
+def test_compact_payload_preserves_latest_values():
+    """최근 캔들 값이 반올림 오차 안에서 보존되는지 테스트"""
+    print("🧪 compact 페이로드 정확성 테스트")
+    market_data = make_market_data()
+    payload, stats = build_prompt_payload(market_data, token_budget=10 ** 6)
+
+    latest = market_data['minute_data'][-1]
+    series = payload['minute_data']['series']
+    assert 'value' not in series
+    for column, values in series.items():
+        assert math.isclose(values[-1], latest[column], rel_tol=1e-5, abs_tol=1e-9), column
+
+    # 일봉 30개에서는 SMA_50이 모두 NaN이므로 제외, RSI는 워밍업 구간 제거
+    daily_series = payload['daily_data']['series']
+    assert 'SMA_50' not in daily_series
+    assert len(daily_series['RSI']) == 30 - 13
+    assert None not in daily_series['RSI']
+
+    assert len(payload['orderbook']['ask_price']) == 5
+    assert 'link' not in payload['news_analysis']['recent_news'][0]
+    json.loads(dumps_compact(payload))
+    print(f"✅ 정확성 테스트 통과 ({stats['total_tokens']:,} 토큰)")
+
+def test_token_budget():
+    """토큰 예산을 지키는지, 기존 형식보다 작은지 테스트"""
+    print("🧪 토큰 예산 테스트")
+    market_data = make_market_data()
+    full_tokens = count_tokens(json.dumps(market_data, default=str))
+
+    unlimited, unlimited_stats = build_prompt_payload(market_data, token_budget=10 ** 6)
+    assert unlimited_stats['total_tokens'] < full_tokens / 2
+    print(f"📉 full {full_tokens:,} → compact {unlimited_stats['total_tokens']:,} 토큰")
+
+    budget = unlimited_stats['total_tokens'] // 2
+    payload, stats = build_prompt_payload(market_data, token_budget=budget)
+    assert stats['within_budget']
+    assert stats['total_tokens'] <= budget
+    assert payload['minute_data']['length'] < 100
+    print(f"✅ 예산 {budget:,} 토큰 이내: {stats['total_tokens']:,} 토큰, 캔들 수 {stats['series_lengths']}")
+
+def test_compact_number():
+    """숫자 반올림 규칙 테스트"""
+    assert compact_number(123456789.123) == 123456789
+    assert compact_number(0.123456789) == 0.123457
+    assert compact_number(float('nan')) is None
+    assert compact_number(None) is None
+    assert compact_number(50.0) == 50
+    print("✅ 숫자 반올림 테스트 통과")
+
+def test_serialize_skips_full_json():
+    """compact 형식은 토큰 통계를 켤 때만 전체 JSON을 만들고, full 형식은 전체 JSON을 반환하는지 테스트"""
+    print("🧪 전체 직렬화 생략 테스트")
+    market_data = make_market_data()
+    calls = []
+    original_dumps, original_stats = ai_analysis.dumps_str, ai_analysis.PROMPT_TOKEN_STATS
+
+    def counting_dumps(data):
+        calls.append(data)
+        return original_dumps(data)
+
+    ai_analysis.dumps_str = counting_dumps
+    try:
+        ai_analysis.PROMPT_TOKEN_STATS = False
+        compact = ai_analysis.serialize_market_data(market_data, "compact")
+        assert calls == [] and json.loads(compact)
+        assert ai_analysis.serialize_market_data(market_data, "full") == original_dumps(market_data)
+        assert len(calls) == 1
+
+        ai_analysis.PROMPT_TOKEN_STATS = True
+        assert ai_analysis.serialize_market_data(market_data, "compact") == compact
+        assert len(calls) == 2
+    finally:
+        ai_analysis.dumps_str, ai_analysis.PROMPT_TOKEN_STATS = original_dumps, original_stats
+    print("✅ 전체 직렬화 생략 테스트 통과")
+
+if __name__ == "__main__":
+    test_compact_payload_preserves_latest_values()
+    test_token_budget()
+    test_compact_number()
+    test_serialize_skips_full_json()
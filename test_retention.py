@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+데이터 보존 정책 테스트
+실제 DB 대신 파티션 목록을 기억하는 가짜 커서로 명시적인 월 파티션 변환, 미래 파티션 추가,
+만료 파티션 보관/삭제, 변환하지 않은 테이블의 월 범위 삭제, 보관 실패 시 삭제 보류를 확인합니다.
+"""
+
+import os
+import re
+import gzip
+import json
+import tempfile
+from datetime import datetime
+from contextlib import contextmanager
+import database.retention as retention
+
+def test_partition_helpers():
+    """월 계산, 파티션 정의, 만료 판정 테스트"""
+    print("🧪 파티션 계산 테스트")
+    assert retention.add_months(datetime(2024, 11, 1), 3) == datetime(2025, 2, 1)
+    assert retention.add_months(datetime(2024, 1, 1), -1) == datetime(2023, 12, 1)
+    months = retention.month_range(datetime(2024, 11, 20, 13), datetime(2025, 1, 1))
+    assert [retention.partition_name(month) for month in months] == ['p202411', 'p202412', 'p202501']
+    assert retention.partition_definitions(months[:1]) == (
+        "PARTITION p202411 VALUES LESS THAN ('2024-12-01'), PARTITION p_future VALUES LESS THAN (MAXVALUE)")
+
+    names = ['p202401', 'p202402', 'p202403', 'p202404', 'p_future']
+    assert retention.expired_partitions(names, datetime(2024, 5, 15), 2) == ['p202401', 'p202402']
+    assert retention.expired_partitions(names, datetime(2024, 5, 15), 12) == []
+    print("✅ 파티션 계산 테스트 통과")
+
+class FakeSchema:
+    """테이블별 파티션 목록과 실행한 DDL을 기억하는 가짜 DB"""
+
+    def __init__(self, oldest, rows, failing=()):
+        self.oldest = oldest
+        self.rows = rows
+        self.failing = failing
+        self.partitions = {table: [] for table in retention.PARTITIONED_TABLES}
+        self.statements = []
+
+    @contextmanager
+    def cursor(self, dictionary=False):
+        schema = self
+
+        class FakeCursor:
+            def execute(self, query, params=()):
+                schema.statements.append(query)
+                self.result = []
+                if "information_schema.partitions" in query:
+                    self.result = [(name,) for name in schema.partitions[params[0]]]
+                elif "information_schema.referential_constraints" in query:
+                    if params[0] == 'trades':
+                        self.result = [('trading_reflections', 'trading_reflections_ibfk_1')]
+                elif query.startswith("SELECT MIN(timestamp)"):
+                    self.result = [(schema.oldest.get(query.split("`")[1]),)]
+                elif "PARTITION BY RANGE" in query:
+                    schema.partitions[query.split("`")[1]] = re.findall(r"PARTITION (\w+) VALUES", query)
+                elif "REORGANIZE PARTITION" in query:
+                    table = query.split("`")[1]
+                    schema.partitions[table] = (schema.partitions[table][:-1] +
+                                                re.findall(r"PARTITION (\w+) VALUES", query))
+                elif "DROP PARTITION" in query:
+                    table, name = query.split("`")[1], query.split("`")[3]
+                    schema.partitions[table].remove(name)
+
+            def fetchone(self):
+                return self.result[0]
+
+            def fetchall(self):
+                return self.result
+
+        yield FakeCursor()
+
+    def stream_query(self, query, params=(), chunk_size=500, dictionary=True):
+        table = query.split("`")[1]
+        if params:  # 파티션되지 않은 테이블은 월 상한 조건으로 조회
+            name = retention.partition_name(retention.add_months(params[0], -1))
+        else:
+            name = query.split("`")[3]
+        if (table, name) in self.failing:
+            raise OSError("디스크 공간 부족")
+        rows = self.rows.get((table, name), [])
+        for start in range(0, len(rows), 2):
+            yield rows[start:start + 2]
+
+def with_fake_schema(**kwargs):
+    def decorator(test):
+        def wrapper():
+            schema = FakeSchema(**kwargs)
+            originals = retention.db_cursor, retention.stream_query
+            retention.db_cursor, retention.stream_query = schema.cursor, schema.stream_query
+            try:
+                with tempfile.TemporaryDirectory() as directory:
+                    test(schema, directory)
+            finally:
+                retention.db_cursor, retention.stream_query = originals
+        wrapper.__name__ = test.__name__
+        wrapper.__doc__ = test.__doc__
+        return wrapper
+    return decorator
+
+MARKET_ROWS = [{'id': i, 'timestamp': datetime(2024, 1, i), 'current_price': 50000000 + i} for i in range(1, 6)]
+
+@with_fake_schema(oldest={'market_data': datetime(2024, 1, 10), 'system_logs': datetime(2024, 3, 5)},
+                  rows={('market_data', 'p202401'): MARKET_ROWS})
+def test_apply_retention(schema, directory):
+    """명시적으로 변환한 테이블의 만료 파티션만 보관 후 삭제하고, 영구 보존인 trades는 변환하지 않는지 테스트"""
+    print("🧪 보존 정책 적용 테스트")
+    manager = retention.RetentionManager({'trades': None, 'market_data': 2, 'system_logs': 1},
+                                         archive_dir=directory, future_months=2)
+    assert manager.partition_targets() == ['market_data', 'system_logs']
+    assert manager.prepare(datetime(2024, 5, 15))
+    dropped = manager.apply(datetime(2024, 5, 15))
+    assert dropped == {'market_data': ['p202401', 'p202402'], 'system_logs': ['p202403']}
+    assert schema.partitions['market_data'] == ['p202403', 'p202404', 'p202405', 'p202406', 'p202407', 'p_future']
+    assert schema.partitions['trades'] == []
+    assert not any("FOREIGN KEY" in query or ("PRIMARY KEY" in query and "`trades`" in query)
+                   for query in schema.statements)
+
+    archive_path = os.path.join(directory, 'market_data', 'market_data_202401.jsonl.gz')
+    with gzip.open(archive_path, "rb") as f:
+        archived = [json.loads(line) for line in f]
+    assert [row['id'] for row in archived] == [1, 2, 3, 4, 5]
+    assert not os.path.exists(os.path.join(directory, 'market_data', 'market_data_202402.jsonl.gz'))
+
+    # 다음 달에는 미래 파티션만 추가되고 테이블을 다시 변환하지 않음
+    manager.apply(datetime(2024, 6, 3))
+    assert schema.partitions['market_data'][-2:] == ['p202408', 'p_future']
+    assert sum("PARTITION BY RANGE" in query for query in schema.statements) == 2
+    print(f"✅ 삭제된 파티션: {dropped}")
+
+@with_fake_schema(oldest={'market_data': datetime(2024, 1, 10)}, rows={('market_data', 'p202401'): MARKET_ROWS})
+def test_apply_without_partitions(schema, directory):
+    """파티션으로 변환하지 않은 테이블은 ALTER 없이 월 범위로 보관 후 DELETE하는지 테스트"""
+    print("🧪 파티션 없는 보존 정책 테스트")
+    manager = retention.RetentionManager({'trades': None, 'market_data': 2}, archive_dir=directory)
+    dropped = manager.apply(datetime(2024, 5, 15))
+    assert dropped == {'market_data': ['p202401', 'p202402']}
+    assert not any(query.startswith("ALTER TABLE") for query in schema.statements)
+    assert sum(query.startswith("DELETE FROM `market_data` WHERE timestamp <") for query in schema.statements) == 2
+    assert os.path.exists(os.path.join(directory, 'market_data', 'market_data_202401.jsonl.gz'))
+    print("✅ 파티션 없는 보존 정책 테스트 통과")
+
+@with_fake_schema(oldest={'market_data': datetime(2024, 1, 10)},
+                  rows={('market_data', 'p202401'): MARKET_ROWS}, failing=[('market_data', 'p202401')])
+def test_archive_failure_keeps_partition(schema, directory):
+    """보관에 실패한 파티션은 삭제하지 않고 임시 파일도 남기지 않는지 테스트"""
+    print("🧪 보관 실패 테스트")
+    manager = retention.RetentionManager({'market_data': 2}, archive_dir=directory)
+    manager.prepare(datetime(2024, 5, 15))
+    dropped = manager.apply(datetime(2024, 5, 15))
+    assert dropped == {'market_data': ['p202402']}
+    assert 'p202401' in schema.partitions['market_data']
+    assert os.listdir(os.path.join(directory, 'market_data')) == []
+    print("✅ 보관 실패 테스트 통과")
+
+if __name__ == "__main__":
+    test_partition_helpers()
+    test_apply_retention()
+    test_apply_without_partitions()
+    test_archive_failure_keeps_partition()
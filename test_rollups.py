@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+거래 롤업 테스트
+기간 경계 계산, 거래 1건의 집계 행 변환, 기존 거래 재구성, 기간 성과 지표 계산을 확인합니다.
+"""
+
+from datetime import datetime
+from contextlib import contextmanager
+import database.rollups as rollups
+
+def test_period_start():
+    """시간/일/주/월 기간 시작 시각 계산 테스트"""
+    print("🧪 집계 기간 경계 테스트")
+    timestamp = datetime(2024, 5, 16, 13, 45, 12)  # 목요일
+    assert rollups.period_start(timestamp, 'hourly') == datetime(2024, 5, 16, 13)
+    assert rollups.period_start(timestamp, 'daily') == datetime(2024, 5, 16)
+    assert rollups.period_start(timestamp, 'weekly') == datetime(2024, 5, 13)
+    assert rollups.period_start(timestamp, 'monthly') == datetime(2024, 5, 1)
+    print("✅ 집계 기간 경계 테스트 통과")
+
+def test_build_rollup_rows():
+    """거래 1건이 기간마다 하나씩 UPSERT 행으로 변환되는지 테스트"""
+    print("🧪 집계 행 변환 테스트")
+    timestamp = datetime(2024, 5, 16, 13, 45)
+    pnl = rollups.realized_pnl('sell', 52000000, 0.01, 260, avg_buy_price=50000000)
+    assert pnl == (52000000 - 50000000) * 0.01 - 260
+    assert rollups.realized_pnl('buy', 52000000, 0.01, 260, avg_buy_price=50000000) is None
+
+    rows = rollups.build_rollup_rows(timestamp, 'sell', 'sell', 520000, 260, pnl,
+                                     rollups.trade_equity(1000000, 0.01, 52000000))
+    assert [row[0] for row in rows] == list(rollups.PERIOD_TYPES)
+    assert all(len(row) == len(rollups.ROLLUP_COLUMNS) for row in rows)
+
+    row = dict(zip(rollups.ROLLUP_COLUMNS, rows[0]))
+    assert row['trade_count'] == 1 and row['sell_decisions'] == 1 and row['executed_sells'] == 1
+    assert row['sell_notional'] == 520000 and row['buy_notional'] == 0
+    assert row['winning_trades'] == 1 and row['losing_trades'] == 0
+    assert row['equity_high'] == row['equity_low'] == 1520000
+    assert rollups.UPSERT_ROLLUP_QUERY.count("%s") == len(rollups.ROLLUP_COLUMNS)
+
+    # 체결 미확인(pending) 거래는 결정 건수만 반영
+    row = dict(zip(rollups.ROLLUP_COLUMNS, rollups.build_rollup_rows(timestamp, 'sell', 'sell', 520000, 260, pnl,
+                                                                      None, executed=False)[0]))
+    assert row['trade_count'] == 1 and row['sell_decisions'] == 1 and row['executed_sells'] == 0
+    assert row['sell_notional'] == 0 and row['fees'] == 0 and row['realized_pnl'] == 0 and row['winning_trades'] == 0
+    print("✅ 집계 행 변환 테스트 통과")
+
+class FakeDatabase:
+    """SELECT 결과를 돌려주고 executemany로 받은 행을 기록하는 가짜 DB"""
+
+    def __init__(self, select_rows):
+        self.select_rows = select_rows
+        self.upserts = []
+
+    @contextmanager
+    def cursor(self, dictionary=False):
+        database = self
+
+        class FakeCursor:
+            def execute(self, query, params=()):
+                pass
+
+            def executemany(self, query, rows):
+                database.upserts.extend(rows)
+
+            def fetchall(self):
+                return database.select_rows
+
+        yield FakeCursor()
+
+def with_fake_database(select_rows):
+    def decorator(test):
+        def wrapper():
+            database = FakeDatabase(select_rows)
+            originals = rollups.db_cursor, rollups.iter_trade_chunks
+            rollups.db_cursor = database.cursor
+            rollups.iter_trade_chunks = lambda columns=None: iter([select_rows[:2], select_rows[2:]])
+            try:
+                test(database)
+            finally:
+                rollups.db_cursor, rollups.iter_trade_chunks = originals
+        wrapper.__name__ = test.__name__
+        wrapper.__doc__ = test.__doc__
+        return wrapper
+    return decorator
+
+TRADES = [
+    {'timestamp': datetime(2024, 5, 1, 9), 'decision': 'buy', 'action': 'buy', 'price': 50000000,
+     'amount': 0.02, 'total_value': 1000000, 'fee': 500, 'balance_krw': 2000000, 'balance_btc': 0},
+    {'timestamp': datetime(2024, 5, 1, 15), 'decision': 'hold', 'action': 'hold', 'price': 0,
+     'amount': 0, 'total_value': 0, 'fee': 0, 'balance_krw': 1000000, 'balance_btc': 0.02},
+    {'timestamp': datetime(2024, 5, 2, 10), 'decision': 'sell', 'action': 'sell', 'price': 55000000,
+     'amount': 0.01, 'total_value': 550000, 'fee': 275, 'balance_krw': 1000000, 'balance_btc': 0.02},
+]
+
+@with_fake_database(TRADES)
+def test_rebuild(database):
+    """거래 순서대로 평균 매수가를 재생해 실현 손익을 계산하는지 테스트"""
+    print("🧪 롤업 재구성 테스트")
+    assert rollups.TradeRollups().rebuild() == 3
+    assert len(database.upserts) == 3 * len(rollups.PERIOD_TYPES)
+
+    sell_row = dict(zip(rollups.ROLLUP_COLUMNS, database.upserts[-4]))
+    assert sell_row['period_type'] == 'hourly'
+    assert sell_row['realized_pnl'] == (55000000 - 50000000) * 0.01 - 275
+    hold_row = dict(zip(rollups.ROLLUP_COLUMNS, database.upserts[4]))
+    assert hold_row['hold_decisions'] == 1 and hold_row['equity_high'] is None
+    print(f"✅ 재구성: 매도 실현 손익 {sell_row['realized_pnl']:,.0f}원")
+
+PENDING_TRADES = TRADES[:1] + [
+    {'timestamp': datetime(2024, 5, 1, 12), 'decision': 'buy', 'action': 'buy', 'price': 50000000,
+     'amount': 0.02, 'total_value': 1000000, 'fee': 500, 'balance_krw': 1000000, 'balance_btc': 0.02,
+     'status': 'pending'},
+    {'timestamp': datetime(2024, 5, 1, 13), 'decision': 'buy', 'action': 'buy', 'price': 0,
+     'amount': 0, 'total_value': 0, 'fee': 0, 'balance_krw': 1000000, 'balance_btc': 0.02,
+     'status': 'cancelled'},
+] + TRADES[2:]
+
+@with_fake_database(PENDING_TRADES)
+def test_rebuild_skips_pending(database):
+    """체결이 확인되지 않거나 체결 없이 끝난 거래는 체결 집계와 평균 매수가 재생에서 제외하는지 테스트"""
+    print("🧪 체결 미확인 거래 재구성 테스트")
+    assert rollups.TradeRollups().rebuild() == 4
+    for position in (4, 8):  # 체결 미확인(pending), 체결 없이 취소(cancelled)
+        row = dict(zip(rollups.ROLLUP_COLUMNS, database.upserts[position]))
+        assert row['buy_decisions'] == 1 and row['executed_buys'] == 0 and row['fees'] == 0
+    sell_row = dict(zip(rollups.ROLLUP_COLUMNS, database.upserts[-4]))
+    assert sell_row['realized_pnl'] == (55000000 - 50000000) * 0.01 - 275  # 평균 매수가는 체결된 매수만 반영
+    print("✅ 체결 미확인 거래 재구성 테스트 통과")
+
+HOURLY_ROWS = [
+    {'trade_count': 2, 'buy_decisions': 1, 'sell_decisions': 0, 'hold_decisions': 1, 'winning_trades': 0,
+     'losing_trades': 0, 'realized_pnl': 0, 'buy_notional': 1000000, 'sell_notional': 0, 'fees': 500,
+     'equity_open': 2000000, 'equity_high': 2000000, 'equity_low': 1900000},
+    {'trade_count': 1, 'buy_decisions': 0, 'sell_decisions': 1, 'hold_decisions': 0, 'winning_trades': 0,
+     'losing_trades': 1, 'realized_pnl': -30000, 'buy_notional': 0, 'sell_notional': 480000, 'fees': 240,
+     'equity_open': 1800000, 'equity_high': 1850000, 'equity_low': 1800000},
+]
+
+@with_fake_database(HOURLY_ROWS)
+def test_period_metrics(database):
+    """시간 단위 집계 행으로 승률, 손익률, 최대 낙폭을 계산하는지 테스트"""
+    print("🧪 기간 성과 지표 테스트")
+    metrics = rollups.TradeRollups().get_period_metrics(datetime(2024, 5, 1), datetime(2024, 5, 1, 23, 59))
+    assert metrics['total_trades'] == 3
+    assert metrics['decision_counts'] == {'buy': 1, 'sell': 1, 'hold': 1}
+    assert metrics['win_rate'] == 0.0 and metrics['losing_trades'] == 1
+    assert metrics['realized_pnl_percentage'] == -30000 / 2000000 * 100
+    assert abs(metrics['max_drawdown'] - 0.1) < 1e-9
+    assert metrics['periods'] == 2
+    print(f"✅ 최대 낙폭 {metrics['max_drawdown']:.1%}, 손익률 {metrics['realized_pnl_percentage']:.2f}%")
+
+if __name__ == "__main__":
+    test_period_start()
+    test_build_rollup_rows()
+    test_rebuild()
+    test_rebuild_skips_pending()
+    test_period_metrics()
@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+분할 주문 실행 테스트
+호가를 따라 체결하는 가짜 거래소로 TWAP/iceberg 조각 계획, 한 번에 시장가 주문 대비 슬리피지,
+지정가 미체결분 이월과 시장가 정리, 취소 실패 시 중단, 부모 주문 한 건 기록을 확인합니다.
+"""
+
+import uuid
+import trading.execution as execution
+import trading.sliced_execution as sliced_execution
+from trading.order_tracker import OrderTracker
+from trading.sliced_execution import SlicedExecutionEngine, plan_twap_slices, depth_slice_size
+
+FEE_RATE = 0.0005
+
+def make_orderbook(best_ask=50000000, best_bid=49990000, size=0.02, tick=10000, levels=10):
+    """단계마다 같은 잔량이 있는 오더북"""
+    return {'orderbook_units': [
+        {'ask_price': best_ask + tick * level, 'bid_price': best_bid - tick * level, 'ask_size': size, 'bid_size': size}
+        for level in range(levels)
+    ]}
+
+class FakeExchange:
+    """
+    가짜 거래소: 주문마다 현재 오더북을 따라 체결하고, 다음 조회 전에 호가 잔량이 다시 채워짐
+    """
+
+    def __init__(self, orderbook):
+        self.orderbook = orderbook
+        self.orders = {}
+        self.placed = []
+
+    def get_orderbook(self, symbol):
+        return self.orderbook
+
+    def _fill(self, side, max_volume=None, max_funds=None, limit_price=None):
+        trades, volume_left, funds_left = [], max_volume, max_funds
+        for unit in self.orderbook['orderbook_units']:
+            price = unit['ask_price'] if side == 'bid' else unit['bid_price']
+            if limit_price is not None and (price > limit_price if side == 'bid' else price < limit_price):
+                break
+            volume = unit['ask_size'] if side == 'bid' else unit['bid_size']
+            if volume_left is not None:
+                volume = min(volume, volume_left)
+            if funds_left is not None:
+                volume = min(volume, funds_left / price)
+            if volume <= 0:
+                break
+            trades.append({'price': str(price), 'volume': str(volume), 'funds': str(price * volume)})
+            if volume_left is not None:
+                volume_left -= volume
+            if funds_left is not None:
+                funds_left -= price * volume
+        return trades
+
+    def _order(self, side, ord_type, trades, state):
+        order_id = uuid.uuid4().hex
+        executed = sum(float(trade['volume']) for trade in trades)
+        funds = sum(float(trade['funds']) for trade in trades)
+        self.orders[order_id] = {'uuid': order_id, 'side': side, 'ord_type': ord_type, 'state': state,
+                                 'executed_volume': str(executed), 'paid_fee': str(funds * FEE_RATE),
+                                 'trades_count': len(trades), 'trades': trades}
+        self.placed.append((side, ord_type))
+        return {'uuid': order_id, 'state': 'wait'}
+
+    def buy_market_order(self, symbol, krw):
+        return self._order('bid', 'price', self._fill('bid', max_funds=krw), 'cancel')
+
+    def sell_market_order(self, symbol, volume):
+        return self._order('ask', 'market', self._fill('ask', max_volume=volume), 'done')
+
+    def buy_limit_order(self, symbol, price, volume):
+        trades = self._fill('bid', max_volume=volume, limit_price=price)
+        filled = sum(float(trade['volume']) for trade in trades)
+        return self._order('bid', 'limit', trades, 'done' if filled >= volume - 1e-12 else 'wait')
+
+    def sell_limit_order(self, symbol, price, volume):
+        trades = self._fill('ask', max_volume=volume, limit_price=price)
+        filled = sum(float(trade['volume']) for trade in trades)
+        return self._order('ask', 'limit', trades, 'done' if filled >= volume - 1e-12 else 'wait')
+
+    def cancel_order(self, order_id):
+        self.orders[order_id]['state'] = 'cancel'
+        return {'uuid': order_id}
+
+    def get_order(self, order_id):
+        return dict(self.orders[order_id])
+
+class StuckCancelExchange(FakeExchange):
+    """취소 요청이 거부되고 주문이 계속 'wait'로 남는 가짜 거래소"""
+
+    def cancel_order(self, order_id):
+        return {'error': {'name': 'order_not_found', 'message': '주문을 찾지 못했습니다.'}}
+
+def make_engine(exchange, **kwargs):
+    tracker = OrderTracker(timeout=1, initial_delay=0.001, max_delay=0.001)
+    return SlicedExecutionEngine(window=kwargs.pop('window', 0), orderbook_fetcher=exchange.get_orderbook,
+                                 tracker=tracker, limit_tracker=tracker, **kwargs)
+
+def test_slice_planning():
+    """TWAP 조각 수/간격과 호가 잔량 기준 조각 크기 계산 테스트"""
+    print("🧪 조각 계획 테스트")
+    assert plan_twap_slices(10000000, 5, 100, 5000) == [(0, 2000000), (20, 2000000), (40, 2000000),
+                                                         (60, 2000000), (80, 2000000)]
+    assert len(plan_twap_slices(12000, 5, 100, 5000)) == 2  # 조각마다 최소 주문 금액 이상
+    book = make_orderbook(size=0.02)
+    assert abs(depth_slice_size(book, 'sell', 0.5, levels=3) - 0.03) < 1e-12
+    assert abs(depth_slice_size(book, 'buy', 1.0, levels=1) - 50000000 * 0.02) < 1e-6
+    assert depth_slice_size({}, 'buy', 0.5) is None
+    print("✅ 조각 계획 테스트 통과")
+
+def test_twap_reduces_slippage():
+    """한 번에 시장가로 사는 것보다 TWAP 분할 매수의 슬리피지가 작은지 테스트"""
+    print("🧪 TWAP 슬리피지 테스트")
+    single = FakeExchange(make_orderbook())
+    single_engine = make_engine(single, max_slices=1, order_type='market')
+    single_engine.submit(single, 'buy', 5000000, 50000000)
+    single_report = single_engine.wait(5)
+
+    exchange = FakeExchange(make_orderbook())
+    engine = make_engine(exchange, max_slices=5, order_type='market')
+    completed = []
+    report = engine.submit(exchange, 'buy', 5000000, 50000000, on_complete=completed.append)
+    assert engine.wait(5) is report and completed == [report]
+
+    assert report.status == 'executed' and len(report.children) == 5 and report.remaining < 1
+    assert report.slippage_bps < single_report.slippage_bps
+    assert abs(report.avg_price - report.funds / report.executed_volume) < 1e-6
+    result = report.to_execution_result()
+    assert result['order_id'] == report.parent_id and result['amount'] == report.executed_volume
+    print(f"✅ 슬리피지: 한 번에 {single_report.slippage_bps:.1f}bp → TWAP {report.slippage_bps:.1f}bp")
+
+def test_iceberg_limit_slices():
+    """지정가 조각의 미체결분은 취소 후 이월되고, 남은 수량은 시장가로 정리되는지 테스트"""
+    print("🧪 iceberg 지정가 테스트")
+    exchange = FakeExchange(make_orderbook(size=0.01))
+    engine = make_engine(exchange, max_slices=3, order_type='limit', depth_ratio=0.5)
+    engine.submit(exchange, 'sell', 0.05, 49990000, strategy='iceberg')
+    report = engine.wait(5)
+
+    # 최우선 매수호가 잔량(0.01)까지만 지정가로 체결, 나머지는 시장가
+    limit_children = [child for child in report.children if child.order_type == 'limit']
+    assert len(limit_children) == 3 and all(child.fill.state in ('done', 'cancel') for child in limit_children)
+    assert all(child.fill.avg_price == 49990000 for child in limit_children)
+    assert report.children[-1].order_type == 'market'
+    assert abs(report.executed_volume - 0.05) < 1e-9 and report.status == 'executed'
+    assert report.slippage_bps > 0  # 매도는 도착가보다 낮게 체결될수록 양수
+    print(f"✅ iceberg 지정가 테스트 통과 (조각 {len(report.children)}개, 슬리피지 {report.slippage_bps:.1f}bp)")
+
+def test_cancel_failure_stops_parent():
+    """지정가 조각 취소가 실패해 주문이 남아 있으면 더 주문하지 않고 partially_filled로 중단하는지 테스트"""
+    print("🧪 조각 취소 실패 테스트")
+    exchange = StuckCancelExchange(make_orderbook(size=0.01))
+    engine = make_engine(exchange, max_slices=3, order_type='limit', depth_ratio=0.5)
+    invalidated = []
+    original = sliced_execution.invalidate_account_state
+    sliced_execution.invalidate_account_state = lambda: invalidated.append(True)
+    try:
+        engine.submit(exchange, 'sell', 0.05, 49990000, strategy='iceberg')
+        report = engine.wait(5)
+    finally:
+        sliced_execution.invalidate_account_state = original
+
+    # 첫 조각 이후 추가 조각도, 남은 수량의 시장가 정리도 없음
+    assert exchange.placed == [('ask', 'limit')] and len(report.children) == 1
+    assert report.children[0].fill.state == 'wait' and abs(report.executed_volume - 0.01) < 1e-9
+    assert report.status == 'partially_filled' and invalidated
+    print("✅ 조각 취소 실패 테스트 통과")
+
+def test_execution_records_parent_once():
+    """큰 매수 결정은 분할 실행되고 부모 주문이 (체결이 없어도) 거래 한 건으로 기록되는지 테스트"""
+    print("🧪 부모 주문 기록 테스트")
+    exchange = FakeExchange(make_orderbook())
+    engine = make_engine(exchange, max_slices=4, order_type='market')
+    saved = []
+    originals = sliced_execution.sliced_execution_engine, execution.save_trade_record, execution.EXECUTION_STRATEGY
+    sliced_execution.sliced_execution_engine = engine
+    execution.save_trade_record = lambda decision, result, status, market_data: saved.append(result)
+    execution.EXECUTION_STRATEGY = 'twap'  # 분할 실행은 설정으로 선택 (기본값은 한 번에 시장가)
+    try:
+        status = {'krw_balance': 4000000, 'btc_balance': 0, 'current_price': 50000000}
+        result = execution.execute_trading_decision(exchange, {'decision': 'buy'}, status)
+        assert result['status'] == 'working' and result['order_id'].startswith('twap-')
+        report = engine.wait(5)
+    finally:
+        sliced_execution.sliced_execution_engine, execution.save_trade_record, execution.EXECUTION_STRATEGY = originals
+
+    assert len(report.children) == 4 and len(exchange.placed) == 4
+    assert len(saved) == 1 and saved[0]['order_id'] == result['order_id'] and saved[0]['status'] == 'executed'
+    assert abs(saved[0]['total_value'] - 4000000 * 0.95) < 1
+
+    # 조각이 하나도 체결되지 않아도 부모 주문은 success=False로 한 번 기록
+    exchange = FakeExchange(make_orderbook(size=0))
+    engine = make_engine(exchange, max_slices=4, order_type='market')
+    saved.clear()
+    sliced_execution.sliced_execution_engine = engine
+    execution.save_trade_record = lambda decision, result, status, market_data: saved.append(result)
+    execution.EXECUTION_STRATEGY = 'twap'
+    try:
+        result = execution.execute_trading_decision(exchange, {'decision': 'buy'}, status)
+        report = engine.wait(5)
+    finally:
+        sliced_execution.sliced_execution_engine, execution.save_trade_record, execution.EXECUTION_STRATEGY = originals
+
+    assert report.status == 'failed' and report.executed_volume == 0
+    assert len(saved) == 1 and saved[0]['order_id'] == result['order_id']
+    assert saved[0]['status'] == 'failed' and not saved[0]['success'] and saved[0]['amount'] == 0
+    print("✅ 부모 주문 기록 테스트 통과")
+
+if __name__ == "__main__":
+    test_slice_planning()
+    test_twap_reduces_slippage()
+    test_iceberg_limit_slices()
+    test_cancel_failure_stops_parent()
+    test_execution_records_parent_once()
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+시장 데이터 스냅샷 저장소 테스트
+실제 DB 대신 가짜 커서로 해시 중복 제거, 압축 왕복, 지연 로딩 캐시, 스풀 파일의 바이너리 보관을 확인합니다.
+"""
+
+import os
+import tempfile
+from contextlib import contextmanager
+import database.snapshot_store as snapshot_store
+import database.write_queue as write_queue
+
+MARKET_DATA = {'current_price': 95000000, 'rsi': 55.2, 'daily_data': [{'close': 94000000 + i} for i in range(200)]}
+
+def test_encode_roundtrip():
+    """키 순서가 달라도 같은 해시가 나오고 압축 본문이 원본으로 복원되는지 테스트"""
+    print("🧪 스냅샷 인코딩 테스트")
+    snapshot_hash, row = snapshot_store.encode_snapshot(MARKET_DATA)
+    reordered_hash, _ = snapshot_store.encode_snapshot(dict(reversed(list(MARKET_DATA.items()))))
+    assert snapshot_hash == reordered_hash and len(snapshot_hash) == 64
+
+    _, codec, raw_size, compressed_size, data = row
+    assert codec in ('zstd', 'gzip') and compressed_size == len(data) < raw_size
+    assert snapshot_store.decode_snapshot(codec, data) == MARKET_DATA
+    print(f"✅ {codec}: {raw_size:,}B → {compressed_size:,}B")
+
+class FakeSnapshotTable:
+    """market_snapshots 행을 해시로 보관하는 가짜 DB"""
+
+    def __init__(self):
+        self.rows = {}
+        self.selects = 0
+
+    @contextmanager
+    def cursor(self, dictionary=False):
+        table = self
+
+        class FakeCursor:
+            def execute(self, query, params=()):
+                if "INSERT IGNORE INTO market_snapshots" in query:
+                    table.rows.setdefault(params[0], {'codec': params[1], 'data': params[4]})
+                elif "FROM market_snapshots" in query:
+                    table.selects += 1
+                    self.result = table.rows.get(params[0])
+
+            def fetchone(self):
+                return self.result
+
+        yield FakeCursor()
+
+def test_dedup_and_lazy_load():
+    """같은 스냅샷은 한 번만 저장하고 조회는 캐시된 복사본을 돌려주는지 테스트"""
+    print("🧪 중복 제거/지연 로딩 테스트")
+    table = FakeSnapshotTable()
+    original = snapshot_store.db_cursor
+    snapshot_store.db_cursor = table.cursor
+    try:
+        store = snapshot_store.SnapshotStore(cache_size=1)
+        snapshot_hash = store.put(MARKET_DATA)
+        assert store.put(dict(MARKET_DATA)) == snapshot_hash
+        assert len(table.rows) == 1
+
+        loaded = store.load_trade_market_data({'market_data': None, 'market_snapshot_hash': snapshot_hash})
+        assert loaded == MARKET_DATA
+        loaded['rsi'] = 0
+        assert store.load(snapshot_hash)['rsi'] == 55.2 and table.selects == 1
+
+        # 이전 방식의 인라인 JSON 행도 그대로 읽힘
+        assert store.load_trade_market_data({'market_data': '{"rsi": 40}', 'market_snapshot_hash': None}) == {'rsi': 40}
+        assert store.load('0' * 64) is None
+    finally:
+        snapshot_store.db_cursor = original
+    print("✅ 중복 제거/지연 로딩 테스트 통과")
+
+def test_spool_keeps_bytes():
+    """DB 장애 시 스풀 파일에 기록한 압축 본문이 재시도 때 바이트로 복원되는지 테스트"""
+    print("🧪 스풀 바이너리 보관 테스트")
+    _, row = snapshot_store.encode_snapshot(MARKET_DATA)
+    with tempfile.TemporaryDirectory() as directory:
+        written = []
+        queue = write_queue.WriteBehindQueue(spool_path=os.path.join(directory, "spool.jsonl"))
+        queue._write = written.extend
+        queue._spool([(snapshot_store.INSERT_SNAPSHOT_QUERY, row)])
+        queue._replay_spool()
+        assert written == [(snapshot_store.INSERT_SNAPSHOT_QUERY, row)]
+    print("✅ 스풀 바이너리 보관 테스트 통과")
+
+if __name__ == "__main__":
+    test_encode_roundtrip()
+    test_dedup_and_lazy_load()
+    test_spool_keeps_bytes()
@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+SQLite 저장소 백엔드 테스트
+MySQL 서버 없이 임시 SQLite 파일로 초기화, 거래 저장(쓰기 대기열), 조회, 통계, 롤업,
+스냅샷 지연 로딩, 반성 기록, 대시보드 형식 조회까지 전체 흐름을 확인합니다.
+"""
+
+import os
+import tempfile
+import warnings
+from datetime import datetime, timedelta
+import pandas as pd
+from mysql.connector import Error
+import database.connection as connection
+from database.connection import DatabaseConnection, init_database, db_cursor, pooled_connection
+from database.sqlite_backend import translate_query
+from database.trade_recorder import save_trade_record
+from database.write_queue import flush_write_queue
+from database.query import get_recent_trades, trade_query
+from database.stats_service import StatisticsService
+from database.rollups import get_period_metrics
+from database.snapshot_store import load_trade_market_data
+from analysis.reflection_system import TradingReflectionSystem, TradeReflection
+from reflection_viewer import ReflectionViewer
+
+def with_sqlite_database(test):
+    def wrapper():
+        original = connection.db_connection
+        with tempfile.TemporaryDirectory() as directory:
+            connection.db_connection = DatabaseConnection(backend='sqlite',
+                                                          sqlite_path=os.path.join(directory, 'trading.db'))
+            try:
+                assert init_database()
+                test()
+            finally:
+                flush_write_queue()
+                connection.db_connection.pool.close_all()
+                connection.db_connection = original
+    wrapper.__name__ = test.__name__
+    wrapper.__doc__ = test.__doc__
+    return wrapper
+
+def test_translate_query():
+    """이 저장소의 MySQL 문법이 SQLite 문법으로 변환되는지 테스트"""
+    print("🧪 쿼리 변환 테스트")
+    assert translate_query("SELECT * FROM t WHERE created_at >= DATE_SUB(NOW(), INTERVAL %s DAY) LIMIT %s") == (
+        "SELECT * FROM t WHERE created_at >= datetime('now', 'localtime', '-' || ? || ' days') LIMIT ?")
+    assert translate_query("INSERT IGNORE INTO s (a) VALUES (%s)") == "INSERT OR IGNORE INTO s (a) VALUES (?)"
+    assert translate_query("INSERT INTO r (a, b) VALUES (%s, %s) ON DUPLICATE KEY UPDATE "
+                           "b = IF(VALUES(a) < a, GREATEST(b, VALUES(b)), LEAST(b, VALUES(b)))") == (
+        "INSERT INTO r (a, b) VALUES (?, ?) ON CONFLICT DO UPDATE SET "
+        "b = IIF(excluded.a < a, MAX(b, excluded.b), MIN(b, excluded.b))")
+    ddl = translate_query("""
+        CREATE TABLE IF NOT EXISTS t (
+            id INT AUTO_INCREMENT PRIMARY KEY,
+            kind ENUM('a', 'b') NOT NULL,
+            data JSON,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP
+        ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
+    """)
+    assert "INTEGER PRIMARY KEY AUTOINCREMENT" in ddl and "kind TEXT NOT NULL" in ddl and "data TEXT" in ddl
+    assert "ENGINE" not in ddl and "ON UPDATE" not in ddl
+    assert translate_query("ALTER TABLE `trades` ADD COLUMN `h` CHAR(64) NULL AFTER market_data") == (
+        "ALTER TABLE `trades` ADD COLUMN `h` CHAR(64) NULL")
+    print("✅ 쿼리 변환 테스트 통과")
+
+MARKET_DATA = {'current_price': 52000000, 'rsi': 61.5, 'daily_data': [{'close': 51000000 + i} for i in range(30)]}
+
+@with_sqlite_database
+def test_trading_pipeline():
+    """서버 없이 거래 저장부터 통계/롤업/스냅샷/반성/대시보드 조회까지 동작하는지 테스트"""
+    print("🧪 SQLite 전체 흐름 테스트")
+    assert connection.get_backend() == 'sqlite'
+    assert save_trade_record({'decision': 'buy', 'confidence': 0.8, 'reasoning': '상승 추세'},
+                             {'action': 'buy', 'price': 50000000, 'amount': 0.01, 'total_value': 500000, 'fee': 250},
+                             {'krw_balance': 500000, 'btc_balance': 0.01, 'btc_avg_price': 0}, MARKET_DATA)
+    assert save_trade_record({'decision': 'sell', 'confidence': 0.7, 'reasoning': '과매수'},
+                             {'action': 'sell', 'price': 52000000, 'amount': 0.01, 'total_value': 520000, 'fee': 260},
+                             {'krw_balance': 1019750, 'btc_balance': 0, 'btc_avg_price': 50000000}, MARKET_DATA)
+    assert flush_write_queue()
+
+    trades = get_recent_trades(10)
+    assert [trade['action'] for trade in trades] == ['sell', 'buy']
+    assert isinstance(trades[0]['timestamp'], datetime)
+    now = datetime.now()
+    assert len(trade_query.get_trades_by_date_range(now - timedelta(hours=1), now + timedelta(hours=1))) == 2
+
+    summary = StatisticsService(ttl=0).get_trade_summary(30)
+    assert summary['total_trades'] == 2
+    assert abs(float(summary['realized_pnl']) - ((52000000 - 50000000) * 0.01 - 260)) < 1e-6
+
+    metrics = get_period_metrics(now - timedelta(days=1), now + timedelta(days=1))
+    assert metrics['total_trades'] == 2 and metrics['winning_trades'] == 1
+
+    # 같은 시장 데이터는 스냅샷 1개로 저장되고 필요할 때만 읽음
+    with db_cursor(dictionary=True) as cursor:
+        cursor.execute("SELECT COUNT(*) AS count FROM market_snapshots")
+        assert cursor.fetchone()['count'] == 1
+        cursor.execute("SELECT id, market_data, market_snapshot_hash FROM trades ORDER BY id LIMIT 1")
+        trade_row = cursor.fetchone()
+    assert trade_row['market_data'] is None and load_trade_market_data(trade_row) == MARKET_DATA
+
+    reflection_system = TradingReflectionSystem()
+    assert reflection_system._save_reflection(TradeReflection(
+        trade_id=trade_row['id'], reflection_type='immediate', performance_score=0.7, profit_loss=19740,
+        profit_loss_percentage=3.9, market_conditions={'rsi': 61.5}, decision_quality_score=0.8,
+        timing_score=0.6, risk_management_score=0.7, ai_analysis='분석', improvement_suggestions='제안',
+        lessons_learned='교훈', next_actions='다음 행동'))
+    viewer = ReflectionViewer()
+    reflections = viewer.get_recent_reflections(5)
+    assert len(reflections) == 1 and reflections[0]['decision'] == 'buy'
+    assert StatisticsService(ttl=0).get_reflection_summary(30)['total_reflections'] == 1
+
+    # 대시보드처럼 풀 연결로 pandas.read_sql 사용
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", UserWarning)
+        with pooled_connection() as pooled:
+            df = pd.read_sql("SELECT id, action, total_value FROM trades ORDER BY timestamp DESC LIMIT %s",
+                             pooled, params=(10,))
+    assert list(df['action']) == ['sell', 'buy']
+    print(f"✅ SQLite 전체 흐름 테스트 통과 (실현 손익 {float(summary['realized_pnl']):,.0f}원)")
+
+@with_sqlite_database
+def test_errors_and_transactions():
+    """SQLite 오류가 mysql.connector 오류로 바뀌고 실패한 트랜잭션은 롤백되는지 테스트"""
+    print("🧪 오류 변환/트랜잭션 테스트")
+    try:
+        with db_cursor() as cursor:
+            cursor.execute("SELECT * FROM missing_table")
+        assert False, "없는 테이블 조회는 오류가 발생해야 합니다"
+    except Error:
+        pass
+
+    try:
+        with pooled_connection() as pooled:
+            pooled.start_transaction()
+            cursor = pooled.cursor()
+            cursor.execute("INSERT INTO system_logs (timestamp, level, message) VALUES (%s, %s, %s)",
+                           (datetime.now(), 'INFO', '롤백될 로그'))
+            cursor.execute("INSERT INTO system_logs (timestamp, level) VALUES (%s, %s)", (datetime.now(), 'INFO'))
+    except Error:
+        pass
+    with db_cursor() as cursor:
+        cursor.execute("SELECT COUNT(*) FROM system_logs")
+        assert cursor.fetchone()[0] == 0
+    print("✅ 오류 변환/트랜잭션 테스트 통과")
+
+if __name__ == "__main__":
+    test_translate_query()
+    test_trading_pipeline()
+    test_errors_and_transactions()
@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+통계 서비스 테스트
+실제 DB 대신 가짜 커서로 쿼리 1회 집계, 기존 반환 형식, TTL 캐시를 확인합니다.
+"""
+
+from decimal import Decimal
+from contextlib import contextmanager
+import database.stats_service as stats_service
+
+TRADE_ROLLUP_ROW = {
+    'total_trades': Decimal(6), 'buy_decisions': Decimal(3), 'sell_decisions': Decimal(1), 'hold_decisions': Decimal(2),
+    'executed_buys': Decimal(2), 'executed_sells': Decimal(1),
+    'buy_total': Decimal('200000'), 'sell_total': Decimal('220000'), 'total_fee': Decimal('210'),
+    'realized_pnl': Decimal('19790')
+}
+
+EMPTY_ROLLUP_ROW = {key: None for key in TRADE_ROLLUP_ROW}
+
+REFLECTION_ROWS = [
+    {'source': 'reflection', 'category': 'immediate', 'count': 4, 'score_sum': Decimal('2.4'), 'score_count': 4},
+    {'source': 'reflection', 'category': 'daily', 'count': 1, 'score_sum': None, 'score_count': 0},
+    {'source': 'insight', 'category': None, 'count': 3, 'score_sum': None, 'score_count': None},
+    {'source': 'improvement', 'category': None, 'count': 2, 'score_sum': None, 'score_count': None},
+]
+
+class FakeDatabase:
+    """실행된 쿼리 수를 세고 준비된 행을 반환하는 가짜 DB"""
+
+    def __init__(self):
+        self.queries = []
+        self.empty = False
+
+    @contextmanager
+    def cursor(self, dictionary=False):
+        database = self
+
+        class FakeCursor:
+            def execute(self, query, params=()):
+                database.queries.append((query, params))
+                if "FROM trade_rollups" in query:
+                    self.rows = [EMPTY_ROLLUP_ROW if database.empty else TRADE_ROLLUP_ROW]
+                else:
+                    self.rows = REFLECTION_ROWS
+
+            def fetchone(self):
+                return self.rows[0]
+
+            def fetchall(self):
+                return self.rows
+
+        yield FakeCursor()
+
+def with_fake_database(test):
+    def wrapper():
+        database = FakeDatabase()
+        original = stats_service.db_cursor
+        stats_service.db_cursor = database.cursor
+        try:
+            test(database)
+        finally:
+            stats_service.db_cursor = original
+    wrapper.__name__ = test.__name__
+    wrapper.__doc__ = test.__doc__
+    return wrapper
+
+@with_fake_database
+def test_trade_summary(database):
+    """거래 통계가 롤업 쿼리 1회로 기존 형식을 반환하는지 테스트"""
+    print("🧪 거래 요약 통계 테스트")
+    service = stats_service.StatisticsService(ttl=60)
+    summary = service.get_trade_summary(30)
+
+    assert len(database.queries) == 1
+    assert "period_type = 'hourly'" in database.queries[0][0]
+    assert summary['period_days'] == 30
+    assert summary['total_trades'] == 6
+    assert summary['decision_counts'] == {'buy': 3, 'sell': 1, 'hold': 2}
+    assert summary['action_counts'] == {'buy': 2, 'sell': 1}
+    assert summary['total_value'] == Decimal('420000')
+    assert summary['total_fee'] == Decimal('210')
+    assert summary['profit'] == Decimal('220000') - Decimal('200000') - Decimal('210')
+    assert abs(float(summary['profit_rate']) - 9.895) < 1e-6
+    assert summary['realized_pnl'] == Decimal('19790')
+
+    # 전체 기간은 월 단위 롤업 합산, 롤업이 없으면 0
+    database.empty = True
+    all_time = service.get_trade_summary(None)
+    assert "period_type = 'monthly'" in database.queries[-1][0]
+    assert all_time['total_trades'] == 0 and all_time['decision_counts'] == {}
+    print(f"✅ 거래 요약: {summary['total_trades']}건, 수익률 {summary['profit_rate']:.2f}%")
+
+@with_fake_database
+def test_reflection_summary(database):
+    """반성 요약이 쿼리 1회로 기존 형식을 반환하는지 테스트"""
+    print("🧪 반성 요약 통계 테스트")
+    service = stats_service.StatisticsService(ttl=60)
+    summary = service.get_reflection_summary(7)
+
+    assert len(database.queries) == 1
+    assert database.queries[0][1] == (7, 7, 7)
+    assert summary == {
+        'total_reflections': 5,
+        'reflection_types': {'immediate': 4, 'daily': 1},
+        'avg_performance_score': Decimal('0.6'),
+        'recent_insights': 3,
+        'recent_improvements': 2,
+        'period_days': 7
+    }
+    print("✅ 반성 요약 통계 테스트 통과")
+
+@with_fake_database
+def test_ttl_cache(database):
+    """TTL 안에서는 캐시를 사용하고, 비우거나 만료되면 다시 조회하는지 테스트"""
+    print("🧪 통계 캐시 테스트")
+    service = stats_service.StatisticsService(ttl=60)
+    first = service.get_trade_summary(30)
+    first['total_trades'] = -1
+    assert service.get_trade_summary(30)['total_trades'] == 6
+    assert len(database.queries) == 1
+
+    service.get_trade_summary(7)
+    assert len(database.queries) == 2
+
+    service.invalidate()
+    service.get_trade_summary(30)
+    assert len(database.queries) == 3
+
+    uncached = stats_service.StatisticsService(ttl=0)
+    uncached.get_trade_summary(30)
+    uncached.get_trade_summary(30)
+    assert len(database.queries) == 5
+    print(f"✅ 캐시 통계: {service.get_stats()}")
+
+if __name__ == "__main__":
+    test_trade_summary()
+    test_reflection_summary()
+    test_ttl_cache()
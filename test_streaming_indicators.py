@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+스트리밍 기술적 지표 테스트
+ta 기반 calculate_technical_indicators 결과와 비교합니다 (조회 구간이 밀리는 streaming 백엔드 포함).
+"""
+
+import numpy as np
+import pandas as pd
+from analysis.technical_indicators import calculate_technical_indicators, get_latest_indicators
+from analysis.streaming_indicators import StreamingIndicatorEngine, get_indicator_engine
+from config.settings import DAILY_INDICATOR_BACKEND
+from test_utils import make_candles
+
+INDICATOR_COLUMNS = [
+    'SMA_20', 'SMA_50', 'EMA_12', 'EMA_26', 'MACD', 'MACD_Signal', 'MACD_Histogram',
+    'RSI', 'BB_Upper', 'BB_Middle', 'BB_Lower', 'BB_Width', 'BB_Position',
+    'Stoch_K', 'Stoch_D', 'Williams_R', 'ATR', 'ADX', 'ADX_Pos', 'ADX_Neg',
+    'OBV', 'ROC', 'CCI'
+]
+
+def assert_matches(expected: pd.Series, actual: dict, label: str):
+    for column in INDICATOR_COLUMNS:
+        assert np.isclose(expected[column], actual[column], rtol=1e-6, atol=1e-6, equal_nan=True), \
+            f"{label} {column}: {expected[column]} != {actual[column]}"
+
+def test_streaming_matches_ta():
+    """캔들별 스트리밍 결과가 ta 결과와 같은지 테스트"""
+    print("🧪 스트리밍 지표 정확도 테스트")
+    df = make_candles(300)
+    expected = calculate_technical_indicators(df, backend='ta')
+
+    engine = StreamingIndicatorEngine()
+    for position, row in enumerate(df.itertuples()):
+        values = engine.update(row.open, row.high, row.low, row.close, row.volume)
+        assert_matches(expected.iloc[position], values, f"{position}번째 캔들")
+
+    latest = engine.get_latest_indicators()
+    reference = get_latest_indicators(expected)
+    assert latest.keys() == reference.keys()
+    print("✅ 모든 캔들에서 ta 결과와 일치")
+
+def test_update_from_dataframe_with_open_bar():
+    """미마감 캔들 교체 및 새 캔들만 반영하는지 테스트"""
+    print("🧪 DataFrame 증분 반영 테스트")
+    df = make_candles(400, seed=7)
+    engine = StreamingIndicatorEngine()
+
+    # 처음 250개 반영 (마지막 캔들은 아직 미마감 상태의 값)
+    partial = df.iloc[:250].copy()
+    partial.iloc[-1, partial.columns.get_loc('close')] -= 50000
+    engine.update_from_dataframe(partial)
+
+    # 마지막 캔들이 마감되고 새 캔들이 추가된 창을 반영
+    window = df.iloc[249:260]
+    values = engine.update_from_dataframe(window)
+    assert engine.bar_count == 260
+
+    expected = calculate_technical_indicators(df.iloc[:260], backend='ta')
+    assert_matches(expected.iloc[-1], values, "증분 반영")
+
+    # update()도 미마감(closed=False)으로 반영한 캔들만 교체
+    row = df.iloc[260]
+    engine.update(row.open, row.high, row.low, row.close - 50000, row.volume, closed=False)
+    values = engine.update(row.open, row.high, row.low, row.close, row.volume, replace_last=True)
+    assert engine.bar_count == 261
+    assert_matches(calculate_technical_indicators(df.iloc[:261], backend='ta').iloc[-1], values, "미마감 교체")
+    print("✅ 증분 반영 결과가 전체 재계산과 일치")
+
+def test_streaming_backend_sliding_window():
+    """조회 구간이 밀려도 streaming 백엔드의 지표 컬럼(OBV 포함)이 구간 전체를 ta로 다시 계산한 값과 같은지 테스트"""
+    print("🧪 streaming 백엔드 구간 이동 테스트")
+    df = make_candles(700, seed=11)
+    engine = get_indicator_engine("test_sliding")
+    engine.reset()
+    calculate_technical_indicators(df.iloc[:600], backend='streaming', stream_name="test_sliding")
+    bars_before = engine.bar_count
+
+    window = df.iloc[50:650]
+    actual = calculate_technical_indicators(window, backend='streaming', stream_name="test_sliding")
+    expected = calculate_technical_indicators(window, backend='ta')
+    assert engine.bar_count == bars_before + 50  # 새 캔들만 계산
+    assert list(actual.columns) == list(expected.columns)
+    # 지수 가중 지표는 워밍업이 끝난 뒤부터 비교, 누적 OBV는 구간 전체 비교
+    for position in range(len(window) - 100, len(window)):
+        assert_matches(expected.iloc[position], actual.iloc[position], f"{position}번째 캔들")
+    assert np.allclose(expected['OBV'], actual['OBV'], rtol=1e-9, atol=1e-6)
+
+    # 같은 시각이라도 다른 데이터가 들어오면 처음부터 다시 계산
+    other = make_candles(600, seed=12)
+    actual = calculate_technical_indicators(other, backend='streaming', stream_name="test_sliding")
+    expected = calculate_technical_indicators(other, backend='ta')
+    assert engine.bar_count == 600
+    assert_matches(expected.iloc[-1], actual.iloc[-1], "다른 데이터")
+    print("✅ 구간 이동 후에도 ta 결과와 일치")
+
+def test_daily_sliding_window():
+    """일봉 30개 구간을 한 캔들씩 밀어도 일봉 지표가 구간 전체를 ta로 다시 계산한 값과 같은지 테스트"""
+    print("🧪 일봉 구간 이동 테스트")
+    df = make_candles(60, seed=5, freq="D")
+    for start in range(1, 31):
+        window = df.iloc[start:start + 30]
+        actual = calculate_technical_indicators(window, backend=DAILY_INDICATOR_BACKEND)
+        expected = calculate_technical_indicators(window, backend='ta')
+        assert list(actual.columns) == list(expected.columns)
+        assert_matches(expected.iloc[-1], actual.iloc[-1], f"{start}번째 이동")
+    print(f"✅ 일봉 구간 이동 후에도 ta 결과와 일치 ({DAILY_INDICATOR_BACKEND})")
+
+if __name__ == "__main__":
+    test_streaming_matches_ta()
+    test_update_from_dataframe_with_open_bar()
+    test_streaming_backend_sliding_window()
+    test_daily_sliding_window()
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+거래 스트리밍 조회 테스트
+실제 DB 대신 가짜 연결로 청크 단위 조회, 컬럼 선택, 중간 종료 시 결과 정리를 확인합니다.
+"""
+
+from datetime import datetime
+from contextlib import contextmanager
+import database.streaming as streaming
+
+class FakeConnection:
+    """unbuffered 커서를 흉내내는 가짜 연결"""
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.queries = []
+        self.fetch_sizes = []
+        self.consumed = False
+        self.cursor_closed = False
+
+    def cursor(self, dictionary=False, buffered=True):
+        connection = self
+        assert buffered is False
+
+        class FakeCursor:
+            def execute(self, query, params=()):
+                connection.queries.append((query, params))
+                self.position = 0
+
+            def fetchmany(self, size):
+                connection.fetch_sizes.append(size)
+                chunk = connection.rows[self.position:self.position + size]
+                self.position += len(chunk)
+                return chunk
+
+            def close(self):
+                connection.cursor_closed = True
+
+        return FakeCursor()
+
+    def consume_results(self):
+        self.consumed = True
+
+def with_fake_connection(rows):
+    def decorator(test):
+        def wrapper():
+            connection = FakeConnection(rows)
+            original = streaming.pooled_connection
+            streaming.pooled_connection = contextmanager(lambda: (yield connection))
+            try:
+                test(connection)
+            finally:
+                streaming.pooled_connection = original
+        wrapper.__name__ = test.__name__
+        wrapper.__doc__ = test.__doc__
+        return wrapper
+    return decorator
+
+ROWS = [{'id': i, 'timestamp': datetime(2024, 5, 1, i % 24)} for i in range(1, 26)]
+
+@with_fake_connection(ROWS)
+def test_chunked_stream(connection):
+    """청크 크기만큼 나눠 읽고 요약 컬럼만 조회하는지 테스트"""
+    print("🧪 청크 스트리밍 테스트")
+    chunks = list(streaming.iter_trade_chunks(datetime(2024, 5, 1), datetime(2024, 5, 31), chunk_size=10))
+    assert [len(chunk) for chunk in chunks] == [10, 10, 5]
+    assert set(connection.fetch_sizes) == {10}
+
+    query, params = connection.queries[0]
+    assert "`market_data`" not in query and "`reasoning`" not in query
+    assert "timestamp >= %s AND timestamp <= %s" in query
+    assert params == (datetime(2024, 5, 1), datetime(2024, 5, 31))
+    assert not connection.consumed and connection.cursor_closed
+    print(f"✅ {len(ROWS)}건을 {len(chunks)}개 청크로 조회")
+
+@with_fake_connection(ROWS)
+def test_column_projection(connection):
+    """market_data 요청 시에만 JSON 컬럼을 조회하고 잘못된 컬럼은 거부하는지 테스트"""
+    print("🧪 컬럼 선택 테스트")
+    list(streaming.iter_trades(columns=('id', 'timestamp'), include_market_data=True))
+    query, params = connection.queries[0]
+    assert query.startswith("SELECT `id`, `timestamp`, `reasoning`, `market_data`, `market_snapshot_hash` FROM trades")
+    assert "WHERE" not in query and params == ()
+
+    try:
+        list(streaming.iter_trades(columns=('id; DROP TABLE trades',)))
+        assert False, "알 수 없는 컬럼은 ValueError가 발생해야 합니다"
+    except ValueError:
+        pass
+    print("✅ 컬럼 선택 테스트 통과")
+
+@with_fake_connection(ROWS)
+def test_early_stop_consumes_results(connection):
+    """중간에 반복을 멈추면 남은 결과를 버리고 커서를 닫는지 테스트"""
+    print("🧪 중간 종료 테스트")
+    trades = streaming.iter_trades(chunk_size=5)
+    first = [next(trades) for _ in range(3)]
+    trades.close()
+    assert [trade['id'] for trade in first] == [1, 2, 3]
+    assert connection.consumed and connection.cursor_closed
+    print("✅ 중간 종료 테스트 통과")
+
+if __name__ == "__main__":
+    test_chunked_stream()
+    test_column_projection()
+    test_early_stop_consumes_results()
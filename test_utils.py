@@ -0,0 +1,30 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+테스트 공용 도우미
+여러 테스트와 벤치마크에서 함께 쓰는 합성 캔들 데이터를 생성합니다.
+"""
+
+import numpy as np
+import pandas as pd
+
+def make_candles(count: int, seed: int = 1, freq: str = "min") -> pd.DataFrame:
+    """
+    pyupbit 형식의 합성 캔들 생성
+
+    Args:
+        count: 캔들 개수
+        seed: 난수 시드 (같은 시드면 같은 캔들)
+        freq: 캔들 간격 (분봉 "min", 일봉 "D")
+    """
+    rng = np.random.default_rng(seed)
+    close = 100000000 + np.cumsum(rng.normal(0, 200000, count))
+    volume = rng.uniform(1, 10, count)
+    return pd.DataFrame({
+        'open': close + rng.normal(0, 100000, count),
+        'high': close + rng.uniform(0, 300000, count),
+        'low': close - rng.uniform(0, 300000, count),
+        'close': close,
+        'volume': volume,
+        'value': close * volume
+    }, index=pd.date_range("2025-08-01", periods=count, freq=freq))
@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+DB 쓰기 대기열 테스트
+실제 DB 대신 가짜 연결로 배치 저장, 스풀 파일 보관/재저장, 잘못된 요청 격리, 종료 시 비우기를 확인합니다.
+"""
+
+import os
+import json
+import tempfile
+import threading
+from contextlib import contextmanager
+from mysql.connector import errors
+from database.write_queue import WriteBehindQueue
+
+INSERT_LOG = "INSERT INTO system_logs (timestamp, level, message, module) VALUES (%s, %s, %s, %s)"
+INSERT_TRADE = "INSERT INTO trades (decision, price) VALUES (%s, %s)"
+
+class FakeDatabase:
+    """executemany 호출과 커밋된 행을 기록하는 가짜 DB"""
+
+    def __init__(self):
+        self.available = True
+        self.gate = threading.Event()
+        self.gate.set()
+        self.rows = []
+        self.rejected = set()  # 저장 시 IntegrityError를 내는 값
+        self.executemany_calls = 0
+        self.commits = 0
+
+    @contextmanager
+    def connection(self):
+        self.gate.wait()
+        if not self.available:
+            raise errors.InterfaceError("Can't connect to MySQL server")
+        database = self
+        pending = []
+
+        class FakeCursor:
+            def executemany(self, query, rows):
+                database.executemany_calls += 1
+                if any(value in database.rejected for row in rows for value in row):
+                    raise errors.IntegrityError("Duplicate entry")
+                pending.extend((query, tuple(row)) for row in rows)
+
+            def close(self):
+                pass
+
+        class FakeConnection:
+            def start_transaction(self):
+                pending.clear()
+
+            def cursor(self):
+                return FakeCursor()
+
+            def commit(self):
+                database.rows.extend(pending)
+                database.commits += 1
+
+            def rollback(self):
+                pending.clear()
+
+        yield FakeConnection()
+
+def make_queue(database, spool_path, **kwargs):
+    quarantine_path = os.path.join(os.path.dirname(spool_path), "quarantine.jsonl")
+    options = dict(max_size=100, batch_size=10, flush_interval=0.05, put_timeout=0.05, retry_interval=0,
+                   spool_path=spool_path, quarantine_path=quarantine_path, connection_factory=database.connection)
+    options.update(kwargs)
+    return WriteBehindQueue(**options)
+
+def test_batched_write():
+    """여러 INSERT가 쿼리별 executemany 배치로 저장되는지 테스트"""
+    print("🧪 배치 저장 테스트")
+    database = FakeDatabase()
+    with tempfile.TemporaryDirectory() as tmp:
+        write_queue = make_queue(database, os.path.join(tmp, "spool.jsonl"))
+        for i in range(20):
+            write_queue.enqueue(INSERT_LOG, ("2024-01-01", "INFO", f"message {i}", "test"))
+        write_queue.enqueue(INSERT_TRADE, ("buy", 50000000))
+        assert write_queue.flush(timeout=2)
+        write_queue.stop()
+
+    stats = write_queue.get_stats()
+    assert len(database.rows) == 21
+    assert [row[1][2] for row in database.rows if row[0] == INSERT_LOG] == [f"message {i}" for i in range(20)]
+    assert database.commits == stats['batches'] < 21
+    print(f"✅ 21건을 {stats['batches']}개 트랜잭션으로 저장 (executemany {database.executemany_calls}회)")
+
+def test_spool_while_unavailable():
+    """DB에 연결할 수 없는 동안 스풀 파일에 보관하고 복구 후 재저장하는지 테스트"""
+    print("🧪 스풀 파일 보관/재저장 테스트")
+    database = FakeDatabase()
+    database.available = False
+    with tempfile.TemporaryDirectory() as tmp:
+        spool_path = os.path.join(tmp, "spool.jsonl")
+        write_queue = make_queue(database, spool_path)
+        for i in range(5):
+            write_queue.enqueue(INSERT_TRADE, ("buy", 50000000 + i))
+        assert not write_queue.flush(timeout=2)  # 스풀 파일에만 보관되면 커밋되지 않은 것으로 보고
+        assert os.path.exists(spool_path)
+        assert write_queue.get_stats()['spooled'] == 5
+
+        # 복구 후 새 요청보다 스풀 파일의 요청을 먼저 저장
+        database.available = True
+        write_queue.enqueue(INSERT_TRADE, ("sell", 51000000))
+        assert write_queue.flush(timeout=2)
+        write_queue.stop()
+        assert not os.path.exists(spool_path)
+
+    assert [row[1] for row in database.rows] == [("buy", 50000000 + i) for i in range(5)] + [("sell", 51000000)]
+    assert write_queue.get_stats()['replayed'] == 5
+    print("✅ 스풀 파일 보관/재저장 테스트 통과")
+
+def test_spool_replayed_before_live_batch():
+    """연결 장애 전후 요청이 요청 순서대로 커밋되는지 테스트 (스풀 파일이 새 배치보다 먼저 저장)"""
+    print("🧪 저장 순서 테스트")
+    database = FakeDatabase()
+    with tempfile.TemporaryDirectory() as tmp:
+        spool_path = os.path.join(tmp, "spool.jsonl")
+        # 쓰기 스레드가 새 요청을 기다리는 동안에는 스풀 파일을 재저장하지 않도록 flush_interval을 길게 설정
+        write_queue = make_queue(database, spool_path, flush_interval=1.0)
+        write_queue.enqueue(INSERT_TRADE, ("A", 1))
+        assert write_queue.flush(timeout=2)
+
+        database.available = False
+        write_queue.enqueue(INSERT_TRADE, ("B", 2))
+        assert not write_queue.flush(timeout=2) and os.path.exists(spool_path)
+
+        database.available = True
+        write_queue.enqueue(INSERT_TRADE, ("C", 3))
+        assert write_queue.flush(timeout=2)
+        write_queue.stop()
+        assert not os.path.exists(spool_path)
+
+    assert [row[1][0] for row in database.rows] == ["A", "B", "C"]
+    print("✅ 저장 순서 테스트 통과")
+
+def test_quarantine_bad_records():
+    """데이터 오류가 난 요청만 격리 파일로 옮기고 나머지 요청(스풀 파일 포함)은 계속 저장하는지 테스트"""
+    print("🧪 잘못된 요청 격리 테스트")
+    database = FakeDatabase()
+    database.rejected.add(-1)
+    with tempfile.TemporaryDirectory() as tmp:
+        spool_path = os.path.join(tmp, "spool.jsonl")
+        quarantine_path = os.path.join(tmp, "quarantine.jsonl")
+        with open(spool_path, "w", encoding="utf-8") as f:
+            for value in (1, -1, 2):
+                f.write(json.dumps({'query': INSERT_TRADE, 'params': ["spooled", value]}) + "\n")
+            f.write("{broken\n")
+        write_queue = make_queue(database, spool_path)
+
+        # 실시간 배치에 잘못된 요청이 섞이면 한 건씩 다시 저장하고 flush는 실패로 보고
+        for value in (10, -1, 11):
+            write_queue.enqueue(INSERT_TRADE, ("live", value))
+        assert not write_queue.flush(timeout=2)
+        write_queue.enqueue(INSERT_TRADE, ("live", 12))
+        assert write_queue.flush(timeout=2)
+        write_queue.stop()
+
+        assert not os.path.exists(spool_path)
+        with open(quarantine_path, encoding="utf-8") as f:
+            quarantined = [json.loads(line) for line in f]
+
+    assert sorted(row[1] for row in database.rows) == sorted([("live", 10), ("live", 11), ("live", 12),
+                                                              ("spooled", 1), ("spooled", 2)])
+    assert sorted(record.get('line') or record['params'][0] for record in quarantined) == ["live", "spooled", "{broken"]
+    assert all(record['error'] for record in quarantined)
+    assert write_queue.get_stats()['quarantined'] == 3
+    print("✅ 잘못된 요청 격리 테스트 통과")
+
+def test_full_queue_and_shutdown():
+    """대기열이 가득 차면 스풀 파일에 기록하고, 종료 시 남은 요청을 모두 저장하는지 테스트"""
+    print("🧪 대기열 포화/종료 테스트")
+    database = FakeDatabase()
+    with tempfile.TemporaryDirectory() as tmp:
+        spool_path = os.path.join(tmp, "spool.jsonl")
+        write_queue = make_queue(database, spool_path, max_size=2, batch_size=1)
+        # DB 응답이 멈춘 동안 대기열(2개)을 넘는 요청은 잠시 기다린 뒤 스풀 파일로 보관
+        database.gate.clear()
+        results = [write_queue.enqueue(INSERT_TRADE, ("hold", i)) for i in range(10)]
+        assert all(results)
+        assert write_queue.get_stats()['spooled'] > 0
+
+        database.gate.set()
+        write_queue.stop(timeout=2)
+        assert not os.path.exists(spool_path)
+
+    assert sorted(row[1][1] for row in database.rows) == list(range(10))
+    print("✅ 대기열 포화/종료 테스트 통과")
+
+if __name__ == "__main__":
+    test_batched_write()
+    test_spool_while_unavailable()
+    test_spool_replayed_before_live_batch()
+    test_quarantine_bad_records()
+    test_full_queue_and_shutdown()
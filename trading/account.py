@@ -3,44 +3,33 @@
 업비트 계좌 정보 조회, 잔고 확인, 투자 상태 분석 등을 수행합니다.
 """
 
-import pyupbit
 from typing import Optional, Dict, Any
 from config.settings import TRADING_SYMBOL
+from .account_state import get_account_snapshot
 
-def get_investment_status(upbit) -> Optional[Dict[str, Any]]:
-    """현재 투자 상태 조회 함수"""
+def get_investment_status(upbit, current_price: Optional[float] = None, force_refresh: bool = False) -> Optional[Dict[str, Any]]:
+    """
+    현재 투자 상태 조회 함수
+
+    Args:
+        upbit: pyupbit.Upbit 객체
+        current_price: 시장 데이터 수집 때 조회한 현재가 (None이면 다시 조회)
+        force_refresh: 캐시된 잔고를 무시하고 다시 조회
+    """
     print("=== 투자 상태 조회 중 ===")
     
     try:
-        # 전체 잔고 조회
-        balances = upbit.get_balances()
-        if balances is None:
+        # 잔고 조회 (캐시가 유효하면 API 호출 없음)
+        snapshot = get_account_snapshot(upbit, current_price, force_refresh)
+        if snapshot is None:
             print("❌ 잔고 조회 실패")
             return None
         
-        # KRW 잔고
-        krw_balance = 0
-        btc_balance = 0
-        btc_avg_price = 0
-        
-        # balances가 리스트인 경우
-        if isinstance(balances, list):
-            for balance in balances:
-                if isinstance(balance, dict):
-                    currency = balance.get('currency', '')
-                    if currency == 'KRW':
-                        krw_balance = float(balance.get('balance', 0))
-                    elif currency == 'BTC':
-                        btc_balance = float(balance.get('balance', 0))
-                        btc_avg_price = float(balance.get('avg_buy_price', 0))
-        # balances가 딕셔너리인 경우
-        elif isinstance(balances, dict):
-            for currency, balance_data in balances.items():
-                if currency == 'KRW':
-                    krw_balance = float(balance_data.get('balance', 0))
-                elif currency == 'BTC':
-                    btc_balance = float(balance_data.get('balance', 0))
-                    btc_avg_price = float(balance_data.get('avg_buy_price', 0))
+        krw_balance = snapshot.krw_balance
+        btc_balance = snapshot.btc_balance
+        btc_avg_price = snapshot.btc_avg_price
+        if snapshot.cached:
+            print(f"♻️ 캐시된 잔고 사용 ({snapshot.balance_age:.0f}초 전 조회)")
         
         print(f"💰 보유 현금: {krw_balance:,.2f}원")
         print(f"₿ 보유 비트코인: {btc_balance:.8f} BTC")
@@ -48,7 +37,7 @@ def get_investment_status(upbit) -> Optional[Dict[str, Any]]:
             print(f"📈 평균 매수가: {btc_avg_price:,.0f}원")
         
         # 현재 비트코인 가격
-        current_price = pyupbit.get_current_price(TRADING_SYMBOL)
+        current_price = snapshot.current_price
         if current_price:
             print(f"📊 현재 비트코인 가격: {current_price:,.0f}원")
             
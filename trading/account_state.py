@@ -0,0 +1,177 @@
+"""
+계좌 상태 서비스 모듈
+잔고 조회(private API) 결과를 캐시하고, 주문 체결 시에는 체결 내역만큼 잔고를 직접 갱신(delta)해
+사이클마다 반복되던 잔고/현재가 조회를 줄입니다.
+
+- 현재가는 호출자가 이미 조회한 값을 넘겨받아 다시 조회하지 않습니다.
+- 캐시는 ACCOUNT_CACHE_TTL마다 실제 잔고로 다시 맞추고, 체결을 확인하지 못한 주문이 있으면 즉시 무효화합니다.
+"""
+
+import time
+import threading
+import pyupbit
+from dataclasses import dataclass
+from typing import Optional, Dict, Any, Callable
+from config.settings import TRADING_SYMBOL, ACCOUNT_CACHE_TTL
+
+@dataclass
+class AccountSnapshot:
+    """계좌 상태 스냅샷"""
+    krw_balance: float
+    btc_balance: float
+    btc_avg_price: float
+    current_price: float
+    cached: bool = False  # 캐시된 잔고 사용 여부
+    balance_age: float = 0.0  # 마지막 실제 잔고 조회 후 경과 시간 (초)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """기존 get_investment_status 반환 형식"""
+        return {
+            'krw_balance': self.krw_balance,
+            'btc_balance': self.btc_balance,
+            'btc_avg_price': self.btc_avg_price,
+            'current_price': self.current_price
+        }
+
+def parse_balances(balances) -> Dict[str, float]:
+    """upbit.get_balances() 응답(리스트 또는 딕셔너리)에서 KRW/BTC 잔고와 평균 매수가 추출"""
+    if isinstance(balances, dict):
+        balances = [dict(data, currency=currency) for currency, data in balances.items()]
+
+    parsed = {'krw_balance': 0.0, 'btc_balance': 0.0, 'btc_avg_price': 0.0}
+    for balance in balances:
+        if not isinstance(balance, dict):
+            continue
+        currency = balance.get('currency', '')
+        if currency == 'KRW':
+            parsed['krw_balance'] = float(balance.get('balance', 0))
+        elif currency == 'BTC':
+            parsed['btc_balance'] = float(balance.get('balance', 0))
+            parsed['btc_avg_price'] = float(balance.get('avg_buy_price', 0))
+    return parsed
+
+class AccountStateService:
+    """잔고 캐시 + 체결 delta 갱신 + 조회 통계"""
+
+    def __init__(self, ttl: float = ACCOUNT_CACHE_TTL,
+                 price_fetcher: Callable[[str], Optional[float]] = pyupbit.get_current_price,
+                 clock: Callable[[], float] = time.monotonic):
+        self.ttl = ttl
+        self.price_fetcher = price_fetcher
+        self.clock = clock
+        self._balances: Optional[Dict[str, float]] = None
+        self._fetched_at = 0.0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.balance_calls = 0
+        self.price_calls = 0
+        self.delta_updates = 0
+        self.invalidations = 0
+
+    def _is_fresh(self) -> bool:
+        return self._balances is not None and self.clock() - self._fetched_at < self.ttl
+
+    def get_snapshot(self, upbit, current_price: Optional[float] = None,
+                     force_refresh: bool = False) -> Optional[AccountSnapshot]:
+        """
+        계좌 상태 조회
+
+        Args:
+            upbit: pyupbit.Upbit 객체
+            current_price: 이미 조회한 현재가 (None이면 조회)
+            force_refresh: 캐시를 무시하고 잔고 조회
+
+        Returns:
+            계좌 상태 스냅샷 (잔고 조회 실패 시 None, 현재가 조회 실패 시 current_price=0)
+        """
+        with self._lock:
+            cached = not force_refresh and self._is_fresh()
+            if cached:
+                self.hits += 1
+            else:
+                self.misses += 1
+                self.balance_calls += 1
+                balances = upbit.get_balances()
+                if balances is None:
+                    return None
+                self._balances = parse_balances(balances)
+                self._fetched_at = self.clock()
+            snapshot_balances = dict(self._balances)
+            balance_age = self.clock() - self._fetched_at
+
+        if current_price is None:
+            self.price_calls += 1
+            current_price = self.price_fetcher(TRADING_SYMBOL)
+        return AccountSnapshot(current_price=current_price or 0, cached=cached, balance_age=balance_age,
+                               **snapshot_balances)
+
+    def apply_fill(self, action: str, volume: float, funds: float, fee: float):
+        """
+        체결된 주문만큼 캐시된 잔고 갱신 (다음 조회에서 잔고 API를 다시 호출하지 않음)
+
+        매수: KRW -= 체결 금액 + 수수료, BTC += 체결 수량, 평균 매수가는 체결 금액 가중 평균
+        매도: KRW += 체결 금액 - 수수료, BTC -= 체결 수량
+        """
+        with self._lock:
+            if self._balances is None:
+                return
+            balances = self._balances
+            if action == 'buy':
+                total_cost = balances['btc_avg_price'] * balances['btc_balance'] + funds
+                balances['btc_balance'] += volume
+                balances['krw_balance'] -= funds + fee
+                if balances['btc_balance'] > 0:
+                    balances['btc_avg_price'] = total_cost / balances['btc_balance']
+            elif action == 'sell':
+                balances['btc_balance'] = max(balances['btc_balance'] - volume, 0.0)
+                balances['krw_balance'] += funds - fee
+                if balances['btc_balance'] == 0:
+                    balances['btc_avg_price'] = 0.0
+            self.delta_updates += 1
+
+    def invalidate(self):
+        """캐시 무효화 (다음 조회에서 잔고 API 호출)"""
+        with self._lock:
+            self._balances = None
+            self.invalidations += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        """캐시 적중/실패 및 API 호출 통계"""
+        requests = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / requests if requests else 0.0,
+            'balance_calls': self.balance_calls,
+            'price_calls': self.price_calls,
+            'delta_updates': self.delta_updates,
+            'invalidations': self.invalidations
+        }
+
+# 전역 계좌 상태 서비스
+account_state = AccountStateService()
+
+def get_account_snapshot(upbit, current_price: Optional[float] = None,
+                         force_refresh: bool = False) -> Optional[AccountSnapshot]:
+    """계좌 상태 스냅샷 조회 (편의 함수)"""
+    return account_state.get_snapshot(upbit, current_price, force_refresh)
+
+def update_account_after_fill(action: str, fill) -> None:
+    """
+    주문 이벤트 반영 (편의 함수)
+
+    체결이 확정된 주문은 체결 내역만큼 잔고를 갱신하고, 진행 중이거나 확인하지 못한 주문은 캐시를 무효화합니다.
+    """
+    if fill.is_final and fill.is_filled:
+        account_state.apply_fill(action, fill.executed_volume, fill.funds, fill.paid_fee)
+    elif not fill.is_final:  # 체결 없이 취소된 주문은 잔고 변화 없음
+        account_state.invalidate()
+
+def invalidate_account_state():
+    """계좌 상태 캐시 무효화 (편의 함수)"""
+    account_state.invalidate()
+
+def get_account_cache_stats() -> Dict[str, Any]:
+    """계좌 상태 캐시 통계 (편의 함수)"""
+    return account_state.get_stats()
@@ -3,10 +3,166 @@
 AI 결정에 따른 실제 매매를 실행합니다.
 """
 
-import time
-from typing import Optional, Dict, Any
-from config.settings import get_trading_config
+from typing import Optional, Dict, Any, Tuple
+from config.settings import get_trading_config, EXECUTION_STRATEGY, SLICED_EXECUTION_MIN_KRW, MARKET_IMPACT_ENABLED
 from database.trade_recorder import save_trade_record, save_market_data_record
+from .order_tracker import OrderFill, wait_for_order_fill
+from .account_state import update_account_after_fill, invalidate_account_state
+from .sliced_execution import ExecutionReport, submit_sliced_order, is_sliced_execution_busy
+from .market_impact import estimate_market_impact
+
+def fill_execution_result(action: str, fill: OrderFill, estimate: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    주문 체결 결과를 execution_result 값으로 변환
+
+    체결이 확인되면 실제 평균 체결가/체결 수량/체결 금액/지불 수수료를 사용하고,
+    시간 안에 체결을 확인하지 못하면 주문 전 추정값(estimate)을 'pending' 상태로 기록합니다.
+    체결이 확인되지 않은 추정값이므로 success=False로 두어 거래 롤업(체결 건수/금액/손익)에서 제외됩니다.
+    """
+    result = {'action': action, 'order_id': fill.order_id}
+    if fill.is_filled:
+        print(f"✅ 체결 확인 ({fill.elapsed:.1f}초, 조회 {fill.polls}회): "
+              f"평균 {fill.avg_price:,.0f}원 × {fill.executed_volume:.8f} BTC, 수수료 {fill.paid_fee:,.2f}원")
+        result.update({
+            'price': fill.avg_price,
+            'amount': fill.executed_volume,
+            'total_value': fill.funds,
+            'fee': fill.paid_fee,
+            'status': 'executed' if fill.is_final else 'partially_filled',
+            'success': True
+        })
+    elif fill.is_final:
+        print("❌ 주문이 체결 없이 취소되었습니다.")
+        result.update({'price': 0, 'amount': 0, 'total_value': 0, 'fee': 0, 'status': 'cancelled', 'success': False})
+    else:
+        print("⚠️ 체결을 확인하지 못해 주문 전 예상 값으로 기록합니다.")
+        result.update(estimate)
+        result.update({'status': 'pending', 'success': False})
+    return result
+
+def should_slice_order(notional: float) -> bool:
+    """주문 금액이 분할 실행 대상인지 여부"""
+    return EXECUTION_STRATEGY in ('twap', 'iceberg') and notional >= SLICED_EXECUTION_MIN_KRW
+
+def planned_order_size(action: str, investment_status: Optional[Dict[str, Any]]) -> Optional[Tuple[float, float]]:
+    """
+    매매 결정 시 낼 주문 크기 (execute_trading_decision과 같은 계산)
+
+    Returns:
+        (주문 크기, 최소 주문 크기), 매수는 원/매도는 BTC. 잔고가 최소 거래금액보다 적으면 None
+    """
+    if not investment_status:
+        return None
+    trading_config = get_trading_config()
+    min_trade_amount = trading_config['min_amount']
+    trade_ratio = trading_config['trade_ratio']
+    current_price = investment_status.get('current_price', 0)
+    if action == 'buy':
+        krw_balance = investment_status.get('krw_balance', 0)
+        if krw_balance < min_trade_amount:
+            return None
+        return max(krw_balance * trade_ratio, min_trade_amount), min_trade_amount
+
+    btc_balance = investment_status.get('btc_balance', 0)
+    if current_price <= 0 or btc_balance * current_price < min_trade_amount:
+        return None
+    sell_amount = btc_balance * trade_ratio
+    if sell_amount * current_price < min_trade_amount:
+        sell_amount = btc_balance  # 전체 매도
+    return sell_amount, min(min_trade_amount / current_price, sell_amount)
+
+def estimate_order_impact(action: str, size: float, market_data: Optional[Dict[str, Any]], min_size: float,
+                          cap: bool = True) -> Tuple[float, Optional[Dict[str, Any]]]:
+    """
+    오더북 호가 잔량으로 슬리피지를 추정하고, 한도(MAX_SLIPPAGE_BPS)를 넘으면 줄인 주문 크기 계산
+
+    Returns:
+        (주문 크기, 추정 결과 딕셔너리), 추정할 수 없으면 (size, None)
+    """
+    if not MARKET_IMPACT_ENABLED or not market_data:
+        return size, None
+    estimate = estimate_market_impact(market_data.get('orderbook'), action, size)
+    if estimate is None:
+        return size, None
+    order_size = size
+    if cap and not estimate.within_budget:
+        order_size = min(size, max(estimate.max_size(), min_size))
+    return order_size, dict(estimate.to_dict(), order_size=order_size)
+
+def attach_market_impact(market_data: Optional[Dict[str, Any]], investment_status: Optional[Dict[str, Any]]):
+    """
+    매수/매도 각각의 예상 주문에 대한 시장 충격 추정을 market_data['market_impact']에 기록
+
+    프롬프트 직렬화 전에 호출하면 AI가 예상 슬리피지를 함께 보고, 매매 실행 시 market_data를
+    다시 바꾸지 않아 직렬화한 바이트(JsonPayload)를 거래 기록에 그대로 재사용할 수 있습니다.
+    """
+    if not MARKET_IMPACT_ENABLED or not market_data:
+        return
+    impacts = {}
+    for action in ('buy', 'sell'):
+        planned = planned_order_size(action, investment_status)
+        if planned is None:
+            continue
+        size, min_size = planned
+        notional = size if action == 'buy' else size * investment_status.get('current_price', 0)
+        _, impact = estimate_order_impact(action, size, market_data, min_size, cap=not should_slice_order(notional))
+        if impact is not None:
+            impacts[action] = impact
+    if impacts:
+        market_data['market_impact'] = impacts
+
+def cap_order_size(action: str, size: float, market_data: Optional[Dict[str, Any]], min_size: float,
+                   cap: bool = True) -> float:
+    """
+    오더북 호가 잔량으로 슬리피지를 추정하고, 한도(MAX_SLIPPAGE_BPS)를 넘으면 주문 크기 제한
+
+    추정 결과는 market_data['market_impact'][action]에 넣어 거래 기록과 함께 저장합니다.
+    attach_market_impact로 같은 추정을 미리 기록했으면 market_data를 바꾸지 않습니다.
+
+    Args:
+        size: 매수는 원, 매도는 BTC
+        min_size: 최소 주문 크기 (제한해도 이보다 작게 줄이지 않음)
+        cap: False면 추정만 기록 (분할 실행 주문)
+
+    Returns:
+        주문 크기
+    """
+    order_size, impact = estimate_order_impact(action, size, market_data, min_size, cap)
+    if impact is None:
+        return size
+
+    print(f"📐 예상 체결가: {impact['vwap']:,.0f}원 (슬리피지 {impact['slippage_bps']:.1f}bp, "
+          f"호가 {impact['levels_used']}단계, 스프레드 {impact['spread_bps']:.1f}bp)")
+    if order_size < size:
+        print(f"✂️ 슬리피지 한도 {impact['budget_bps']}bp를 넘어 주문 크기를 줄입니다: {size:,.8g} → {order_size:,.8g}")
+    recorded = market_data.get('market_impact') or {}
+    if recorded.get(action) != impact:
+        market_data['market_impact'] = dict(recorded, **{action: impact})
+    return order_size
+
+def start_sliced_execution(upbit, action: str, total: float, current_price: float, decision: Dict[str, Any],
+                           investment_status: Dict[str, Any], market_data: Optional[Dict[str, Any]],
+                           execution_result: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    분할 주문 시작 (조각은 백그라운드에서 실행되고, 끝나면 체결 여부와 관계없이 부모 주문을 거래 한 건으로 기록)
+
+    Args:
+        total: 매수는 원, 매도는 BTC
+    """
+    def record(report: ExecutionReport):
+        # 체결 없이 끝나도 결정은 기록 (success=False라 롤업 체결 집계에서는 제외)
+        save_trade_record(decision, report.to_execution_result(), investment_status, market_data)
+
+    report = submit_sliced_order(upbit, action, total, current_price, EXECUTION_STRATEGY, on_complete=record)
+    print(f"🧩 {EXECUTION_STRATEGY} 분할 주문을 백그라운드에서 실행합니다: {report.parent_id}")
+    execution_result.update({
+        'action': action,
+        'price': current_price,
+        'order_id': report.parent_id,
+        'status': 'working',
+        'success': True
+    })
+    return execution_result
 
 def execute_trading_decision(upbit, decision: Dict[str, Any], investment_status: Optional[Dict[str, Any]], market_data: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
     """AI 결정에 따른 매매 실행"""
@@ -31,7 +187,6 @@ def execute_trading_decision(upbit, decision: Dict[str, Any], investment_status:
     
     trading_config = get_trading_config()
     min_trade_amount = trading_config['min_amount']
-    trade_ratio = trading_config['trade_ratio']
     fee_rate = trading_config['fee_rate']
     
     krw_balance = investment_status.get('krw_balance', 0)
@@ -42,6 +197,12 @@ def execute_trading_decision(upbit, decision: Dict[str, Any], investment_status:
     print(f"₿ 보유 비트코인: {btc_balance:.8f} BTC")
     print(f"📊 현재 가격: {current_price:,.0f}원")
     
+    # 이전 분할 주문이 아직 실행 중이면 새 주문을 내지 않음
+    if decision['decision'] in ('buy', 'sell') and is_sliced_execution_busy():
+        print("⏳ 이전 분할 주문이 실행 중이라 이번 매매를 건너뜁니다.")
+        execution_result['status'] = 'order_in_progress'
+        return execution_result
+    
     if decision['decision'] == 'buy':
         print("🟢 매수 신호 감지")
         
@@ -54,9 +215,11 @@ def execute_trading_decision(upbit, decision: Dict[str, Any], investment_status:
             return execution_result
         
         # 매수 금액 계산 (전체 현금의 95% 사용, 수수료 고려)
-        buy_amount = krw_balance * trade_ratio
-        if buy_amount < min_trade_amount:
-            buy_amount = min_trade_amount
+        buy_amount, _ = planned_order_size('buy', investment_status)
+        
+        # 호가 잔량 기준 슬리피지 추정 (한 번에 내는 주문은 한도 안으로 크기 제한)
+        sliced = should_slice_order(buy_amount)
+        buy_amount = cap_order_size('buy', buy_amount, market_data, min_trade_amount, cap=not sliced)
         
         print(f"💰 매수 금액: {buy_amount:,.2f}원")
         
@@ -68,10 +231,16 @@ def execute_trading_decision(upbit, decision: Dict[str, Any], investment_status:
         print(f"📦 실제 구매 금액: {actual_buy_amount:,.2f}원")
         
         # 예상 구매 수량
+        expected_btc = 0
         if current_price > 0:
             expected_btc = actual_buy_amount / current_price
             print(f"📊 예상 구매 수량: {expected_btc:.8f} BTC")
         
+        # 큰 주문은 나눠서 실행 (호가를 한 번에 쓸어 생기는 슬리피지 감소)
+        if sliced:
+            return start_sliced_execution(upbit, 'buy', buy_amount, current_price, decision,
+                                          investment_status, market_data, execution_result)
+        
         # 매수 실행
         print(f"\n🚀 {buy_amount:,.2f}원 비트코인 매수를 실행합니다...")
         print("⚠️ 실제 거래가 발생합니다!")
@@ -82,28 +251,17 @@ def execute_trading_decision(upbit, decision: Dict[str, Any], investment_status:
                 print("✅ 매수 주문 성공!")
                 print(f"📋 주문 결과: {result}")
                 
-                # 거래 결과 정보 업데이트
-                execution_result.update({
-                    'action': 'buy',
+                # 체결 확인 (체결되는 즉시 반환, 실제 체결가/수량/수수료 사용)
+                print("⏳ 주문 체결 확인 중...")
+                fill = wait_for_order_fill(upbit, result.get('uuid', ''))
+                update_account_after_fill('buy', fill)
+                execution_result.update(fill_execution_result('buy', fill, {
                     'price': current_price,
                     'amount': expected_btc,
                     'total_value': buy_amount,
-                    'fee': fee_amount,
-                    'order_id': result.get('uuid', ''),
-                    'status': 'executed',
-                    'success': True
-                })
-                
-                # 주문 후 잠시 대기
-                print("⏳ 주문 처리 중... (3초 대기)")
-                time.sleep(3)
-                
-                # 매수 후 계좌 상태 재확인
-                print("\n📊 매수 후 계좌 상태:")
-                from .account import get_investment_status
-                get_investment_status(upbit)
-                
-                # 거래 기록 저장
+                    'fee': fee_amount
+                }))
+                # 거래 기록 저장 (체결 없이 취소돼도 결정은 기록, success=False라 롤업 체결 집계에서는 제외)
                 save_trade_record(decision, execution_result, investment_status, market_data)
                 
                 return execution_result
@@ -113,6 +271,7 @@ def execute_trading_decision(upbit, decision: Dict[str, Any], investment_status:
                 return execution_result
         except Exception as e:
             print(f"❌ 매수 주문 중 오류: {e}")
+            invalidate_account_state()  # 주문 접수 여부를 알 수 없으므로 다음 조회에서 잔고를 다시 확인
             execution_result['status'] = 'error'
             return execution_result
             
@@ -128,9 +287,11 @@ def execute_trading_decision(upbit, decision: Dict[str, Any], investment_status:
             return execution_result
         
         # 매도 수량 계산 (전체 비트코인의 95% 매도, 수수료 고려)
-        sell_amount = btc_balance * trade_ratio
-        if sell_amount * current_price < min_trade_amount:
-            sell_amount = btc_balance  # 전체 매도
+        sell_amount, min_sell_amount = planned_order_size('sell', investment_status)
+        
+        # 호가 잔량 기준 슬리피지 추정 (한 번에 내는 주문은 한도 안으로 크기 제한)
+        sliced = should_slice_order(sell_amount * current_price)
+        sell_amount = cap_order_size('sell', sell_amount, market_data, min_sell_amount, cap=not sliced)
         
         print(f"₿ 매도 수량: {sell_amount:.8f} BTC")
         
@@ -138,6 +299,11 @@ def execute_trading_decision(upbit, decision: Dict[str, Any], investment_status:
         expected_sell_amount = sell_amount * current_price
         print(f"💰 예상 매도 금액: {expected_sell_amount:,.2f}원")
         
+        # 큰 주문은 나눠서 실행 (호가를 한 번에 쓸어 생기는 슬리피지 감소)
+        if sliced:
+            return start_sliced_execution(upbit, 'sell', sell_amount, current_price, decision,
+                                          investment_status, market_data, execution_result)
+        
         # 매도 실행
         print(f"\n🚀 {sell_amount:.8f} BTC 비트코인 매도를 실행합니다...")
         print("⚠️ 실제 거래가 발생합니다!")
@@ -148,28 +314,17 @@ def execute_trading_decision(upbit, decision: Dict[str, Any], investment_status:
                 print("✅ 매도 주문 성공!")
                 print(f"📋 주문 결과: {result}")
                 
-                # 거래 결과 정보 업데이트
-                execution_result.update({
-                    'action': 'sell',
+                # 체결 확인 (체결되는 즉시 반환, 실제 체결가/수량/수수료 사용)
+                print("⏳ 주문 체결 확인 중...")
+                fill = wait_for_order_fill(upbit, result.get('uuid', ''))
+                update_account_after_fill('sell', fill)
+                execution_result.update(fill_execution_result('sell', fill, {
                     'price': current_price,
                     'amount': sell_amount,
                     'total_value': expected_sell_amount,
-                    'fee': expected_sell_amount * fee_rate,
-                    'order_id': result.get('uuid', ''),
-                    'status': 'executed',
-                    'success': True
-                })
-                
-                # 주문 후 잠시 대기
-                print("⏳ 주문 처리 중... (3초 대기)")
-                time.sleep(3)
-                
-                # 매도 후 계좌 상태 재확인
-                print("\n📊 매도 후 계좌 상태:")
-                from .account import get_investment_status
-                get_investment_status(upbit)
-                
-                # 거래 기록 저장
+                    'fee': expected_sell_amount * fee_rate
+                }))
+                # 거래 기록 저장 (체결 없이 취소돼도 결정은 기록, success=False라 롤업 체결 집계에서는 제외)
                 save_trade_record(decision, execution_result, investment_status, market_data)
                 
                 return execution_result
@@ -179,6 +334,7 @@ def execute_trading_decision(upbit, decision: Dict[str, Any], investment_status:
                 return execution_result
         except Exception as e:
             print(f"❌ 매도 주문 중 오류: {e}")
+            invalidate_account_state()  # 주문 접수 여부를 알 수 없으므로 다음 조회에서 잔고를 다시 확인
             execution_result['status'] = 'error'
             return execution_result
             
@@ -0,0 +1,127 @@
+"""
+시장 충격(슬리피지) 추정 모듈
+주문 전에 오더북 호가 단계(orderbook_units)를 따라 체결을 계산해 예상 체결 가중 평균가(VWAP),
+최우선 호가 대비 슬리피지(bp), 슬리피지 한도 안에서 낼 수 있는 최대 주문 크기를 구합니다.
+
+누적 잔량/누적 금액을 numpy 배열로 한 번에 계산하고, 주문 크기가 걸리는 호가 단계는 searchsorted로 찾습니다.
+오더북에 보이는 잔량보다 큰 주문은 보이는 잔량까지만 계산하고 depth_exhausted로 표시합니다.
+"""
+
+import numpy as np
+from dataclasses import dataclass, asdict
+from typing import Optional, Dict, Any, Tuple
+from config.settings import MAX_SLIPPAGE_BPS
+
+@dataclass
+class ImpactEstimate:
+    """주문 전 시장 충격 추정 결과"""
+    action: str  # 'buy' 또는 'sell'
+    unit: str  # 주문 크기 단위: 'krw' 또는 'btc'
+    requested: float
+    best_price: float  # 최우선 호가 (매수: 매도호가, 매도: 매수호가)
+    mid_price: float
+    spread_bps: float
+    volume: float  # 예상 체결 수량 (BTC)
+    funds: float  # 예상 체결 금액 (원)
+    vwap: float  # 예상 체결 가중 평균가
+    slippage_bps: float  # 최우선 호가 대비 (양수 = 불리)
+    budget_bps: float
+    max_volume: float  # 슬리피지 한도 안의 최대 수량 (BTC)
+    max_funds: float  # 슬리피지 한도 안의 최대 금액 (원)
+    levels_used: int
+    depth_exhausted: bool = False  # 보이는 호가 잔량보다 큰 주문
+
+    @property
+    def within_budget(self) -> bool:
+        return not self.depth_exhausted and self.slippage_bps <= self.budget_bps
+
+    def max_size(self) -> float:
+        """슬리피지 한도 안의 최대 주문 크기 (요청과 같은 단위)"""
+        return self.max_funds if self.unit == 'krw' else self.max_volume
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+def orderbook_ladder(orderbook: Optional[Dict[str, Any]], action: str) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    주문 방향에서 소진할 호가 단계의 (가격, 잔량) 배열
+
+    매수는 매도호가(ask)를, 매도는 매수호가(bid)를 최우선 호가부터 차례로 소진합니다.
+    """
+    units = (orderbook or {}).get('orderbook_units') or []
+    side = 'ask' if action == 'buy' else 'bid'
+    prices = np.fromiter((float(unit[f'{side}_price']) for unit in units), dtype=float, count=len(units))
+    sizes = np.fromiter((float(unit[f'{side}_size']) for unit in units), dtype=float, count=len(units))
+    mask = (prices > 0) & (sizes > 0)
+    return prices[mask], sizes[mask]
+
+def estimate_market_impact(orderbook: Optional[Dict[str, Any]], action: str, size: float,
+                           unit: Optional[str] = None,
+                           budget_bps: float = MAX_SLIPPAGE_BPS) -> Optional[ImpactEstimate]:
+    """
+    주문 크기에 대한 예상 체결가와 슬리피지 추정
+
+    Args:
+        orderbook: pyupbit.get_orderbook 결과
+        action: 'buy' 또는 'sell'
+        size: 주문 크기
+        unit: 'krw' 또는 'btc' (기본값: 매수는 원, 매도는 BTC - 시장가 주문과 같은 단위)
+        budget_bps: 슬리피지 한도 (bp)
+
+    Returns:
+        추정 결과 (오더북이 없으면 None)
+    """
+    unit = unit or ('krw' if action == 'buy' else 'btc')
+    prices, sizes = orderbook_ladder(orderbook, action)
+    if len(prices) == 0:
+        return None
+
+    direction = 1.0 if action == 'buy' else -1.0
+    best_price = float(prices[0])
+    top = orderbook['orderbook_units'][0]
+    ask, bid = float(top['ask_price']), float(top['bid_price'])
+    mid_price = (ask + bid) / 2 if ask and bid else best_price
+    spread_bps = (ask - bid) / mid_price * 10000 if ask and bid else 0.0
+
+    cum_volume = np.cumsum(sizes)
+    cum_funds = np.cumsum(prices * sizes)
+    prev_volume = np.concatenate(([0.0], cum_volume[:-1]))
+    prev_funds = np.concatenate(([0.0], cum_funds[:-1]))
+
+    # 주문 크기가 걸리는 호가 단계
+    level = int(np.searchsorted(cum_funds if unit == 'krw' else cum_volume, size, side='left'))
+    depth_exhausted = level >= len(prices)
+    if depth_exhausted:
+        volume, funds = float(cum_volume[-1]), float(cum_funds[-1])
+        levels_used = len(prices)
+    elif unit == 'krw':
+        volume = float(prev_volume[level] + (size - prev_funds[level]) / prices[level])
+        funds = float(size)
+        levels_used = level + 1
+    else:
+        volume = float(size)
+        funds = float(prev_funds[level] + (size - prev_volume[level]) * prices[level])
+        levels_used = level + 1
+    vwap = funds / volume if volume > 0 else best_price
+    slippage_bps = direction * (vwap - best_price) / best_price * 10000
+
+    # 한도 가격을 넘는 첫 단계에서 VWAP이 한도 가격과 같아지는 수량을 풂
+    # (prev_funds + p * (v - prev_volume)) / v = limit  →  v = (p * prev_volume - prev_funds) / (p - limit)
+    limit_price = best_price * (1 + direction * budget_bps / 10000)
+    over = direction * (cum_funds / cum_volume - limit_price) > 0
+    if not over.any():
+        max_volume, max_funds = float(cum_volume[-1]), float(cum_funds[-1])
+    else:
+        k = int(np.argmax(over))
+        if k == 0:
+            max_volume = max_funds = 0.0
+        else:
+            max_volume = float((prices[k] * prev_volume[k] - prev_funds[k]) / (prices[k] - limit_price))
+            max_funds = float(prev_funds[k] + (max_volume - prev_volume[k]) * prices[k])
+
+    return ImpactEstimate(
+        action=action, unit=unit, requested=float(size), best_price=best_price, mid_price=mid_price,
+        spread_bps=spread_bps, volume=volume, funds=funds, vwap=vwap, slippage_bps=float(slippage_bps),
+        budget_bps=budget_bps, max_volume=max_volume, max_funds=max_funds, levels_used=levels_used,
+        depth_exhausted=depth_exhausted
+    )
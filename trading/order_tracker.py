@@ -0,0 +1,170 @@
+"""
+주문 체결 추적 모듈
+주문 UUID의 상태를 백오프 간격으로 조회해 체결이 확정되는 즉시 실제 평균 체결가, 체결 수량,
+지불 수수료를 반환합니다. 고정 대기(time.sleep) 없이 체결 시점에 바로 다음 단계로 진행합니다.
+
+체결 피드(OrderFillFeed)에 주문 상태가 게시되면 조회 간격을 기다리지 않고 즉시 깨어나므로,
+웹소켓 체결 알림이나 모의 거래 엔진을 연결하면 REST 조회 없이 체결을 확인할 수 있습니다.
+"""
+
+import time
+import threading
+from dataclasses import dataclass, field
+from typing import Optional, Dict, Any, List, Callable
+from config.settings import ORDER_FILL_TIMEOUT, ORDER_POLL_INITIAL_DELAY, ORDER_POLL_MAX_DELAY
+
+# 더 이상 바뀌지 않는 주문 상태 (업비트 시장가 매수는 남은 금액이 취소되어 'cancel'로 끝남)
+TERMINAL_STATES = ('done', 'cancel')
+
+@dataclass
+class OrderFill:
+    """주문 체결 결과"""
+    order_id: str
+    state: str  # 업비트 주문 상태: wait, watch, done, cancel (조회 실패/시간 초과 시 마지막 상태 또는 'unknown')
+    side: str = ''
+    executed_volume: float = 0.0  # 체결 수량 (BTC)
+    funds: float = 0.0  # 체결 금액 (원, 수수료 제외)
+    paid_fee: float = 0.0  # 지불 수수료 (원)
+    avg_price: float = 0.0  # 평균 체결가 (원)
+    trades_count: int = 0
+    elapsed: float = 0.0  # 주문 후 체결 확인까지 걸린 시간 (초)
+    polls: int = 0  # REST 조회 횟수
+    trades: List[Dict[str, Any]] = field(default_factory=list)
+
+    @property
+    def is_final(self) -> bool:
+        return self.state in TERMINAL_STATES
+
+    @property
+    def is_filled(self) -> bool:
+        return self.executed_volume > 0
+
+def _to_float(value: Any) -> float:
+    try:
+        return float(value or 0)
+    except (TypeError, ValueError):
+        return 0.0
+
+def parse_order_fill(order: Dict[str, Any]) -> OrderFill:
+    """업비트 주문 조회 응답(get_order(uuid))을 체결 결과로 변환"""
+    trades = order.get('trades') or []
+    executed_volume = _to_float(order.get('executed_volume'))
+    funds = sum(_to_float(trade.get('funds')) for trade in trades)
+    if not funds and trades:
+        funds = sum(_to_float(trade.get('price')) * _to_float(trade.get('volume')) for trade in trades)
+    if not executed_volume and trades:
+        executed_volume = sum(_to_float(trade.get('volume')) for trade in trades)
+
+    avg_price = funds / executed_volume if executed_volume > 0 and funds > 0 else 0.0
+    if not avg_price and executed_volume > 0 and order.get('ord_type') == 'limit':
+        avg_price = _to_float(order.get('price'))
+        funds = avg_price * executed_volume
+
+    return OrderFill(
+        order_id=order.get('uuid', ''),
+        state=order.get('state', 'unknown'),
+        side=order.get('side', ''),
+        executed_volume=executed_volume,
+        funds=funds,
+        paid_fee=_to_float(order.get('paid_fee')),
+        avg_price=avg_price,
+        trades_count=int(order.get('trades_count') or len(trades)),
+        trades=trades
+    )
+
+class OrderFillFeed:
+    """
+    주문 상태 게시판 (이벤트 기반 체결 알림)
+
+    체결 알림 소스(웹소켓, 모의 거래 엔진 등)가 publish()로 주문 상태를 올리면
+    wait()로 기다리던 추적기가 즉시 깨어납니다.
+    """
+
+    def __init__(self):
+        self._orders: Dict[str, Dict[str, Any]] = {}
+        self._condition = threading.Condition()
+
+    def publish(self, order: Dict[str, Any]):
+        """주문 상태 게시 (get_order(uuid) 응답과 같은 형식)"""
+        with self._condition:
+            self._orders[order['uuid']] = order
+            self._condition.notify_all()
+
+    def wait(self, order_id: str, timeout: float) -> Optional[Dict[str, Any]]:
+        """주문 상태가 게시될 때까지 최대 timeout초 대기 (게시된 상태는 한 번만 반환)"""
+        deadline = time.monotonic() + timeout
+        with self._condition:
+            while order_id not in self._orders:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return None
+                self._condition.wait(remaining)
+            return self._orders.pop(order_id)
+
+class OrderTracker:
+    """
+    주문 체결 추적기
+
+    체결 피드를 기다리다가(없으면 단순 대기) 조회 간격이 지나면 REST로 주문 상태를 확인합니다.
+    조회 간격은 initial_delay부터 두 배씩 늘어 max_delay까지 커집니다.
+    """
+
+    def __init__(self, timeout: float = ORDER_FILL_TIMEOUT, initial_delay: float = ORDER_POLL_INITIAL_DELAY,
+                 max_delay: float = ORDER_POLL_MAX_DELAY, feed: Optional[OrderFillFeed] = None,
+                 clock: Callable[[], float] = time.monotonic):
+        self.timeout = timeout
+        self.initial_delay = initial_delay
+        self.max_delay = max_delay
+        self.feed = feed
+        self.clock = clock
+
+    def _pause(self, order_id: str, delay: float) -> Optional[Dict[str, Any]]:
+        """다음 조회까지 대기 (체결 피드에 상태가 올라오면 즉시 반환)"""
+        if self.feed is not None:
+            return self.feed.wait(order_id, delay)
+        time.sleep(delay)
+        return None
+
+    def wait_for_fill(self, upbit, order_id: str) -> OrderFill:
+        """
+        주문이 종료 상태(done/cancel)가 될 때까지 추적
+
+        Returns:
+            체결 결과. timeout 안에 종료되지 않으면 마지막으로 확인한 상태(부분 체결 포함)를 반환합니다.
+        """
+        started = self.clock()
+        delay = self.initial_delay
+        fill = OrderFill(order_id=order_id, state='unknown')
+        polls = 0
+
+        while True:
+            order = self._pause(order_id, delay)
+            if order is None:
+                try:
+                    order = upbit.get_order(order_id)
+                    polls += 1
+                except Exception as e:
+                    print(f"⚠️ 주문 상태 조회 실패: {e}")
+                    order = None
+
+            if isinstance(order, dict) and order.get('uuid') == order_id:
+                fill = parse_order_fill(order)
+                if fill.is_final:
+                    break
+
+            if self.clock() - started >= self.timeout:
+                print(f"⚠️ {self.timeout:.0f}초 안에 주문이 종료되지 않았습니다 (상태: {fill.state})")
+                break
+            delay = min(delay * 2, self.max_delay)
+
+        fill.elapsed = self.clock() - started
+        fill.polls = polls
+        return fill
+
+# 전역 체결 피드 및 추적기
+order_fill_feed = OrderFillFeed()
+order_tracker = OrderTracker(feed=order_fill_feed)
+
+def wait_for_order_fill(upbit, order_id: str) -> OrderFill:
+    """주문 체결 추적 (편의 함수)"""
+    return order_tracker.wait_for_fill(upbit, order_id)
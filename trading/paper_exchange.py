@@ -0,0 +1,507 @@
+"""
+모의 거래(페이퍼 트레이딩) 거래소 모듈
+기록된 캔들/오더북을 시뮬레이션 시각에 맞춰 재생하고, main.py와 trading 모듈이 사용하는
+pyupbit.Upbit 메서드(get_balances, buy/sell_market_order, buy/sell_limit_order, cancel_order, get_order)와
+pyupbit 모듈 함수(get_current_price, get_ohlcv, get_orderbook)를 같은 응답 형식으로 제공합니다.
+
+- 시뮬레이션 시각은 API 호출 지연(latency)과 advance()로만 흐르므로 실제 시간보다 빠르게 재생할 수 있습니다.
+- 현재가는 시뮬레이션 시각까지 마감된 마지막 분봉의 종가이고, 일봉/N분봉은 분봉을 묶어서 만듭니다.
+- 시장가 주문은 오더북(기록이 없으면 현재가 주변의 합성 오더북)을 따라 체결하고 수수료를 차감합니다.
+  호가 잔량은 주문마다 다시 채워진 것으로 봅니다.
+- 지정가 주문은 즉시 체결 가능한 만큼 체결하고, 남은 수량은 이후 분봉의 고가/저가가 주문 가격에 닿으면 체결합니다.
+- install()은 pyupbit 모듈 함수, 캔들 저장소, 계좌 캐시, 분할 주문 엔진의 조회 함수를 모의 거래소로 바꾸고
+  끝나면 되돌립니다.
+"""
+
+import time
+import uuid
+import threading
+import pyupbit
+import pandas as pd
+from collections import Counter
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from typing import Optional, Dict, Any, List, Sequence, Tuple
+from config.settings import (
+    TRADING_SYMBOL, MIN_TRADE_AMOUNT, MINUTE_DATA_COUNT, PAPER_INITIAL_KRW, PAPER_FEE_RATE, PAPER_LATENCY,
+    PAPER_SPEED, PAPER_FILL_DELAY, PAPER_FILL_RATIO, PAPER_BOOK_LEVELS, PAPER_BOOK_SPREAD_BPS,
+    PAPER_BOOK_LEVEL_BPS, PAPER_BOOK_LEVEL_SIZE
+)
+from .market_impact import orderbook_ladder
+
+# 재생 캔들 간격 (업비트 1분봉)
+BAR = timedelta(minutes=1)
+
+OHLCV_AGGREGATION = {'open': 'first', 'high': 'max', 'low': 'min', 'close': 'last', 'volume': 'sum', 'value': 'sum'}
+
+class MarketReplay:
+    """
+    기록된 시장 데이터 재생기
+
+    candles는 pyupbit.get_ohlcv(interval="minute1") 형식(인덱스: KST 캔들 시작 시각)이고,
+    orderbooks는 (시각, pyupbit.get_orderbook 결과) 목록입니다.
+    """
+
+    def __init__(self, candles: pd.DataFrame, orderbooks: Optional[Sequence[Tuple[datetime, Dict[str, Any]]]] = None):
+        columns = [column for column in OHLCV_AGGREGATION if column in candles.columns]
+        self.candles = candles.sort_index()[columns]
+        self.candles = self.candles[~self.candles.index.duplicated(keep='last')]
+        self.candles.index = pd.DatetimeIndex(self.candles.index).as_unit('us')  # 지연 시간(마이크로초) 단위 비교
+        recorded = sorted(orderbooks or [], key=lambda item: item[0])
+        self._orderbook_times = pd.DatetimeIndex([timestamp for timestamp, _ in recorded]).as_unit('us')
+        self._orderbooks = [orderbook for _, orderbook in recorded]
+
+    @classmethod
+    def from_archive(cls, symbol: str = TRADING_SYMBOL, start: Optional[datetime] = None,
+                     end: Optional[datetime] = None) -> 'MarketReplay':
+        """Parquet 분석 아카이브에 저장된 분봉으로 재생기 생성"""
+        from database.parquet_archive import load_archive
+        frame = load_archive('candles_minute1', symbol, start, end, columns=['timestamp'] + list(OHLCV_AGGREGATION))
+        return cls(frame.set_index('timestamp'))
+
+    @property
+    def start(self) -> datetime:
+        """첫 분봉이 마감된 시각"""
+        return (self.candles.index[0] + BAR).to_pydatetime()
+
+    @property
+    def end(self) -> datetime:
+        """마지막 분봉이 마감된 시각"""
+        return (self.candles.index[-1] + BAR).to_pydatetime()
+
+    def visible(self, now: datetime) -> pd.DataFrame:
+        """now까지 마감된 분봉"""
+        return self.candles.iloc[:self.candles.index.searchsorted(now - BAR, side='right')]
+
+    def between(self, start: datetime, end: datetime) -> pd.DataFrame:
+        """start 이후 end까지 마감된 분봉"""
+        index = self.candles.index
+        return self.candles.iloc[index.searchsorted(start - BAR, side='right'):index.searchsorted(end - BAR, side='right')]
+
+    def price_at(self, now: datetime) -> Optional[float]:
+        """now 시점 현재가 (마지막으로 마감된 분봉의 종가)"""
+        position = self.candles.index.searchsorted(now - BAR, side='right')
+        return float(self.candles['close'].iloc[position - 1]) if position else None
+
+    def ohlcv(self, now: datetime, interval: str = "day", count: int = 200) -> Optional[pd.DataFrame]:
+        """
+        now 시점에 조회되는 캔들 (분봉을 묶어서 생성, 마지막 캔들은 진행 중인 캔들)
+
+        일봉은 업비트와 같이 KST 09:00에 시작합니다.
+        """
+        from data.candle_store import interval_to_timedelta
+        frame = self.visible(now)
+        if frame.empty:
+            return None
+        if interval in ("minute1", "minute"):
+            return frame.tail(count).copy()
+        bar = interval_to_timedelta(interval)
+        offset = '9h' if bar >= timedelta(days=1) else None
+        frame = frame.resample(bar, offset=offset).agg({column: OHLCV_AGGREGATION[column] for column in frame.columns})
+        return frame.dropna(subset=['close']).tail(count)
+
+    def orderbook_at(self, now: datetime) -> Optional[Dict[str, Any]]:
+        """now 이전에 기록된 마지막 오더북 (1분보다 오래되었으면 None)"""
+        if not self._orderbooks:
+            return None
+        position = self._orderbook_times.searchsorted(now, side='right')
+        if not position or now - self._orderbook_times[position - 1] > BAR:
+            return None
+        return self._orderbooks[position - 1]
+
+def synthetic_orderbook(price: float, levels: int = PAPER_BOOK_LEVELS, spread_bps: float = PAPER_BOOK_SPREAD_BPS,
+                        level_bps: float = PAPER_BOOK_LEVEL_BPS, level_size: float = PAPER_BOOK_LEVEL_SIZE,
+                        symbol: str = TRADING_SYMBOL) -> Dict[str, Any]:
+    """현재가 주변에 호가 단계별 같은 잔량을 둔 오더북 (업비트 호가 단위로 맞춤)"""
+    units = []
+    for level in range(levels):
+        distance = (spread_bps / 2 + level * level_bps) / 10000
+        units.append({
+            'ask_price': pyupbit.get_tick_size(price * (1 + distance), method='ceil'),
+            'bid_price': pyupbit.get_tick_size(price * (1 - distance), method='floor'),
+            'ask_size': level_size,
+            'bid_size': level_size
+        })
+    return {'market': symbol, 'timestamp': 0, 'total_ask_size': level_size * levels,
+            'total_bid_size': level_size * levels, 'orderbook_units': units}
+
+def _error(name: str, message: str) -> Dict[str, Any]:
+    """업비트 오류 응답 형식"""
+    return {'error': {'name': name, 'message': message}}
+
+class PaperExchange:
+    """
+    모의 거래소 (pyupbit.Upbit 대체)
+
+    주문 응답과 get_order(uuid) 응답은 업비트와 같은 형식(숫자는 문자열)입니다.
+    시장가 매수는 업비트처럼 체결 후 'cancel' 상태로 끝납니다.
+    """
+
+    def __init__(self, replay: MarketReplay, initial_krw: float = PAPER_INITIAL_KRW, initial_btc: float = 0.0,
+                 fee_rate: float = PAPER_FEE_RATE, latency: float = PAPER_LATENCY, speed: float = PAPER_SPEED,
+                 fill_delay: float = PAPER_FILL_DELAY, fill_ratio: float = PAPER_FILL_RATIO,
+                 start: Optional[datetime] = None, symbol: str = TRADING_SYMBOL):
+        self.replay = replay
+        self.fee_rate = fee_rate
+        self.latency = latency
+        self.speed = speed
+        self.fill_delay = fill_delay
+        self.fill_ratio = fill_ratio
+        self.symbol = symbol
+        self.now = start or replay.start
+        self.balances = {
+            'KRW': {'balance': float(initial_krw), 'locked': 0.0, 'avg_buy_price': 0.0},
+            'BTC': {'balance': float(initial_btc), 'locked': 0.0, 'avg_buy_price': 0.0}
+        }
+        self.orders: Dict[str, Dict[str, Any]] = {}
+        self.call_counts: Counter = Counter()
+        self.fees_paid = 0.0
+        self.feed = None  # 체결 알림을 게시할 OrderFillFeed (install()에서 설정)
+        self._matched_until = self.now
+        self._lock = threading.RLock()
+        self.initial_equity = self.equity()
+
+    # 시뮬레이션 시각
+
+    def _call(self, name: str):
+        """API 호출 1회: 지연만큼 시각을 진행하고 체결 처리"""
+        self.call_counts[name] += 1
+        if self.latency:
+            self.advance(self.latency)
+            if self.speed:
+                time.sleep(self.latency / self.speed)
+
+    def advance(self, seconds: float):
+        """시뮬레이션 시각 진행 (접수된 주문 체결 및 대기 중인 지정가 주문 체결)"""
+        with self._lock:
+            self.now += timedelta(seconds=seconds)
+            self._process_orders()
+
+    @property
+    def finished(self) -> bool:
+        """기록된 캔들을 모두 재생했는지 여부"""
+        return self.now >= self.replay.end
+
+    # pyupbit 모듈 함수
+
+    def get_current_price(self, ticker=TRADING_SYMBOL, limit_info: bool = False, verbose: bool = False):
+        self._call('get_current_price')
+        price = self.replay.price_at(self.now)
+        if isinstance(ticker, (list, tuple)):
+            return {symbol: price for symbol in ticker}
+        return price
+
+    def get_ohlcv(self, ticker: str = TRADING_SYMBOL, interval: str = "day", count: int = 200,
+                  to=None, period: float = 0.1) -> Optional[pd.DataFrame]:
+        self._call('get_ohlcv')
+        now = min(self.now, pd.Timestamp(to).to_pydatetime()) if to is not None else self.now
+        return self.replay.ohlcv(now, interval, count)
+
+    def get_orderbook(self, ticker: str = TRADING_SYMBOL, limit_info: bool = False) -> Optional[Dict[str, Any]]:
+        self._call('get_orderbook')
+        return self._orderbook()
+
+    def _orderbook(self) -> Optional[Dict[str, Any]]:
+        orderbook = self.replay.orderbook_at(self.now)
+        if orderbook is not None:
+            return orderbook
+        price = self.replay.price_at(self.now)
+        return synthetic_orderbook(price, symbol=self.symbol) if price else None
+
+    # pyupbit.Upbit 메서드
+
+    def get_balances(self, contain_req: bool = False) -> List[Dict[str, Any]]:
+        self._call('get_balances')
+        with self._lock:
+            return [{
+                'currency': currency,
+                'balance': str(balance['balance']),
+                'locked': str(balance['locked']),
+                'avg_buy_price': str(balance['avg_buy_price']),
+                'avg_buy_price_modified': False,
+                'unit_currency': 'KRW'
+            } for currency, balance in self.balances.items()]
+
+    def buy_market_order(self, ticker: str, price: float, contain_req: bool = False) -> Dict[str, Any]:
+        """시장가 매수 (price: 주문 금액, 수수료는 별도)"""
+        self._call('buy_market_order')
+        return self._submit('bid', 'price', ticker, amount=float(price))
+
+    def sell_market_order(self, ticker: str, volume: float, contain_req: bool = False) -> Dict[str, Any]:
+        """시장가 매도"""
+        self._call('sell_market_order')
+        return self._submit('ask', 'market', ticker, volume=float(volume))
+
+    def buy_limit_order(self, ticker: str, price: float, volume: float, contain_req: bool = False) -> Dict[str, Any]:
+        self._call('buy_limit_order')
+        return self._submit('bid', 'limit', ticker, limit_price=float(price), volume=float(volume))
+
+    def sell_limit_order(self, ticker: str, price: float, volume: float, contain_req: bool = False) -> Dict[str, Any]:
+        self._call('sell_limit_order')
+        return self._submit('ask', 'limit', ticker, limit_price=float(price), volume=float(volume))
+
+    def cancel_order(self, uuid: str, contain_req: bool = False) -> Dict[str, Any]:
+        self._call('cancel_order')
+        with self._lock:
+            order = self.orders.get(uuid)
+            if order is None:
+                return _error('order_not_found', '주문을 찾지 못했습니다.')
+            if order['state'] != 'wait':
+                return _error('canceled_order' if order['state'] == 'cancel' else 'done_order', '이미 종료된 주문입니다.')
+            if not order['settled']:
+                self._settle(order)
+            self._finish(order, 'cancel')
+            return self._response(order, trades=False)
+
+    def get_order(self, ticker_or_uuid: str, state: str = 'wait', page: int = 1, limit: int = 100,
+                  contain_req: bool = False):
+        """uuid면 주문 한 건(체결 목록 포함), 마켓 코드면 해당 상태의 주문 목록"""
+        self._call('get_order')
+        with self._lock:
+            if ticker_or_uuid in self.orders:
+                return self._response(self.orders[ticker_or_uuid])
+            if '-' in ticker_or_uuid and ticker_or_uuid.isupper():
+                orders = [order for order in self.orders.values()
+                          if order['market'] == ticker_or_uuid and self._visible_state(order) == state]
+                orders.sort(key=lambda order: order['created_at'], reverse=True)
+                return [self._response(order, trades=False) for order in orders[(page - 1) * limit:page * limit]]
+            return _error('order_not_found', '주문을 찾지 못했습니다.')
+
+    # 주문 처리
+
+    def _submit(self, side: str, ord_type: str, ticker: str, amount: Optional[float] = None,
+                volume: Optional[float] = None, limit_price: Optional[float] = None) -> Dict[str, Any]:
+        """주문 접수: 주문 가능 잔고를 확인해 잠그고, 즉시 체결분을 계산"""
+        with self._lock:
+            price = self.replay.price_at(self.now)
+            if price is None:
+                return _error('market_not_ready', '재생할 시세가 없습니다.')
+            notional = amount if amount is not None else volume * (limit_price or price)
+            if notional < MIN_TRADE_AMOUNT:
+                return _error(f'under_min_total_{side}', f'최소주문금액 이상으로 주문해주세요. ({MIN_TRADE_AMOUNT}원)')
+
+            if side == 'bid':
+                locked = (amount if amount is not None else limit_price * volume) * (1 + self.fee_rate)
+                wallet = self.balances['KRW']
+            else:
+                locked = volume
+                wallet = self.balances['BTC']
+            if wallet['balance'] + 1e-9 < locked:
+                return _error(f'insufficient_funds_{side}', '주문가능한 금액이 부족합니다.')
+            wallet['balance'] -= locked
+            wallet['locked'] += locked
+
+            order = {
+                'uuid': str(uuid.uuid4()), 'side': side, 'ord_type': ord_type, 'market': ticker,
+                'amount': amount, 'volume': volume, 'limit_price': limit_price, 'locked': locked,
+                'state': 'wait', 'created_at': self.now, 'settle_at': self.now + timedelta(seconds=self.fill_delay),
+                'settled': False, 'trades': self._match_book(side, amount, volume, limit_price, ord_type != 'limit')
+            }
+            self.orders[order['uuid']] = order
+            if not self.fill_delay:
+                self._settle(order)
+            return self._response(order, trades=False)
+
+    def _match_book(self, side: str, amount: Optional[float], volume: Optional[float],
+                    limit_price: Optional[float], partial: bool) -> List[Dict[str, Any]]:
+        """오더북 호가를 따라 체결 목록 계산 (시장가는 fill_ratio만큼만 체결)"""
+        prices, sizes = orderbook_ladder(self._orderbook(), 'buy' if side == 'bid' else 'sell')
+        ratio = self.fill_ratio if partial else 1.0
+        funds_left = amount * ratio if amount is not None else None
+        volume_left = volume * ratio if volume is not None else None
+        trades = []
+        for price, size in zip(prices, sizes):
+            if limit_price is not None and (price > limit_price if side == 'bid' else price < limit_price):
+                break
+            fill = size
+            if funds_left is not None:
+                fill = min(fill, funds_left / price)
+            if volume_left is not None:
+                fill = min(fill, volume_left)
+            if fill <= 1e-12:
+                break
+            trades.append(self._trade(side, float(price), float(fill)))
+            if funds_left is not None:
+                funds_left -= price * fill
+            if volume_left is not None:
+                volume_left -= fill
+        return trades
+
+    def _trade(self, side: str, price: float, volume: float) -> Dict[str, Any]:
+        return {'market': self.symbol, 'uuid': str(uuid.uuid4()), 'price': price, 'volume': volume,
+                'funds': price * volume, 'side': side, 'created_at': self.now.isoformat()}
+
+    def _apply_trades(self, order: Dict[str, Any], trades: List[Dict[str, Any]]):
+        """체결분만큼 잔고 반영 (잠긴 금액/수량에서 차감)"""
+        krw, btc = self.balances['KRW'], self.balances['BTC']
+        for trade in trades:
+            fee = trade['funds'] * self.fee_rate
+            self.fees_paid += fee
+            if order['side'] == 'bid':
+                cost = trade['funds'] + fee
+                krw['locked'] -= cost
+                order['locked'] -= cost
+                held = btc['balance'] + btc['locked']
+                btc['avg_buy_price'] = (btc['avg_buy_price'] * held + trade['funds']) / (held + trade['volume'])
+                btc['balance'] += trade['volume']
+            else:
+                btc['locked'] -= trade['volume']
+                order['locked'] -= trade['volume']
+                krw['balance'] += trade['funds'] - fee
+                if btc['balance'] + btc['locked'] <= 1e-12:
+                    btc['avg_buy_price'] = 0.0
+
+    def _settle(self, order: Dict[str, Any]):
+        """즉시 체결분 반영 (시장가는 종료, 지정가는 남은 수량이 있으면 대기)"""
+        order['settled'] = True
+        self._apply_trades(order, order['trades'])
+        if order['ord_type'] != 'limit':
+            fully_filled = order['amount'] is None and self._executed(order) >= order['volume'] - 1e-12
+            self._finish(order, 'done' if fully_filled else 'cancel')
+        elif self._remaining(order) <= 1e-12:
+            self._finish(order, 'done')
+
+    def _finish(self, order: Dict[str, Any], state: str):
+        """주문 종료: 남은 잠금 해제 후 체결 알림 게시"""
+        wallet = self.balances['KRW' if order['side'] == 'bid' else 'BTC']
+        wallet['locked'] -= order['locked']
+        wallet['balance'] += order['locked']
+        order['locked'] = 0.0
+        order['state'] = state
+        if self.feed is not None:
+            self.feed.publish(self._response(order))
+
+    def _process_orders(self):
+        """체결 시각이 된 주문 반영, 대기 중인 지정가 주문은 새로 마감된 분봉의 고가/저가로 체결"""
+        candles = self.replay.between(self._matched_until, self.now)
+        self._matched_until = self.now
+        for order in list(self.orders.values()):
+            if order['state'] != 'wait':
+                continue
+            if not order['settled']:
+                if self.now >= order['settle_at']:
+                    self._settle(order)
+                continue
+            if order['ord_type'] != 'limit' or candles.empty:
+                continue
+            crossed = (candles['low'].min() <= order['limit_price'] if order['side'] == 'bid'
+                       else candles['high'].max() >= order['limit_price'])
+            if crossed:
+                trade = self._trade(order['side'], order['limit_price'], self._remaining(order))
+                order['trades'].append(trade)
+                self._apply_trades(order, [trade])
+                self._finish(order, 'done')
+
+    @staticmethod
+    def _executed(order: Dict[str, Any]) -> float:
+        return sum(trade['volume'] for trade in order['trades'])
+
+    def _remaining(self, order: Dict[str, Any]) -> float:
+        return max(order['volume'] - self._executed(order), 0.0) if order['volume'] is not None else 0.0
+
+    def _visible_state(self, order: Dict[str, Any]) -> str:
+        return order['state'] if order['settled'] else 'wait'
+
+    def _response(self, order: Dict[str, Any], trades: bool = True) -> Dict[str, Any]:
+        """업비트 주문 응답 형식 (체결 시각 전에는 체결 내역 없이 'wait')"""
+        visible = order['trades'] if order['settled'] else []
+        price = order['amount'] if order['ord_type'] == 'price' else order['limit_price']
+        executed = sum((trade['volume'] for trade in visible), 0.0)
+        funds = sum((trade['funds'] for trade in visible), 0.0)
+        response = {
+            'uuid': order['uuid'],
+            'side': order['side'],
+            'ord_type': order['ord_type'],
+            'price': None if price is None else str(price),
+            'state': self._visible_state(order),
+            'market': order['market'],
+            'created_at': order['created_at'].isoformat(),
+            'volume': None if order['volume'] is None else str(order['volume']),
+            'remaining_volume': None if order['volume'] is None else str(max(order['volume'] - executed, 0.0)),
+            'reserved_fee': str((order['amount'] or 0) * self.fee_rate),
+            'paid_fee': str(funds * self.fee_rate),
+            'locked': str(order['locked']),
+            'executed_volume': str(executed),
+            'trades_count': len(visible)
+        }
+        if trades:
+            response['trades'] = [dict(trade, price=str(trade['price']), volume=str(trade['volume']),
+                                       funds=str(trade['funds'])) for trade in visible]
+        return response
+
+    # 결과
+
+    def equity(self) -> float:
+        """평가 자산 (현금 + 비트코인 평가금액, 잠긴 잔고 포함)"""
+        with self._lock:
+            price = self.replay.price_at(self.now) or 0.0
+            krw, btc = self.balances['KRW'], self.balances['BTC']
+            return krw['balance'] + krw['locked'] + (btc['balance'] + btc['locked']) * price
+
+    def get_summary(self) -> Dict[str, Any]:
+        """모의 거래 결과 요약"""
+        with self._lock:
+            equity = self.equity()
+            filled = [order for order in self.orders.values() if order['settled'] and order['trades']]
+            return {
+                'now': self.now,
+                'equity': equity,
+                'return_pct': (equity / self.initial_equity - 1) * 100 if self.initial_equity else 0.0,
+                'krw_balance': self.balances['KRW']['balance'] + self.balances['KRW']['locked'],
+                'btc_balance': self.balances['BTC']['balance'] + self.balances['BTC']['locked'],
+                'orders': len(self.orders),
+                'filled_orders': len(filled),
+                'fees_paid': self.fees_paid,
+                'api_calls': dict(self.call_counts)
+            }
+
+    @contextmanager
+    def install(self):
+        """
+        pyupbit 모듈 함수와 시세/계좌 조회 경로를 모의 거래소로 교체
+
+        - pyupbit.get_current_price/get_ohlcv/get_orderbook
+        - 분봉 캔들 저장소 (디스크 저장 없이 시뮬레이션 시각 기준으로 증분 조회)
+        - 계좌 캐시 현재가 조회, 분할 주문 엔진 오더북 조회, 체결 알림 피드
+        - 분할 주문 실행 구간과 지정가 조각 대기 시간 (재생 배속만큼 단축, 배속 0이면 기다리지 않음)
+        """
+        import data.candle_store as candle_store
+        from .account_state import account_state
+        from .order_tracker import order_fill_feed
+        from .sliced_execution import sliced_execution_engine
+
+        originals = {name: getattr(pyupbit, name) for name in ('get_current_price', 'get_ohlcv', 'get_orderbook')}
+        saved_stores = dict(candle_store._candle_stores)
+        saved_price_fetcher = account_state.price_fetcher
+        saved_orderbook_fetcher = sliced_execution_engine.orderbook_fetcher
+        saved_timing = sliced_execution_engine.window, sliced_execution_engine.limit_tracker.timeout
+
+        pyupbit.get_current_price = self.get_current_price
+        pyupbit.get_ohlcv = self.get_ohlcv
+        pyupbit.get_orderbook = self.get_orderbook
+        with candle_store._candle_stores_lock:
+            candle_store._candle_stores.clear()
+            key = (self.symbol, "minute1", MINUTE_DATA_COUNT)
+            candle_store._candle_stores[key] = candle_store.CandleStore(
+                self.symbol, "minute1", MINUTE_DATA_COUNT, storage_dir=None, fetcher=self.get_ohlcv,
+                clock=lambda: self.now)
+        account_state.price_fetcher = self.get_current_price
+        account_state.invalidate()  # 실제 계좌 잔고 캐시를 쓰지 않도록
+        sliced_execution_engine.orderbook_fetcher = self.get_orderbook
+        scale = 1 / self.speed if self.speed else 0.0
+        sliced_execution_engine.window = saved_timing[0] * scale
+        sliced_execution_engine.limit_tracker.timeout = saved_timing[1] * scale
+        self.feed = order_fill_feed
+        try:
+            yield self
+        finally:
+            for name, function in originals.items():
+                setattr(pyupbit, name, function)
+            with candle_store._candle_stores_lock:
+                candle_store._candle_stores.clear()
+                candle_store._candle_stores.update(saved_stores)
+            account_state.price_fetcher = saved_price_fetcher
+            account_state.invalidate()
+            sliced_execution_engine.orderbook_fetcher = saved_orderbook_fetcher
+            sliced_execution_engine.window, sliced_execution_engine.limit_tracker.timeout = saved_timing
+            self.feed = None
@@ -0,0 +1,330 @@
+"""
+분할 주문 실행 모듈
+큰 주문(부모 주문)을 여러 개의 작은 주문(조각)으로 나눠 백그라운드에서 실행합니다.
+
+- twap: 실행 구간(EXECUTION_WINDOW_SECONDS)에 같은 크기의 조각을 일정 간격으로 실행
+- iceberg: 조각마다 보이는 호가 잔량의 일정 비율(ICEBERG_DEPTH_RATIO)만큼만 실행
+
+조각은 시장가 또는 최우선 호가 지정가로 주문합니다. 지정가 조각의 미체결분은 취소 후 다음 조각으로 이월하고,
+마지막 조각의 남은 수량은 시장가로 정리합니다. 취소 후에도 종료 상태가 확인되지 않은 조각이 있으면
+거래소에 주문이 남아 있을 수 있으므로 부모 주문을 partially_filled로 중단합니다. 모든 조각이 끝나면 체결 가중 평균가와 도착가(주문 결정 시점 가격)
+대비 슬리피지를 보고하고, 부모 주문을 trades 테이블에 한 건으로 기록합니다.
+"""
+
+import math
+import time
+import uuid
+import threading
+import pyupbit
+from concurrent.futures import ThreadPoolExecutor, Future
+from dataclasses import dataclass, field
+from typing import Optional, Dict, Any, List, Tuple, Callable
+from config.settings import (
+    TRADING_SYMBOL, MIN_TRADE_AMOUNT, EXECUTION_WINDOW_SECONDS, EXECUTION_MAX_SLICES, SLICE_ORDER_TYPE,
+    SLICE_LIMIT_TIMEOUT, ICEBERG_DEPTH_RATIO, ICEBERG_DEPTH_LEVELS
+)
+from .order_tracker import OrderFill, OrderTracker, order_tracker, order_fill_feed
+from .account_state import update_account_after_fill, invalidate_account_state
+
+# 조각 수량은 업비트 최소 단위(소수점 8자리)로 내림
+VOLUME_DECIMALS = 8
+
+@dataclass
+class ChildOrder:
+    """조각 주문 결과"""
+    index: int
+    order_type: str  # 'market' 또는 'limit'
+    requested: float  # 매수: 원, 매도: BTC
+    fill: OrderFill
+    limit_price: Optional[float] = None
+
+@dataclass
+class ExecutionReport:
+    """부모 주문 실행 보고서"""
+    parent_id: str
+    action: str  # 'buy' 또는 'sell'
+    strategy: str  # 'twap' 또는 'iceberg'
+    requested: float  # 매수: 원, 매도: BTC
+    arrival_price: float
+    status: str = 'working'  # working, executed, partially_filled, cancelled, failed
+    children: List[ChildOrder] = field(default_factory=list)
+    started_at: float = field(default_factory=time.time)
+    finished_at: Optional[float] = None
+
+    @property
+    def executed_volume(self) -> float:
+        return sum(child.fill.executed_volume for child in self.children)
+
+    @property
+    def funds(self) -> float:
+        return sum(child.fill.funds for child in self.children)
+
+    @property
+    def fee(self) -> float:
+        return sum(child.fill.paid_fee for child in self.children)
+
+    @property
+    def remaining(self) -> float:
+        """남은 주문 크기 (매수: 원, 매도: BTC)"""
+        filled = self.funds if self.action == 'buy' else self.executed_volume
+        return max(self.requested - filled, 0.0)
+
+    @property
+    def avg_price(self) -> float:
+        """체결 가중 평균가"""
+        volume = self.executed_volume
+        return self.funds / volume if volume > 0 else 0.0
+
+    @property
+    def slippage_bps(self) -> float:
+        """도착가 대비 슬리피지 (bp, 양수면 도착가보다 불리하게 체결)"""
+        if self.arrival_price <= 0 or self.executed_volume <= 0:
+            return 0.0
+        difference = self.avg_price - self.arrival_price
+        if self.action == 'sell':
+            difference = -difference
+        return difference / self.arrival_price * 10000
+
+    def to_execution_result(self) -> Dict[str, Any]:
+        """save_trade_record에 넘길 execution_result (부모 주문 한 건)"""
+        return {
+            'action': self.action,
+            'price': self.avg_price,
+            'amount': self.executed_volume,
+            'total_value': self.funds,
+            'fee': self.fee,
+            'order_id': self.parent_id,
+            'status': self.status,
+            'success': self.executed_volume > 0
+        }
+
+def plan_twap_slices(total: float, max_slices: int, window: float, min_slice: float) -> List[Tuple[float, float]]:
+    """
+    TWAP 조각 계획
+
+    Returns:
+        (시작 후 실행 시각(초), 조각 크기) 목록. 모든 조각이 min_slice 이상이 되도록 조각 수를 줄입니다.
+    """
+    count = max(1, min(max_slices, int(total // min_slice) if min_slice > 0 else max_slices))
+    return [(window * index / count, total / count) for index in range(count)]
+
+def depth_slice_size(orderbook: Optional[Dict[str, Any]], action: str, depth_ratio: float,
+                     levels: int = ICEBERG_DEPTH_LEVELS) -> Optional[float]:
+    """
+    호가 잔량 기준 조각 크기 (매수: 매도호가 잔량의 원화 가치, 매도: 매수호가 잔량 BTC)
+
+    Returns:
+        조각 크기 (오더북이 없으면 None)
+    """
+    units = (orderbook or {}).get('orderbook_units') or []
+    if not units:
+        return None
+    units = units[:levels]
+    if action == 'buy':
+        depth = sum(float(unit['ask_price']) * float(unit['ask_size']) for unit in units)
+    else:
+        depth = sum(float(unit['bid_size']) for unit in units)
+    return depth * depth_ratio
+
+def _floor_volume(volume: float) -> float:
+    factor = 10 ** VOLUME_DECIMALS
+    return math.floor(volume * factor) / factor
+
+class SlicedExecutionEngine:
+    """
+    분할 주문 실행 엔진
+
+    부모 주문은 전용 워커 스레드(백그라운드 스케줄러)에서 한 번에 하나씩 실행됩니다.
+    조각 사이의 대기는 cancel()로 즉시 중단할 수 있습니다.
+    """
+
+    def __init__(self, window: float = EXECUTION_WINDOW_SECONDS, max_slices: int = EXECUTION_MAX_SLICES,
+                 order_type: str = SLICE_ORDER_TYPE, limit_timeout: float = SLICE_LIMIT_TIMEOUT,
+                 depth_ratio: float = ICEBERG_DEPTH_RATIO, symbol: str = TRADING_SYMBOL,
+                 orderbook_fetcher: Callable[[str], Optional[Dict[str, Any]]] = pyupbit.get_orderbook,
+                 tracker: OrderTracker = order_tracker, limit_tracker: Optional[OrderTracker] = None):
+        self.window = window
+        self.max_slices = max_slices
+        self.order_type = order_type
+        self.depth_ratio = depth_ratio
+        self.symbol = symbol
+        self.orderbook_fetcher = orderbook_fetcher
+        self.tracker = tracker
+        self.limit_tracker = limit_tracker or OrderTracker(timeout=limit_timeout, feed=order_fill_feed)
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._future: Optional[Future] = None
+        self._stop = threading.Event()
+        self.active: Optional[ExecutionReport] = None
+
+    def is_busy(self) -> bool:
+        """실행 중인 부모 주문이 있는지 여부"""
+        return self._future is not None and not self._future.done()
+
+    def submit(self, upbit, action: str, total: float, arrival_price: float, strategy: str = 'twap',
+               on_complete: Optional[Callable[[ExecutionReport], None]] = None) -> ExecutionReport:
+        """
+        부모 주문 제출 (즉시 반환, 조각은 백그라운드에서 실행)
+
+        Args:
+            upbit: pyupbit.Upbit 객체
+            action: 'buy' (total = 원) 또는 'sell' (total = BTC)
+            total: 부모 주문 크기
+            arrival_price: 주문 결정 시점 가격 (슬리피지 기준)
+            strategy: 'twap' 또는 'iceberg'
+            on_complete: 실행이 끝나면 보고서를 받아 호출할 함수 (거래 기록 저장 등)
+        """
+        if self.is_busy():
+            raise RuntimeError("이미 실행 중인 분할 주문이 있습니다")
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="sliced-execution")
+        report = ExecutionReport(parent_id=f"{strategy}-{uuid.uuid4().hex[:16]}", action=action, strategy=strategy,
+                                 requested=total, arrival_price=arrival_price)
+        self._stop.clear()
+        self.active = report
+        self._future = self._executor.submit(self._run, upbit, report, on_complete)
+        return report
+
+    def wait(self, timeout: Optional[float] = None) -> Optional[ExecutionReport]:
+        """실행 중인 부모 주문이 끝날 때까지 대기"""
+        if self._future is not None:
+            self._future.result(timeout)
+        return self.active
+
+    def cancel(self):
+        """남은 조각 실행 중단 (진행 중인 조각은 끝까지 추적)"""
+        self._stop.set()
+
+    def _min_slice(self, action: str, arrival_price: float) -> float:
+        if action == 'buy':
+            return MIN_TRADE_AMOUNT
+        return MIN_TRADE_AMOUNT / arrival_price if arrival_price > 0 else 0.0
+
+    def _slice_size(self, report: ExecutionReport, index: int, count: int, remaining: float,
+                    planned: float, orderbook: Optional[Dict[str, Any]]) -> float:
+        """이번 조각 크기 (마지막 조각이거나 남은 양이 최소 주문보다 작아지면 전부)"""
+        min_slice = self._min_slice(report.action, report.arrival_price)
+        size = planned
+        if report.strategy == 'iceberg':
+            depth_size = depth_slice_size(orderbook, report.action, self.depth_ratio)
+            size = depth_size if depth_size is not None else planned
+        size = min(max(size, min_slice), remaining)
+        if index == count - 1 or remaining - size < min_slice:
+            size = remaining
+        return size
+
+    def _place(self, upbit, action: str, size: float, order_type: str,
+               orderbook: Optional[Dict[str, Any]]) -> Tuple[Optional[str], Optional[float]]:
+        """조각 주문 (지정가는 최우선 호가 가격으로 즉시 체결 가능한 만큼만 체결)"""
+        units = (orderbook or {}).get('orderbook_units') or []
+        if order_type == 'limit' and units:
+            if action == 'buy':
+                price = float(units[0]['ask_price'])
+                result = upbit.buy_limit_order(self.symbol, price, _floor_volume(size / price))
+            else:
+                price = float(units[0]['bid_price'])
+                result = upbit.sell_limit_order(self.symbol, price, _floor_volume(size))
+        else:
+            price = None
+            if action == 'buy':
+                result = upbit.buy_market_order(self.symbol, size)
+            else:
+                result = upbit.sell_market_order(self.symbol, _floor_volume(size))
+        if not isinstance(result, dict) or not result.get('uuid'):
+            print(f"❌ 조각 주문 실패: {result}")
+            return None, price
+        return result['uuid'], price
+
+    def _execute_child(self, upbit, report: ExecutionReport, index: int, size: float, order_type: str,
+                       orderbook: Optional[Dict[str, Any]]) -> Optional[ChildOrder]:
+        """조각 주문 후 체결 추적 (지정가 미체결분은 취소, 취소 후에도 종료되지 않으면 미종료 상태로 반환)"""
+        order_id, limit_price = self._place(upbit, report.action, size, order_type, orderbook)
+        if order_id is None:
+            return None
+        if limit_price is None:
+            fill = self.tracker.wait_for_fill(upbit, order_id)
+        else:
+            fill = self.limit_tracker.wait_for_fill(upbit, order_id)
+            if not fill.is_final:
+                cancelled = upbit.cancel_order(order_id)
+                if not isinstance(cancelled, dict) or not cancelled.get('uuid') or cancelled.get('error'):
+                    print(f"⚠️ 조각 주문 취소 실패: {cancelled}")
+                # 취소 실패여도 그 사이에 체결이 끝났을 수 있으므로 다시 확인
+                fill = self.tracker.wait_for_fill(upbit, order_id)
+        update_account_after_fill(report.action, fill)
+        return ChildOrder(index=index, order_type='limit' if limit_price else 'market', requested=size,
+                          fill=fill, limit_price=limit_price)
+
+    def _add_child(self, report: ExecutionReport, child: Optional[ChildOrder], count: int):
+        if child is None:
+            return
+        report.children.append(child)
+        print(f"  🔹 조각 {child.index + 1}/{count}: {child.fill.executed_volume:.8f} BTC @ "
+              f"{child.fill.avg_price:,.0f}원 ({child.order_type})")
+
+    def _run(self, upbit, report: ExecutionReport, on_complete: Optional[Callable[[ExecutionReport], None]]):
+        """부모 주문 실행 (워커 스레드)"""
+        min_slice = self._min_slice(report.action, report.arrival_price)
+        plan = plan_twap_slices(report.requested, self.max_slices, self.window, min_slice)
+        started = time.monotonic()
+        print(f"🧩 분할 주문 시작: {report.parent_id} ({report.action}, {len(plan)}개 조각, {self.window:.0f}초)")
+        unresolved = False  # 종료 상태를 확인하지 못한 조각이 있는지
+
+        try:
+            for index, (offset, planned) in enumerate(plan):
+                if self._stop.wait(max(0.0, started + offset - time.monotonic())):
+                    break
+                if report.children and report.remaining < min_slice:
+                    break
+                orderbook = None
+                if report.strategy == 'iceberg' or self.order_type == 'limit':
+                    orderbook = self.orderbook_fetcher(self.symbol)
+                size = self._slice_size(report, index, len(plan), report.remaining, planned, orderbook)
+                child = self._execute_child(upbit, report, index, size, self.order_type, orderbook)
+                self._add_child(report, child, len(plan))
+                if child is not None and not child.fill.is_final:
+                    unresolved = True
+                    break
+
+            # 지정가 조각에서 남은 수량은 시장가로 정리 (중단 요청 시 제외)
+            if (self.order_type == 'limit' and not unresolved and report.remaining >= min_slice
+                    and not self._stop.is_set()):
+                child = self._execute_child(upbit, report, len(plan) - 1, report.remaining, 'market', None)
+                self._add_child(report, child, len(plan))
+                unresolved = child is not None and not child.fill.is_final
+        except Exception as e:
+            print(f"❌ 분할 주문 실행 중 오류: {e}")
+            invalidate_account_state()
+
+        if unresolved:
+            # 남은 주문이 나중에 체결될 수 있으므로 더 주문하지 않고 잔고는 거래소에서 다시 조회
+            print(f"⚠️ 종료되지 않은 조각 주문이 있어 분할 주문을 중단합니다: {report.children[-1].fill.order_id}")
+            invalidate_account_state()
+            report.status = 'partially_filled'
+        elif report.executed_volume <= 0:
+            report.status = 'cancelled' if self._stop.is_set() else 'failed'
+        elif report.remaining >= min_slice:
+            report.status = 'partially_filled'
+        else:
+            report.status = 'executed'
+        report.finished_at = time.time()
+        print(f"🧩 분할 주문 종료: {report.parent_id} {report.status}, 평균 {report.avg_price:,.0f}원, "
+              f"도착가 {report.arrival_price:,.0f}원 대비 슬리피지 {report.slippage_bps:+.1f}bp")
+
+        if on_complete is not None:
+            try:
+                on_complete(report)
+            except Exception as e:
+                print(f"❌ 분할 주문 완료 처리 중 오류: {e}")
+        return report
+
+# 전역 분할 주문 실행 엔진
+sliced_execution_engine = SlicedExecutionEngine()
+
+def submit_sliced_order(upbit, action: str, total: float, arrival_price: float, strategy: str = 'twap',
+                        on_complete: Optional[Callable[[ExecutionReport], None]] = None) -> ExecutionReport:
+    """분할 주문 제출 (편의 함수)"""
+    return sliced_execution_engine.submit(upbit, action, total, arrival_price, strategy, on_complete)
+
+def is_sliced_execution_busy() -> bool:
+    """실행 중인 분할 주문 여부 (편의 함수)"""
+    return sliced_execution_engine.is_busy()
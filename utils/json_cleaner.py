@@ -20,8 +20,10 @@ def clean_json_data(data: Any) -> Any:
         for key, value in data.items():
             cleaned[key] = clean_json_data(value)
         return cleaned
-    elif isinstance(data, list):
+    elif isinstance(data, (list, tuple)):
         return [clean_json_data(item) for item in data]
+    elif isinstance(data, (bool, np.bool_)):
+        return bool(data)
     elif isinstance(data, (np.floating, float)):
         if np.isnan(data) or np.isinf(data):
             return None
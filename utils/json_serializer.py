@@ -0,0 +1,121 @@
+"""
+JSON 직렬화 유틸리티
+시장 데이터를 한 번만 직렬화해 AI 프롬프트와 DB 저장에 같은 바이트를 재사용합니다.
+
+- DataFrame의 NaN/Infinity는 레코드로 바꾸기 전에 벡터 연산으로 None 처리
+- orjson이 있으면 사용 (NaN/Infinity를 null로, numpy 스칼라도 바로 직렬화)
+- 없으면 clean_json_data로 정리한 뒤 표준 json으로 직렬화
+- 스냅샷 해시용 dumps_canonical은 orjson 설치 여부와 관계없이 항상 표준 json 사용
+"""
+
+import json
+import numpy as np
+import pandas as pd
+from typing import Any, Dict, List, Optional
+from .json_cleaner import clean_json_data
+
+try:
+    import orjson
+    _ORJSON_OPTIONS = orjson.OPT_SORT_KEYS | orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+except ImportError:  # orjson은 선택 의존성
+    orjson = None
+
+def frame_to_records(df: Optional[pd.DataFrame], tail: Optional[int] = None) -> List[Dict[str, Any]]:
+    """
+    DataFrame을 JSON 직렬화 가능한 레코드 리스트로 변환
+
+    Args:
+        df: 변환할 DataFrame (None이나 빈 DataFrame이면 빈 리스트)
+        tail: 마지막 N행만 변환
+
+    Returns:
+        레코드 리스트 (NaN, Infinity 값은 None)
+    """
+    if df is None or df.empty:
+        return []
+    if tail is not None:
+        df = df.tail(tail)
+    cleaned = df.replace([np.inf, -np.inf], np.nan)
+    return cleaned.astype(object).where(cleaned.notna(), None).to_dict('records')
+
+def dumps_bytes(data: Any) -> bytes:
+    """
+    JSON 바이트로 직렬화 (키 정렬, 공백 없음, UTF-8)
+
+    orjson 사용 여부에 따라 숫자/날짜 표기가 달라질 수 있으므로 내용 해시에는 dumps_canonical을 사용합니다.
+    """
+    if isinstance(data, JsonPayload):
+        return data.json_bytes()
+    if orjson is not None:
+        return orjson.dumps(data, default=str, option=_ORJSON_OPTIONS)
+    return json.dumps(clean_json_data(data), ensure_ascii=False, sort_keys=True,
+                      separators=(',', ':')).encode('utf-8')
+
+def dumps_canonical(data: Any) -> bytes:
+    """
+    정규화된 JSON 바이트 (스냅샷 해시용, 실행 환경과 관계없이 같은 내용이면 같은 바이트)
+
+    항상 clean_json_data + 표준 json으로 직렬화합니다 (키 정렬, 공백 없음, UTF-8, NaN/Infinity는 null).
+    """
+    if isinstance(data, JsonPayload):
+        return data.canonical_bytes()
+    return json.dumps(clean_json_data(data), ensure_ascii=False, sort_keys=True, separators=(',', ':'),
+                      allow_nan=False).encode('utf-8')
+
+def dumps_str(data: Any) -> str:
+    """JSON 문자열로 직렬화 (dumps_bytes와 같은 형식)"""
+    return dumps_bytes(data).decode('utf-8')
+
+class JsonPayload(dict):
+    """
+    직렬화 결과를 함께 보관하는 딕셔너리
+
+    처음 직렬화할 때 바이트(프롬프트용, 해시용 정규화 바이트)를 기억해 두고, 최상위 키를 바꾸면 다시 직렬화합니다.
+    중첩된 값을 직접 바꾸는 경우는 감지하지 못하므로 생성 후에는 읽기 전용으로 다룹니다.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._encoded: Optional[bytes] = None
+        self._canonical: Optional[bytes] = None
+
+    def json_bytes(self) -> bytes:
+        """직렬화된 JSON 바이트 (한 번만 인코딩)"""
+        if self._encoded is None:
+            self._encoded = dumps_bytes(dict(self))
+        return self._encoded
+
+    def canonical_bytes(self) -> bytes:
+        """정규화된 JSON 바이트 (dumps_canonical, 한 번만 인코딩)"""
+        if self._canonical is None:
+            self._canonical = dumps_canonical(dict(self))
+        return self._canonical
+
+    def _invalidate(self):
+        self._encoded = None
+        self._canonical = None
+
+    def json_str(self) -> str:
+        """직렬화된 JSON 문자열"""
+        return self.json_bytes().decode('utf-8')
+
+    def __setitem__(self, key, value):
+        self._invalidate()
+        super().__setitem__(key, value)
+
+    def __delitem__(self, key):
+        self._invalidate()
+        super().__delitem__(key)
+
+    def update(self, *args, **kwargs):
+        self._invalidate()
+        super().update(*args, **kwargs)
+
+    def pop(self, *args):
+        self._invalidate()
+        return super().pop(*args)
+
+    def setdefault(self, key, default=None):
+        if key not in self:
+            self._invalidate()
+        return super().setdefault(key, default)
@@ -34,6 +34,7 @@ def print_statistics(stats):
     print(f"   매수 총액: {stats['buy_total']:,.2f}원")
     print(f"   매도 총액: {stats['sell_total']:,.2f}원")
     print(f"   수익: {stats['profit']:,.2f}원 ({stats['profit_rate']:.2f}%)")
+    print(f"   실현 손익: {stats.get('realized_pnl', 0):,.2f}원")
     print("-" * 60)
 
 def main():